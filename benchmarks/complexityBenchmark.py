@@ -0,0 +1,373 @@
+# SPDX-FileCopyrightText: Copyright © 2026 BBC
+#
+# SPDX-License-Identifier: BSD-3-Clause
+
+"""
+Guards against growth faster than intended in known code paths.
+
+Each :py:class:`ComplexityCase` builds documents of increasing size that
+are shaped to exercise one code path as hard as possible, validates them
+through the full :py:func:`validate_ttml<src.ttmlValidator.validate_ttml>`
+pipeline, and takes the time spent in the check that contains the path
+from a :py:class:`CheckProfiler<src.checkProfiler.CheckProfiler>`
+profile. The growth exponent is the slope of a least squares fit of
+log(time) against log(size). A case fails if its exponent is above its
+bound, and the module exits with a non-zero status if any case fails.
+
+Each case states the complexity its path is meant to have: linear, or
+n log n where sorting is needed, and quadratic only where the work is
+inherently pairwise, as when every region is compared with every other.
+Its bound is the exponent of that complexity, from
+:py:data:`complexity_exponents`, plus :py:data:`exponent_margin` for
+timing noise and the log factor, so that a path that grows faster than
+it should is caught. The sizes are large enough for the smallest
+document to take several milliseconds, so that the fit is not dominated
+by noise. Use ``-max_exponent`` to apply a different bound to every
+case.
+
+The documents are not meant to be valid; they only need to reach the
+code path being measured.
+"""
+
+import argparse
+import io
+import json
+import logging
+import math
+import sys
+from benchmarks.scalingBenchmark import validation_args
+from src.ttmlValidator import validate_ttml
+
+_ebuttd_template = """<?xml version="1.0" encoding="UTF-8"?>
+<tt xml:lang="en-GB"
+    xmlns="http://www.w3.org/ns/ttml"
+    xmlns:tts="http://www.w3.org/ns/ttml#styling"
+    xmlns:ttp="http://www.w3.org/ns/ttml#parameter"
+    ttp:cellResolution="32 15" ttp:timeBase="media">
+<head>
+<styling>
+<style xml:id="s_base" tts:fontSize="100%" tts:lineHeight="120%"/>
+{styles}</styling>
+<layout>
+{regions}</layout>
+</head>
+<body style="s_base"><div>
+{paragraphs}</div></body>
+</tt>
+"""
+
+_dapt_template = """<?xml version="1.0" encoding="UTF-8"?>
+<tt xmlns="http://www.w3.org/ns/ttml"
+    xmlns:ttm="http://www.w3.org/ns/ttml#metadata"
+    xmlns:ttp="http://www.w3.org/ns/ttml#parameter"
+    xmlns:daptm="http://www.w3.org/ns/ttml/profile/dapt#metadata"
+    ttp:contentProfiles="http://www.w3.org/ns/ttml/profile/dapt1.0/content"
+    daptm:scriptRepresents="{script_represents}"
+    daptm:scriptType="originalTranscript"
+    xml:lang="en">
+<head>
+<metadata>
+{agents}</metadata>
+</head>
+<body>
+{events}</body>
+</tt>
+"""
+
+_region = '<region xml:id="r{}" tts:origin="10% 10%" tts:extent="80% 80%"/>\n'
+
+
+def _p(index: int, begin: float, end: float, region: int, style: str = '') \
+        -> str:
+    return '<p xml:id="p{}" begin="{:.3f}s" end="{:.3f}s" region="r{}"{}>' \
+           '<span>Text {}</span></p>\n'.format(
+               index,
+               begin,
+               end,
+               region,
+               ' style="{}"'.format(style) if style else '',
+               index)
+
+
+def _dapt_event(index: int, represents: str) -> str:
+    return '<div xml:id="se{0}" begin="{0}s" end="{1}s" ' \
+           'daptm:represents="{2}"><p><span>Event {0}</span></p></div>\n' \
+           .format(index, index + 1, represents)
+
+
+def build_region_overlap_pairs(size: int) -> bytes:
+    """``size`` regions that all overlap spatially, each used once."""
+    return _ebuttd_template.format(
+        styles='',
+        regions=''.join(_region.format(i) for i in range(size)),
+        paragraphs=''.join(
+            _p(index=i, begin=i, end=i + 1, region=i) for i in range(size)),
+    ).encode('utf-8')
+
+
+def build_temporal_overlap(size: int) -> bytes:
+    """``size`` paragraphs that all overlap each other in time."""
+    return _ebuttd_template.format(
+        styles='',
+        regions=_region.format(0),
+        paragraphs=''.join(
+            _p(index=i, begin=i * 0.1, end=size, region=0)
+            for i in range(size)),
+    ).encode('utf-8')
+
+
+def build_style_chain(size: int) -> bytes:
+    """A chain of ``size`` styles, each referencing the next."""
+    return _ebuttd_template.format(
+        styles=''.join(
+            '<style xml:id="s{}"{} tts:fontStyle="normal"/>\n'.format(
+                i,
+                ' style="s{}"'.format(i + 1) if i + 1 < size else '')
+            for i in range(size)),
+        regions=_region.format(0),
+        paragraphs=_p(index=0, begin=0, end=1, region=0, style='s0'),
+    ).encode('utf-8')
+
+
+def build_nested_agents(size: int) -> bytes:
+    """``size`` ttm:agent elements, each nested in the previous one."""
+    agents = ''.join(
+        '<ttm:agent type="character" xml:id="a{0}">'
+        '<ttm:name type="alias">A{0}</ttm:name>'.format(i)
+        for i in range(size)) + '</ttm:agent>' * size + '\n'
+    return _dapt_template.format(
+        script_represents='audio',
+        agents=agents,
+        events=_dapt_event(index=0, represents='audio.dialogue'),
+    ).encode('utf-8')
+
+
+def build_represents_descriptors(size: int) -> bytes:
+    """
+    ``size`` scriptRepresents values and ``size`` script events, each
+    representing the last of the values.
+    """
+    values = ['visual.x-value{}'.format(i) for i in range(size)]
+    return _dapt_template.format(
+        script_represents=' '.join(values),
+        agents='',
+        events=''.join(
+            _dapt_event(index=i, represents=values[-1])
+            for i in range(size)),
+    ).encode('utf-8')
+
+
+# The growth exponent of each intended complexity. The log factor of
+# n log n is within the margin at these sizes.
+complexity_exponents = {
+    'n': 1.0,
+    'n log n': 1.0,
+    'n**2': 2.0,
+}
+
+# Allowance above the intended exponent of each case for timing noise
+exponent_margin = 0.3
+
+
+class ComplexityCase:
+    """
+    A document builder, the flavour to validate it as, the profiled check
+    whose time is measured, and the complexity the path is meant to have.
+    """
+
+    def __init__(
+            self,
+            name: str,
+            builder,
+            flavour: str,
+            check_name: str,
+            complexity: str,
+            sizes: list[int]):
+        if complexity not in complexity_exponents:
+            raise ValueError('Unknown complexity {}'.format(complexity))
+        self.name = name
+        self.builder = builder
+        self.flavour = flavour
+        self.check_name = check_name
+        self.complexity = complexity
+        self.sizes = sizes
+
+    @property
+    def max_exponent(self) -> float:
+        return complexity_exponents[self.complexity] + exponent_margin
+
+
+default_cases = [
+    # Every pair of regions is compared
+    ComplexityCase(
+        name='region_overlap_pairs',
+        builder=build_region_overlap_pairs,
+        flavour='bbc',
+        check_name='bbcTimingCheck',
+        complexity='n**2',
+        sizes=[50, 100, 200, 400]),
+    # Sorted by begin time, and only the pairs in different regions
+    # that overlap are visited
+    ComplexityCase(
+        name='temporal_overlap',
+        builder=build_temporal_overlap,
+        flavour='bbc',
+        check_name='bbcTimingCheck',
+        complexity='n log n',
+        sizes=[800, 1600, 3200, 6400]),
+    # Each style is resolved once, from the styles it references
+    ComplexityCase(
+        name='style_chain',
+        builder=build_style_chain,
+        flavour='bbc',
+        check_name='styleRefsXmlCheck',
+        complexity='n',
+        sizes=[2000, 4000, 8000, 16000]),
+    # One walk of the tree, keeping the ancestor agents
+    ComplexityCase(
+        name='nested_agents',
+        builder=build_nested_agents,
+        flavour='dapt',
+        check_name='actorRefsCheck',
+        complexity='n',
+        sizes=[2000, 4000, 8000, 16000]),
+    # Each represents value is looked up in a set of scriptRepresents
+    # values
+    ComplexityCase(
+        name='represents_descriptors',
+        builder=build_represents_descriptors,
+        flavour='dapt',
+        check_name='daptmRepresentsCheck',
+        complexity='n',
+        sizes=[1000, 2000, 4000, 8000]),
+]
+
+
+def fit_exponent(sizes: list[float], times: list[float]) -> float:
+    """
+    Returns the slope of the least squares line through
+    (log size, log time), i.e. k where time is proportional to size**k.
+    """
+    if len(sizes) != len(times) or len(sizes) < 2:
+        raise ValueError('Need at least two sizes and matching times')
+    xs = [math.log(size) for size in sizes]
+    ys = [math.log(max(t, 1e-9)) for t in times]
+    mean_x = sum(xs) / len(xs)
+    mean_y = sum(ys) / len(ys)
+    sxx = sum((x - mean_x) ** 2 for x in xs)
+    if sxx == 0:
+        raise ValueError('Sizes must not all be the same')
+    sxy = sum((x - mean_x) * (y - mean_y) for x, y in zip(xs, ys))
+    return sxy / sxx
+
+
+def check_seconds(document: bytes, flavour: str, check_name: str) -> float:
+    """
+    Validates the document and returns the time taken by the check,
+    which may be a sub-check of a container check.
+    """
+    profile_out = io.StringIO()
+    validate_ttml(validation_args(
+        document=document, flavour=flavour, profile_out=profile_out))
+    return sum(
+        profile['wall_ns'] for profile in json.loads(profile_out.getvalue())
+        if profile['check'].split('/')[-1] == check_name) / 1e9
+
+
+def run_case(
+        case: ComplexityCase,
+        repeat: int,
+        scale: float = 1.0,
+        max_exponent: float | None = None) -> dict:
+    sizes = [max(2, round(size * scale)) for size in case.sizes]
+    times = []
+    for size in sizes:
+        document = case.builder(size)
+        times.append(min(
+            check_seconds(
+                document=document,
+                flavour=case.flavour,
+                check_name=case.check_name)
+            for _ in range(repeat)))
+    exponent = fit_exponent(sizes=sizes, times=times)
+    bound = case.max_exponent if max_exponent is None else max_exponent
+    return {
+        'case': case.name,
+        'check': case.check_name,
+        'sizes': sizes,
+        'seconds': times,
+        'complexity': case.complexity,
+        'exponent': exponent,
+        'max_exponent': bound,
+        'passed': exponent <= bound,
+    }
+
+
+def main():
+    logging.getLogger().setLevel(logging.INFO)
+    case_names = [case.name for case in default_cases]
+    parser = argparse.ArgumentParser(
+        description='Check the growth of known code paths against the '
+                    'complexity each is meant to have')
+    parser.add_argument(
+        '-cases',
+        nargs='+',
+        default=case_names,
+        choices=case_names,
+        help='Cases to run (default all)')
+    parser.add_argument(
+        '-repeat',
+        type=int,
+        default=3,
+        help='Timed runs per size; the fastest is used (default 3)')
+    parser.add_argument(
+        '-scale',
+        type=float,
+        default=1.0,
+        help='Multiplier for the document sizes of every case (default 1)')
+    parser.add_argument(
+        '-max_exponent',
+        type=float,
+        default=None,
+        help='Growth exponent bound for every case, instead of each '
+             'case\'s own bound')
+    parser.add_argument(
+        '-out',
+        type=argparse.FileType('w'),
+        default=None,
+        help='JSON file to write the results to')
+    args = parser.parse_args()
+
+    # The documents are invalid, so do not log their summaries
+    root_logger = logging.getLogger()
+    results = []
+    for case in default_cases:
+        if case.name not in args.cases:
+            continue
+        root_logger.setLevel(logging.CRITICAL)
+        result = run_case(
+            case=case,
+            repeat=args.repeat,
+            scale=args.scale,
+            max_exponent=args.max_exponent)
+        root_logger.setLevel(logging.INFO)
+        results.append(result)
+        log = logging.info if result['passed'] else logging.error
+        log('{} ({}, {}): exponent {:.2f}, bound {:.2f}, {}'.format(
+            result['case'],
+            result['check'],
+            result['complexity'],
+            result['exponent'],
+            result['max_exponent'],
+            'passed' if result['passed'] else 'FAILED'))
+
+    if args.out is not None:
+        json.dump(results, args.out, indent=2)
+        args.out.write('\n')
+        args.out.flush()
+
+    return 0 if all(result['passed'] for result in results) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
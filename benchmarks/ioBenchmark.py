@@ -0,0 +1,236 @@
+# SPDX-FileCopyrightText: Copyright © 2026 BBC
+#
+# SPDX-License-Identifier: BSD-3-Clause
+
+"""
+Compares reading compressed and uncompressed documents from local disk.
+
+The same batch of generated documents is written to a directory once for
+each kind of compression, including none, and each case then reads every
+file ``repeat`` times through
+:py:func:`read_decompressed<src.compressedInput.read_decompressed>`,
+as :py:func:`validate<src.validator.validate>` does, reporting the bytes
+on disk, the megabytes of document read per second and the documents
+per second. With ``-validate``, each case also validates every file,
+so that the cost of decompression can be compared with the cost of
+validation.
+
+The files are read soon after being written, so are likely to be in the
+operating system's page cache; to measure reading from the disk itself,
+write them with ``-keep`` into ``-dir``, drop the page cache and run
+again with ``-reuse``.
+"""
+
+from pathlib import Path
+import argparse
+import datetime
+import gzip
+import json
+import logging
+import platform
+import sys
+import tempfile
+import time
+from benchmarks.ttmlGenerator import DocumentShape, generate, flavours
+from src.compressedInput import compression_kinds, read_decompressed, zstd
+from src.validator import validate
+
+compressions = ['none'] + compression_kinds
+
+file_suffixes = {
+    'none': '.xml',
+    'gzip': '.xml.gz',
+    'zstd': '.xml.zst',
+}
+
+
+def compress(content: bytes, compression: str) -> bytes:
+    match compression:
+        case 'gzip':
+            return gzip.compress(content)
+        case 'zstd':
+            return zstd.compress(content)
+    return content
+
+
+def write_documents(
+        directory: Path,
+        compression: str,
+        documents: list[bytes]) -> list[Path]:
+    """
+    Writes the documents to the directory with the compression, returning
+    their paths.
+    """
+    paths = []
+    for index, document in enumerate(documents):
+        path = directory / '{:05d}{}'.format(
+            index, file_suffixes[compression])
+        path.write_bytes(compress(document, compression))
+        paths.append(path)
+    return paths
+
+
+def run_case(
+        compression: str,
+        flavour: str,
+        paths: list[Path],
+        repeat: int,
+        validate_documents: bool) -> dict:
+    """Measures reading, and optionally validating, the files."""
+    document_bytes = 0
+    read_timings = []
+    for _ in range(repeat):
+        document_bytes = 0
+        start = time.perf_counter()
+        for path in paths:
+            with open(path, 'rb') as document_file:
+                document_bytes += len(read_decompressed(document_file))
+        read_timings.append(time.perf_counter() - start)
+    best_read = min(read_timings)
+
+    validate_timings = []
+    if validate_documents:
+        for _ in range(repeat):
+            start = time.perf_counter()
+            for path in paths:
+                validate(source=path, flavour=flavour)
+            validate_timings.append(time.perf_counter() - start)
+    best_validate = min(validate_timings) if validate_timings else None
+
+    return {
+        'compression': compression,
+        'flavour': flavour,
+        'documents': len(paths),
+        'bytes_on_disk': sum(path.stat().st_size for path in paths),
+        'document_bytes': document_bytes,
+        'repeat': repeat,
+        'read_seconds': read_timings,
+        'read_mb_per_second':
+            document_bytes / best_read / 1e6 if best_read > 0 else None,
+        'read_docs_per_second':
+            len(paths) / best_read if best_read > 0 else None,
+        'validate_seconds': validate_timings,
+        'validate_docs_per_second':
+            len(paths) / best_validate if best_validate else None,
+    }
+
+
+def run_benchmarks(args) -> dict:
+    results = {
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'started': datetime.datetime.now(datetime.timezone.utc).isoformat(),
+        'cases': [],
+    }
+    documents = None
+    with tempfile.TemporaryDirectory(dir=args.dir) as temp_dir:
+        base_directory = Path(args.dir) if args.keep or args.reuse \
+            else Path(temp_dir)
+        for compression in args.compressions:
+            directory = base_directory / compression
+            if args.reuse:
+                paths = sorted(directory.iterdir())
+            else:
+                if documents is None:
+                    documents = [
+                        generate(
+                            flavour=args.flavour,
+                            shape=DocumentShape(subtitles=args.subtitles),
+                            valid=index % 2 == 0,
+                            seed=args.seed + index)
+                        for index in range(args.documents)]
+                directory.mkdir(parents=True, exist_ok=True)
+                paths = write_documents(directory, compression, documents)
+            case = run_case(
+                compression=compression,
+                flavour=args.flavour,
+                paths=paths,
+                repeat=args.repeat,
+                validate_documents=args.validate)
+            results['cases'].append(case)
+            logging.info(
+                '{}: {} bytes on disk, {:.1f} MB/s, {:.1f} docs/s read'
+                .format(
+                    compression,
+                    case['bytes_on_disk'],
+                    case['read_mb_per_second'] or 0,
+                    case['read_docs_per_second'] or 0))
+    return results
+
+
+def main():
+    logging.getLogger().setLevel(logging.INFO)
+    parser = argparse.ArgumentParser(
+        description='Compare reading compressed and uncompressed documents')
+    parser.add_argument(
+        '-out',
+        type=argparse.FileType('w'),
+        default=sys.stdout,
+        help='JSON file to write the results to',
+        action='store')
+    parser.add_argument(
+        '-compressions',
+        nargs='+',
+        default=compressions,
+        choices=compressions,
+        help='Kinds of compression to compare (default all available)')
+    parser.add_argument(
+        '-flavour',
+        default='bbc',
+        choices=flavours,
+        help='Flavour of document to generate (default bbc)')
+    parser.add_argument(
+        '-documents',
+        type=int,
+        default=200,
+        help='Number of documents in the batch (default 200)')
+    parser.add_argument(
+        '-subtitles',
+        type=int,
+        default=100,
+        help='Number of subtitles in each document (default 100)')
+    parser.add_argument(
+        '-repeat',
+        type=int,
+        default=3,
+        help='Number of timed runs per kind; the fastest is reported '
+             '(default 3)')
+    parser.add_argument(
+        '-seed',
+        type=int,
+        default=0,
+        help='Seed for generating invalid documents (default 0)')
+    parser.add_argument(
+        '-validate',
+        default=False,
+        action='store_true',
+        help='Also time validating every document')
+    parser.add_argument(
+        '-dir',
+        default=None,
+        help='Directory to write the documents in (default a temporary '
+             'directory)')
+    parser.add_argument(
+        '-keep',
+        default=False,
+        action='store_true',
+        help='Keep the documents written in -dir')
+    parser.add_argument(
+        '-reuse',
+        default=False,
+        action='store_true',
+        help='Read the documents kept in -dir by an earlier run rather '
+             'than writing them')
+    args = parser.parse_args()
+    if (args.keep or args.reuse) and args.dir is None:
+        parser.error('-keep and -reuse need -dir')
+
+    results = run_benchmarks(args)
+    json.dump(results, args.out, indent=2)
+    args.out.write('\n')
+    args.out.flush()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,200 @@
+# SPDX-FileCopyrightText: Copyright © 2026 BBC
+#
+# SPDX-License-Identifier: BSD-3-Clause
+
+"""
+Compares the throughput and memory of the worker pools made by
+:py:func:`make_executor<src.validationPool.make_executor>`.
+
+Each case validates the same batch of generated documents ``repeat``
+times with :py:func:`validate_batch<src.validationPool.validate_batch>`
+on one kind of executor, after waiting for its workers to be warmed,
+and reports documents per second and peak RSS.
+
+Each case runs in a fresh process, so that the peak RSS reported is that
+of the case alone. Thread and interpreter workers run inside that
+process, so its peak RSS includes them. Process workers are separate
+processes, so the peak RSS of the largest of them is reported too; the
+total for a process pool is roughly the case's own peak RSS plus that
+for each worker.
+"""
+
+from concurrent.futures import ProcessPoolExecutor
+import argparse
+import datetime
+import json
+import logging
+import os
+import platform
+import sys
+import time
+from benchmarks.ttmlGenerator import DocumentShape, generate, flavours
+from benchmarks.scalingBenchmark import peak_rss_bytes
+from src.validationPool import executor_kinds, make_executor, \
+    validate_batch, warm_worker
+
+try:
+    import resource
+except ImportError:  # Not available on Windows
+    resource = None
+
+
+def peak_worker_rss_bytes() -> int | None:
+    """
+    Returns the peak resident set size of the largest child process that
+    has finished, if known.
+    """
+    if resource is None:
+        return None
+    max_rss = resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss
+    # ru_maxrss is in bytes on macOS and kilobytes elsewhere
+    return max_rss if sys.platform == 'darwin' else max_rss * 1024
+
+
+def make_documents(
+        flavour: str,
+        count: int,
+        subtitles: int,
+        seed: int) -> list[bytes]:
+    """Generates a batch of documents, alternately valid and invalid."""
+    return [
+        generate(
+            flavour=flavour,
+            shape=DocumentShape(subtitles=subtitles),
+            valid=index % 2 == 0,
+            seed=seed + index)
+        for index in range(count)]
+
+
+def run_case(
+        kind: str,
+        flavour: str,
+        workers: int,
+        documents: list[bytes],
+        repeat: int) -> dict:
+    """Measures validating the documents on an executor of the kind."""
+    with make_executor(kind=kind, max_workers=workers) as executor:
+        # Wait for every worker to be warm, so that only validation is
+        # timed
+        start = time.perf_counter()
+        for future in [executor.submit(warm_worker) for _ in range(workers)]:
+            future.result()
+        warm_seconds = time.perf_counter() - start
+
+        timings = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            reports = list(validate_batch(
+                executor=executor,
+                sources=documents,
+                flavour=flavour))
+            timings.append(time.perf_counter() - start)
+    best = min(timings)
+
+    return {
+        'kind': kind,
+        'flavour': flavour,
+        'workers': workers,
+        'documents': len(documents),
+        'bytes': sum(len(document) for document in documents),
+        'valid': sum(1 for report in reports if report.valid),
+        'repeat': repeat,
+        'warm_seconds': warm_seconds,
+        'seconds': timings,
+        'docs_per_second': len(documents) / best if best > 0 else None,
+        'peak_rss_bytes': peak_rss_bytes(),
+        'peak_worker_rss_bytes':
+            peak_worker_rss_bytes() if kind == 'process' else None,
+    }
+
+
+def run_benchmarks(args) -> dict:
+    documents = make_documents(
+        flavour=args.flavour,
+        count=args.documents,
+        subtitles=args.subtitles,
+        seed=args.seed)
+    results = {
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'started': datetime.datetime.now(datetime.timezone.utc).isoformat(),
+        'cases': [],
+    }
+    for kind in args.kinds:
+        # A fresh process for each case keeps peak RSS separate
+        with ProcessPoolExecutor(max_workers=1) as executor:
+            case = executor.submit(
+                run_case,
+                kind=kind,
+                flavour=args.flavour,
+                workers=args.workers,
+                documents=documents,
+                repeat=args.repeat).result()
+        results['cases'].append(case)
+        logging.info(
+            '{} x{}: {:.1f} docs/s, warmed in {:.2f}s'.format(
+                kind,
+                args.workers,
+                case['docs_per_second'] or 0,
+                case['warm_seconds']))
+    return results
+
+
+def main():
+    logging.getLogger().setLevel(logging.INFO)
+    parser = argparse.ArgumentParser(
+        description='Compare validation throughput of the worker pools')
+    parser.add_argument(
+        '-out',
+        type=argparse.FileType('w'),
+        default=sys.stdout,
+        help='JSON file to write the results to',
+        action='store')
+    parser.add_argument(
+        '-kinds',
+        nargs='+',
+        default=executor_kinds,
+        choices=executor_kinds,
+        help='Kinds of executor to compare (default all available)')
+    parser.add_argument(
+        '-flavour',
+        default='bbc',
+        choices=flavours,
+        help='Flavour of document to generate (default bbc)')
+    parser.add_argument(
+        '-workers',
+        type=int,
+        default=os.process_cpu_count() or 1,
+        help='Number of workers (default the number of CPUs)')
+    parser.add_argument(
+        '-documents',
+        type=int,
+        default=64,
+        help='Number of documents in the batch (default 64)')
+    parser.add_argument(
+        '-subtitles',
+        type=int,
+        default=100,
+        help='Number of subtitles in each document (default 100)')
+    parser.add_argument(
+        '-repeat',
+        type=int,
+        default=3,
+        help='Number of timed runs per kind; the fastest is reported '
+             '(default 3)')
+    parser.add_argument(
+        '-seed',
+        type=int,
+        default=0,
+        help='Seed for generating invalid documents (default 0)')
+    args = parser.parse_args()
+
+    results = run_benchmarks(args)
+    json.dump(results, args.out, indent=2)
+    args.out.write('\n')
+    args.out.flush()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
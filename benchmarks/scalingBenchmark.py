@@ -0,0 +1,278 @@
+# SPDX-FileCopyrightText: Copyright © 2026 BBC
+#
+# SPDX-License-Identifier: BSD-3-Clause
+
+"""
+Measures how validation throughput scales with document size and shape.
+
+Each benchmark case generates a document with
+:py:mod:`benchmarks.ttmlGenerator`, validates it once untimed, so that
+the constraint set and schema are built, then validates it ``repeat``
+times through the full
+:py:func:`validate_ttml<src.ttmlValidator.validate_ttml>` pipeline,
+reporting documents per second, microseconds per element and peak RSS.
+One further profiled run records the time taken by each check, using
+:py:class:`CheckProfiler<src.checkProfiler.CheckProfiler>`.
+
+Each case runs in a fresh process, so that the peak RSS reported is that
+of the case alone. Results are written as JSON so that runs can be
+compared across versions, for example with ``-baseline``.
+"""
+
+from argparse import Namespace
+from concurrent.futures import ProcessPoolExecutor
+import argparse
+import datetime
+import io
+import json
+import logging
+import platform
+import sys
+import time
+import xml.etree.ElementTree as ElementTree
+from benchmarks.ttmlGenerator import DocumentShape, generate, flavours
+from src.ttmlValidator import default_args, validate_ttml
+
+try:
+    import resource
+except ImportError:  # Not available on Windows
+    resource = None
+
+# Each series varies one shape parameter from a base shape. The base
+# shape itself is run once, in the first series that includes it.
+default_series = {
+    'subtitles': [10, 100, 1000],
+    'spans_per_p': [1, 2, 4],
+    'styles': [1, 10, 100],
+    'style_chain_depth': [0, 2, 8],
+    'regions': [1, 4, 16],
+    'nesting_depth': [1, 2, 4],
+    'duration': [20.0, 200.0, 7200.0],
+}
+
+# DAPT documents do not use styles or nested divs, and use the
+# number of regions as the number of characters
+flavour_series = {
+    'bbc': list(default_series.keys()),
+    'dapt': ['subtitles', 'spans_per_p', 'regions', 'duration'],
+}
+
+default_base_subtitles = 100
+
+
+class namedBuffer(io.BytesIO):
+    name = 'benchmark'
+
+
+def peak_rss_bytes() -> int | None:
+    """Returns the peak resident set size of this process, if known."""
+    if resource is None:
+        return None
+    max_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is in bytes on macOS and kilobytes elsewhere
+    return max_rss if sys.platform == 'darwin' else max_rss * 1024
+
+
+def validation_args(
+        document: bytes,
+        flavour: str,
+        profile_out: io.StringIO | None = None) -> Namespace:
+    return default_args(
+        ttml_in=namedBuffer(document),
+        results_out=io.TextIOWrapper(
+            buffer=namedBuffer(), encoding='utf-8', newline='\n'),
+        collate_more_than=5,
+        flavour=flavour,
+        profile_out=profile_out,
+    )
+
+
+def run_case(
+        flavour: str,
+        shape: DocumentShape,
+        valid: bool,
+        repeat: int,
+        seed: int) -> dict:
+    """Generates a document and measures validating it."""
+    # Invalid documents are expected, so do not log their summaries
+    logging.getLogger().setLevel(logging.CRITICAL)
+    document = generate(flavour=flavour, shape=shape, valid=valid, seed=seed)
+    element_count = sum(1 for _ in ElementTree.fromstring(document).iter())
+
+    # Builds the constraint set and schema, which are then cached
+    result = validate_ttml(validation_args(document, flavour))
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = validate_ttml(validation_args(document, flavour))
+        timings.append(time.perf_counter() - start)
+    best = min(timings)
+
+    profile_out = io.StringIO()
+    validate_ttml(validation_args(document, flavour, profile_out))
+
+    return {
+        'flavour': flavour,
+        'valid': valid,
+        'shape': shape.asDict(),
+        'bytes': len(document),
+        'elements': element_count,
+        'result': result,
+        'repeat': repeat,
+        'seconds': timings,
+        'docs_per_second': 1 / best if best > 0 else None,
+        'us_per_element': best * 1e6 / element_count,
+        'peak_rss_bytes': peak_rss_bytes(),
+        'checks': json.loads(profile_out.getvalue()),
+    }
+
+
+def make_cases(
+        series: dict[str, list[int]],
+        base_subtitles: int) -> list[tuple[str, DocumentShape]]:
+    """
+    Returns (series name, shape) pairs, one for each series value, leaving
+    out a shape that an earlier series already has, such as the base
+    shape.
+    """
+    cases = []
+    seen_shapes = set()
+    for parameter, values in series.items():
+        for value in values:
+            shape_args = {'subtitles': base_subtitles}
+            shape_args[parameter] = value
+            shape = DocumentShape(**shape_args)
+            shape_key = json.dumps(shape.asDict(), sort_keys=True)
+            if shape_key not in seen_shapes:
+                seen_shapes.add(shape_key)
+                cases.append((parameter, shape))
+    return cases
+
+
+def case_key(case: dict) -> str:
+    return json.dumps(
+        [case.get('series'), case['flavour'], case['valid'], case['shape']],
+        sort_keys=True)
+
+
+def compare(results: dict, baseline: dict) -> list[str]:
+    """
+    Returns one line per case found in both runs, giving the ratio of
+    the current throughput to the baseline throughput.
+    """
+    baseline_cases = {
+        case_key(case): case for case in baseline.get('cases', [])}
+    lines = []
+    for case in results['cases']:
+        baseline_case = baseline_cases.get(case_key(case))
+        if baseline_case is None \
+           or not case['docs_per_second'] \
+           or not baseline_case['docs_per_second']:
+            continue
+        lines.append('{} {} {} {}: {:.2f}x'.format(
+            case['series'],
+            case['flavour'],
+            'valid' if case['valid'] else 'invalid',
+            case['shape'][case['series']],
+            case['docs_per_second'] / baseline_case['docs_per_second']))
+    return lines
+
+
+def run_benchmarks(args) -> dict:
+    results = {
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'started': datetime.datetime.now(datetime.timezone.utc).isoformat(),
+        'cases': [],
+    }
+    for flavour in args.flavour:
+        cases = make_cases(
+            series={
+                name: values for name, values in default_series.items()
+                if name in flavour_series[flavour]
+                and (args.series is None or name in args.series)},
+            base_subtitles=args.base_subtitles)
+        for valid in [True, False]:
+            for series_name, shape in cases:
+                # A fresh process for each case keeps peak RSS separate
+                with ProcessPoolExecutor(max_workers=1) as executor:
+                    case = executor.submit(
+                        run_case,
+                        flavour=flavour,
+                        shape=shape,
+                        valid=valid,
+                        repeat=args.repeat,
+                        seed=args.seed).result()
+                case['series'] = series_name
+                results['cases'].append(case)
+                logging.info(
+                    '{} {} {}={}: {:.1f} docs/s, {:.2f} us/element'.format(
+                        flavour,
+                        'valid' if valid else 'invalid',
+                        series_name,
+                        case['shape'][series_name],
+                        case['docs_per_second'] or 0,
+                        case['us_per_element']))
+    return results
+
+
+def main():
+    logging.getLogger().setLevel(logging.INFO)
+    parser = argparse.ArgumentParser(
+        description='Measure validation throughput on generated documents')
+    parser.add_argument(
+        '-out',
+        type=argparse.FileType('w'),
+        default=sys.stdout,
+        help='JSON file to write the results to',
+        action='store')
+    parser.add_argument(
+        '-flavour',
+        nargs='+',
+        default=flavours,
+        choices=flavours,
+        help='Flavours of document to generate (default all)')
+    parser.add_argument(
+        '-series',
+        nargs='+',
+        default=None,
+        choices=list(default_series.keys()),
+        help='Shape parameters to vary (default all)')
+    parser.add_argument(
+        '-base_subtitles',
+        type=int,
+        default=default_base_subtitles,
+        help='Number of subtitles when varying other parameters '
+             '(default {})'.format(default_base_subtitles))
+    parser.add_argument(
+        '-repeat',
+        type=int,
+        default=3,
+        help='Number of timed runs per case, after one untimed run; the '
+             'fastest is reported (default 3)')
+    parser.add_argument(
+        '-seed',
+        type=int,
+        default=0,
+        help='Seed for generating invalid documents (default 0)')
+    parser.add_argument(
+        '-baseline',
+        type=argparse.FileType('r'),
+        default=None,
+        help='JSON results of an earlier run to compare against')
+    args = parser.parse_args()
+
+    results = run_benchmarks(args)
+    json.dump(results, args.out, indent=2)
+    args.out.write('\n')
+    args.out.flush()
+
+    if args.baseline is not None:
+        for line in compare(results, json.load(args.baseline)):
+            logging.info(line)
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,277 @@
+# SPDX-FileCopyrightText: Copyright © 2026 BBC
+#
+# SPDX-License-Identifier: BSD-3-Clause
+
+"""
+Deterministic generator of synthetic TTML documents for benchmarking.
+
+Documents are generated from a :py:class:`DocumentShape` and a seed, so
+that the same arguments always generate the same bytes. Valid documents
+are EBU-TT-D meeting the BBC requirements, or DAPT. Invalid documents
+have faults injected into a proportion of their subtitles or script
+events, chosen using the seed.
+"""
+
+from random import Random
+from xml.sax.saxutils import escape
+
+flavours = ['bbc', 'dapt']
+
+
+class DocumentShape:
+    """
+    The size and structure of a generated document.
+
+    :param subtitles: number of ``p`` elements (EBU-TT-D) or script
+        events (DAPT)
+    :param spans_per_p: number of ``span`` elements in each ``p``,
+        separated by ``br`` elements
+    :param styles: number of ``style`` elements (EBU-TT-D only)
+    :param style_chain_depth: number of further styles referenced by
+        each ``p`` after its first style. EBU-TT-D does not permit
+        ``style`` elements to reference each other, so the chain is
+        expressed as a list of references (EBU-TT-D only)
+    :param regions: number of ``region`` elements (EBU-TT-D), or
+        number of character agents (DAPT)
+    :param nesting_depth: depth of nested ``div`` elements (EBU-TT-D
+        only). EBU-TT-D does not permit nested ``div`` elements, so
+        documents with a depth of more than 1 are not valid
+    :param duration: document duration in seconds, or None for 2s per
+        subtitle
+    """
+
+    def __init__(
+            self,
+            subtitles: int = 100,
+            spans_per_p: int = 1,
+            styles: int = 1,
+            style_chain_depth: int = 0,
+            regions: int = 1,
+            nesting_depth: int = 1,
+            duration: float | None = None):
+        self.subtitles = subtitles
+        self.spans_per_p = spans_per_p
+        self.styles = max(styles, 1)
+        self.style_chain_depth = max(style_chain_depth, 0)
+        self.regions = max(regions, 1)
+        self.nesting_depth = max(nesting_depth, 1)
+        self.duration = 2.0 * subtitles if duration is None else duration
+
+    def asDict(self) -> dict:
+        return {
+            'subtitles': self.subtitles,
+            'spans_per_p': self.spans_per_p,
+            'styles': self.styles,
+            'style_chain_depth': self.style_chain_depth,
+            'regions': self.regions,
+            'nesting_depth': self.nesting_depth,
+            'duration': self.duration,
+        }
+
+
+def clock_time(seconds: float) -> str:
+    """Returns an hh:mm:ss.sss clock time expression."""
+    milliseconds = round(seconds * 1000)
+    hours, milliseconds = divmod(milliseconds, 3600000)
+    minutes, milliseconds = divmod(milliseconds, 60000)
+    return '{:02}:{:02}:{:06.3f}'.format(
+        hours, minutes, milliseconds / 1000)
+
+
+def _subtitle_times(shape: DocumentShape) -> list[tuple[float, float]]:
+    # Contiguous subtitles with no gaps, which the BBC requirements allow
+    step = shape.duration / max(shape.subtitles, 1)
+    return [
+        (i * step, (i + 1) * step)
+        for i in range(shape.subtitles)
+    ]
+
+
+def _faulty_indices(
+        rng: Random,
+        count: int,
+        proportion: float) -> set[int]:
+    fault_count = max(1, round(count * proportion)) if count > 0 else 0
+    return set(rng.sample(range(count), fault_count))
+
+
+_ebuttd_header = """<?xml version="1.0" encoding="UTF-8"?>
+<tt xml:lang="en-GB"
+    xmlns="http://www.w3.org/ns/ttml"
+    xmlns:tts="http://www.w3.org/ns/ttml#styling"
+    xmlns:ttp="http://www.w3.org/ns/ttml#parameter"
+    xmlns:ttm="http://www.w3.org/ns/ttml#metadata"
+    xmlns:ebuttm="urn:ebu:tt:metadata"
+    xmlns:ebutts="urn:ebu:tt:style"
+    xmlns:itts="http://www.w3.org/ns/ttml/profile/imsc1#styling"
+    xmlns:ittp="http://www.w3.org/ns/ttml/profile/imsc1#parameter"
+    ttp:cellResolution="32 15" ttp:timeBase="media"
+    ittp:activeArea="14.375% 10% 71.25% 80%">
+<head>
+<ttm:copyright>Synthetic benchmark document</ttm:copyright>
+<metadata>
+<ebuttm:documentMetadata>
+<ebuttm:conformsToStandard>urn:ebu:tt:distribution:2014-01</ebuttm:conformsToStandard>
+<ebuttm:conformsToStandard>http://www.w3.org/ns/ttml/profile/imsc1/text</ebuttm:conformsToStandard>
+</ebuttm:documentMetadata>
+</metadata>
+<styling>
+<style xml:id="s_base" tts:fontFamily="ReithSans, Arial, Roboto, proportionalSansSerif, default" tts:fontSize="100%" tts:lineHeight="120%" tts:textAlign="center" ebutts:linePadding="0.5c" itts:fillLineGap="true"/>
+<style xml:id="s_span" tts:color="#FFFFFF" tts:backgroundColor="#000000"/>
+"""  # noqa: E501
+
+
+def _ebuttd_style_id(index: int, depth: int) -> str:
+    return 's{}_{}'.format(index, depth)
+
+
+def generate_ebuttd(
+        shape: DocumentShape,
+        valid: bool = True,
+        seed: int = 0,
+        fault_proportion: float = 0.1) -> bytes:
+    """
+    Generates an EBU-TT-D document meeting the BBC requirements.
+
+    If ``valid`` is False, faults are injected into about
+    ``fault_proportion`` of the subtitles.
+    """
+    rng = Random(seed)
+    parts = [_ebuttd_header]
+
+    # Each of the styles is the first of a chain of style_chain_depth
+    # further styles, all referenced together
+    for style_index in range(shape.styles):
+        for depth in range(shape.style_chain_depth + 1):
+            parts.append(
+                '<style xml:id="{}" tts:fontStyle="normal"/>\n'.format(
+                    _ebuttd_style_id(style_index, depth)))
+    parts.append('</styling>\n<layout>\n')
+    for region_index in range(shape.regions):
+        parts.append(
+            '<region xml:id="r{}" tts:origin="14.375% 10%" '
+            'tts:extent="71.25% 80%" tts:displayAlign="after" '
+            'tts:overflow="visible"/>\n'.format(region_index))
+    parts.append('</layout>\n</head>\n<body style="s_base">\n')
+
+    faulty = set() if valid else _faulty_indices(
+        rng=rng, count=shape.subtitles, proportion=fault_proportion)
+    nesting = shape.nesting_depth
+    parts.append('<div>' * nesting + '\n')
+    for index, (begin, end) in enumerate(_subtitle_times(shape)):
+        xml_id = 'sub{}'.format(index)
+        style_ref = ' '.join(
+            _ebuttd_style_id(index % shape.styles, depth)
+            for depth in range(shape.style_chain_depth + 1))
+        region_ref = 'r{}'.format(index % shape.regions)
+        begin_attr = clock_time(begin)
+        if index in faulty:
+            match rng.randrange(4):
+                case 0:
+                    xml_id = 'sub0'  # duplicate xml:id
+                case 1:
+                    style_ref = 'missing_style'
+                case 2:
+                    begin_attr = '{}f'.format(round(begin * 25))
+                case _:
+                    region_ref = 'missing_region'
+        spans = '<br/>'.join(
+            '<span style="s_span">Subtitle {} line {}</span>'.format(
+                index, escape(str(span_index)))
+            for span_index in range(shape.spans_per_p))
+        parts.append(
+            '<p xml:id="{}" begin="{}" end="{}" region="{}" '
+            'style="{}">{}</p>\n'.format(
+                xml_id,
+                begin_attr,
+                clock_time(end),
+                region_ref,
+                style_ref,
+                spans))
+    parts.append('</div>' * nesting + '\n</body>\n</tt>\n')
+    return ''.join(parts).encode('utf-8')
+
+
+_dapt_header = """<?xml version="1.0" encoding="UTF-8"?>
+<tt xmlns="http://www.w3.org/ns/ttml"
+    xmlns:ttm="http://www.w3.org/ns/ttml#metadata"
+    xmlns:ttp="http://www.w3.org/ns/ttml#parameter"
+    xmlns:daptm="http://www.w3.org/ns/ttml/profile/dapt#metadata"
+    ttp:contentProfiles="http://www.w3.org/ns/ttml/profile/dapt1.0/content"
+    daptm:scriptRepresents="audio.dialogue"
+    daptm:scriptType="originalTranscript"
+    xml:lang="en">
+<head>
+<ttm:copyright>Synthetic benchmark document</ttm:copyright>
+<metadata>
+"""
+
+
+def generate_dapt(
+        shape: DocumentShape,
+        valid: bool = True,
+        seed: int = 0,
+        fault_proportion: float = 0.1) -> bytes:
+    """
+    Generates a DAPT original transcript document.
+
+    ``shape.regions`` is used as the number of characters. The styling,
+    region and nesting parameters of the shape are not used, since
+    DAPT does not use them.
+
+    If ``valid`` is False, faults are injected into about
+    ``fault_proportion`` of the script events.
+    """
+    rng = Random(seed)
+    parts = [_dapt_header]
+    for agent_index in range(shape.regions):
+        parts.append(
+            '<ttm:agent type="person" xml:id="actor_{0}">'
+            '<ttm:name type="full">Actor {0}</ttm:name></ttm:agent>\n'
+            '<ttm:agent type="character" xml:id="character_{0}">'
+            '<ttm:name type="alias">CHARACTER {0}</ttm:name>'
+            '<ttm:actor agent="actor_{0}"/></ttm:agent>\n'
+            .format(agent_index))
+    parts.append('</metadata>\n</head>\n<body>\n')
+
+    faulty = set() if valid else _faulty_indices(
+        rng=rng, count=shape.subtitles, proportion=fault_proportion)
+    for index, (begin, end) in enumerate(_subtitle_times(shape)):
+        xml_id = 'se{}'.format(index)
+        agent = 'character_{}'.format(index % shape.regions)
+        represents = 'audio.dialogue'
+        begin_attr = '{:.3f}s'.format(begin)
+        if index in faulty:
+            match rng.randrange(4):
+                case 0:
+                    xml_id = 'se0'  # duplicate xml:id
+                case 1:
+                    agent = 'missing_agent'
+                case 2:
+                    represents = 'audio.bad'
+                case _:
+                    begin_attr = 'soon'
+        spans = ''.join(
+            '<span>Line {} of event {}.</span>'.format(span_index, index)
+            for span_index in range(shape.spans_per_p))
+        parts.append(
+            '<div xml:id="{}" begin="{}" end="{:.3f}s" ttm:agent="{}" '
+            'daptm:represents="{}">'
+            '<p daptm:langSrc="en">{}</p></div>\n'.format(
+                xml_id, begin_attr, end, agent, represents, spans))
+    parts.append('</body>\n</tt>\n')
+    return ''.join(parts).encode('utf-8')
+
+
+def generate(
+        flavour: str,
+        shape: DocumentShape,
+        valid: bool = True,
+        seed: int = 0) -> bytes:
+    """Generates a document of the flavour, ``bbc`` or ``dapt``."""
+    match flavour:
+        case 'bbc':
+            return generate_ebuttd(shape=shape, valid=valid, seed=seed)
+        case 'dapt':
+            return generate_dapt(shape=shape, valid=valid, seed=seed)
+    raise ValueError('Flavour {} not recognised'.format(flavour))
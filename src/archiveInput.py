@@ -0,0 +1,153 @@
+# SPDX-FileCopyrightText: Copyright © 2026 BBC
+#
+# SPDX-License-Identifier: BSD-3-Clause
+
+"""
+Validates the documents in tar and zip archives without extracting them.
+
+Members are read one at a time straight out of the archive, so that a
+bundle of many TTML documents can be validated without writing them to
+disk first. Tar archives, compressed or not, are read as a stream, so
+they can come from a pipe; zip archives need random access, so one read
+from a pipe is held in memory.
+
+Members are selected by matching their names against a glob pattern with
+:py:func:`fnmatch.fnmatchcase`, in which ``*`` also matches ``/``, so
+``*.xml`` selects every member whose name ends in ``.xml`` in any
+directory.
+"""
+
+from collections import deque
+from collections.abc import Callable, Iterator
+from concurrent.futures import Executor
+from fnmatch import fnmatchcase
+from typing import BinaryIO
+import io
+import tarfile
+import zipfile
+from src.compressedInput import PrefixedStream
+from src.validationPool import validate_in_worker
+from src.validator import ValidationOptions, ValidationReport, validate
+
+
+class ArchiveError(ValueError):
+    """Raised when an input is not a tar or zip archive."""
+
+
+def archive_members(
+        archive: BinaryIO,
+        member_glob: str = '*',
+        read_limit: int = -1) -> Iterator[tuple[str, bytes]]:
+    """
+    Yields the name and content of each regular file in a tar or zip
+    archive whose name matches ``member_glob``, in archive order.
+
+    At most ``read_limit`` bytes of each member are read, or all of it
+    if -1, as for
+    :py:meth:`ResourceLimits.readLimit<src.validationLogging.resourceLimits.ResourceLimits.readLimit>`.
+
+    Raises :py:class:`ArchiveError` if the input is neither.
+    """
+    if not archive.seekable():
+        head = archive.read(4)
+        if head[:4] != b'PK\x03\x04':
+            # Not a zip, so stream it as a tar, putting back what was read
+            yield from _tar_members(
+                PrefixedStream(head, archive), member_glob, read_limit)
+            return
+        archive = io.BytesIO(head + archive.read())
+
+    if zipfile.is_zipfile(archive):
+        archive.seek(0)
+        yield from _zip_members(archive, member_glob, read_limit)
+    else:
+        archive.seek(0)
+        yield from _tar_members(archive, member_glob, read_limit)
+
+
+def _zip_members(
+        archive: BinaryIO,
+        member_glob: str,
+        read_limit: int) -> Iterator[tuple[str, bytes]]:
+    with zipfile.ZipFile(archive) as zip_file:
+        for info in zip_file.infolist():
+            if info.is_dir() or not fnmatchcase(info.filename, member_glob):
+                continue
+            with zip_file.open(info) as member_file:
+                yield info.filename, member_file.read(read_limit)
+
+
+def _tar_members(
+        archive: BinaryIO,
+        member_glob: str,
+        read_limit: int) -> Iterator[tuple[str, bytes]]:
+    try:
+        tar_file = tarfile.open(fileobj=archive, mode='r|*')
+    except tarfile.ReadError as e:
+        raise ArchiveError(
+            'Input is not a tar or zip archive: {}'.format(e)) from e
+    with tar_file:
+        # In stream mode each member must be read before the next
+        for member in tar_file:
+            if not member.isfile() \
+               or not fnmatchcase(member.name, member_glob):
+                continue
+            member_file = tar_file.extractfile(member)
+            if member_file is not None:
+                yield member.name, member_file.read(read_limit)
+
+
+def validate_archive(
+        archive: BinaryIO,
+        flavour: str = 'bbc',
+        options: ValidationOptions | None = None,
+        member_glob: str = '*',
+        member_options: Callable[[str], ValidationOptions] | None = None,
+        executor: Executor | None = None,
+        max_pending: int = 16) -> Iterator[tuple[str, ValidationReport]]:
+    """
+    Validates the members of an archive selected by ``member_glob``,
+    yielding each member name with its report in archive order.
+
+    If ``member_options`` is set, it is called with each member name to
+    get the options for that member, for example to set the epoch from
+    a segment number in the name; otherwise ``options`` is used for all.
+    The size of each member read is limited by ``options``.
+
+    If ``executor`` is set, members are validated on it, with at most
+    ``max_pending`` members read but not yet reported, so that memory
+    use does not grow with the size of the archive. As for
+    :py:func:`validate_in_worker<src.validationPool.validate_in_worker>`,
+    the options should not have result sinks when using process or
+    interpreter executors.
+    """
+    if options is None:
+        options = ValidationOptions()
+    members = archive_members(
+        archive=archive,
+        member_glob=member_glob,
+        read_limit=options.resourceLimits().readLimit())
+
+    def options_for(name: str) -> ValidationOptions:
+        return options if member_options is None else member_options(name)
+
+    if executor is None:
+        for name, content in members:
+            yield name, validate(
+                source=content, flavour=flavour, options=options_for(name))
+        return
+
+    pending = deque()
+    try:
+        for name, content in members:
+            pending.append((name, executor.submit(
+                validate_in_worker, content, flavour, options_for(name))))
+            if len(pending) >= max_pending:
+                name, future = pending.popleft()
+                yield name, future.result()
+        while len(pending) > 0:
+            name, future = pending.popleft()
+            yield name, future.result()
+    finally:
+        for _, future in pending:
+            future.cancel()
@@ -0,0 +1,140 @@
+# SPDX-FileCopyrightText: Copyright © 2026 BBC
+#
+# SPDX-License-Identifier: BSD-3-Clause
+
+"""
+Validation from asyncio code, without blocking the event loop.
+"""
+
+import asyncio
+import copy
+from collections.abc import Iterable
+from concurrent.futures import Executor
+from src.validationPool import make_executor, validate_in_worker
+from src.validator import ValidationOptions, ValidationReport, \
+    ValidationSource
+
+
+class AsyncValidator:
+    """
+    Runs :py:func:`validate<src.validator.validate>` on an executor of
+    warm workers, so that reading and validating documents do not block
+    the event loop.
+
+    At most ``max_concurrent`` documents are validated at once, counting
+    those whose calls timed out or were cancelled but whose validation
+    is still running; further calls wait for a free slot. If
+    ``executor`` is None, one is made by
+    :py:func:`make_executor<src.validationPool.make_executor>` with
+    ``kind`` and ``max_workers``, and shut down by :py:meth:`close`.
+
+    A call that takes longer than its ``timeout`` in seconds, or the
+    default ``timeout``, raises ``TimeoutError``. A running thread
+    cannot be stopped from outside, so the timeout is also passed to the
+    worker as the ``max_seconds`` resource limit, which stops validation
+    of the document soon after the timeout. A cancelled or timed out
+    call that has not started yet is not started.
+
+    Use as an asynchronous context manager to close it on exit.
+    """
+
+    def __init__(
+            self,
+            executor: Executor | None = None,
+            kind: str = 'thread',
+            max_workers: int | None = None,
+            max_concurrent: int = 8,
+            timeout: float | None = None):
+        self._own_executor = executor is None
+        self._executor = make_executor(kind=kind, max_workers=max_workers) \
+            if executor is None else executor
+        self._semaphore = asyncio.Semaphore(max_concurrent)
+        self._timeout = timeout
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, traceback):
+        await self.close()
+
+    async def close(self):
+        """Shuts down the executor, if it was made by this validator."""
+        if self._own_executor:
+            await asyncio.to_thread(
+                self._executor.shutdown, wait=True, cancel_futures=True)
+
+    @staticmethod
+    def _limitedOptions(
+            options: ValidationOptions | None,
+            timeout: float | None) -> ValidationOptions | None:
+        if timeout is None:
+            return options
+        limited_options = ValidationOptions() if options is None \
+            else copy.copy(options)
+        if limited_options.max_seconds <= 0 \
+           or limited_options.max_seconds > timeout:
+            limited_options.max_seconds = timeout
+        return limited_options
+
+    async def validate(
+            self,
+            source: ValidationSource,
+            flavour: str = 'bbc',
+            options: ValidationOptions | None = None,
+            timeout: float | None = None) -> ValidationReport:
+        """
+        Validates a document on the executor.
+
+        A path is read by the worker, not by the event loop's thread.
+        The time spent waiting for a free slot does not count towards
+        the timeout.
+        """
+        if timeout is None:
+            timeout = self._timeout
+        loop = asyncio.get_running_loop()
+        await self._semaphore.acquire()
+        try:
+            future = self._executor.submit(
+                validate_in_worker,
+                source,
+                flavour,
+                self._limitedOptions(options=options, timeout=timeout))
+        except BaseException:
+            self._semaphore.release()
+            raise
+        # A job that has started keeps running after a timeout or
+        # cancellation, so its slot is held until it finishes
+        future.add_done_callback(lambda _: self._releaseSlot(loop))
+        return await asyncio.wait_for(
+            asyncio.wrap_future(future), timeout=timeout)
+
+    def _releaseSlot(self, loop: asyncio.AbstractEventLoop):
+        # Called from the worker's thread when its job finishes
+        try:
+            loop.call_soon_threadsafe(self._semaphore.release)
+        except RuntimeError:
+            # The event loop has closed, so nothing waits for the slot
+            pass
+
+    async def validate_many(
+            self,
+            sources: Iterable[ValidationSource],
+            flavour: str = 'bbc',
+            options: ValidationOptions | None = None,
+            timeout: float | None = None) -> list[ValidationReport]:
+        """
+        Validates the documents concurrently, up to the concurrency
+        limit, returning their reports in the same order as the sources.
+
+        If any document fails or times out, the others are cancelled and
+        the exception is raised.
+        """
+        async with asyncio.TaskGroup() as task_group:
+            tasks = [
+                task_group.create_task(self.validate(
+                    source=source,
+                    flavour=flavour,
+                    options=options,
+                    timeout=timeout))
+                for source in sources]
+        return [task.result() for task in tasks]
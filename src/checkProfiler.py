@@ -0,0 +1,262 @@
+# SPDX-FileCopyrightText: Copyright © 2026 BBC
+#
+# SPDX-License-Identifier: BSD-3-Clause
+
+"""
+Optional per-check instrumentation for the validation pipeline.
+
+A :py:class:`CheckProfiler` wraps pre-parse checks and XML checks,
+including the sub-checks of container checks such as ``bodyCheck``,
+and records for each of them the number of calls, the wall time, the
+CPU time of the calling thread, the number of validation results
+emitted and, if memory tracing is enabled, the peak number of bytes
+allocated above the level when the check started.
+
+Times, results and allocations are inclusive: a container check's
+figures include those of its sub-checks.
+
+The checks passed in are not modified, so a constraint set can be
+profiled and used unprofiled at the same time. When profiling is not
+requested the checks are not wrapped, so there is no overhead.
+"""
+
+from contextlib import contextmanager
+from csv import writer as csvWriter
+from io import TextIOWrapper
+import copy
+import json
+import time
+import tracemalloc
+from xml.etree.ElementTree import Element
+from src.preParseChecks.preParseCheck import PreParseCheck
+from src.validationLogging.validationCodes import ValidationCode
+from src.validationLogging.validationLogger import ValidationLogger
+from src.xmlChecks.xmlCheck import XmlCheck
+
+profile_csv_headers = [
+    'check',
+    'calls',
+    'wall_ns',
+    'cpu_ns',
+    'results',
+    'peak_allocated_bytes',
+]
+
+
+def unwrapped(check: PreParseCheck | XmlCheck) -> PreParseCheck | XmlCheck:
+    """Returns the check that a profiled check runs."""
+    return getattr(check, 'profiled_check', check)
+
+
+class CheckProfile:
+    """Figures accumulated for one check."""
+
+    def __init__(self, name: str):
+        self.name = name
+        self.calls = 0
+        self.wall_ns = 0
+        self.cpu_ns = 0
+        self.results = 0
+        self.peak_allocated_bytes = None
+
+    def asDict(self) -> dict:
+        return {
+            'check': self.name,
+            'calls': self.calls,
+            'wall_ns': self.wall_ns,
+            'cpu_ns': self.cpu_ns,
+            'results': self.results,
+            'peak_allocated_bytes': self.peak_allocated_bytes,
+        }
+
+
+class _memoryFrame:
+    def __init__(self, start: int):
+        self.start = start
+        self.peak = start
+
+
+class CheckProfiler:
+    """
+    Records the cost of each check it wraps.
+
+    If ``trace_memory`` is True, :py:mod:`tracemalloc` is started by
+    :py:meth:`start` and stopped by :py:meth:`stop`. Tracing memory
+    slows validation down considerably, so the times recorded with it
+    enabled are only useful relative to each other.
+    """
+
+    def __init__(self, trace_memory: bool = False):
+        self._trace_memory = trace_memory
+        self._started_tracemalloc = False
+        self._profiles = []
+        self._memory_frames = []
+
+    def start(self):
+        if self._trace_memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._started_tracemalloc = True
+
+    def stop(self):
+        if self._started_tracemalloc:
+            tracemalloc.stop()
+            self._started_tracemalloc = False
+
+    def newProfile(self, name: str) -> CheckProfile:
+        profile = CheckProfile(name=name)
+        self._profiles.append(profile)
+        return profile
+
+    def profiles(self) -> list[CheckProfile]:
+        """Returns the profiles in the order that they were created."""
+        return self._profiles
+
+    def _enterMemory(self):
+        current, peak = tracemalloc.get_traced_memory()
+        # Resetting the peak loses the enclosing check's peak so far,
+        # so keep it in that check's frame
+        if len(self._memory_frames) > 0:
+            outer = self._memory_frames[-1]
+            outer.peak = max(outer.peak, peak)
+        tracemalloc.reset_peak()
+        self._memory_frames.append(_memoryFrame(start=current))
+
+    def _exitMemory(self) -> int:
+        _, peak = tracemalloc.get_traced_memory()
+        frame = self._memory_frames.pop()
+        frame.peak = max(frame.peak, peak)
+        if len(self._memory_frames) > 0:
+            outer = self._memory_frames[-1]
+            outer.peak = max(outer.peak, frame.peak)
+        return frame.peak - frame.start
+
+    @contextmanager
+    def measure(
+            self,
+            profile: CheckProfile,
+            validation_results: ValidationLogger):
+        """Adds the cost of the enclosed code to the profile."""
+        trace_memory = self._trace_memory and tracemalloc.is_tracing()
+        if trace_memory:
+            self._enterMemory()
+        results_before = validation_results.resultCount()
+        cpu_before = time.thread_time_ns()
+        wall_before = time.perf_counter_ns()
+        try:
+            yield
+        finally:
+            profile.wall_ns += time.perf_counter_ns() - wall_before
+            profile.cpu_ns += time.thread_time_ns() - cpu_before
+            profile.results += \
+                validation_results.resultCount() - results_before
+            profile.calls += 1
+            if trace_memory:
+                allocated = self._exitMemory()
+                profile.peak_allocated_bytes = max(
+                    profile.peak_allocated_bytes or 0, allocated)
+
+    def profilePreParseCheck(self, check: PreParseCheck) -> PreParseCheck:
+        return profiledPreParseCheck(
+            check=check,
+            profile=self.newProfile(type(check).__name__),
+            profiler=self)
+
+    def profileXmlCheck(
+            self,
+            check: XmlCheck,
+            parent_name: str = '') -> XmlCheck:
+        """
+        Returns a profiled copy of the check, with profiled sub-checks.
+        """
+        name = parent_name + type(check).__name__
+        profile = self.newProfile(name)
+        sub_checks = check.subChecks()
+        if len(sub_checks) > 0:
+            check = copy.copy(check)
+            check._subChecks = [
+                self.profileXmlCheck(
+                    check=sub_check,
+                    parent_name=name + '/')
+                for sub_check in sub_checks
+            ]
+        return profiledXmlCheck(
+            check=check,
+            profile=profile,
+            profiler=self)
+
+    def write_json(self, stream: TextIOWrapper):
+        stream.write(
+            json.JSONEncoder().encode(
+                [profile.asDict() for profile in self._profiles]
+            )
+        )
+
+    def write_csv(self, stream: TextIOWrapper):
+        stream.reconfigure(newline='')
+        csv_writer = csvWriter(stream)
+        csv_writer.writerow(profile_csv_headers)
+        for profile in self._profiles:
+            profile_dict = profile.asDict()
+            csv_writer.writerow([
+                '' if profile_dict[header] is None else profile_dict[header]
+                for header in profile_csv_headers
+            ])
+
+
+class profiledPreParseCheck(PreParseCheck):
+    """Runs a pre-parse check, adding its cost to a profile."""
+
+    def __init__(
+            self,
+            check: PreParseCheck,
+            profile: CheckProfile,
+            profiler: CheckProfiler):
+        super().__init__()
+        self.profiled_check = check
+        self._profile = profile
+        self._profiler = profiler
+
+    def validationCodes(self) -> list[ValidationCode]:
+        return self.profiled_check.validationCodes()
+
+    def run(
+            self,
+            input: bytes,
+            validation_results: ValidationLogger) -> tuple[bool, bytes]:
+        with self._profiler.measure(
+                profile=self._profile,
+                validation_results=validation_results):
+            return self.profiled_check.run(input, validation_results)
+
+
+class profiledXmlCheck(XmlCheck):
+    """Runs an XML check, adding its cost to a profile."""
+
+    def __init__(
+            self,
+            check: XmlCheck,
+            profile: CheckProfile,
+            profiler: CheckProfiler):
+        super().__init__()
+        self.profiled_check = check
+        self._profile = profile
+        self._profiler = profiler
+
+    def subChecks(self) -> list[XmlCheck]:
+        return self.profiled_check.subChecks()
+
+    def validationCodes(self) -> list[ValidationCode]:
+        return self.profiled_check.validationCodes()
+
+    def run(
+            self,
+            input: Element,
+            context: dict,
+            validation_results: ValidationLogger) -> bool:
+        with self._profiler.measure(
+                profile=self._profile,
+                validation_results=validation_results):
+            return self.profiled_check.run(
+                input=input,
+                context=context,
+                validation_results=validation_results)
@@ -0,0 +1,304 @@
+# SPDX-FileCopyrightText: Copyright © 2026 BBC
+#
+# SPDX-License-Identifier: BSD-3-Clause
+
+"""
+Orders XML checks by the context keys that they declare.
+
+XML checks pass information to each other through the ``context``
+dictionary. Each check declares, through
+:py:meth:`providesContext<src.xmlChecks.xmlCheck.XmlCheck.providesContext>`,
+:py:meth:`requiresContext<src.xmlChecks.xmlCheck.XmlCheck.requiresContext>`
+and :py:meth:`readsContext<src.xmlChecks.xmlCheck.XmlCheck.readsContext>`,
+which keys it sets, which it needs and which it uses if they are set.
+A :py:class:`CheckScheduler` builds the graph of dependencies between
+the checks from those declarations:
+
+* a check that requires a key runs after the check that provides it;
+* a check that reads a key keeps its place relative to the check that
+  provides it, so that it sees the key if and only if it did when the
+  checks ran one at a time in the order given;
+* a check that modifies the tree, such as the
+  :py:class:`Pruner<src.xmlChecks.pruner.Pruner>`, runs after every
+  check before it and before every check after it.
+
+Checks with no path between them in the graph do not affect each other,
+so can run at the same time.
+
+A scheduler can also select the checks to run from patterns that name
+validation code prefixes or check classes, adding the checks that the
+selected ones depend on.
+"""
+
+from collections.abc import Callable, Iterable, Iterator
+from concurrent.futures import Executor, FIRST_COMPLETED, wait
+import heapq
+from typing import TypeVar
+from src.validationLogging.validationCodes import ValidationCode
+from src.xmlChecks.xmlCheck import XmlCheck
+
+# Keys that the validator sets before running any checks
+pipeline_context_keys = ['args', 'document_index']
+
+T = TypeVar('T')
+
+
+class ContextContractError(ValueError):
+    """
+    Raised when the context declarations of a list of checks cannot be
+    satisfied, giving every problem found.
+    """
+
+    def __init__(self, problems: list[str]):
+        super().__init__('; '.join(problems))
+        self.problems = problems
+
+
+class CheckSelectionError(ValueError):
+    """Raised when a check selection pattern matches nothing."""
+
+
+class CheckScheduler:
+    """
+    Dependency graph of a list of XML checks.
+
+    Raises :py:class:`ContextContractError` if a check requires a key
+    that no check provides, if more than one check provides the same
+    key, or if the dependencies form a cycle.
+
+    Checks are identified by their index in the list.
+    """
+
+    def __init__(
+            self,
+            checks: list[XmlCheck],
+            initial_context_keys: Iterable[str] = pipeline_context_keys):
+        self._checks = checks
+        check_count = len(checks)
+        self._dependencies = [set() for _ in range(check_count)]
+        # Dependencies through which a check gets something it uses
+        self._dataDependencies = [set() for _ in range(check_count)]
+        problems = []
+
+        initial_context_keys = set(initial_context_keys)
+        providers = {}
+        for index, check in enumerate(checks):
+            for key in check.providesContext():
+                if key in providers:
+                    problems.append(
+                        'Context key {} is provided by both {} and {}'.format(
+                            key,
+                            self.checkName(providers[key]),
+                            self.checkName(index)))
+                elif key in initial_context_keys:
+                    problems.append(
+                        'Context key {} is provided by {} but is set '
+                        'before the checks run'.format(
+                            key, self.checkName(index)))
+                else:
+                    providers[key] = index
+
+        for index, check in enumerate(checks):
+            for key in check.requiresContext():
+                provider = providers.get(key)
+                if provider is None:
+                    if key not in initial_context_keys:
+                        problems.append(
+                            '{} requires context key {}, which no check '
+                            'provides'.format(self.checkName(index), key))
+                elif provider != index:
+                    self._dependencies[index].add(provider)
+                    self._dataDependencies[index].add(provider)
+            for key in check.readsContext():
+                provider = providers.get(key)
+                if provider is None or provider == index:
+                    continue
+                if provider < index:
+                    self._dependencies[index].add(provider)
+                    self._dataDependencies[index].add(provider)
+                else:
+                    self._dependencies[provider].add(index)
+            if check.modifiesTree():
+                for other_index in range(check_count):
+                    if other_index < index:
+                        self._dependencies[index].add(other_index)
+                    elif other_index > index:
+                        self._dependencies[other_index].add(index)
+                        self._dataDependencies[other_index].add(index)
+
+        if len(problems) == 0:
+            self._order = self._topologicalOrder()
+            if len(self._order) < check_count:
+                ordered = set(self._order)
+                problems.append(
+                    'Context dependencies form a cycle between {}'.format(
+                        ', '.join(
+                            self.checkName(index)
+                            for index in range(check_count)
+                            if index not in ordered)))
+        if len(problems) > 0:
+            raise ContextContractError(problems)
+
+    def checkName(self, index: int) -> str:
+        return '{} (check {})'.format(
+            type(self._checks[index]).__name__, index)
+
+    def _topologicalOrder(self) -> list[int]:
+        # Kahn's algorithm, always taking the earliest check that is
+        # ready, so that checks stay in the order given where possible
+        dependants = [[] for _ in self._checks]
+        waiting_on = []
+        for index, dependencies in enumerate(self._dependencies):
+            waiting_on.append(len(dependencies))
+            for dependency in dependencies:
+                dependants[dependency].append(index)
+        ready = [index for index, count in enumerate(waiting_on) if count == 0]
+        heapq.heapify(ready)
+        order = []
+        while len(ready) > 0:
+            index = heapq.heappop(ready)
+            order.append(index)
+            for dependant in dependants[index]:
+                waiting_on[dependant] -= 1
+                if waiting_on[dependant] == 0:
+                    heapq.heappush(ready, dependant)
+        return order
+
+    def order(self) -> list[int]:
+        """
+        Returns the indices of the checks in an order that satisfies
+        their dependencies, keeping the order given where possible.
+        """
+        return list(self._order)
+
+    def dependencies(self, index: int) -> set[int]:
+        """Returns the checks that must finish before the check starts."""
+        return set(self._dependencies[index])
+
+    def neededFor(self, codes: Iterable[ValidationCode]) -> list[int]:
+        """
+        Returns, in the scheduled order, the checks that can log any of
+        the codes, together with the checks whose context or changes to
+        the tree they use, directly or indirectly.
+        """
+        codes = set(codes)
+        return self.neededForChecks(
+            index for index, check in enumerate(self._checks)
+            if codes.intersection(check.validationCodes()))
+
+    def neededForChecks(self, indices: Iterable[int]) -> list[int]:
+        """
+        Returns, in the scheduled order, the checks with the given
+        indices together with the checks whose context or changes to the
+        tree they use, directly or indirectly.
+        """
+        needed = set()
+        pending = list(indices)
+        while len(pending) > 0:
+            index = pending.pop()
+            if index not in needed:
+                needed.add(index)
+                pending.extend(self._dataDependencies[index])
+        return [index for index in self._order if index in needed]
+
+    def validationCodes(self) -> list[ValidationCode]:
+        """Returns the codes that the checks can log, in order."""
+        codes = []
+        for check in self._checks:
+            codes.extend(
+                code for code in check.validationCodes()
+                if code not in codes)
+        return codes
+
+    def codesMatching(self, pattern: str) -> list[ValidationCode]:
+        """
+        Returns the codes of the checks whose class is named ``pattern``,
+        including sub-checks, or otherwise the codes whose names start
+        with ``pattern``.
+
+        Raises :py:class:`CheckSelectionError` if there are none.
+        """
+        codes = []
+        pending = list(self._checks)
+        while len(pending) > 0:
+            check = pending.pop()
+            if type(check).__name__ == pattern:
+                codes.extend(
+                    code for code in check.validationCodes()
+                    if code not in codes)
+            pending.extend(check.subChecks())
+        if len(codes) == 0:
+            codes = [
+                code for code in self.validationCodes()
+                if code.name.startswith(pattern)]
+        if len(codes) == 0:
+            raise CheckSelectionError(
+                '{} does not match any check or validation code'.format(
+                    pattern))
+        return codes
+
+    def select(
+            self,
+            include: list[str] | None = None,
+            exclude: list[str] | None = None) -> list[int]:
+        """
+        Returns, in the scheduled order, the fewest checks needed to log
+        the codes matched by any ``include`` pattern, or all codes if
+        there are none, apart from those matched by an ``exclude``
+        pattern. Patterns are matched by :py:meth:`codesMatching`.
+
+        Checks that the selected checks depend on are included, even if
+        excluded, and log all of their results.
+        """
+        if include:
+            codes = set(
+                code for pattern in include
+                for code in self.codesMatching(pattern))
+        else:
+            codes = set(self.validationCodes())
+        for pattern in exclude or []:
+            codes.difference_update(self.codesMatching(pattern))
+        return self.neededFor(codes)
+
+    def runConcurrently(
+            self,
+            executor: Executor,
+            run_check: Callable[[int], T],
+            indices: list[int] | None = None) -> Iterator[tuple[int, T]]:
+        """
+        Calls ``run_check`` with the index of each check on the executor,
+        as soon as the checks it depends on have finished, and yields
+        each index with the value returned, in the scheduled order.
+
+        ``indices`` selects the checks to run, by default all of them;
+        dependencies on checks that are not selected are ignored.
+
+        Checks that have not started are cancelled if the caller stops
+        early, and those that have started are waited for.
+        """
+        selected = set(self._order if indices is None else indices)
+        order = [index for index in self._order if index in selected]
+        futures = {}
+        finished = set()
+        position = 0
+        try:
+            while position < len(order):
+                for index in order:
+                    if index not in futures and \
+                       self._dependencies[index] & selected <= finished:
+                        futures[index] = executor.submit(run_check, index)
+                wait(
+                    [future for index, future in futures.items()
+                     if index not in finished],
+                    return_when=FIRST_COMPLETED)
+                finished.update(
+                    index for index, future in futures.items()
+                    if future.done())
+                while position < len(order) and order[position] in finished:
+                    index = order[position]
+                    position += 1
+                    yield index, futures[index].result()
+        finally:
+            for future in futures.values():
+                future.cancel()
+            wait(futures.values())
@@ -0,0 +1,135 @@
+# SPDX-FileCopyrightText: Copyright © 2026 BBC
+#
+# SPDX-License-Identifier: BSD-3-Clause
+
+"""
+Reads gzip or zstd compressed input as if it were not compressed.
+
+Compression is detected from the magic bytes at the start of the input,
+whatever the file is called, and the input is decompressed as it is
+read, so that there is never a decompressed copy on disk and no more
+than the bytes asked for are decompressed. Limiting the number of bytes
+read therefore limits the decompressed size, which guards against
+inputs that decompress to far more than their own size.
+
+zstd is only available from Python 3.14, through ``compression.zstd``;
+the ``zstd`` kind is only in :py:data:`compression_kinds` when it is
+available.
+"""
+
+from typing import BinaryIO
+import gzip
+import io
+import zlib
+
+try:
+    from compression import zstd
+except ImportError:  # Before Python 3.14
+    zstd = None
+
+gzip_magic = b'\x1f\x8b'
+zstd_magic = b'\x28\xb5\x2f\xfd'
+
+compression_kinds = ['gzip'] + (['zstd'] if zstd is not None else [])
+
+_decompression_errors = (gzip.BadGzipFile, EOFError, zlib.error) \
+    + ((zstd.ZstdError,) if zstd is not None else ())
+
+
+class CompressionError(ValueError):
+    """Raised when compressed input cannot be decompressed."""
+
+
+def detect_compression(head: bytes) -> str | None:
+    """
+    Returns the kind of compression that the input starting with
+    ``head`` uses, ``gzip`` or ``zstd``, or None if it is not compressed.
+    """
+    if head[:2] == gzip_magic:
+        return 'gzip'
+    if head[:4] == zstd_magic:
+        return 'zstd'
+    return None
+
+
+class PrefixedStream(io.RawIOBase):
+    """
+    Stream that returns some bytes already read from another stream
+    before the rest of it, so that the start of a stream that cannot
+    seek, such as a pipe, can be looked at and put back.
+    """
+
+    def __init__(self, prefix: bytes, stream: BinaryIO):
+        super().__init__()
+        self._prefix = prefix
+        self._stream = stream
+
+    def readable(self) -> bool:
+        return True
+
+    def read(self, size: int = -1) -> bytes:
+        if size is None or size < 0:
+            data = self._prefix + self._stream.read()
+            self._prefix = b''
+            return data
+        if len(self._prefix) > 0:
+            data = self._prefix[:size]
+            self._prefix = self._prefix[size:]
+            return data
+        return self._stream.read(size)
+
+    def readinto(self, buffer) -> int:
+        data = self.read(len(buffer))
+        buffer[:len(data)] = data
+        return len(data)
+
+
+def open_decompressed(stream: BinaryIO) -> BinaryIO:
+    """
+    Returns a stream of the decompressed content of ``stream`` if it is
+    compressed, otherwise a stream of its content.
+
+    Raises :py:class:`CompressionError` if it is compressed in a way that
+    cannot be read here.
+    """
+    head = stream.read(4)
+    kind = detect_compression(head)
+    if kind is None and stream.seekable():
+        stream.seek(-len(head), io.SEEK_CUR)
+        return stream
+    prefixed = PrefixedStream(head, stream)
+    match kind:
+        case 'gzip':
+            return gzip.GzipFile(fileobj=prefixed, mode='rb')
+        case 'zstd':
+            if zstd is None:
+                raise CompressionError(
+                    'Reading zstd compressed input needs Python 3.14')
+            return zstd.ZstdFile(prefixed, mode='rb')
+    return prefixed
+
+
+def read_decompressed(stream: BinaryIO, read_limit: int = -1) -> bytes:
+    """
+    Returns up to ``read_limit`` bytes, or all if -1, of the content of
+    ``stream``, decompressing it if it is compressed.
+
+    Raises :py:class:`CompressionError` if it cannot be decompressed.
+    """
+    try:
+        return open_decompressed(stream).read(read_limit)
+    except _decompression_errors as e:
+        raise CompressionError(
+            'Could not decompress the input: {}'.format(e)) from e
+
+
+def decompressed_bytes(content: bytes, read_limit: int = -1) -> bytes:
+    """
+    Returns up to ``read_limit`` bytes, or all if -1, of ``content``,
+    decompressing it if it is compressed.
+
+    Raises :py:class:`CompressionError` if it cannot be decompressed.
+    """
+    if detect_compression(content[:4]) is None:
+        return bytes(content)
+    return read_decompressed(io.BytesIO(content), read_limit)
@@ -36,51 +36,12 @@ from src.validationLogging.validationSummariser import \
 
 
 class BbcSubtitleConstraintSet(ConstraintSet):
-    _preParseChecks = [
-        ByteOrderMarkCheck(),  # encoding check will remove BOM
-        BadEncodingCheck(),  # check encoding before null bytes
-        NullByteCheck(),
-        XmlStructureCheck()
-    ]
 
-    _xmlChecks = [
-        unqualifiedIdAttributeCheck(),
-        xsdValidator(xml_schema=EBUTTDSchema, schema_name='EBU-TT-D'),
-        duplicateXmlIdCheck(),
-        IDREFSelementApplicabilityCheck(),
-        ttTagAndNamespaceCheck(),
-        timeBaseCheck(timeBase_acceptlist=['media'], timeBase_required=True),
-        activeAreaCheck(activeArea_required=False),
-        cellResolutionCheck(cellResolution_required=False),
-        headCheck(
-            sub_checks=[
-                copyrightCheck(copyright_required=False),
-                stylingCheck(),
-                layoutCheck(),
-            ]
-            ),
-        styleRefsXmlCheck(),
-        inlineStyleAttributesCheck(),
-        regionRefsXmlCheck(),
-        bodyCheck(sub_checks=[
-            noTimingAttributeCheck(),
-            ttmlRoleTypeCheck(),
-            divCheck(sub_checks=[
-                noTimingAttributeCheck(),
-                pCheck(sub_checks=[
-                    requireXmlId(),
-                    noTextChildren(),
-                    checkLineBreaks(),
-                    spanCheck(sub_checks=[
-                        noNestedTimedElementsCheck()
-                        ],
-                        require_text_in_span=True,
-                        permit_nested_spans=False)
-                    ])
-                ],
-                recurse_div_children=True)
-            ]
-        )
+    _summaryCheckers = [
+        (XmlPassChecker, ValidationCode.xml_document_validity),
+        (TtmlPassChecker, ValidationCode.ttml_document_validity),
+        (EbuttdPassChecker, ValidationCode.ebuttd_document_validity),
+        (BbcPassChecker, ValidationCode.bbc_document_validity),
     ]
 
     def __init__(
@@ -89,27 +50,82 @@ class BbcSubtitleConstraintSet(ConstraintSet):
             segment_dur: float | None = None,
             segment_relative_timing: bool = False) -> None:
         super().__init__()
-        self._xmlChecks.append(
+        # Build the checks for each instance, so that constraint sets
+        # never share mutable state
+        self._preParseChecks = [
+            ByteOrderMarkCheck(),  # encoding check will remove BOM
+            BadEncodingCheck(),  # check encoding before null bytes
+            NullByteCheck(),
+            XmlStructureCheck()
+        ]
+
+        # Structure, root element and namespace, and schema
+        gate_checks = [
+            unqualifiedIdAttributeCheck(),
+            xsdValidator(xml_schema=EBUTTDSchema, schema_name='EBU-TT-D'),
+            duplicateXmlIdCheck(),
+            IDREFSelementApplicabilityCheck(),
+            ttTagAndNamespaceCheck(),
+            timeBaseCheck(
+                timeBase_acceptlist=['media'], timeBase_required=True),
+            activeAreaCheck(activeArea_required=False),
+            cellResolutionCheck(cellResolution_required=False),
+        ]
+        # Styles, regions and timing
+        full_checks = [
+            headCheck(
+                sub_checks=[
+                    copyrightCheck(copyright_required=False),
+                    stylingCheck(),
+                    layoutCheck(),
+                ]
+                ),
+            styleRefsXmlCheck(),
+            inlineStyleAttributesCheck(),
+            regionRefsXmlCheck(),
+            bodyCheck(sub_checks=[
+                noTimingAttributeCheck(),
+                ttmlRoleTypeCheck(),
+                divCheck(sub_checks=[
+                    noTimingAttributeCheck(),
+                    pCheck(sub_checks=[
+                        requireXmlId(),
+                        noTextChildren(),
+                        checkLineBreaks(),
+                        spanCheck(sub_checks=[
+                            noNestedTimedElementsCheck()
+                            ],
+                            require_text_in_span=True,
+                            permit_nested_spans=False)
+                        ])
+                    ],
+                    recurse_div_children=True)
+                ]
+            ),
             bbcTimingCheck(
                 epoch=epoch,
                 segment_dur=segment_dur,
                 segment_relative_timing=segment_relative_timing)
-            )
+        ]
+        self._xmlChecks = gate_checks + full_checks
+        self._gateXmlCheckCount = len(gate_checks)
 
     @staticmethod
-    def summarise(validation_results: ValidationLogger) -> tuple[int, int]:
+    def summarise(
+            validation_results: ValidationLogger,
+            location: str = 'Document') -> tuple[int, int]:
         xmlFails, xmlWarns, xmlSkips = \
             XmlPassChecker.failuresAndWarningsAndSkips(validation_results)
         if xmlSkips == 0 and xmlFails == 0:
             validation_results.good(
-                location='Document',
+                location=location,
                 message='Document appears to be valid XML with {} '
                         'XML-related warnings'.format(xmlWarns),
                 code=ValidationCode.xml_document_validity
             )
         elif xmlSkips == 0:
             validation_results.error(
-                location='Document',
+                location=location,
                 message='Document is not valid XML with {} '
                         'XML-related failures and '
                         '{} warnings'.format(xmlFails, xmlWarns),
@@ -117,7 +133,7 @@ class BbcSubtitleConstraintSet(ConstraintSet):
             )
         else:
             validation_results.skip(
-                location='Document',
+                location=location,
                 message='{} XML checks skipped, '
                         'document {} with '
                         '{} XML-related failures and '
@@ -134,14 +150,14 @@ class BbcSubtitleConstraintSet(ConstraintSet):
             TtmlPassChecker.failuresAndWarningsAndSkips(validation_results)
         if ttmlSkips == 0 and ttmlFails == 0:
             validation_results.good(
-                location='Document',
+                location=location,
                 message='Document appears to be valid TTML with {} '
                         'TTML-related warnings'.format(xmlWarns),
                 code=ValidationCode.ttml_document_validity
             )
         elif ttmlSkips == 0:
             validation_results.error(
-                location='Document',
+                location=location,
                 message='Document is not valid TTML with {} '
                         'TTML-related failures and '
                         '{} warnings'.format(ttmlFails, ttmlWarns),
@@ -149,7 +165,7 @@ class BbcSubtitleConstraintSet(ConstraintSet):
             )
         else:
             validation_results.skip(
-                location='Document',
+                location=location,
                 message='{} TTML checks skipped, '
                         'document {} with '
                         '{} TTML-related failures and '
@@ -166,14 +182,14 @@ class BbcSubtitleConstraintSet(ConstraintSet):
             EbuttdPassChecker.failuresAndWarningsAndSkips(validation_results)
         if ebuttdSkips == 0 and ebuttdFails == 0:
             validation_results.good(
-                location='Document',
+                location=location,
                 message='Document appears to be valid EBU-TT-D with {} '
                         'EBU-TT-D-related warnings'.format(ebuttdWarns),
                 code=ValidationCode.ebuttd_document_validity
             )
         elif ebuttdSkips == 0:
             validation_results.error(
-                location='Document',
+                location=location,
                 message='Document is not valid EBU-TT-D with {} '
                         'EBU-TT-D-related failures and '
                         '{} warnings'.format(ebuttdFails, ebuttdWarns),
@@ -181,7 +197,7 @@ class BbcSubtitleConstraintSet(ConstraintSet):
             )
         else:
             validation_results.skip(
-                location='Document',
+                location=location,
                 message='{} EBU-TT-D checks skipped, '
                         'document {} with '
                         '{} EBU-TT-D-related failures and '
@@ -199,7 +215,7 @@ class BbcSubtitleConstraintSet(ConstraintSet):
             BbcPassChecker.failuresAndWarningsAndSkips(validation_results)
         if bbcSkips == 0 and bbcFails == 0:
             validation_results.good(
-                location='Document',
+                location=location,
                 message='Document appears to meet BBC requirements '
                         'and should play okay in the BBC\'s player. '
                         'There were {} BBC-related warnings'.format(bbcWarns),
@@ -207,7 +223,7 @@ class BbcSubtitleConstraintSet(ConstraintSet):
             )
         elif bbcSkips == 0 and mightPlay:
             validation_results.error(
-                location='Document',
+                location=location,
                 message='Document does not meet BBC '
                         'requirements but may play with unexpected '
                         'appearance in the BBC\'s player. '
@@ -217,7 +233,7 @@ class BbcSubtitleConstraintSet(ConstraintSet):
             )
         elif bbcSkips == 0:
             validation_results.error(
-                location='Document',
+                location=location,
                 message='Document does not meet BBC '
                         'requirements and is likely not to play properly '
                         'if at all in the BBC\'s player. '
@@ -236,7 +252,7 @@ class BbcSubtitleConstraintSet(ConstraintSet):
                 'does not meet BBC requirements and is likely not to play ' \
                 'properly if at all in the BBC\'s player. There were '
             validation_results.skip(
-                location='Document',
+                location=location,
                 message='{} BBC requirement checks skipped, '
                         'document {} '
                         '{} BBC-related errors and '
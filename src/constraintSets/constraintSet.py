@@ -2,14 +2,28 @@
 #
 # SPDX-License-Identifier: BSD-3-Clause
 
+from src.checkScheduler import CheckScheduler
 from src.preParseChecks.preParseCheck import PreParseCheck
 from src.xmlChecks.xmlCheck import XmlCheck
+from src.validationLogging.validationCodes import ValidationCode
 from src.validationLogging.validationLogger import ValidationLogger
+from src.validationLogging.validationSummariser import ValidationPassChecker
 
 
 class ConstraintSet():
-    _preParseChecks = []
-    _xmlChecks = []
+
+    # The pass checkers whose results are summarised, each with the code
+    # of its document validity summary
+    _summaryCheckers: list[
+        tuple[type[ValidationPassChecker], ValidationCode]] = []
+
+    def __init__(self) -> None:
+        self._preParseChecks: list[PreParseCheck] = []
+        self._xmlChecks: list[XmlCheck] = []
+        # The first checks, which make up the gate tier with the
+        # pre-parse checks and parsing; the rest make up the full tier
+        self._gateXmlCheckCount: int = 0
+        self._checkScheduler: CheckScheduler | None = None
 
     def preParseChecks(self) -> list[PreParseCheck]:
         return self._preParseChecks
@@ -17,6 +31,93 @@ class ConstraintSet():
     def xmlChecks(self) -> list[XmlCheck]:
         return self._xmlChecks
 
+    def tierChecks(self, tier: str) -> list[int]:
+        """
+        Returns the indices of the XML checks in the tier, ``gate`` or
+        ``full``.
+
+        The gate tier checks the structure of the document, its root
+        element and namespace and its schema, so that a document can be
+        accepted or rejected quickly. The full tier checks its styles,
+        regions and timing.
+        """
+        match tier:
+            case 'gate':
+                return list(range(self._gateXmlCheckCount))
+            case 'full':
+                return list(range(
+                    self._gateXmlCheckCount, len(self._xmlChecks)))
+        raise ValueError('Tier {} not recognised'.format(tier))
+
+    def checkScheduler(self) -> CheckScheduler:
+        """
+        Returns the scheduler for the XML checks, building it the first
+        time, which raises
+        :py:class:`ContextContractError<src.checkScheduler.ContextContractError>`
+        if their context declarations cannot be satisfied.
+        """
+        if self._checkScheduler is None:
+            self._checkScheduler = CheckScheduler(self._xmlChecks)
+        return self._checkScheduler
+
     @staticmethod
-    def summarise(validation_results: ValidationLogger) -> tuple[int, int]:
+    def summarise(
+            validation_results: ValidationLogger,
+            location: str = 'Document') -> tuple[int, int]:
+        """
+        Logs the document validity summaries at ``location`` and returns
+        the numbers of failures and skips.
+        """
         raise NotImplementedError
+
+    def summariseTier(
+            self,
+            validation_results: ValidationLogger,
+            tier: str,
+            location: str) -> tuple[int, int]:
+        """
+        Logs a summary of the results of one tier of checks for each
+        document validity code at ``location`` and returns the numbers of
+        failures and skips.
+
+        Unlike those of :py:meth:`summarise`, the summaries do not say
+        whether the document is valid, since the other tier has not been
+        checked, so a tier that finds no failures is logged as
+        information rather than as a pass.
+        """
+        totalFails = 0
+        totalSkips = 0
+        for pass_checker, code in self._summaryCheckers:
+            fails, warns, skips = \
+                pass_checker.failuresAndWarningsAndSkips(validation_results)
+            totalFails += fails
+            totalSkips += skips
+            counts = '{} {}-related failures and {} warnings'.format(
+                fails, pass_checker.name, warns)
+            if skips > 0:
+                validation_results.skip(
+                    location=location,
+                    message='{} {} checks skipped in the {} tier of checks, '
+                            'with {}'.format(
+                                skips, pass_checker.name, tier, counts),
+                    code=code
+                )
+            elif fails > 0:
+                validation_results.error(
+                    location=location,
+                    message='Document fails the {} tier of {} checks with '
+                            '{}'.format(tier, pass_checker.name, counts),
+                    code=code
+                )
+            else:
+                validation_results.info(
+                    location=location,
+                    message='Document passes the {} tier of {} checks with '
+                            '{}. Only this tier was checked, so it is not '
+                            'known whether the document meets every {} '
+                            'requirement'.format(
+                                tier, pass_checker.name, counts,
+                                pass_checker.name),
+                    code=code
+                )
+        return totalFails, totalSkips
@@ -77,74 +77,87 @@ known_no_ns_attributes = set([
 
 class DaptConstraintSet(ConstraintSet):
 
-    _preParseChecks = [
-        ByteOrderMarkCheck(),  # encoding check will remove BOM
-        BadEncodingCheck(),  # check encoding before null bytes
-        NullByteCheck(),
-        XmlStructureCheck()
+    _summaryCheckers = [
+        (XmlPassChecker, ValidationCode.xml_document_validity),
+        (TtmlPassChecker, ValidationCode.ttml_document_validity),
+        (DaptPassChecker, ValidationCode.dapt_document_validity),
     ]
 
-    _xmlChecks = [
-        duplicateXmlIdCheck(),
-        Pruner(
-            no_prune_namespaces=recognised_namespaces,
-            no_prune_no_namespace_attributes=known_no_ns_attributes),
-        xsdValidator(xml_schema=DAPTSchema, schema_name='DAPT'),
-        unqualifiedIdAttributeCheck(),
-        IDREFSelementApplicabilityCheck(),
-        ttTagAndNamespaceCheck(),
-        nonEmptyLangRootCheck(),
-        daptLangAudioNonMatchingCheck(),
-        timeBaseCheck(
-            timeBase_acceptlist=['media'],
-            timeBase_required=False),
-        contentProfilesCheck(
-            contentProfiles_atleastonelist=[
-                'http://www.w3.org/ns/ttml/profile/dapt1.0/content',
-                ],
-            contentProfiles_denylist=[],
-            contentProfiles_required=True
-        ),
-        headCheck(
-            sub_checks=[
-                copyrightCheck(copyright_required=False),
-                actorRefsCheck(),
-            ]),
-        daptmDescTypeCheck(),
-        daptmRepresentsCheck(),
-        ttmlRoleTypeCheck(),
-        # bodyCheck(
-        #     sub_checks=[
-        #     ]),
-    ]  # Note that daptTimingCheck is appended in init method
-
     def __init__(
             self,
             epoch: float = 0.0,
             segment_dur: float | None = None,
             segment_relative_timing: bool = False) -> None:
         super().__init__()
-        self._xmlChecks.append(
+        # Build the checks for each instance, so that constraint sets
+        # never share mutable state
+        self._preParseChecks = [
+            ByteOrderMarkCheck(),  # encoding check will remove BOM
+            BadEncodingCheck(),  # check encoding before null bytes
+            NullByteCheck(),
+            XmlStructureCheck()
+        ]
+
+        # Structure, root element and namespace, and schema
+        gate_checks = [
+            duplicateXmlIdCheck(),
+            Pruner(
+                no_prune_namespaces=recognised_namespaces,
+                no_prune_no_namespace_attributes=known_no_ns_attributes),
+            xsdValidator(xml_schema=DAPTSchema, schema_name='DAPT'),
+            unqualifiedIdAttributeCheck(),
+            IDREFSelementApplicabilityCheck(),
+            ttTagAndNamespaceCheck(),
+            nonEmptyLangRootCheck(),
+            daptLangAudioNonMatchingCheck(),
+            timeBaseCheck(
+                timeBase_acceptlist=['media'],
+                timeBase_required=False),
+            contentProfilesCheck(
+                contentProfiles_atleastonelist=[
+                    'http://www.w3.org/ns/ttml/profile/dapt1.0/content',
+                    ],
+                contentProfiles_denylist=[],
+                contentProfiles_required=True
+            ),
+        ]
+        # Metadata, content descriptions and timing
+        full_checks = [
+            headCheck(
+                sub_checks=[
+                    copyrightCheck(copyright_required=False),
+                    actorRefsCheck(),
+                ]),
+            daptmDescTypeCheck(),
+            daptmRepresentsCheck(),
+            ttmlRoleTypeCheck(),
+            # bodyCheck(
+            #     sub_checks=[
+            #     ]),
             daptTimingCheck(
                 epoch=epoch,
                 segment_dur=segment_dur,
                 segment_relative_timing=segment_relative_timing)
-            )
+        ]
+        self._xmlChecks = gate_checks + full_checks
+        self._gateXmlCheckCount = len(gate_checks)
 
     @staticmethod
-    def summarise(validation_results: ValidationLogger) -> tuple[int, int]:
+    def summarise(
+            validation_results: ValidationLogger,
+            location: str = 'Document') -> tuple[int, int]:
         xmlFails, xmlWarns, xmlSkips = \
             XmlPassChecker.failuresAndWarningsAndSkips(validation_results)
         if xmlSkips == 0 and xmlFails == 0:
             validation_results.good(
-                location='Document',
+                location=location,
                 message='Document appears to be valid XML with {} '
                         'XML-related warnings'.format(xmlWarns),
                 code=ValidationCode.xml_document_validity
             )
         elif xmlSkips == 0:
             validation_results.error(
-                location='Document',
+                location=location,
                 message='Document is not valid XML with {} '
                         'XML-related failures and '
                         '{} warnings'.format(xmlFails, xmlWarns),
@@ -152,7 +165,7 @@ class DaptConstraintSet(ConstraintSet):
             )
         else:
             validation_results.skip(
-                location='Document',
+                location=location,
                 message='{} XML checks skipped, '
                         'document {} with '
                         '{} XML-related failures and '
@@ -169,14 +182,14 @@ class DaptConstraintSet(ConstraintSet):
             TtmlPassChecker.failuresAndWarningsAndSkips(validation_results)
         if ttmlSkips == 0 and ttmlFails == 0:
             validation_results.good(
-                location='Document',
+                location=location,
                 message='Document appears to be valid TTML with {} '
                         'TTML-related warnings'.format(xmlWarns),
                 code=ValidationCode.ttml_document_validity
             )
         elif ttmlSkips == 0:
             validation_results.error(
-                location='Document',
+                location=location,
                 message='Document is not valid TTML with {} '
                         'TTML-related failures and '
                         '{} warnings'.format(ttmlFails, ttmlWarns),
@@ -184,7 +197,7 @@ class DaptConstraintSet(ConstraintSet):
             )
         else:
             validation_results.skip(
-                location='Document',
+                location=location,
                 message='{} TTML checks skipped, '
                         'document {} with '
                         '{} TTML-related failures and '
@@ -201,14 +214,14 @@ class DaptConstraintSet(ConstraintSet):
             DaptPassChecker.failuresAndWarningsAndSkips(validation_results)
         if daptSkips == 0 and daptFails == 0:
             validation_results.good(
-                location='Document',
+                location=location,
                 message='Document appears to be valid DAPT with {} '
                         'DAPT-related warnings'.format(daptWarns),
                 code=ValidationCode.dapt_document_validity
             )
         elif daptSkips == 0:
             validation_results.error(
-                location='Document',
+                location=location,
                 message='Document is not valid DAPT with {} '
                         'DAPT-related failures and '
                         '{} warnings'.format(daptFails, daptWarns),
@@ -216,7 +229,7 @@ class DaptConstraintSet(ConstraintSet):
             )
         else:
             validation_results.skip(
-                location='Document',
+                location=location,
                 message='{} DAPT checks skipped, '
                         'document {} with '
                         '{} DAPT-related failures and '
@@ -0,0 +1,344 @@
+# SPDX-FileCopyrightText: Copyright © 2026 BBC
+#
+# SPDX-License-Identifier: BSD-3-Clause
+
+"""
+Watches a directory and validates files as soon as they are written.
+
+A file is only validated once it has been fully written. On Linux,
+inotify, called through :py:mod:`ctypes`, reports a file when it is
+closed after being written or when it is renamed into the directory,
+which is how packagers usually publish a segment atomically. Elsewhere,
+or if inotify cannot be used, the directory is polled, and a file is
+reported once its size and modification time are the same in two scans
+in a row, so a file still being written is not picked up.
+
+Only files written after watching starts are reported, and
+subdirectories are not watched. Names are matched against a glob
+pattern with :py:func:`fnmatch.fnmatchcase`, so temporary files can be
+left out.
+
+Reported files wait in a :py:class:`BacklogQueue` for validation. The
+queue is bounded: if validation falls behind and the queue is full, the
+file that has waited longest is dropped, since for live output a late
+result is worth less than a current one. A file that is reported again
+while it is waiting is only queued once.
+"""
+
+from collections import deque
+from collections.abc import Callable, Iterator
+from fnmatch import fnmatchcase
+from pathlib import Path
+import ctypes
+import ctypes.util
+import logging
+import os
+import select
+import struct
+import sys
+import threading
+import time
+from src.validationPool import warm_worker
+from src.validator import ValidationOptions, ValidationReport, validate
+
+# inotify event masks and flags, from <sys/inotify.h>
+_in_close_write = 0x00000008
+_in_moved_to = 0x00000080
+_in_q_overflow = 0x00004000
+_in_isdir = 0x40000000
+_in_nonblock = 0o4000
+_in_cloexec = 0o2000000
+
+_inotify_event = struct.Struct('iIII')
+
+
+def _load_libc():
+    if not sys.platform.startswith('linux'):
+        return None
+    try:
+        libc = ctypes.CDLL(ctypes.util.find_library('c'), use_errno=True)
+    except OSError:
+        return None
+    if not hasattr(libc, 'inotify_init1'):
+        return None
+    libc.inotify_init1.argtypes = [ctypes.c_int]
+    libc.inotify_add_watch.argtypes = [
+        ctypes.c_int, ctypes.c_char_p, ctypes.c_uint32]
+    return libc
+
+
+_libc = _load_libc()
+
+
+def inotify_available() -> bool:
+    """Returns True if inotify can be used here."""
+    return _libc is not None
+
+
+class BacklogQueue:
+    """
+    Queue of at most ``max_size`` files waiting to be validated, each
+    with the time it was reported, which drops the oldest when full.
+    """
+
+    def __init__(self, max_size: int = 64):
+        self._max_size = max(1, max_size)
+        self._entries = deque()
+        self._queued = set()
+        self._condition = threading.Condition()
+        self._closed = False
+        self.dropped = 0
+
+    def put(self, path: str, reported_at: float | None = None) -> None:
+        with self._condition:
+            if path in self._queued:
+                return
+            if len(self._entries) >= self._max_size:
+                dropped_path, _ = self._entries.popleft()
+                self._queued.discard(dropped_path)
+                self.dropped += 1
+                logging.warning(
+                    'Backlog full: not validating {}'.format(dropped_path))
+            self._entries.append((
+                path,
+                time.monotonic() if reported_at is None else reported_at))
+            self._queued.add(path)
+            self._condition.notify()
+
+    def get(self, timeout: float | None = None) -> tuple[str, float] | None:
+        """
+        Returns the next file and the time it was reported, or None if
+        there is none within ``timeout`` seconds or the queue is closed
+        and empty.
+        """
+        with self._condition:
+            self._condition.wait_for(
+                lambda: len(self._entries) > 0 or self._closed, timeout)
+            if len(self._entries) == 0:
+                return None
+            path, reported_at = self._entries.popleft()
+            self._queued.discard(path)
+            return path, reported_at
+
+    def close(self) -> None:
+        """Wakes any waiting :py:meth:`get`; no more files are expected."""
+        with self._condition:
+            self._closed = True
+            self._condition.notify_all()
+
+    @property
+    def closed(self) -> bool:
+        return self._closed
+
+    def __len__(self) -> int:
+        with self._condition:
+            return len(self._entries)
+
+
+class PollingWatcher:
+    """
+    Reports files in a directory that have been written since the last
+    call, once their size and modification time have stopped changing.
+    """
+
+    def __init__(self, directory: str, pattern: str = '*'):
+        self._directory = directory
+        self._pattern = pattern
+        # Size and modification time of each file at the last scan, and
+        # those last reported
+        self._seen = {}
+        self._reported = {}
+        for path, state in self._scan().items():
+            self._seen[path] = state
+            self._reported[path] = state
+
+    def _scan(self) -> dict[str, tuple[int, int]]:
+        states = {}
+        with os.scandir(self._directory) as entries:
+            for entry in entries:
+                if not fnmatchcase(entry.name, self._pattern):
+                    continue
+                try:
+                    if not entry.is_file():
+                        continue
+                    stat = entry.stat()
+                except FileNotFoundError:
+                    continue
+                states[entry.path] = (stat.st_size, stat.st_mtime_ns)
+        return states
+
+    def poll(self, timeout: float) -> list[str]:
+        """
+        Waits ``timeout`` seconds, then returns the files ready, in the
+        order they were last modified.
+        """
+        time.sleep(timeout)
+        states = self._scan()
+        ready = sorted(
+            (path for path, state in states.items()
+             if self._seen.get(path) == state
+             and self._reported.get(path) != state),
+            key=lambda path: states[path][1])
+        for path in ready:
+            self._reported[path] = states[path]
+        self._seen = states
+        self._reported = {
+            path: state for path, state in self._reported.items()
+            if path in states}
+        return ready
+
+    def close(self) -> None:
+        return
+
+
+class InotifyWatcher:
+    """
+    Reports files in a directory that have been closed after writing or
+    renamed into it since the last call, using inotify.
+    """
+
+    def __init__(self, directory: str, pattern: str = '*'):
+        if _libc is None:
+            raise OSError('inotify is not available')
+        self._directory = directory
+        self._pattern = pattern
+        self._fd = _libc.inotify_init1(_in_nonblock | _in_cloexec)
+        if self._fd < 0:
+            errno = ctypes.get_errno()
+            raise OSError(errno, os.strerror(errno))
+        if _libc.inotify_add_watch(
+                self._fd,
+                os.fsencode(directory),
+                _in_close_write | _in_moved_to) < 0:
+            errno = ctypes.get_errno()
+            os.close(self._fd)
+            raise OSError(errno, os.strerror(errno), directory)
+
+    def poll(self, timeout: float) -> list[str]:
+        """
+        Waits up to ``timeout`` seconds for events, then returns the files
+        ready, in the order they were written.
+        """
+        readable, _, _ = select.select([self._fd], [], [], timeout)
+        if len(readable) == 0:
+            return []
+        try:
+            data = os.read(self._fd, 64 * 1024)
+        except BlockingIOError:
+            return []
+        ready = []
+        offset = 0
+        while offset + _inotify_event.size <= len(data):
+            _, mask, _, name_length = _inotify_event.unpack_from(
+                data, offset)
+            offset += _inotify_event.size
+            name = data[offset:offset + name_length].rstrip(b'\0')
+            offset += name_length
+            if mask & _in_q_overflow:
+                logging.warning(
+                    'Too many changes in {}: some files may not be '
+                    'validated'.format(self._directory))
+                continue
+            if mask & _in_isdir or len(name) == 0:
+                continue
+            name = os.fsdecode(name)
+            if fnmatchcase(name, self._pattern):
+                path = os.path.join(self._directory, name)
+                if path not in ready:
+                    ready.append(path)
+        return ready
+
+    def close(self) -> None:
+        os.close(self._fd)
+
+
+def make_watcher(
+        directory: str,
+        pattern: str = '*',
+        use_inotify: bool = True) -> PollingWatcher | InotifyWatcher:
+    """
+    Returns an :py:class:`InotifyWatcher` if ``use_inotify`` and it is
+    available, otherwise a :py:class:`PollingWatcher`.
+    """
+    if use_inotify and inotify_available():
+        try:
+            return InotifyWatcher(directory, pattern)
+        except OSError as e:
+            logging.warning(
+                'Could not use inotify, polling instead: {}'.format(e))
+    return PollingWatcher(directory, pattern)
+
+
+def watch_directory(
+        watcher: PollingWatcher | InotifyWatcher,
+        backlog: BacklogQueue,
+        stop: threading.Event,
+        interval: float = 0.2) -> None:
+    """
+    Puts the files reported by the watcher on the backlog until ``stop``
+    is set, checking at least every ``interval`` seconds, then closes
+    the watcher and the backlog.
+    """
+    try:
+        while not stop.is_set():
+            for path in watcher.poll(interval):
+                backlog.put(path)
+    finally:
+        watcher.close()
+        backlog.close()
+
+
+def validate_watched(
+        backlog: BacklogQueue,
+        flavour: str = 'bbc',
+        file_options: Callable[[str], ValidationOptions] | None = None,
+        max_files: int = 0,
+        warm_options: ValidationOptions | None = None
+        ) -> Iterator[tuple[str, ValidationReport]]:
+    """
+    Validates each file taken from the backlog, yielding its path and
+    report, until the backlog is closed and empty or ``max_files`` have
+    been validated, if more than 0.
+
+    ``file_options`` is called with each path to get the options to
+    validate it with. The constraint sets are built before the first
+    file arrives, including those for the segment duration and timing
+    of ``warm_options``, if given. The time from each file being
+    reported to its results being written by the caller is logged at the
+    end.
+    """
+    warm_worker(warm_options)
+    latencies = []
+    try:
+        while max_files <= 0 or len(latencies) < max_files:
+            entry = backlog.get(timeout=0.5)
+            if entry is None:
+                if backlog.closed:
+                    return
+                continue
+            path, reported_at = entry
+            options = ValidationOptions() if file_options is None \
+                else file_options(path)
+            try:
+                report = validate(
+                    source=Path(path),
+                    flavour=flavour,
+                    options=options)
+            except FileNotFoundError:
+                logging.warning('{} was removed before it could be '
+                                'validated'.format(path))
+                continue
+            yield path, report
+            # After the report has been written by the caller
+            latencies.append(time.monotonic() - reported_at)
+    finally:
+        if len(latencies) > 0:
+            logging.info(
+                'Validated {} files, {:.1f} ms mean and {:.1f} ms maximum '
+                'from each being found to its results being written, {} '
+                'dropped from the backlog'
+                .format(
+                    len(latencies),
+                    1000 * sum(latencies) / len(latencies),
+                    1000 * max(latencies),
+                    backlog.dropped))
@@ -0,0 +1,194 @@
+# SPDX-FileCopyrightText: Copyright © 2026 BBC
+#
+# SPDX-License-Identifier: BSD-3-Clause
+
+"""
+Validates a stream of documents, each framed so that one validator
+process can check many documents sent through a pipe.
+
+Two framings are read:
+
+``nul``
+    Each document is followed by a NUL byte, for example written by
+    ``for f in *.xml; do cat "$f"; printf '\\0'; done``. The last
+    document may be left unterminated. Documents are numbered from 1.
+    Documents that themselves contain NUL bytes must be sent with the
+    ``length`` framing instead.
+
+``length``
+    Each document is preceded by a header line giving its length in
+    bytes as a decimal number and, optionally after a space, an id for
+    it, for example ``1234 segment-42.xml``; the document follows the
+    newline straight away. Documents without an id are numbered from 1.
+
+Documents are read as they arrive, so a caller can write one document,
+read its result and then write the next, keeping the validator running
+as a co-process. At most the read limit of each document is kept in
+memory; the rest is read and discarded, so that the next document can
+still be found.
+
+The result of each document is a single line of JSON, giving its id,
+its exit status as for a single document and its report, as written by
+:py:func:`result_line`.
+"""
+
+from collections.abc import Callable, Iterator
+from typing import BinaryIO
+import json
+from src.validationPool import warm_worker
+from src.validator import ValidationOptions, ValidationReport, validate
+
+framings = ['nul', 'length']
+
+_chunk_size = 64 * 1024
+
+
+class FrameError(ValueError):
+    """Raised when a stream of documents is not framed correctly."""
+
+
+def _read_chunk(stream: BinaryIO, size: int) -> bytes:
+    # read1 returns what is available rather than waiting for it all, so
+    # that a co-process is not left waiting for a full chunk
+    if hasattr(stream, 'read1'):
+        return stream.read1(size)
+    return stream.read(size)
+
+
+def nul_frames(
+        stream: BinaryIO,
+        read_limit: int = -1) -> Iterator[tuple[str | None, bytes]]:
+    """
+    Yields each NUL-terminated document in ``stream`` with no id,
+    keeping at most ``read_limit`` bytes of each, or all if -1.
+    """
+    frame = bytearray()
+    while True:
+        chunk = _read_chunk(stream, _chunk_size)
+        if len(chunk) == 0:
+            break
+        start = 0
+        while True:
+            end = chunk.find(b'\0', start)
+            piece = chunk[start:] if end < 0 else chunk[start:end]
+            if read_limit < 0:
+                frame += piece
+            elif len(frame) < read_limit:
+                frame += piece[:read_limit - len(frame)]
+            if end < 0:
+                break
+            yield None, bytes(frame)
+            frame.clear()
+            start = end + 1
+    if len(frame) > 0:
+        yield None, bytes(frame)
+
+
+def _read_exactly(stream: BinaryIO, size: int) -> bytes:
+    data = bytearray()
+    while len(data) < size:
+        chunk = stream.read(size - len(data))
+        if len(chunk) == 0:
+            raise FrameError(
+                'Stream ended {} bytes into a document of {} bytes'.format(
+                    len(data), size))
+        data += chunk
+    return bytes(data)
+
+
+def length_frames(
+        stream: BinaryIO,
+        read_limit: int = -1) -> Iterator[tuple[str | None, bytes]]:
+    """
+    Yields the id, or None, and content of each length-prefixed document
+    in ``stream``, keeping at most ``read_limit`` bytes of each, or all
+    if -1.
+
+    Raises :py:class:`FrameError` if a header is not recognised or the
+    stream ends inside a document.
+    """
+    while True:
+        header = stream.readline(1024)
+        if len(header) == 0:
+            return
+        if len(header.strip()) == 0:
+            # Blank lines between documents are allowed
+            continue
+        if not header.endswith(b'\n'):
+            raise FrameError('Header {!r} not recognised'.format(header))
+        parts = header.split(maxsplit=1)
+        try:
+            length = int(parts[0])
+        except ValueError:
+            length = -1
+        if length < 0:
+            raise FrameError('Header {!r} not recognised'.format(header))
+        document_id = parts[1].decode('utf-8', 'replace').strip() \
+            if len(parts) > 1 else None
+
+        kept = length if read_limit < 0 else min(length, read_limit)
+        content = _read_exactly(stream, kept)
+        remaining = length - kept
+        while remaining > 0:
+            remaining -= len(_read_exactly(
+                stream, min(remaining, _chunk_size)))
+        yield document_id, content
+
+
+def read_frames(
+        stream: BinaryIO,
+        framing: str,
+        read_limit: int = -1) -> Iterator[tuple[str, bytes]]:
+    """
+    Yields the id and content of each document in ``stream`` framed as
+    ``framing``, one of :py:data:`framings`, numbering those without an
+    id from 1.
+    """
+    match framing:
+        case 'nul':
+            frames = nul_frames(stream, read_limit)
+        case 'length':
+            frames = length_frames(stream, read_limit)
+        case _:
+            raise ValueError('Framing {} not recognised'.format(framing))
+    for number, (document_id, content) in enumerate(frames, start=1):
+        yield document_id or str(number), content
+
+
+def validate_frames(
+        stream: BinaryIO,
+        framing: str = 'nul',
+        flavour: str = 'bbc',
+        document_options: Callable[[str], ValidationOptions]
+        | None = None,
+        read_limit: int = -1) -> Iterator[tuple[str, ValidationReport]]:
+    """
+    Validates each document in ``stream`` as it arrives, yielding its id
+    and report.
+
+    ``document_options`` is called with each id to get the options to
+    validate it with. At most ``read_limit`` bytes of each document are
+    kept, as for
+    :py:meth:`ResourceLimits.readLimit<src.validationLogging.resourceLimits.ResourceLimits.readLimit>`.
+    The constraint sets are built before the first document is read.
+    """
+    warm_worker()
+    if document_options is None:
+        def document_options(_: str) -> ValidationOptions:
+            return ValidationOptions()
+
+    for document_id, content in read_frames(stream, framing, read_limit):
+        yield document_id, validate(
+            source=content,
+            flavour=flavour,
+            options=document_options(document_id))
+
+
+def result_line(document_id: str, report: ValidationReport) -> str:
+    """
+    Returns the result of a document as one line of JSON, with its id,
+    exit status and report, ending in a newline.
+    """
+    return json.dumps(
+        {'id': document_id, 'exit_status': report.exitCode()}
+        | report.asDict()) + '\n'
@@ -0,0 +1,399 @@
+# SPDX-FileCopyrightText: Copyright © 2026 BBC
+#
+# SPDX-License-Identifier: BSD-3-Clause
+
+"""
+Validates the TTML documents carried in fragmented MP4 ``stpp`` tracks.
+
+DASH subtitle segments carry each TTML document as a sample of an ISO
+BMFF (ISO/IEC 14496-12) text track whose sample entry is ``stpp``. The
+box reader here finds the ``stpp`` tracks and their timescales in the
+``moov`` box of the initialisation segment, then reads the samples of
+those tracks from each ``moof`` box and the ``mdat`` box it refers to,
+so that the documents can be validated without demuxing them to files.
+
+The begin time of each sample is its decode time, from the ``tfdt`` box
+and the durations of the samples before it in the ``trun`` box, plus any
+composition time offset, and is used as the epoch of the document
+rather than a segment number in the file name. The duration of the
+sample, if known, is used as the segment duration.
+
+Boxes are read through a :py:class:`memoryview` of the input, which is
+memory mapped when it is a file, so that no box is copied; each sample
+is only copied when it is validated, since the pre-parse checks work on
+bytes. Only fragmented files are read: samples described by the sample
+tables of a ``moov`` box are not.
+"""
+
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import BinaryIO
+import io
+import mmap
+import struct
+from src.validator import ValidationOptions, ValidationReport, validate
+
+# tfhd flags
+_base_data_offset_present = 0x000001
+_sample_description_index_present = 0x000002
+_default_sample_duration_present = 0x000008
+_default_sample_size_present = 0x000010
+_default_base_is_moof = 0x020000
+
+# trun flags
+_data_offset_present = 0x000001
+_first_sample_flags_present = 0x000004
+_sample_duration_present = 0x000100
+_sample_size_present = 0x000200
+_sample_flags_present = 0x000400
+_sample_composition_time_offset_present = 0x000800
+
+
+class IsoBmffError(ValueError):
+    """Raised when an input cannot be read as fragmented MP4."""
+
+
+@dataclass
+class StppTrack:
+    """An ``stpp`` track described by a ``moov`` box."""
+    track_id: int
+    timescale: int
+    default_sample_duration: int | None = None
+    default_sample_size: int | None = None
+
+
+@dataclass
+class StppSample:
+    """A sample of an ``stpp`` track, holding one TTML document."""
+    track_id: int
+    begin: int
+    duration: int | None
+    timescale: int
+    data: memoryview
+
+    @property
+    def begin_seconds(self) -> float:
+        return self.begin / self.timescale
+
+    @property
+    def duration_seconds(self) -> float | None:
+        if self.duration is None:
+            return None
+        return self.duration / self.timescale
+
+    @property
+    def name(self) -> str:
+        """The track and begin time in seconds, for example ``1/3.840``."""
+        return '{}/{:.3f}'.format(self.track_id, self.begin_seconds)
+
+
+def iter_boxes(
+        buffer: memoryview,
+        start: int = 0,
+        end: int | None = None) -> Iterator[tuple[bytes, int, memoryview]]:
+    """
+    Yields the type, offset and payload of each box in ``buffer`` from
+    ``start`` to ``end``, without copying them.
+
+    Raises :py:class:`IsoBmffError` if a box runs past the end.
+    """
+    if end is None:
+        end = len(buffer)
+    offset = start
+    while offset + 8 <= end:
+        size, box_type = struct.unpack_from('>I4s', buffer, offset)
+        header_size = 8
+        if size == 1:
+            if offset + 16 > end:
+                raise IsoBmffError(
+                    'Truncated {} box header at {}'.format(
+                        box_type.decode('latin-1'), offset))
+            (size,) = struct.unpack_from('>Q', buffer, offset + 8)
+            header_size = 16
+        elif size == 0:
+            size = end - offset
+        if size < header_size or offset + size > end:
+            raise IsoBmffError(
+                '{} box at {} of size {} does not fit in {} bytes'.format(
+                    box_type.decode('latin-1'), offset, size, end))
+        yield box_type, offset, \
+            buffer[offset + header_size:offset + size]
+        offset += size
+
+
+def _find_boxes(
+        buffer: memoryview,
+        path: list[bytes]) -> Iterator[tuple[int, memoryview]]:
+    """Yields the offset and payload of each box at the path of types."""
+    for box_type, offset, payload in iter_boxes(buffer):
+        if box_type != path[0]:
+            continue
+        if len(path) == 1:
+            yield offset, payload
+        else:
+            yield from _find_boxes(payload, path[1:])
+
+
+def _full_box_header(payload: memoryview) -> tuple[int, int]:
+    """Returns the version and flags of a full box."""
+    (version_and_flags,) = struct.unpack_from('>I', payload, 0)
+    return version_and_flags >> 24, version_and_flags & 0xffffff
+
+
+def _is_stpp_track(trak: memoryview) -> bool:
+    for _, stsd in _find_boxes(trak, [b'mdia', b'minf', b'stbl', b'stsd']):
+        # Sample entries are boxes after the entry count
+        for entry_type, _, _ in iter_boxes(stsd, start=8):
+            if entry_type == b'stpp':
+                return True
+    return False
+
+
+def _track_id(trak: memoryview) -> int:
+    for _, tkhd in _find_boxes(trak, [b'tkhd']):
+        version, _ = _full_box_header(tkhd)
+        (track_id,) = struct.unpack_from(
+            '>I', tkhd, 20 if version == 1 else 12)
+        return track_id
+    raise IsoBmffError('trak box has no tkhd box')
+
+
+def _timescale(trak: memoryview) -> int:
+    for _, mdhd in _find_boxes(trak, [b'mdia', b'mdhd']):
+        version, _ = _full_box_header(mdhd)
+        (timescale,) = struct.unpack_from(
+            '>I', mdhd, 20 if version == 1 else 12)
+        if timescale == 0:
+            raise IsoBmffError('mdhd box has a timescale of 0')
+        return timescale
+    raise IsoBmffError('trak box has no mdhd box')
+
+
+def read_tracks(buffer: memoryview) -> dict[int, StppTrack]:
+    """
+    Returns the ``stpp`` tracks described by the ``moov`` box of an
+    initialisation segment or whole file, by track ID, with the sample
+    defaults from its ``trex`` boxes.
+    """
+    tracks = {}
+    for _, trak in _find_boxes(buffer, [b'moov', b'trak']):
+        if _is_stpp_track(trak):
+            track_id = _track_id(trak)
+            tracks[track_id] = StppTrack(
+                track_id=track_id, timescale=_timescale(trak))
+    for _, trex in _find_boxes(buffer, [b'moov', b'mvex', b'trex']):
+        track_id, _, duration, size = struct.unpack_from(
+            '>IIII', trex, 4)
+        if track_id in tracks:
+            tracks[track_id].default_sample_duration = duration
+            tracks[track_id].default_sample_size = size
+    return tracks
+
+
+def _read_tfhd(tfhd: memoryview) -> tuple[int, int, dict]:
+    """Returns the track ID, flags and present fields of a tfhd box."""
+    _, flags = _full_box_header(tfhd)
+    (track_id,) = struct.unpack_from('>I', tfhd, 4)
+    fields = {}
+    position = 8
+    if flags & _base_data_offset_present:
+        (fields['base_data_offset'],) = struct.unpack_from(
+            '>Q', tfhd, position)
+        position += 8
+    if flags & _sample_description_index_present:
+        position += 4
+    if flags & _default_sample_duration_present:
+        (fields['default_sample_duration'],) = struct.unpack_from(
+            '>I', tfhd, position)
+        position += 4
+    if flags & _default_sample_size_present:
+        (fields['default_sample_size'],) = struct.unpack_from(
+            '>I', tfhd, position)
+    return track_id, flags, fields
+
+
+def _read_tfdt(traf: memoryview) -> int | None:
+    for _, tfdt in _find_boxes(traf, [b'tfdt']):
+        version, _ = _full_box_header(tfdt)
+        (decode_time,) = struct.unpack_from(
+            '>Q' if version == 1 else '>I', tfdt, 4)
+        return decode_time
+    return None
+
+
+def _read_trun(
+        trun: memoryview) -> tuple[int | None, list[tuple[int | None, ...]]]:
+    """
+    Returns the data offset, if present, and the duration, size and
+    composition time offset of each sample of a trun box, each None if
+    not present.
+    """
+    version, flags = _full_box_header(trun)
+    (sample_count,) = struct.unpack_from('>I', trun, 4)
+    position = 8
+    data_offset = None
+    if flags & _data_offset_present:
+        (data_offset,) = struct.unpack_from('>i', trun, position)
+        position += 4
+    if flags & _first_sample_flags_present:
+        position += 4
+    fields = [
+        (_sample_duration_present, 'I'),
+        (_sample_size_present, 'I'),
+        (_sample_flags_present, 'I'),
+        (_sample_composition_time_offset_present,
+         'i' if version == 1 else 'I'),
+    ]
+    present = [(flag, code) for flag, code in fields if flags & flag]
+    sample_format = '>' + ''.join(code for _, code in present)
+    sample_size = struct.calcsize(sample_format)
+    if position + sample_count * sample_size > len(trun):
+        raise IsoBmffError(
+            'trun box is too short for {} samples'.format(sample_count))
+    if sample_size == 0:
+        rows = [()] * sample_count
+    else:
+        rows = struct.iter_unpack(
+            sample_format,
+            trun[position:position + sample_count * sample_size])
+    samples = []
+    for values in rows:
+        by_flag = dict(zip((flag for flag, _ in present), values))
+        samples.append((
+            by_flag.get(_sample_duration_present),
+            by_flag.get(_sample_size_present),
+            by_flag.get(_sample_composition_time_offset_present, 0)))
+    return data_offset, samples
+
+
+def stpp_samples(
+        buffer: memoryview,
+        tracks: dict[int, StppTrack] | None = None) -> Iterator[StppSample]:
+    """
+    Yields the samples of the ``stpp`` tracks in each movie fragment of
+    ``buffer``, in file order, with their data as views of ``buffer``.
+
+    The tracks are read from ``buffer`` itself if it has a ``moov`` box,
+    otherwise ``tracks`` must be given, for example read from the
+    initialisation segment by :py:func:`read_tracks`.
+
+    Raises :py:class:`IsoBmffError` if there are no ``stpp`` tracks, or
+    if the size or position of a sample cannot be found.
+    """
+    tracks = dict(tracks or {}) | read_tracks(buffer)
+    if len(tracks) == 0:
+        raise IsoBmffError(
+            'No stpp track found: an initialisation segment may be needed')
+
+    for box_type, moof_offset, moof in iter_boxes(buffer):
+        if box_type != b'moof':
+            continue
+        # The data of each track fragment follows that of the previous
+        # one unless its tfhd box says where it starts
+        previous_end = moof_offset
+        for traf_type, _, traf in iter_boxes(moof):
+            if traf_type != b'traf':
+                continue
+            tfhd = next(
+                (payload for _, payload in _find_boxes(traf, [b'tfhd'])),
+                None)
+            if tfhd is None:
+                raise IsoBmffError('traf box has no tfhd box')
+            track_id, flags, defaults = _read_tfhd(tfhd)
+            if 'base_data_offset' in defaults:
+                base = defaults['base_data_offset']
+            elif flags & _default_base_is_moof:
+                base = moof_offset
+            else:
+                base = previous_end
+            position = base
+            track = tracks.get(track_id)
+            decode_time = _read_tfdt(traf) or 0
+            for _, trun in _find_boxes(traf, [b'trun']):
+                data_offset, run_samples = _read_trun(trun)
+                if data_offset is not None:
+                    position = base + data_offset
+                for duration, size, composition_offset in run_samples:
+                    if duration is None:
+                        duration = defaults.get(
+                            'default_sample_duration',
+                            track.default_sample_duration if track
+                            else None)
+                    if size is None:
+                        size = defaults.get(
+                            'default_sample_size',
+                            track.default_sample_size if track else None)
+                    if size is None:
+                        raise IsoBmffError(
+                            'No size for a sample of track {}'.format(
+                                track_id))
+                    if position + size > len(buffer):
+                        raise IsoBmffError(
+                            'Sample of track {} at {} of size {} is past '
+                            'the end of the input'.format(
+                                track_id, position, size))
+                    if track is not None:
+                        yield StppSample(
+                            track_id=track_id,
+                            begin=decode_time + composition_offset,
+                            duration=duration,
+                            timescale=track.timescale,
+                            data=buffer[position:position + size])
+                    position += size
+                    decode_time += duration or 0
+            previous_end = position
+
+
+@contextmanager
+def mapped_input(stream: BinaryIO) -> Iterator[memoryview]:
+    """
+    Gives a view of the whole content of ``stream``, memory mapped if it
+    is a file, otherwise read, for example from a pipe.
+    """
+    try:
+        mapped = mmap.mmap(stream.fileno(), 0, access=mmap.ACCESS_READ)
+    except (OSError, ValueError, io.UnsupportedOperation):
+        # Pipes and empty files cannot be mapped
+        yield memoryview(stream.read())
+        return
+    view = memoryview(mapped)
+    try:
+        yield view
+    finally:
+        try:
+            view.release()
+            mapped.close()
+        except BufferError:
+            # Views of samples are still held, for example by a
+            # traceback; the map is closed when they are collected
+            pass
+
+
+def validate_isobmff(
+        buffer: memoryview,
+        flavour: str = 'bbc',
+        tracks: dict[int, StppTrack] | None = None,
+        sample_options: Callable[[StppSample], ValidationOptions]
+        | None = None) -> Iterator[tuple[str, ValidationReport]]:
+    """
+    Validates each sample of the ``stpp`` tracks in ``buffer``, yielding
+    its :py:attr:`name<StppSample.name>` with its report in file order.
+
+    ``sample_options`` is called with each sample to get the options to
+    validate it with; by default the epoch and segment duration are taken
+    from the sample timing.
+    """
+    if sample_options is None:
+        def sample_options(sample: StppSample) -> ValidationOptions:
+            return ValidationOptions(
+                epoch=sample.begin_seconds,
+                segment_dur=sample.duration_seconds)
+
+    for sample in stpp_samples(buffer, tracks):
+        with sample.data:
+            report = validate(
+                source=sample.data,
+                flavour=flavour,
+                options=sample_options(sample))
+        yield sample.name, report
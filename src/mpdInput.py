@@ -0,0 +1,473 @@
+# SPDX-FileCopyrightText: Copyright © 2026 BBC
+#
+# SPDX-License-Identifier: BSD-3-Clause
+
+"""
+Validates the subtitle segments referenced by a local DASH MPD.
+
+The subtitle representations of each period are those whose MIME
+type, which may be inherited from the adaptation set, is
+``application/ttml+xml``, or ``application/mp4`` with a content type of
+``text`` or ``stpp`` codecs. For each of their representations, the
+``SegmentTemplate``, inherited from the period and adaptation set, and
+its ``SegmentTimeline`` or fixed segment ``duration`` give the number,
+time and duration of every segment, and the ``media`` template, resolved
+against the ``BaseURL`` elements and the location of the MPD, gives the
+local file holding it.
+
+Each segment is validated with the epoch and segment duration given by
+the MPD, rather than guessed from digits in its file name: the epoch is
+the segment's time on the track's media timeline, the ``t`` of its
+``S`` element divided by the timescale, which is the timeline that the
+times in the documents are on. Segments of TTML documents are validated
+as they are; segments of fragmented MP4 (``application/mp4``) are read
+with :py:mod:`src.isobmffInput`, using the tracks described by the
+representation's initialisation segment, and each ``stpp`` sample in
+them is validated with the segment's timing.
+
+Segments are ordered by their presentation time across all periods and
+representations, and may be validated in parallel on an executor, with
+the reports still given in that order. Segments that are not local
+files cannot be validated here.
+"""
+
+from collections import deque
+from collections.abc import Callable, Iterator
+from concurrent.futures import Executor, Future
+from dataclasses import dataclass
+from pathlib import Path
+from typing import BinaryIO
+from urllib.parse import urljoin, urlparse
+from urllib.request import url2pathname
+import math
+import re
+import xml.etree.ElementTree as ElementTree
+from xml.etree.ElementTree import Element
+from src.isobmffInput import IsoBmffError, StppTrack, mapped_input, \
+    read_tracks, validate_isobmff
+from src.validator import ValidationOptions, ValidationReport, validate
+
+mpd_ns = 'urn:mpeg:dash:schema:mpd:2011'
+
+_duration_re = re.compile(
+    r'^P(?:(?P<days>\d+(?:\.\d+)?)D)?'
+    r'(?:T(?:(?P<hours>\d+(?:\.\d+)?)H)?'
+    r'(?:(?P<minutes>\d+(?:\.\d+)?)M)?'
+    r'(?:(?P<seconds>\d+(?:\.\d+)?)S)?)?$')
+
+_template_re = re.compile(
+    r'\$(?:(?P<name>RepresentationID|Number|Time|Bandwidth)'
+    r'(?:%0(?P<width>\d+)d)?)?\$')
+
+
+class MpdError(ValueError):
+    """Raised when an MPD cannot be read or its segments resolved."""
+
+
+@dataclass
+class Segment:
+    """A subtitle segment referenced by an MPD."""
+    representation_id: str
+    kind: str
+    number: int
+    time: int
+    duration: int
+    timescale: int
+    presentation_time: float
+    path: str
+    init_path: str | None = None
+
+    @property
+    def begin_seconds(self) -> float:
+        return self.time / self.timescale
+
+    @property
+    def duration_seconds(self) -> float:
+        return self.duration / self.timescale
+
+    @property
+    def name(self) -> str:
+        """The representation and segment number, for example ``en/42``."""
+        return '{}/{}'.format(self.representation_id, self.number)
+
+
+@dataclass
+class RepresentationSummary:
+    """Counts of the segments of one representation and their validity."""
+    representation_id: str
+    segments: int = 0
+    valid: int = 0
+    invalid: int = 0
+    unreadable: int = 0
+    begin: float | None = None
+    end: float | None = None
+    discontinuities: int = 0
+
+    def add(self, segment: Segment, valid: bool | None):
+        """
+        Counts a segment that is valid, not valid, or None if it could
+        not be read, and whether it begins where the previous one ended.
+        """
+        self.segments += 1
+        if valid is None:
+            self.unreadable += 1
+        elif valid:
+            self.valid += 1
+        else:
+            self.invalid += 1
+        begin = segment.presentation_time
+        if self.end is not None and not math.isclose(begin, self.end):
+            self.discontinuities += 1
+        if self.begin is None:
+            self.begin = begin
+        self.end = begin + segment.duration_seconds
+
+    def asDict(self) -> dict:
+        return {
+            'segments': self.segments,
+            'valid': self.valid,
+            'invalid': self.invalid,
+            'unreadable': self.unreadable,
+            'begin': self.begin,
+            'end': self.end,
+            'discontinuities': self.discontinuities,
+        }
+
+
+def parse_duration(value: str) -> float:
+    """
+    Returns the number of seconds in an ISO 8601 duration such as
+    ``PT1H2M3.5S``, as used in MPDs; years and months are not accepted.
+    """
+    match = _duration_re.match(value.strip())
+    if match is None:
+        raise MpdError('Duration {} not recognised'.format(value))
+    parts = {key: float(part) if part else 0.0
+             for key, part in match.groupdict().items()}
+    return parts['days'] * 86400 + parts['hours'] * 3600 \
+        + parts['minutes'] * 60 + parts['seconds']
+
+
+def fill_template(template: str, values: dict[str, int | str]) -> str:
+    """
+    Replaces the ``$Name$`` and ``$Name%0nd$`` identifiers in a segment
+    template with the values, and ``$$`` with ``$``.
+    """
+    def replace(match: re.Match) -> str:
+        name = match.group('name')
+        if name is None:
+            return '$'
+        if name not in values:
+            raise MpdError(
+                'No value for ${}$ in template {}'.format(name, template))
+        width = match.group('width')
+        if width is not None:
+            return '{:0{}d}'.format(int(values[name]), int(width))
+        return str(values[name])
+
+    return _template_re.sub(replace, template)
+
+
+def _resolve_base(base_url: str, element: Element) -> str:
+    base_element = element.find('{{{}}}BaseURL'.format(mpd_ns))
+    if base_element is None or not (base_element.text or '').strip():
+        return base_url
+    return urljoin(base_url, base_element.text.strip())
+
+
+def _local_path(url: str) -> str:
+    parsed = urlparse(url)
+    if parsed.scheme not in ('', 'file'):
+        raise MpdError('Segment {} is not a local file'.format(url))
+    return url2pathname(parsed.path)
+
+
+def _is_subtitle(attributes: dict[str, str]) -> bool:
+    """
+    Returns True for TTML subtitles, as documents or in MP4, but not for
+    other text, such as WebVTT.
+    """
+    mime_type = attributes.get('mimeType')
+    if mime_type == 'application/ttml+xml':
+        return True
+    return mime_type == 'application/mp4' and (
+        attributes.get('contentType') == 'text'
+        or 'stpp' in attributes.get('codecs', ''))
+
+
+def _segment_times(
+        template: dict[str, str],
+        timeline: Element | None,
+        period_duration: float | None) -> Iterator[tuple[int, int, int]]:
+    """Yields the number, time and duration of each segment."""
+    timescale = int(template.get('timescale', '1'))
+    number = int(template.get('startNumber', '1'))
+    offset = int(template.get('presentationTimeOffset', '0'))
+    period_end = None if period_duration is None \
+        else offset + round(period_duration * timescale)
+
+    if timeline is not None:
+        entries = timeline.findall('{{{}}}S'.format(mpd_ns))
+        time = 0
+        for index, entry in enumerate(entries):
+            time = int(entry.get('t', time))
+            duration = int(entry.get('d', '0'))
+            if duration <= 0:
+                raise MpdError('S element without a positive duration')
+            repeat = int(entry.get('r', '0'))
+            if repeat < 0:
+                # Repeats until the next S element or the period end
+                following = entries[index + 1].get('t') \
+                    if index + 1 < len(entries) else None
+                end = int(following) if following is not None \
+                    else period_end
+                if end is None:
+                    raise MpdError(
+                        'Open-ended S element without a period duration')
+                repeat = math.ceil((end - time) / duration) - 1
+            for _ in range(repeat + 1):
+                yield number, time, duration
+                time += duration
+                number += 1
+        return
+
+    if 'duration' not in template:
+        raise MpdError('SegmentTemplate has neither a SegmentTimeline '
+                       'nor a duration')
+    duration = int(template['duration'])
+    if period_duration is None:
+        raise MpdError('Segment count unknown without a period duration')
+    count = math.ceil(period_duration * timescale / duration)
+    for index in range(count):
+        yield number + index, offset + index * duration, duration
+
+
+def read_mpd(mpd: BinaryIO | str, base_url: str) -> list[Segment]:
+    """
+    Returns the subtitle segments referenced by an MPD, in presentation
+    time order, with relative URLs resolved against ``base_url``, for
+    example the ``file:`` URL of the directory holding the MPD, ending
+    in ``/``.
+
+    Raises :py:class:`MpdError` if the MPD cannot be read or a segment
+    cannot be located.
+    """
+    try:
+        root = ElementTree.parse(mpd).getroot()
+    except ElementTree.ParseError as e:
+        raise MpdError('Could not parse the MPD: {}'.format(e)) from e
+    if root.tag != '{{{}}}MPD'.format(mpd_ns):
+        raise MpdError('Not a DASH MPD: the root element is {}'.format(
+            root.tag))
+
+    ns = {'mpd': mpd_ns}
+    presentation_duration = root.get('mediaPresentationDuration')
+    presentation_duration = None if presentation_duration is None \
+        else parse_duration(presentation_duration)
+    mpd_base = _resolve_base(base_url, root)
+
+    periods = root.findall('mpd:Period', ns)
+    segments = []
+    period_start = 0.0
+    for period_index, period in enumerate(periods):
+        if period.get('start') is not None:
+            period_start = parse_duration(period.get('start'))
+        period_duration = None
+        if period.get('duration') is not None:
+            period_duration = parse_duration(period.get('duration'))
+        elif period_index + 1 < len(periods) \
+                and periods[period_index + 1].get('start') is not None:
+            period_duration = parse_duration(
+                periods[period_index + 1].get('start')) - period_start
+        elif presentation_duration is not None:
+            period_duration = presentation_duration - period_start
+        period_base = _resolve_base(mpd_base, period)
+        period_template = period.find('mpd:SegmentTemplate', ns)
+
+        for adaptation_set in period.findall('mpd:AdaptationSet', ns):
+            set_template = adaptation_set.find('mpd:SegmentTemplate', ns)
+            set_base = _resolve_base(period_base, adaptation_set)
+            for representation in adaptation_set.findall(
+                    'mpd:Representation', ns):
+                attributes = dict(adaptation_set.attrib) \
+                    | dict(representation.attrib)
+                if not _is_subtitle(attributes):
+                    continue
+                segments.extend(_representation_segments(
+                    representation=representation,
+                    attributes=attributes,
+                    templates=[period_template, set_template,
+                               representation.find(
+                                   'mpd:SegmentTemplate', ns)],
+                    base_url=_resolve_base(set_base, representation),
+                    period_start=period_start,
+                    period_duration=period_duration))
+        if period_duration is not None:
+            period_start += period_duration
+
+    segments.sort(key=lambda segment: segment.presentation_time)
+    return segments
+
+
+def _representation_segments(
+        representation: Element,
+        attributes: dict[str, str],
+        templates: list[Element | None],
+        base_url: str,
+        period_start: float,
+        period_duration: float | None) -> list[Segment]:
+    representation_id = representation.get('id')
+    if representation_id is None:
+        raise MpdError('Representation without an id')
+    template = {}
+    timeline = None
+    for level in templates:
+        if level is None:
+            continue
+        template |= level.attrib
+        level_timeline = level.find(
+            '{{{}}}SegmentTimeline'.format(mpd_ns))
+        if level_timeline is not None:
+            timeline = level_timeline
+    if 'media' not in template:
+        raise MpdError(
+            'Representation {} has no SegmentTemplate media'.format(
+                representation_id))
+
+    values = {
+        'RepresentationID': representation_id,
+        'Bandwidth': attributes.get('bandwidth', '0'),
+    }
+    kind = 'ttml' if attributes.get('mimeType') == 'application/ttml+xml' \
+        else 'isobmff'
+    init_path = None
+    if kind == 'isobmff' and 'initialization' in template:
+        init_path = _local_path(urljoin(
+            base_url, fill_template(template['initialization'], values)))
+
+    timescale = int(template.get('timescale', '1'))
+    offset = int(template.get('presentationTimeOffset', '0'))
+    segments = []
+    for number, time, duration in _segment_times(
+            template, timeline, period_duration):
+        segments.append(Segment(
+            representation_id=representation_id,
+            kind=kind,
+            number=number,
+            time=time,
+            duration=duration,
+            timescale=timescale,
+            presentation_time=period_start + (time - offset) / timescale,
+            path=_local_path(urljoin(base_url, fill_template(
+                template['media'],
+                values | {'Number': number, 'Time': time}))),
+            init_path=init_path))
+    return segments
+
+
+def validate_segment(
+        segment: Segment,
+        flavour: str,
+        options: ValidationOptions,
+        tracks: dict[int, StppTrack] | None = None) \
+        -> list[tuple[str, ValidationReport]]:
+    """
+    Validates a segment, returning the name and report of each document
+    in it: the segment itself for TTML, or each ``stpp`` sample for MP4,
+    named after the segment and the sample.
+
+    Raises OSError if the segment cannot be read, and
+    :py:class:`IsoBmffError<src.isobmffInput.IsoBmffError>` if an MP4
+    segment cannot be read as fragmented MP4.
+    """
+    if segment.kind == 'ttml':
+        return [(segment.name, validate(
+            source=Path(segment.path), flavour=flavour, options=options))]
+    with open(segment.path, 'rb') as segment_file, \
+            mapped_input(segment_file) as view:
+        return [
+            ('{}/{}'.format(segment.name, name), report)
+            for name, report in validate_isobmff(
+                buffer=view,
+                flavour=flavour,
+                tracks=tracks,
+                sample_options=lambda _: options)]
+
+
+def validate_mpd(
+        segments: list[Segment],
+        flavour: str = 'bbc',
+        segment_options: Callable[[Segment], ValidationOptions]
+        | None = None,
+        executor: Executor | None = None,
+        max_pending: int = 16) -> Iterator[
+            tuple[Segment, list[tuple[str, ValidationReport]], str | None]]:
+    """
+    Validates the segments, yielding each with the names and reports of
+    its documents, and an error message if it could not be read, in the
+    order given.
+
+    ``segment_options`` is called with each segment to get the options
+    to validate it with; by default the epoch and segment duration are
+    those of the segment. If ``executor`` is set, segments are validated
+    on it, with at most ``max_pending`` waiting to be reported; as for
+    :py:func:`validate_in_worker<src.validationPool.validate_in_worker>`,
+    the options should not have result sinks when using process or
+    interpreter executors.
+    """
+    if segment_options is None:
+        def segment_options(segment: Segment) -> ValidationOptions:
+            return ValidationOptions(
+                epoch=segment.begin_seconds,
+                segment_dur=segment.duration_seconds)
+
+    tracks_by_init = {}
+
+    def tracks_for(segment: Segment) -> dict[int, StppTrack] | None:
+        if segment.init_path is None:
+            return None
+        if segment.init_path not in tracks_by_init:
+            with open(segment.init_path, 'rb') as init_file, \
+                    mapped_input(init_file) as view:
+                tracks_by_init[segment.init_path] = read_tracks(view)
+        return tracks_by_init[segment.init_path]
+
+    def arguments(segment: Segment) -> tuple:
+        return (segment, flavour, segment_options(segment),
+                tracks_for(segment))
+
+    if executor is None:
+        for segment in segments:
+            try:
+                yield segment, validate_segment(*arguments(segment)), None
+            except (OSError, IsoBmffError) as e:
+                yield segment, [], str(e)
+        return
+
+    pending = deque()
+
+    def next_result():
+        segment, future = pending.popleft()
+        try:
+            return segment, future.result(), None
+        except (OSError, IsoBmffError) as e:
+            return segment, [], str(e)
+
+    try:
+        for segment in segments:
+            try:
+                pending.append((segment, executor.submit(
+                    validate_segment, *arguments(segment))))
+            except (OSError, IsoBmffError) as e:
+                # The initialisation segment could not be read
+                failed = Future()
+                failed.set_exception(e)
+                pending.append((segment, failed))
+            if len(pending) >= max_pending:
+                yield next_result()
+        while len(pending) > 0:
+            yield next_result()
+    finally:
+        for _, future in pending:
+            future.cancel()
+
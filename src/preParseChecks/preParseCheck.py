@@ -9,6 +9,11 @@ import codecs
 
 
 class PreParseCheck:
+    _validationCodes: list[ValidationCode] = []
+
+    def validationCodes(self) -> list[ValidationCode]:
+        """Returns the codes that this check can log."""
+        return list(self._validationCodes)
 
     def run(
             self,
@@ -19,6 +24,10 @@ class PreParseCheck:
 
 class NullByteCheck(PreParseCheck):
 
+    _validationCodes = [
+        ValidationCode.preParse_nullBytes,
+    ]
+
     def run(
             self,
             input: bytes,
@@ -42,6 +51,10 @@ class NullByteCheck(PreParseCheck):
 
 class BadEncodingCheck(PreParseCheck):
 
+    _validationCodes = [
+        ValidationCode.preParse_encoding,
+    ]
+
     def run(
             self,
             input: bytes,
@@ -155,6 +168,11 @@ class ByteOrderMarkCheck(PreParseCheck):
     Must be run before BadEncodingCheck to work.
     """
 
+    _validationCodes = [
+        ValidationCode.preParse_byteOrderMark,
+        ValidationCode.preParse_byteOrderMark_corrupt,
+    ]
+
     _boms_to_encodings = {
         codecs.BOM: 'utf_16',
         codecs.BOM_BE: 'utf_16_be',
@@ -22,6 +22,13 @@ class XmlStructureCheck(PreParseCheck):
     is deprecated (although it doesn't offer an alternative!).
     """
 
+    _validationCodes = [
+        ValidationCode.xml_document_validity,
+        ValidationCode.xml_encoding_decl,
+        ValidationCode.xml_dtd,
+        ValidationCode.xml_entity_decl,
+    ]
+
     def run(
             self,
             input: bytes,
@@ -45,6 +45,8 @@ class TimeExpressionHandler:
                  framerate: str | None = None,
                  framerate_multiplier: str | None = None,
                  tickrate: str | None = None):
+        self._framerate_specified = framerate is not None
+        self._tickrate_specified = tickrate is not None
         if framerate is not None:
             self._framerate = int(framerate)
         if framerate_multiplier is not None:
@@ -60,6 +62,14 @@ class TimeExpressionHandler:
         else:
             self._tickrate = 1
 
+    def frameRateSpecified(self) -> bool:
+        """Returns True if a frame rate was given, not the default."""
+        return self._framerate_specified
+
+    def tickRateSpecified(self) -> bool:
+        """Returns True if a tick rate was given, not the default."""
+        return self._tickrate_specified
+
     def seconds(self, time_value: str) -> float:
         # try hhmmss first
         m = _hms_regex.match(time_value)
@@ -3,16 +3,33 @@
 # SPDX-License-Identifier: BSD-3-Clause
 
 import argparse
+from csv import writer as csvWriter
 import sys
+import json
 import logging
 import re
 import io
-import xml.etree.ElementTree as ElementTree
-from src.validationLogging.validationCodes import ValidationCode
-from src.validationLogging.validationLogger import ValidationLogger
-from src.constraintSets import constraintSet
-from src.constraintSets.bbcConstraints import BbcSubtitleConstraintSet
-from src.constraintSets.daptConstraints import DaptConstraintSet
+import threading
+from src.archiveInput import ArchiveError, validate_archive
+from src.checkScheduler import CheckSelectionError
+from src.directoryWatcher import BacklogQueue, make_watcher, \
+    validate_watched, watch_directory
+from src.framedInput import FrameError, framings, result_line, \
+    validate_frames
+from src.isobmffInput import IsoBmffError, mapped_input, read_tracks, \
+    validate_isobmff
+from src.mpdInput import MpdError, RepresentationSummary, read_mpd, \
+    validate_mpd
+from src.validationLogging.validationResult import ERROR, \
+    CsvStatusStrings, csv_headers
+from src.validationLogging.resultSinks import ResultSink, \
+    PlaintextResultSink, CsvResultSink, NdjsonResultSink, \
+    CollatingResultSink, SqliteResultSink, open_results_database
+from src.validationLogging.validationSummariser import pass_checkers
+from src.validationPool import executor_kinds, make_executor
+from src.validator import ValidationOptions, ValidationReport, flavours, \
+    resume, tiers, validate, validate_flavours
+from collections.abc import Iterable
 from pathlib import Path
 
 logging.getLogger().setLevel(logging.INFO)
@@ -38,10 +55,11 @@ def log_results_summary_dapt(valid: bool):
             'Document is not valid DAPT.')
 
 
-def get_epoch(args) -> float:
+def get_epoch(args, filename: str | None = None) -> float:
     epoch = 0.0
     if args.segment:
-        filename = Path(args.ttml_in.name).name
+        if filename is None:
+            filename = Path(args.ttml_in.name).name
         digits_re = re.compile(r'([0-9]+)[.]*')
         digits_match = digits_re.match(filename)
         if digits_match is not None:
@@ -57,131 +75,584 @@ def get_epoch(args) -> float:
     return epoch
 
 
-def validate_ttml(args) -> int:
-    logging.info('Validating {}'.format(args.ttml_in.name))
-    logging.info('Writing results to {}'.format(args.results_out.name))
+min_status_choices = {
+    status_string.lower(): status
+    for status, status_string in CsvStatusStrings.items()
+}
+
+
+def get_min_status(args) -> int:
+    return min_status_choices[args.min_status]
+
+
+fail_fast_choices = ['any'] + list(pass_checkers.keys())
+
+
+def make_results_sink(args) -> ResultSink:
+    """
+    Makes a sink that writes results to args.results_out as they arrive.
+
+    JSON output is written as newline-delimited JSON since a JSON array
+    cannot be written incrementally.
+    """
+    flush_every = args.flush_every
+    if args.csv:
+        sink = CsvResultSink(
+            stream=args.results_out, flush_every=flush_every)
+    elif args.json or args.ndjson:
+        sink = NdjsonResultSink(
+            stream=args.results_out, flush_every=flush_every)
+    else:
+        sink = PlaintextResultSink(
+            stream=args.results_out, flush_every=flush_every)
+
+    if args.collate_more_than and args.collate_more_than > 0:
+        sink = CollatingResultSink(
+            sink=sink, more_than=args.collate_more_than)
+
+    return sink
+
 
-    epoch = get_epoch(args)
-    dur = args.segdur if args.segment else None
+def make_database_sink(args) -> SqliteResultSink | None:
+    """
+    Makes a sink that stores results in the database at args.results_db,
+    if set, under args.document_id or otherwise the input file name.
+    """
+    results_db = args.results_db
+    if results_db is None:
+        return None
+    return SqliteResultSink(
+        connection=results_db,
+        document=args.document_id or args.ttml_in.name,
+        flavour=args.flavour)
 
-    constraints = constraintSet.ConstraintSet()
-    match args.flavour:
+
+def get_validation_options(
+        args,
+        member: str | None = None,
+        epoch: float | None = None,
+        segment_dur: float | None = None) -> ValidationOptions:
+    """
+    Returns the options for validate() given by the arguments.
+
+    For a member of an archive, an MP4 sample or an MPD segment, named by
+    ``member``, results are retained rather than passed to sinks. The
+    segment number is taken from the member name unless the ``epoch`` is
+    given, with ``segment_dur``, or args.segdur if that is None.
+    """
+    stream_results = member is None and args.stream
+    sinks = [make_results_sink(args)] if stream_results else []
+    database_sink = make_database_sink(args) if member is None else None
+    if database_sink is not None:
+        sinks.append(database_sink)
+    if epoch is None:
+        epoch = get_epoch(
+            args, filename=None if member is None else Path(member).name)
+        segment_dur = args.segdur if args.segment else None
+    elif segment_dur is None:
+        segment_dur = args.segdur
+    return ValidationOptions(
+        epoch=epoch,
+        segment_dur=segment_dur,
+        segment_relative_timing=args.segment_relative_timing,
+        vertical=args.vertical,
+        collate_more_than=args.collate_more_than,
+        collate_sample_first=args.collate_sample_first,
+        collate_sample_random=args.collate_sample_random,
+        min_status=get_min_status(args),
+        max_errors=args.max_errors,
+        fail_fast=args.fail_fast,
+        max_bytes=args.max_bytes,
+        max_elements=args.max_elements,
+        max_depth=args.max_depth,
+        max_results=args.max_results,
+        max_seconds=args.max_seconds,
+        include=args.include,
+        exclude=args.exclude,
+        check_workers=args.check_workers,
+        profile=args.profile_out is not None,
+        profile_memory=args.profile_memory,
+        sinks=sinks,
+        retain_results=not stream_results,
+        tier=args.tier)
+
+
+def write_report(args, report: ValidationReport, retained: bool):
+    """
+    Writes the results of a report to args.results_out, unless they
+    were not retained because they were streamed to it, and the check
+    profiles to args.profile_out, then logs whether the document is
+    valid.
+    """
+    validation_results = report.results
+
+    validation_results.closeSinks()
+    if retained:
+        if args.csv:
+            validation_results.write_csv(args.results_out)
+        elif args.json:
+            validation_results.write_json(args.results_out)
+        elif args.ndjson:
+            validation_results.write_ndjson(args.results_out)
+        else:
+            validation_results.write_plaintext(args.results_out)
+    args.results_out.flush()
+
+    if report.profiler is not None:
+        profile_out = args.profile_out
+        if args.csv:
+            report.profiler.write_csv(profile_out)
+        else:
+            report.profiler.write_json(profile_out)
+        profile_out.flush()
+
+    if report.tier != 'all':
+        prerequisite_failures = 0 if report.prerequisites is None \
+            else report.prerequisites.statusCount(ERROR)
+        if prerequisite_failures > 0:
+            logging.warning(
+                'The gate tier checks that the full tier needs found {} '
+                'failures, which are not included in its results; run the '
+                'gate tier to see them.'.format(prerequisite_failures))
+        if report.valid:
+            logging.info('Document passes the {} tier of checks.'.format(
+                report.tier))
+        else:
+            logging.error(
+                'Document does not pass the {} tier of checks.'.format(
+                    report.tier))
+        return
+    match report.flavour:
         case 'bbc':
-            constraints = BbcSubtitleConstraintSet(
-                epoch=epoch,
-                segment_dur=dur,
-                segment_relative_timing=args.segment_relative_timing
-            )
+            log_results_summary_bbc(report.valid)
         case 'dapt':
-            constraints = DaptConstraintSet(
-                epoch=epoch,
-                segment_dur=dur,
-                segment_relative_timing=args.segment_relative_timing
-            )
-        case other_flavour:
-            logging.exception(
-                'Flavour {} not recognised.'.format(other_flavour))
+            log_results_summary_dapt(report.valid)
 
-    preParseChecks = constraints.preParseChecks()
-    xmlChecks = constraints.xmlChecks()
 
-    validation_results = ValidationLogger()
-    overall_valid = True
+def validate_ttml(args) -> int:
+    logging.info('Validating {}'.format(args.ttml_in.name))
+    logging.info('Writing results to {}'.format(args.results_out.name))
+
+    options = get_validation_options(args)
 
     # If stdin is used then we get a TextIOBase, but we want to read bytes
     buffer = args.ttml_in \
         if isinstance(args.ttml_in, io.BufferedIOBase) \
         else args.ttml_in.buffer
-    in_bytes = buffer.read()
-    for pre_parse_check in preParseChecks:
-        current_check_name = ''
-        try:
-            current_check_name = type(pre_parse_check).__name__
-            (check_valid, in_bytes) = \
-                pre_parse_check.run(in_bytes, validation_results)
-            overall_valid &= check_valid
-        except Exception as e:
-            overall_valid = False
-            validation_results.error(
-                location='While running ' + current_check_name,
-                message='Exception raised: ' + str(e),
-                code=ValidationCode.validator_internal_exception
-            )
 
-    try:
-        in_xml_str = str(in_bytes, encoding='utf-8', errors='strict')
-    except Exception as e:
-        overall_valid = False
-        validation_results.error(
-            location='Unknown',
-            message='Could not decode into UTF-8: ' + str(e),
-            code=ValidationCode.preParse_encoding
-        )
-        in_xml_str = ''
-
-    context = {
-        "args": {
-            "vertical": True if args.vertical else False,
-        }
-    }
-    root = None
-    try:
-        root = ElementTree.fromstring(in_xml_str)
-    except Exception as e:
-        overall_valid = False
-        validation_results.error(
-            location='Document',
-            message='Could not parse XML: ' + str(e),
-            code=ValidationCode.xml_parse
-        )
-    if root is not None:
-        for xml_check in xmlChecks:
-            current_check_name = ''
-            try:
-                current_check_name = type(xml_check).__name__
-                overall_valid &= xml_check.run(
-                    input=root,
-                    context=context,
-                    validation_results=validation_results
-                )
-            except Exception as e:
-                overall_valid = False
-                validation_results.error(
-                    location='While running ' + current_check_name,
-                    message='Exception raised: ' + str(e),
-                    code=ValidationCode.validator_internal_exception
-                )
-
-    totalFails, totalSkips = constraints.summarise(
-        validation_results)
-    if overall_valid != (totalFails == 0 and totalSkips == 0):
-        validation_results.error(
-            location='Document validity summaries',
-            message='Overall validity {} mismatch'.format(overall_valid),
-            code=ValidationCode.validator_internal_exception
-        )
+    # Reading the stream lets compressed input be decompressed as it is
+    # read, up to the size limit
+    report = validate(
+        source=buffer, flavour=args.flavour, options=options)
+    write_report(args, report, retained=options.retain_results)
 
-    if args.collate_more_than and args.collate_more_than > 0:
-        validation_results = validation_results.collateResults(
-            more_than=args.collate_more_than)
+    full_out = args.full_out
+    if full_out is None or report.tier != 'gate':
+        return report.exitCode()
+    if report.parsed is None:
+        logging.warning(
+            'Not running the full tier, since the gate tier did not '
+            'finish parsing the document')
+        return report.exitCode()
+
+    # The gate tier results have been written, so the full tier can take
+    # as long as it needs
+    logging.info('Writing full tier results to {}'.format(full_out.name))
+    full_args = argparse.Namespace(**vars(args))
+    full_args.results_out = full_out
+    full_args.profile_out = None
+    full_args.tier = 'full'
+    if args.results_db is not None:
+        # Kept apart, since storing replaces a document's results
+        full_args.document_id = '{} (full tier)'.format(
+            args.document_id or args.ttml_in.name)
+    full_options = get_validation_options(full_args)
+    full_report = resume(report, options=full_options)
+    write_report(
+        full_args, full_report, retained=full_options.retain_results)
+    return report.exitCode() + full_report.exitCode()
+
+
+def flavour_list(flavour: str) -> list[str]:
+    """
+    Returns the flavours named by the comma separated -flavour argument.
+    """
+    return [name.strip() for name in flavour.split(',') if name.strip()]
+
+
+def validate_ttml_flavours(args) -> int:
+    """
+    Validates args.ttml_in as each of the comma separated flavours in
+    args.flavour, reading and parsing it once, writing the results keyed
+    by flavour and logging a summary for each.
+
+    Returns 0 if the document is valid as every flavour, otherwise the
+    number of flavours it is not valid as.
+    """
+    logging.info('Validating {}'.format(args.ttml_in.name))
+    logging.info('Writing results to {}'.format(args.results_out.name))
+    buffer = args.ttml_in \
+        if isinstance(args.ttml_in, io.BufferedIOBase) \
+        else args.ttml_in.buffer
+    reports = validate_flavours(
+        source=buffer,
+        flavours_to_validate=flavour_list(args.flavour),
+        options=get_validation_options(args, member=args.ttml_in.name))
+
+    def summarised_reports():
+        for flavour, report in reports.items():
+            yield flavour, report
+            match flavour:
+                case 'bbc':
+                    log_results_summary_bbc(report.valid)
+                case 'dapt':
+                    log_results_summary_dapt(report.valid)
+
+    return write_keyed_reports(args, summarised_reports(), key='flavour')
+
+
+def write_member_results(
+        args,
+        member: str,
+        report: ValidationReport,
+        first: bool,
+        key: str = 'member'):
+    """
+    Writes the results of an archive member to args.results_out, in the
+    output format given by the arguments, keyed by the member name, in
+    the ``key`` column or property.
+    """
+    out = args.results_out
     if args.csv:
-        validation_results.write_csv(args.results_out)
+        csv_writer = csvWriter(out)
+        if first:
+            csv_writer.writerow([key] + csv_headers)
+        for result in report.results:
+            csv_writer.writerow([
+                member,
+                CsvStatusStrings.get(result.status),
+                result.code.name if result.code else '',
+                result.location,
+                result.message
+            ])
     elif args.json:
-        validation_results.write_json(args.results_out)
+        out.write('{' if first else ',\n')
+        out.write('{}: {}'.format(
+            json.dumps(member), json.dumps(report.asDict())))
+    elif args.ndjson:
+        for result in report.results:
+            out.write(
+                json.dumps({key: member, **result.asDict()}) + '\n')
     else:
-        validation_results.write_plaintext(args.results_out)
+        for result in report.results:
+            out.write('{}: {}\n'.format(member, result.asString()))
+
+
+def write_keyed_reports(
+        args,
+        reports: Iterable[tuple[str, ValidationReport]],
+        key: str = 'member',
+        document_prefix: str | None = None) -> int:
+    """
+    Writes the results of each named report to args.results_out, flushing
+    after each, and to the results database if args.results_db is set,
+    keyed by the name under ``document_prefix``, by default
+    args.document_id or the input name.
+
+    Returns the number of reports that are not valid.
+    """
+    if args.csv:
+        args.results_out.reconfigure(newline='')
+
+    connection = None
+    if args.results_db is not None:
+        connection = open_results_database(args.results_db)
+    if document_prefix is None:
+        document_prefix = args.document_id or args.ttml_in.name
+
+    count = 0
+    invalid_count = 0
+    try:
+        for name, report in reports:
+            write_member_results(
+                args, name, report, first=count == 0, key=key)
+            args.results_out.flush()
+            if connection is not None:
+                sink = SqliteResultSink(
+                    connection=connection,
+                    document='{}/{}'.format(document_prefix, name),
+                    flavour=report.flavour)
+                for result in report.results:
+                    sink.write(result)
+                sink.close()
+            count += 1
+            if report.valid:
+                logging.info('{} {} appears to be valid'.format(key, name))
+            else:
+                invalid_count += 1
+                logging.error('{} {} is not valid'.format(key, name))
+    finally:
+        if connection is not None:
+            connection.close()
+
+    if args.json:
+        args.results_out.write('{}\n' if count == 0 else '}\n')
     args.results_out.flush()
+    logging.info('{} of {} {}s are valid'.format(
+        count - invalid_count, count, key))
+    return invalid_count
 
-    match args.flavour:
-        case 'bbc':
-            log_results_summary_bbc(overall_valid)
-        case 'dapt':
-            log_results_summary_dapt(overall_valid)
 
-    return 0 if overall_valid else totalFails
+def validate_ttml_archive(args) -> int:
+    """
+    Validates each member of the tar or zip archive args.ttml_in that
+    matches args.member_glob, writing the results keyed by member name.
 
+    Returns 0 if every member is valid, otherwise the number of members
+    that are not.
+    """
+    logging.info('Validating members of {} matching {}'.format(
+        args.ttml_in.name, args.member_glob))
+    logging.info('Writing results to {}'.format(args.results_out.name))
 
-def main():
+    # If stdin is used then we get a TextIOBase, but we want to read bytes
+    buffer = args.ttml_in \
+        if isinstance(args.ttml_in, io.BufferedIOBase) \
+        else args.ttml_in.buffer
+
+    workers = args.workers or 1
+    executor = make_executor(kind=args.executor, max_workers=workers) \
+        if workers > 1 else None
+    try:
+        return write_keyed_reports(args, validate_archive(
+            archive=buffer,
+            flavour=args.flavour,
+            # Only used to limit the size of the members read
+            options=ValidationOptions(
+                max_bytes=args.max_bytes),
+            member_glob=args.member_glob,
+            member_options=lambda member: get_validation_options(
+                args, member=member),
+            executor=executor,
+            max_pending=workers * 2))
+    finally:
+        if executor is not None:
+            executor.shutdown(cancel_futures=True)
+
+
+def validate_ttml_isobmff(args) -> int:
+    """
+    Validates each sample of the stpp tracks of the fragmented MP4 file
+    args.ttml_in, writing the results keyed by sample name, with the
+    tracks described by args.init_segment if the file has no moov box.
+
+    Returns 0 if every sample is valid, otherwise the number of samples
+    that are not.
+    """
+    logging.info('Validating stpp samples of {}'.format(args.ttml_in.name))
+    logging.info('Writing results to {}'.format(args.results_out.name))
+
+    # If stdin is used then we get a TextIOBase, but we want to read bytes
+    buffer = args.ttml_in \
+        if isinstance(args.ttml_in, io.BufferedIOBase) \
+        else args.ttml_in.buffer
+
+    tracks = None
+    if args.init_segment is not None:
+        with mapped_input(args.init_segment) as init_view:
+            tracks = read_tracks(init_view)
+
+    with mapped_input(buffer) as view:
+        return write_keyed_reports(
+            args,
+            validate_isobmff(
+                buffer=view,
+                flavour=args.flavour,
+                tracks=tracks,
+                sample_options=lambda sample: get_validation_options(
+                    args,
+                    member=sample.name,
+                    epoch=sample.begin_seconds,
+                    segment_dur=sample.duration_seconds)),
+            key='sample')
+
+
+def validate_ttml_mpd(args) -> int:
+    """
+    Validates each subtitle segment referenced by the DASH MPD
+    args.ttml_in, in presentation time order, with the epoch and segment
+    duration of each given by the MPD, writing the results keyed by
+    segment and a summary of each representation to args.summary_out if
+    set.
+
+    Returns 0 if every segment is valid, otherwise the number of
+    documents that are not valid plus the number of segments that could
+    not be read.
+    """
+    logging.info('Validating segments of {}'.format(args.ttml_in.name))
+    logging.info('Writing results to {}'.format(args.results_out.name))
+
+    # Relative segment URLs are resolved against the MPD location, or
+    # the working directory for stdin
+    mpd_path = Path(args.ttml_in.name)
+    directory = mpd_path.parent if mpd_path.is_file() else Path.cwd()
+    segments = read_mpd(
+        args.ttml_in, base_url=directory.resolve().as_uri() + '/')
+    logging.info('{} subtitle segments found'.format(len(segments)))
+
+    summaries = {}
+    unreadable_count = 0
+
+    def reports():
+        nonlocal unreadable_count
+        for segment, segment_reports, error in validate_mpd(
+                segments=segments,
+                flavour=args.flavour,
+                segment_options=lambda segment: get_validation_options(
+                    args,
+                    member=segment.name,
+                    epoch=segment.begin_seconds,
+                    segment_dur=segment.duration_seconds),
+                executor=executor,
+                max_pending=workers * 2):
+            summary = summaries.setdefault(
+                segment.representation_id,
+                RepresentationSummary(segment.representation_id))
+            if error is not None:
+                unreadable_count += 1
+                summary.add(segment, None)
+                logging.error('Could not read segment {}: {}'.format(
+                    segment.name, error))
+                continue
+            summary.add(segment, all(
+                report.valid for _, report in segment_reports))
+            yield from segment_reports
+
+    workers = args.workers or 1
+    executor = make_executor(kind=args.executor, max_workers=workers) \
+        if workers > 1 else None
+    try:
+        invalid_count = write_keyed_reports(args, reports(), key='segment')
+    finally:
+        if executor is not None:
+            executor.shutdown(cancel_futures=True)
+
+    for summary in summaries.values():
+        logging.info(
+            'Representation {}: {} of {} segments valid, {} not readable, '
+            '{} discontinuities'.format(
+                summary.representation_id, summary.valid, summary.segments,
+                summary.unreadable, summary.discontinuities))
+    summary_out = args.summary_out
+    if summary_out is not None:
+        json.dump(
+            {representation_id: summary.asDict()
+             for representation_id, summary in summaries.items()},
+            summary_out, indent=2)
+        summary_out.write('\n')
+        summary_out.flush()
+    return invalid_count + unreadable_count
+
+
+def validate_ttml_watch(args) -> int:
+    """
+    Validates each file matching args.member_glob written to the
+    directory args.watch, as soon as it has been fully written, until
+    interrupted or args.max_files have been validated, appending the
+    results keyed by file name to args.results_out.
+
+    Returns 0 if every file is valid, otherwise the number of files that
+    are not.
+    """
+    # A JSON object cannot be appended to, so write NDJSON instead
+    watch_args = argparse.Namespace(**vars(args))
+    if watch_args.json:
+        watch_args.json = False
+        watch_args.ndjson = True
+
+    watcher = make_watcher(
+        directory=args.watch,
+        pattern=args.member_glob,
+        use_inotify=not args.watch_poll)
+    logging.info('Watching {} for {} with {}'.format(
+        args.watch, args.member_glob, type(watcher).__name__))
+    logging.info('Writing results to {}'.format(args.results_out.name))
+    backlog = BacklogQueue(max_size=args.backlog)
+    stop = threading.Event()
+    watch_thread = threading.Thread(
+        target=watch_directory,
+        args=(watcher, backlog, stop, args.poll_interval),
+        name='watcher',
+        daemon=True)
+    watch_thread.start()
+
+    # The constraint sets for the segments are built before the first
+    # file arrives
+    warm_options = ValidationOptions(
+        segment_dur=args.segdur if args.segment else None,
+        segment_relative_timing=args.segment_relative_timing)
+
+    def reports():
+        try:
+            for path, report in validate_watched(
+                    backlog=backlog,
+                    flavour=args.flavour,
+                    file_options=lambda path: get_validation_options(
+                        watch_args, member=Path(path).name),
+                    max_files=args.max_files,
+                    warm_options=warm_options):
+                yield Path(path).name, report
+        except KeyboardInterrupt:
+            logging.info('Stopped watching {}'.format(args.watch))
+
+    try:
+        return write_keyed_reports(
+            watch_args, reports(), key='file', document_prefix=args.watch)
+    finally:
+        stop.set()
+        watch_thread.join()
+
+
+def validate_ttml_frames(args) -> int:
+    """
+    Validates each document in the stream args.ttml_in framed as
+    args.frames, writing one line of JSON with its id, exit status and
+    report to args.results_out as soon as it has been validated.
+
+    Returns 0 if every document is valid, otherwise the number of
+    documents that are not.
+    """
+    logging.info('Validating {}-framed documents from {}'.format(
+        args.frames, args.ttml_in.name))
+
+    # If stdin is used then we get a TextIOBase, but we want to read bytes
+    buffer = args.ttml_in \
+        if isinstance(args.ttml_in, io.BufferedIOBase) \
+        else args.ttml_in.buffer
+
+    count = 0
+    invalid_count = 0
+    for document_id, report in validate_frames(
+            stream=buffer,
+            framing=args.frames,
+            flavour=args.flavour,
+            document_options=lambda document_id: get_validation_options(
+                args, member=document_id),
+            read_limit=ValidationOptions(
+                max_bytes=args.max_bytes)
+            .resourceLimits().readLimit()):
+        args.results_out.write(result_line(document_id, report))
+        args.results_out.flush()
+        count += 1
+        if not report.valid:
+            invalid_count += 1
+    logging.info('{} of {} documents are valid'.format(
+        count - invalid_count, count))
+    return invalid_count
+
+
+def make_parser() -> argparse.ArgumentParser:
+    """Returns the parser for the command line arguments of main."""
     parser = argparse.ArgumentParser()
 
     parser.add_argument(
@@ -209,6 +680,163 @@ def main():
         required=False,
         action='store_true',
         help='If set, output in JSON format')
+    parser.add_argument(
+        '-ndjson',
+        default=False,
+        required=False,
+        action='store_true',
+        help='If set, output in newline-delimited JSON format, '
+             'one result per line')
+    parser.add_argument(
+        '-stream',
+        default=False,
+        required=False,
+        action='store_true',
+        help='If set, write each result as soon as it is generated. '
+             'Collated messages are summarised at the end. Cannot be '
+             'used with -json, since a JSON array cannot be written a '
+             'result at a time: use -ndjson instead.')
+    parser.add_argument(
+        '-flush_every',
+        default='1',
+        required=False,
+        action='store',
+        type=int,
+        help='When streaming, flush the output after this many results '
+             '(default 1). If 0, only flush at the end.')
+    # Each of these reads -ttml_in, or a directory, in its own way
+    input_modes = parser.add_mutually_exclusive_group()
+    input_modes.add_argument(
+        '-archive',
+        default=False,
+        required=False,
+        action='store_true',
+        help='If set, -ttml_in is a tar or zip archive, and each member '
+             'matching -member_glob is validated, with the results keyed '
+             'by member name. -stream is ignored.')
+    parser.add_argument(
+        '-member_glob',
+        default='*',
+        required=False,
+        action='store',
+        help='With -archive or -watch, only validate members or files '
+             'whose names match this glob pattern, in which * also '
+             'matches / (default *)')
+    parser.add_argument(
+        '-workers',
+        default='1',
+        required=False,
+        action='store',
+        type=int,
+        help='With -archive or -mpd, the number of members or segments '
+             'to validate at the same time on warm workers (default 1)')
+    parser.add_argument(
+        '-executor',
+        default='process',
+        required=False,
+        choices=executor_kinds,
+        help='With -archive or -mpd and -workers, the kind of worker pool '
+             '(default process)')
+    input_modes.add_argument(
+        '-isobmff',
+        default=False,
+        required=False,
+        action='store_true',
+        help='If set, -ttml_in is a fragmented MP4 file, such as a DASH '
+             'segment, and each sample of its stpp tracks is validated, '
+             'with the epoch and segment duration taken from the sample '
+             'timing and the results keyed by sample. -stream is ignored.')
+    parser.add_argument(
+        '-init_segment',
+        type=argparse.FileType('rb'),
+        default=None,
+        required=False,
+        help='With -isobmff, the initialisation segment describing the '
+             'tracks, if -ttml_in does not have a moov box',
+        action='store')
+    input_modes.add_argument(
+        '-mpd',
+        default=False,
+        required=False,
+        action='store_true',
+        help='If set, -ttml_in is a DASH MPD, and each local segment of '
+             'its subtitle representations is validated in presentation '
+             'time order, with the epoch and segment duration given by '
+             'the MPD and the results keyed by segment. -stream is '
+             'ignored.')
+    parser.add_argument(
+        '-summary_out',
+        type=argparse.FileType('w'),
+        default=None,
+        required=False,
+        help='With -mpd, write a JSON summary of the segments of each '
+             'representation to this file',
+        action='store')
+    input_modes.add_argument(
+        '-frames',
+        default=None,
+        required=False,
+        choices=framings,
+        help='Read a stream of documents from -ttml_in, each followed by '
+             'a NUL byte (nul) or preceded by a line giving its length '
+             'and optionally an id (length), and write one line of JSON '
+             'per document with its id, exit status and results.')
+    input_modes.add_argument(
+        '-watch',
+        default=None,
+        required=False,
+        action='store',
+        metavar='DIRECTORY',
+        help='Validate each file written to this directory as soon as it '
+             'has been fully written, until interrupted, appending the '
+             'results keyed by file name. JSON output is written as '
+             'newline-delimited JSON.')
+    parser.add_argument(
+        '-watch_poll',
+        default=False,
+        required=False,
+        action='store_true',
+        help='With -watch, poll the directory rather than using inotify')
+    parser.add_argument(
+        '-poll_interval',
+        default='0.2',
+        required=False,
+        action='store',
+        type=float,
+        help='With -watch, the seconds between scans when polling; a file '
+             'is validated once its size is the same in two scans '
+             '(default 0.2)')
+    parser.add_argument(
+        '-backlog',
+        default='64',
+        required=False,
+        action='store',
+        type=int,
+        help='With -watch, the most files to keep waiting for validation; '
+             'when full, the file that has waited longest is dropped '
+             '(default 64)')
+    parser.add_argument(
+        '-max_files',
+        default='0',
+        required=False,
+        action='store',
+        type=int,
+        help='With -watch, stop after validating this many files '
+             '(default 0, never stop)')
+    parser.add_argument(
+        '-results_db',
+        default=None,
+        required=False,
+        action='store',
+        help='SQLite database to also store the results in, replacing '
+             'any already stored for the same document')
+    parser.add_argument(
+        '-document_id',
+        default=None,
+        required=False,
+        action='store',
+        help='Identifier of the document in the results database '
+             '(default the input file name)')
     parser.add_argument(
         '-segment',
         default=False,
@@ -251,18 +879,231 @@ def main():
         help='If more than zero, collates similar messages '
              'when there are more than the specified number.'
     )
+    parser.add_argument(
+        '-collate_sample_first',
+        default='3',
+        required=False,
+        action='store',
+        type=int,
+        help='Number of the first locations to list for each '
+             'collated message (default 3).'
+    )
+    parser.add_argument(
+        '-collate_sample_random',
+        default='2',
+        required=False,
+        action='store',
+        type=int,
+        help='Number of randomly sampled later locations to list for '
+             'each collated message (default 2).'
+    )
+    parser.add_argument(
+        '-min_status',
+        default='pass',
+        required=False,
+        action='store',
+        type=str.lower,
+        choices=list(min_status_choices.keys()),
+        help='Only output results with this status or a more severe one, '
+             'in the order pass, info, warn, fail, skip (default pass). '
+             'Document validity summaries still count all results.'
+    )
+    parser.add_argument(
+        '-max_errors',
+        default='0',
+        required=False,
+        action='store',
+        type=int,
+        help='If more than zero, stop validating once this many errors '
+             'have been found, and report the remaining checks as skipped.'
+    )
+    parser.add_argument(
+        '-fail_fast',
+        default=[],
+        required=False,
+        action='append',
+        type=str.lower,
+        choices=fail_fast_choices,
+        help='Stop validating after the first error of this class, '
+             'and report the remaining checks as skipped. '
+             'May be repeated.'
+    )
+    parser.add_argument(
+        '-max_bytes',
+        default='0',
+        required=False,
+        action='store',
+        type=int,
+        help='If more than zero, do not validate input larger than this '
+             'many bytes.'
+    )
+    parser.add_argument(
+        '-max_elements',
+        default='0',
+        required=False,
+        action='store',
+        type=int,
+        help='If more than zero, do not run the XML checks on documents '
+             'with more than this many elements.'
+    )
+    parser.add_argument(
+        '-max_depth',
+        default='0',
+        required=False,
+        action='store',
+        type=int,
+        help='If more than zero, do not run the XML checks on documents '
+             'with elements nested more deeply than this.'
+    )
+    parser.add_argument(
+        '-max_results',
+        default='0',
+        required=False,
+        action='store',
+        type=int,
+        help='If more than zero, stop validating once this many results '
+             'have been generated.'
+    )
+    parser.add_argument(
+        '-max_seconds',
+        default='0',
+        required=False,
+        action='store',
+        type=float,
+        help='If more than zero, stop validating once this many seconds '
+             'have passed, interrupting the running check.'
+    )
+    parser.add_argument(
+        '-include',
+        default=[],
+        required=False,
+        action='extend',
+        nargs='+',
+        metavar='PATTERN',
+        help='Only run the checks needed for the validation codes starting '
+             'with PATTERN, or logged by the check class named PATTERN. '
+             'Codes that are not checked are reported as skipped.'
+    )
+    parser.add_argument(
+        '-exclude',
+        default=[],
+        required=False,
+        action='extend',
+        nargs='+',
+        metavar='PATTERN',
+        help='Do not check the validation codes starting with PATTERN, or '
+             'logged by the check class named PATTERN, unless another '
+             'check needs them.'
+    )
+    parser.add_argument(
+        '-check_workers',
+        default='0',
+        required=False,
+        action='store',
+        type=int,
+        help='If more than one, run checks that do not depend on each '
+             'other at the same time on this many threads. Results are '
+             'the same as when they run one at a time.'
+    )
+    parser.add_argument(
+        '-profile_out',
+        type=argparse.FileType('w'),
+        default=None,
+        required=False,
+        help='If set, write the time taken and the number of results '
+             'emitted by each check to this file, as CSV if -csv is set, '
+             'otherwise as JSON.',
+        action='store')
+    parser.add_argument(
+        '-profile_memory',
+        default=False,
+        required=False,
+        action='store_true',
+        help='If set with -profile_out, also record the peak memory '
+             'allocated by each check. This slows validation down.')
+    parser.add_argument(
+        '-tier',
+        default='all',
+        required=False,
+        choices=['all'] + tiers,
+        help='Run only the gate tier of checks, of the structure, root '
+             'element and namespace and schema, or only the full tier, of '
+             'the styles, regions and timing (default all). The validity '
+             'summaries are marked with the tier.')
+    parser.add_argument(
+        '-full_out',
+        type=argparse.FileType('w'),
+        default=None,
+        required=False,
+        help='With -tier gate, once the gate tier results have been '
+             'written, resume the full tier from the parsed document and '
+             'write its results to this file. The exit code counts the '
+             'failures of both tiers.',
+        action='store')
     parser.add_argument(
         '-flavour',
         default='bbc',
         required=False,
         action='store',
         type=str,
-        help='bbc (subtitles) or dapt'
+        help='bbc (subtitles), dapt, auto to detect the flavour of each '
+             'document from its root element, or a comma separated list '
+             'of flavours to validate a single document as each of them, '
+             'parsing it once and writing the results keyed by flavour'
     )
     parser.set_defaults(func=validate_ttml)
+    return parser
+
+
+def default_args(**kwargs) -> argparse.Namespace:
+    """
+    Returns the arguments of a command line without options, as main
+    parses them, with each keyword argument set, for calling the
+    validate_ttml functions without a command line.
+    """
+    args = make_parser().parse_args([])
+    for name, value in kwargs.items():
+        if not hasattr(args, name):
+            raise TypeError('No argument named {}'.format(name))
+        setattr(args, name, value)
+    return args
 
+
+def main():
+    parser = make_parser()
     args = parser.parse_args()
-    return args.func(args)
+    if args.stream and args.json and not args.csv:
+        parser.error('-stream cannot write -json output, use -ndjson')
+    flavour_names = flavour_list(args.flavour)
+    if len(flavour_names) > 1 or args.flavour not in flavours + ['auto']:
+        unknown = [name for name in flavour_names if name not in flavours]
+        if len(unknown) > 0 or len(flavour_names) == 0:
+            parser.error('-flavour must be one of {}, or a comma separated '
+                         'list of {}'.format(
+                             ', '.join(flavours + ['auto']),
+                             ', '.join(flavours)))
+        if args.archive or args.isobmff or args.mpd \
+           or args.watch is not None or args.frames is not None \
+           or args.tier != 'all' or args.profile_out is not None:
+            parser.error('A list of flavours can only validate a single '
+                         'document with every tier of checks, without '
+                         '-profile_out')
+        args.func = validate_ttml_flavours
+    elif args.archive:
+        args.func = validate_ttml_archive
+    elif args.isobmff:
+        args.func = validate_ttml_isobmff
+    elif args.mpd:
+        args.func = validate_ttml_mpd
+    elif args.watch is not None:
+        args.func = validate_ttml_watch
+    elif args.frames is not None:
+        args.func = validate_ttml_frames
+    try:
+        return args.func(args)
+    except (CheckSelectionError, ArchiveError, FrameError, IsoBmffError,
+            MpdError) as e:
+        parser.error(str(e))
 
 
 if __name__ == "__main__":
@@ -35,15 +35,41 @@ code,good_count,info_count,warn_count,error_count
 xml_document_validity,3,0,0,0
 ebuttd_document_validity,2,0,0,0
 bbc_document_validity,1,0,0,2
+
+Files are read in parallel by a pool of worker processes.
+
+The results of each file are kept in a :py:class:`PartialSummary`,
+which records, for each file, its modification time, size and SHA-256
+hash and the statuses it had for each code. Given a ``-manifest``, the
+partial summary of the previous run is read first and files whose
+modification time and size have not changed, or whose content hashes
+the same, are not parsed again; the manifest is then rewritten for the
+files found this time. Partial summaries made on different machines or
+on different days can be combined with ``-merge``, and the combined
+partial summary written with ``-summary_out`` for merging later.
+
+Results stored in a SQLite database by ``validate-ttml -results_db`` are
+collated with SQL by :py:func:`collate_database`, using its index on
+code, status and document rather than reading every result.
 """
+from collections.abc import Iterable, Iterator
+from concurrent.futures import ProcessPoolExecutor
 import argparse
 import csv
+import datetime
 import glob
+import hashlib
+import io
+import json
 import logging
+import os
 from pathlib import Path
+import sqlite3
 import sys
 import traceback
+from .validationLogging.resultSinks import open_results_database
 from .validationLogging.validationCodes import ValidationCode
+from .validationLogging.validationResult import ERROR
 
 logging.getLogger().setLevel(logging.INFO)
 
@@ -76,48 +102,301 @@ status_string_map = dict(zip(
     ))
 
 
-def collate_validation(args) -> int:
-    path = Path(args.validation_csv_path)
-    val_filenames = glob.glob(str(path.expanduser()))
-    logging.info(
-        'Found {} matching files for {}'
-        .format(len(val_filenames), args.validation_csv_path))
-    if len(val_filenames) == 0:
-        return 0
+class PartialSummary:
+    """
+    Statuses found for each code in each of a set of validation CSV
+    files, from which the collated counts can be worked out.
+
+    ``files`` maps the absolute path of each file to a dictionary of:
+
+    * ``mtime_ns`` and ``size``: as given by ``os.stat()`` when it was
+      read;
+    * ``sha256``: the hex digest of its content;
+    * ``statuses``: map of code name to the status strings, such as
+      ``Pass`` or ``Fail``, of at least one result with that code.
+
+    Saved as JSON, so that it can be loaded on another machine or on a
+    later day and merged with others.
+    """
+
+    format_version = 1
+
+    def __init__(self, files: dict[str, dict] | None = None):
+        self.files = {} if files is None else files
+
+    @classmethod
+    def load(cls, path: str) -> 'PartialSummary':
+        """
+        Reads a partial summary, raising ValueError if it is not one.
+        """
+        with open(path, 'r', encoding='utf-8') as summary_file:
+            summary = json.load(summary_file)
+        if not isinstance(summary, dict) \
+           or summary.get('version') != cls.format_version:
+            raise ValueError(
+                '{} is not a version {} partial summary'.format(
+                    path, cls.format_version))
+        return cls(files=summary['files'])
+
+    def save(self, path: str):
+        """Writes the partial summary, replacing any file at the path."""
+        temp_path = path + '.tmp'
+        with open(temp_path, 'w', encoding='utf-8') as summary_file:
+            json.dump(
+                {'version': self.format_version, 'files': self.files},
+                summary_file,
+                separators=(',', ':'))
+        os.replace(temp_path, path)
+
+    def merge(self, other: 'PartialSummary'):
+        """
+        Adds the files of another partial summary. Where both have the
+        same file, the entry with the later modification time is kept.
+        """
+        for path, entry in other.files.items():
+            existing = self.files.get(path)
+            if existing is None or entry['mtime_ns'] > existing['mtime_ns']:
+                self.files[path] = entry
+
+    def collated(self) -> dict[str, dict[str, int]]:
+        """
+        Returns, for each code, the number of files with at least one
+        result of each status, keyed by output header.
+        """
+        collated_results = {
+            vc.name: {h: 0 for h in out_headers[1:]}
+            for vc in list(ValidationCode)}
+        for entry in self.files.values():
+            for code, statuses in entry['statuses'].items():
+                code_counts = collated_results.setdefault(
+                    code, {h: 0 for h in out_headers[1:]})
+                for status in statuses:
+                    code_counts[status_string_map[status]] += 1
+        return collated_results
+
+
+def summarise_file(
+        path: str,
+        previous: dict | None = None) -> tuple[str, dict | None, str | None]:
+    """
+    Reads a validation CSV file and returns its path, its
+    :py:class:`PartialSummary` entry and None, or its path, None and
+    the reason it could not be read.
+
+    If the content hashes the same as that of ``previous``, the
+    statuses of ``previous`` are used without parsing the file again.
+    """
+    try:
+        stat = os.stat(path)
+        with open(path, 'rb') as val_file:
+            content = val_file.read()
+        sha256 = hashlib.sha256(content).hexdigest()
+        if previous is not None and previous['sha256'] == sha256:
+            statuses = previous['statuses']
+        else:
+            statuses = {}
+            reader = csv.reader(
+                io.StringIO(content.decode('utf-8'), newline=''))
+            headers = next(reader, [])
+            code_index = headers.index('code')
+            status_index = headers.index('status')
+            for row in reader:
+                code = row[code_index]
+                status = row[status_index]
+                if code not in ValidationCode.__members__:
+                    raise ValueError(
+                        'Unknown validation code {}'.format(code))
+                if status not in status_string_map:
+                    raise ValueError('Unknown status {}'.format(status))
+                code_statuses = statuses.setdefault(code, [])
+                if status not in code_statuses:
+                    code_statuses.append(status)
+        return path, {
+            'mtime_ns': stat.st_mtime_ns,
+            'size': stat.st_size,
+            'sha256': sha256,
+            'statuses': statuses,
+        }, None
+    except Exception as e:
+        return path, None, ''.join(traceback.format_exception(e))
+
+
+def summarise_files(
+        paths: list[str],
+        previous: PartialSummary,
+        workers: int = 1) -> Iterator[tuple[str, dict | None, str | None]]:
+    """
+    Calls :py:func:`summarise_file` for each path, on a pool of
+    ``workers`` processes if more than one, yielding the results in
+    the order of the paths.
+    """
+    previous_entries = [previous.files.get(path) for path in paths]
+    if workers <= 1 or len(paths) <= 1:
+        yield from map(summarise_file, paths, previous_entries)
+        return
+    # Sending each file in its own task would cost more than reading it
+    chunksize = max(1, min(256, len(paths) // (workers * 4)))
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        yield from executor.map(
+            summarise_file, paths, previous_entries, chunksize=chunksize)
+
+
+def update_summary(
+        paths: Iterable[str],
+        previous: PartialSummary,
+        workers: int = 1) -> PartialSummary:
+    """
+    Returns the partial summary of the files at ``paths``, reusing the
+    entries of ``previous`` for files that have not changed since.
+
+    Files that cannot be read are logged and left out, so that they are
+    read again next time.
+    """
+    summary = PartialSummary()
+    changed_paths = []
+    for path in paths:
+        entry = previous.files.get(path)
+        if entry is not None:
+            stat = os.stat(path)
+            if entry['mtime_ns'] == stat.st_mtime_ns \
+               and entry['size'] == stat.st_size:
+                summary.files[path] = entry
+                continue
+        changed_paths.append(path)
+    logging.info('Reading {} new or changed files, {} unchanged'.format(
+        len(changed_paths), len(summary.files)))
+
+    for path, entry, error in summarise_files(
+            paths=changed_paths, previous=previous, workers=workers):
+        if entry is None:
+            logging.error('Could not read {}: {}'.format(path, error))
+        else:
+            logging.debug('Processed {}'.format(path))
+            summary.files[path] = entry
+    return summary
+
+
+def collate_database(
+        connection: sqlite3.Connection,
+        since: float | None = None) -> tuple[dict[str, dict[str, int]], int]:
+    """
+    Returns, for each code, the number of documents in a results
+    database with at least one result of each status, keyed by output
+    header, and the number of documents.
 
+    If ``since`` is set, only documents validated at or after that time,
+    in seconds since the Unix epoch, are counted.
+    """
+    where, parameters = ('WHERE validated_at >= ?', (since,)) \
+        if since is not None else ('', ())
     collated_results = {
         vc.name: {h: 0 for h in out_headers[1:]}
         for vc in list(ValidationCode)}
+    for code, status, count in connection.execute(
+            'SELECT code, status, COUNT(DISTINCT document) FROM results '
+            '{} GROUP BY code, status'.format(where),
+            parameters):
+        code_counts = collated_results.setdefault(
+            code, {h: 0 for h in out_headers[1:]})
+        code_counts[out_headers[1 + status]] += count
+    document_count, = connection.execute(
+        'SELECT COUNT(DISTINCT document) FROM results {}'.format(where),
+        parameters).fetchone()
+    return collated_results, document_count
 
-    for val_filename in val_filenames:
-        this_file_results = {
-            vc.name: {h: 0 for h in out_headers[1:]}
-            for vc in list(ValidationCode)}
-        # print(this_file_results)
-        logging.info('Processing {}'.format(val_filename))
+
+def documents_with(
+        connection: sqlite3.Connection,
+        code: ValidationCode,
+        status: int = ERROR,
+        since: float | None = None) -> list[str]:
+    """
+    Returns the documents in a results database with at least one result
+    of the code and status, for example those failing
+    ``bbc_timing_gaps``, optionally only those validated since a time
+    in seconds since the Unix epoch.
+    """
+    query = 'SELECT DISTINCT document FROM results ' \
+        'WHERE code = ? AND status = ?'
+    parameters = [code.name, status]
+    if since is not None:
+        query += ' AND validated_at >= ?'
+        parameters.append(since)
+    return [
+        document for document, in connection.execute(
+            query + ' ORDER BY document', parameters)]
+
+
+def _csv_only_options(args) -> list[str]:
+    # Options that read or write CSV summaries, so cannot be combined with
+    # -results_db
+    return [
+        option for option, value in [
+            ('-validation_csv_path', args.validation_csv_path),
+            ('-merge', args.merge),
+            ('-manifest', args.manifest),
+            ('-summary_out', args.summary_out)]
+        if value]
+
+
+def collate_validation(args) -> int:
+    summary = PartialSummary()
+    if args.results_db is not None:
+        # A document can be both in the database and a CSV file, with no
+        # way to tell, so it would be counted twice
+        csv_only_options = _csv_only_options(args)
+        if len(csv_only_options) > 0:
+            raise ValueError(
+                '-results_db cannot be combined with {}'.format(
+                    ', '.join(csv_only_options)))
+        since = None
+        if args.since is not None:
+            since = datetime.datetime.fromisoformat(args.since).timestamp()
+        connection = open_results_database(args.results_db)
         try:
-            with open(val_filename, 'r', newline='') as val_file:
-                val_file_reader = csv.DictReader(
-                    f=val_file)
+            collated_results, document_count = collate_database(
+                connection=connection, since=since)
+        finally:
+            connection.close()
+    else:
+        if args.validation_csv_path is not None:
+            path = Path(args.validation_csv_path)
+            val_filenames = sorted(
+                os.path.abspath(filename)
+                for filename in glob.glob(str(path.expanduser())))
+            logging.info(
+                'Found {} matching files for {}'
+                .format(len(val_filenames), args.validation_csv_path))
+
+            previous = PartialSummary()
+            if args.manifest is not None and os.path.exists(args.manifest):
+                previous = PartialSummary.load(args.manifest)
+            summary = update_summary(
+                paths=val_filenames,
+                previous=previous,
+                workers=args.workers or os.process_cpu_count() or 1)
+            if args.manifest is not None:
+                summary.save(args.manifest)
+                logging.info('Wrote manifest to {}'.format(args.manifest))
 
-                for result in val_file_reader:
-                    this_file_results[result['code']][
-                        status_string_map[result['status']]
-                        ] += 1
+        for merge_path in args.merge or []:
+            summary.merge(PartialSummary.load(merge_path))
 
-                for code, status_count in this_file_results.items():
-                    for status, count in status_count.items():
-                        if count > 0:
-                            collated_results[code][status] += 1
+        collated_results = summary.collated()
+        document_count = len(summary.files)
+    if document_count == 0:
+        return 0
 
-        except Exception as e:
-            logging.error(str(e), ''.join(traceback.format_exception(e)))
+    if args.summary_out is not None:
+        summary.save(args.summary_out)
+        logging.info('Wrote partial summary to {}'.format(args.summary_out))
 
     out_csv = csv.writer(args.results_out)
     out_csv.writerow(out_headers)
     for code, status in collated_results.items():
         out_csv.writerow([code] + [count for count in status.values()])
-    logging.info('Wrote results to {}'.format(args.results_out.name))
+    logging.info('Wrote results to {} from {} documents'.format(
+        args.results_out.name, document_count))
 
     return 0
 
@@ -128,7 +407,7 @@ def main():
     parser.add_argument(
         '-validation_csv_path',
         type=str,
-        required=True,
+        default=None,
         help='Path where validation CSV files can be found. '
              'May include wildcards.',
         action='store')
@@ -139,9 +418,60 @@ def main():
         nargs='?',
         help='file to be written, containing the validation summary output',
         action='store')
+    parser.add_argument(
+        '-workers',
+        type=int,
+        default=0,
+        help='Number of processes to read files with (default the number '
+             'of CPUs)',
+        action='store')
+    parser.add_argument(
+        '-manifest',
+        type=str,
+        default=None,
+        help='Partial summary of the previous run, used to skip files '
+             'that have not changed, and rewritten for this run',
+        action='store')
+    parser.add_argument(
+        '-merge',
+        type=str,
+        action='extend',
+        nargs='+',
+        metavar='SUMMARY',
+        help='Partial summaries, for example from other machines, to '
+             'combine with the results')
+    parser.add_argument(
+        '-summary_out',
+        type=str,
+        default=None,
+        help='File to write the combined partial summary to, for merging '
+             'later',
+        action='store')
+    parser.add_argument(
+        '-results_db',
+        type=str,
+        default=None,
+        help='SQLite results database, written by validate-ttml '
+             '-results_db, to collate with SQL instead of CSV files and '
+             'partial summaries',
+        action='store')
+    parser.add_argument(
+        '-since',
+        type=str,
+        default=None,
+        help='Only collate documents in the results database validated '
+             'at or after this ISO 8601 date and time',
+        action='store')
     parser.set_defaults(func=collate_validation)
 
     args = parser.parse_args()
+    if args.validation_csv_path is None and not args.merge \
+       and args.results_db is None:
+        parser.error(
+            '-validation_csv_path, -merge or -results_db is required')
+    if args.results_db is not None and len(_csv_only_options(args)) > 0:
+        parser.error('-results_db cannot be combined with {}'.format(
+            ', '.join(_csv_only_options(args))))
     return args.func(args)
 
 
@@ -0,0 +1,69 @@
+# SPDX-FileCopyrightText: Copyright © 2026 BBC
+#
+# SPDX-License-Identifier: BSD-3-Clause
+
+from .validationCodes import ValidationCode
+from .validationLogger import ValidationLogger
+from .validationResult import ERROR
+from .validationSummariser import ValidationPassChecker
+
+
+class ErrorBudget:
+    """
+    Decides when validation can stop early because the verdict is known.
+
+    Validation stops once ``max_errors`` errors have been logged, if
+    ``max_errors`` is more than zero, or once an error has been logged
+    with any of the codes checked by one of the ``fail_fast`` pass
+    checkers. With the defaults, validation never stops early.
+
+    The codes of the checks that are not run are logged as skipped by
+    :py:meth:`skipCodes`, so that the document validity summaries
+    report that the document was not fully checked.
+    """
+
+    def __init__(
+            self,
+            max_errors: int = 0,
+            fail_fast: list[type[ValidationPassChecker]] | None = None):
+        self._max_errors = max_errors
+        self._fail_fast = [] if fail_fast is None else fail_fast
+
+    def isUnlimited(self) -> bool:
+        return self._max_errors <= 0 and len(self._fail_fast) == 0
+
+    def stopReason(self, validation_results: ValidationLogger) -> str | None:
+        """
+        Returns why validation should stop, or None if it should continue.
+        """
+        if self._max_errors > 0:
+            error_count = validation_results.statusCount(ERROR)
+            if error_count >= self._max_errors:
+                return '{} errors found, limit is {}'.format(
+                    error_count, self._max_errors)
+
+        for pass_checker in self._fail_fast:
+            fails, _, _ = \
+                pass_checker.failuresAndWarningsAndSkips(validation_results)
+            if fails > 0:
+                return '{} check failed'.format(pass_checker.name)
+
+        return None
+
+    @staticmethod
+    def skipCodes(
+            validation_results: ValidationLogger,
+            codes: list[ValidationCode],
+            reason: str):
+        """Logs one skipped result for each distinct code, in order."""
+        skipped = set()
+        for code in codes:
+            if code in skipped:
+                continue
+            skipped.add(code)
+            validation_results.skip(
+                location='Document',
+                message='Not checked because validation stopped early: '
+                        + reason,
+                code=code
+            )
@@ -0,0 +1,332 @@
+# SPDX-FileCopyrightText: Copyright © 2026 BBC
+#
+# SPDX-License-Identifier: BSD-3-Clause
+
+import ctypes
+import threading
+import time
+from contextlib import contextmanager
+from xml.etree.ElementTree import Element
+from .validationCodes import ValidationCode
+
+
+class ResourceLimitExceeded(BaseException):
+    """
+    Raised while a check is running, when a resource limit is reached.
+
+    Derives from ``BaseException`` rather than ``Exception`` so that
+    checks that handle their own exceptions do not report it as a
+    failure of the check.
+    """
+
+    def __init__(self, reason: str):
+        super().__init__(reason)
+        self.reason = reason
+
+
+class TimeLimitInterrupt(ResourceLimitExceeded):
+    """
+    Raised inside a running check when the wall clock time limit is
+    reached.
+
+    Raised asynchronously, so it is constructed without arguments.
+    """
+
+    def __init__(self, reason: str = 'wall clock time limit reached'):
+        super().__init__(reason)
+
+
+def _set_async_exc(ident: int, exception_class: type | None):
+    # Raises the exception in the thread when it next runs Python code,
+    # or, given None, cancels one that has not been raised yet
+    ctypes.pythonapi.PyThreadState_SetAsyncExc(
+        ctypes.c_ulong(ident),
+        None if exception_class is None
+        else ctypes.py_object(exception_class))
+
+
+class ResourceLimits:
+    """
+    Limits on the resources that validating one document may use.
+
+    Each limit is disabled if it is zero or less: ``max_bytes`` of input,
+    ``max_elements`` and ``max_depth`` of the parsed document,
+    ``max_results`` validation results, and ``max_seconds`` of wall
+    clock time from :py:meth:`start`.
+
+    The input size is checked before the input is processed further. The
+    element count and nesting depth are checked as the document is
+    parsed, with :py:meth:`checkElement` for each element as it starts,
+    so that parsing stops as soon as a limit is passed, without building
+    the rest of the tree, and a tree that is already parsed is checked
+    with :py:meth:`checkTree` before it is checked.
+
+    The result count and time are checked by the
+    :py:class:`ValidationLogger<src.validationLogging.validationLogger.ValidationLogger>`
+    whenever a result is logged, raising :py:class:`ResourceLimitExceeded`
+    from inside the running check, and between checks by
+    :py:meth:`exceeded`. A check that runs for a long time without logging
+    a result is stopped when the time limit is reached if it runs inside
+    :py:meth:`interruptible`, by raising :py:class:`TimeLimitInterrupt`
+    in its thread. The exception is raised when the thread next runs
+    Python code, so a single long call into C code, such as matching a
+    regular expression, still finishes first. The logger holds the
+    interruption back with :py:meth:`uninterrupted` while it counts and
+    keeps a result, so that its counts and collated results stay
+    consistent.
+
+    Once a limit has been reached it stays reached, and no further
+    exceptions are raised, so that the reason and the skipped checks can
+    be logged. Call :py:meth:`stop` once the checks have finished, so that
+    logging the summaries is not interrupted.
+    """
+
+    def __init__(
+            self,
+            max_bytes: int = 0,
+            max_elements: int = 0,
+            max_depth: int = 0,
+            max_results: int = 0,
+            max_seconds: float = 0):
+        self._max_bytes = max_bytes
+        self._max_elements = max_elements
+        self._max_depth = max_depth
+        self._max_results = max_results
+        self._max_seconds = max_seconds
+        self._deadline = None
+        self._reason = None
+        self._recorded = False
+        self._stopped = False
+        self._lock = threading.Lock()
+        self._timer = None
+        self._timed_out = False
+        # Threads that may be interrupted, and those that have been
+        self._interruptible = set()
+        self._interrupted = set()
+
+    def __getstate__(self) -> dict:
+        # The timer and the threads it may interrupt belong to this
+        # process
+        state = self.__dict__.copy()
+        del state['_lock']
+        state.update(_timer=None, _interruptible=set(), _interrupted=set())
+        return state
+
+    def __setstate__(self, state: dict):
+        self.__dict__.update(state)
+        self._lock = threading.Lock()
+
+    def isUnlimited(self) -> bool:
+        return self._max_bytes <= 0 \
+            and self._max_elements <= 0 \
+            and self._max_depth <= 0 \
+            and self._max_results <= 0 \
+            and self._max_seconds <= 0
+
+    def readLimit(self) -> int:
+        """
+        Returns the number of bytes to read from the input, enough to
+        tell if it is too large, or -1 to read it all.
+        """
+        return self._max_bytes + 1 if self._max_bytes > 0 else -1
+
+    def start(self):
+        """Starts the wall clock time limit."""
+        self._stopped = False
+        if self._max_seconds > 0:
+            self._deadline = time.monotonic() + self._max_seconds
+            self._timer = threading.Timer(
+                self._max_seconds, self._interruptAll)
+            self._timer.daemon = True
+            self._timer.start()
+
+    def stop(self):
+        """Stops checking the result count and time limits."""
+        with self._lock:
+            self._stopped = True
+            if self._timer is not None:
+                self._timer.cancel()
+
+    def _reach(self, reason: str) -> str:
+        with self._lock:
+            if self._reason is None:
+                self._reason = reason
+            return self._reason
+
+    def _interruptAll(self):
+        # Runs in the timer's thread when the time limit is reached
+        with self._lock:
+            if self._stopped:
+                return
+            self._timed_out = True
+            if self._reason is None:
+                self._reason = 'wall clock time limit of {}s reached' \
+                    .format(self._max_seconds)
+            for ident in self._interruptible:
+                _set_async_exc(ident, TimeLimitInterrupt)
+                self._interrupted.add(ident)
+
+    def _leave(self, ident: int) -> bool:
+        # Stops the thread being interrupted, cancelling an interruption
+        # that has not been raised yet, and returns True if it was
+        # interrupted
+        with self._lock:
+            self._interruptible.discard(ident)
+            if ident not in self._interrupted:
+                return False
+            self._interrupted.discard(ident)
+            _set_async_exc(ident, None)
+            return True
+
+    @contextmanager
+    def interruptible(self):
+        """
+        Lets the wall clock time limit interrupt the current thread,
+        raising :py:class:`TimeLimitInterrupt`, while in the context.
+        """
+        if self._timer is None:
+            yield
+            return
+        ident = threading.get_ident()
+        with self._lock:
+            timed_out = self._timed_out and not self._stopped
+            if not timed_out:
+                self._interruptible.add(ident)
+        if timed_out:
+            raise TimeLimitInterrupt(self._reason)
+        try:
+            yield
+        finally:
+            try:
+                self._leave(ident)
+            except ResourceLimitExceeded:
+                # The interruption was raised while leaving, and cannot
+                # be raised again
+                self._leave(ident)
+
+    @contextmanager
+    def uninterrupted(self):
+        """
+        Holds back the wall clock time limit's interruption of the
+        current thread while in the context, raising
+        :py:class:`TimeLimitInterrupt` before it instead if the thread has
+        already been interrupted, or after it if the limit is reached
+        meanwhile.
+        """
+        ident = threading.get_ident()
+        if ident not in self._interruptible:
+            yield
+            return
+        if self._leave(ident):
+            raise TimeLimitInterrupt(self._reason)
+        try:
+            yield
+        finally:
+            with self._lock:
+                self._interruptible.add(ident)
+                timed_out = self._timed_out and not self._stopped
+        if timed_out:
+            raise TimeLimitInterrupt(self._reason)
+
+    def _timeReason(self) -> str | None:
+        if self._deadline is not None and time.monotonic() > self._deadline:
+            return 'wall clock time limit of {}s reached'.format(
+                self._max_seconds)
+        return None
+
+    def exceeded(self) -> str | None:
+        """
+        Returns the reason a limit has been reached, or None.
+
+        Checks the wall clock time limit, so call this between checks.
+        """
+        if self._reason is None and not self._stopped:
+            time_reason = self._timeReason()
+            if time_reason is not None:
+                self._reach(time_reason)
+        return self._reason
+
+    def checkResult(self, result_count: int):
+        """
+        Raises :py:class:`ResourceLimitExceeded` if another result would
+        go over the result limit, or if the time limit has been reached.
+
+        Called by the logger before each result is counted.
+        """
+        if self._reason is not None or self._stopped:
+            return
+        reason = None
+        if 0 < self._max_results <= result_count:
+            reason = 'result limit of {} reached'.format(self._max_results)
+        else:
+            reason = self._timeReason()
+        if reason is not None:
+            raise ResourceLimitExceeded(self._reach(reason))
+
+    def checkBytes(self, byte_count: int) -> str | None:
+        """Returns the reason if the input is too large, or None."""
+        if 0 < self._max_bytes < byte_count:
+            return self._reach('input is larger than the limit of {} bytes'
+                               .format(self._max_bytes))
+        return None
+
+    def limitsTree(self) -> bool:
+        """Returns True if the element count or nesting is limited."""
+        return self._max_elements > 0 or self._max_depth > 0
+
+    def limitsTime(self) -> bool:
+        """Returns True if the wall clock time is limited."""
+        return self._max_seconds > 0
+
+    def checkElement(self, element_count: int, depth: int) -> str | None:
+        """
+        Returns the reason if an element at the depth, the root being at
+        depth 1, that makes element_count elements so far passes the
+        element or nesting limit, or None.
+        """
+        if 0 < self._max_elements < element_count:
+            return self._reach(
+                'document has more than the limit of {} elements'
+                .format(self._max_elements))
+        if 0 < self._max_depth < depth:
+            return self._reach(
+                'document is nested more deeply than the limit of {} '
+                'elements'.format(self._max_depth))
+        return None
+
+    def checkTree(self, root: Element) -> str | None:
+        """
+        Returns the reason if the document has too many elements or is
+        too deeply nested, or None.
+
+        Stops walking the tree as soon as a limit is passed.
+        """
+        if not self.limitsTree():
+            return None
+        element_count = 0
+        stack = [(root, 1)]
+        while len(stack) > 0:
+            element, depth = stack.pop()
+            element_count += 1
+            reason = self.checkElement(element_count, depth)
+            if reason is not None:
+                return reason
+            stack.extend((child, depth + 1) for child in element)
+        return None
+
+    def record(self, validation_results) -> bool:
+        """
+        Logs an error giving the limit that was reached, once.
+
+        Returns True if a limit has been reached.
+        """
+        if self._reason is None:
+            return False
+        if not self._recorded:
+            self._recorded = True
+            validation_results.error(
+                location='Document',
+                message='Resource limit reached: ' + self._reason,
+                code=ValidationCode.validator_resource_limit
+            )
+        return True
@@ -0,0 +1,262 @@
+# SPDX-FileCopyrightText: Copyright © 2026 BBC
+#
+# SPDX-License-Identifier: BSD-3-Clause
+
+"""
+Sinks that write validation results out as soon as they are generated.
+
+A :py:class:`ResultSink` is attached to a
+:py:class:`ValidationLogger<src.validationLogging.validationLogger.ValidationLogger>`
+and is given every result when it is appended, so that results can be
+written, tailed and processed before validation has completed.
+"""
+
+from io import TextIOWrapper
+from csv import writer as csvWriter
+import json
+import sqlite3
+import time
+from .validationResult import ValidationResult, CsvStatusStrings, \
+    csv_headers
+
+
+class ResultSink:
+    """
+    Receives validation results one at a time.
+
+    Must be subclassed.
+    """
+
+    def write(self, result: ValidationResult) -> None:
+        raise NotImplementedError()
+
+    def flush(self) -> None:
+        return
+
+    def close(self) -> None:
+        """Flushes any outstanding output. Does not close the stream."""
+        self.flush()
+
+
+class TextResultSink(ResultSink):
+    """
+    Writes results to a text stream, flushing every ``flush_every`` results.
+
+    If ``flush_every`` is 0 the stream is only flushed when the sink is
+    closed.
+    """
+
+    def __init__(
+            self,
+            stream: TextIOWrapper,
+            flush_every: int = 1) -> None:
+        super().__init__()
+        self._stream = stream
+        self._flush_every = flush_every
+        self._unflushed = 0
+
+    def _write_result(self, result: ValidationResult) -> None:
+        raise NotImplementedError()
+
+    def write(self, result: ValidationResult) -> None:
+        self._write_result(result)
+        self._unflushed += 1
+        if self._flush_every > 0 and self._unflushed >= self._flush_every:
+            self.flush()
+
+    def flush(self) -> None:
+        self._stream.flush()
+        self._unflushed = 0
+
+
+class PlaintextResultSink(TextResultSink):
+    """Writes one line of plain text per result."""
+
+    def _write_result(self, result: ValidationResult) -> None:
+        self._stream.write(result.asString() + '\n')
+
+
+class CsvResultSink(TextResultSink):
+    """
+    Writes one CSV row per result, in the same format as
+    :py:meth:`ValidationLogger.write_csv<src.validationLogging.validationLogger.ValidationLogger.write_csv>`.
+
+    The header row is written when the sink is created.
+    """
+
+    def __init__(
+            self,
+            stream: TextIOWrapper,
+            flush_every: int = 1) -> None:
+        super().__init__(stream=stream, flush_every=flush_every)
+        stream.reconfigure(newline='')
+        self._csv_writer = csvWriter(stream)
+        self._csv_writer.writerow(csv_headers)
+
+    def _write_result(self, result: ValidationResult) -> None:
+        self._csv_writer.writerow([
+            CsvStatusStrings.get(result.status),
+            result.code.name if result.code else '',
+            result.location,
+            result.message
+        ])
+
+
+class NdjsonResultSink(TextResultSink):
+    """Writes one JSON object per line per result."""
+
+    _encoder = json.JSONEncoder()
+
+    def _write_result(self, result: ValidationResult) -> None:
+        self._stream.write(self._encoder.encode(result.asDict()) + '\n')
+
+
+class CollatingResultSink(ResultSink):
+    """
+    Collates repeated results on the fly before passing them to another sink.
+
+    The first ``more_than`` results with the same status, message and code
+    are passed straight through. Further matching results are only counted,
+    and when the sink is closed one result per collated status, message
+    and code is written with its location set to the number of further
+    locations found.
+
+    Only a count is held for each distinct status, message and code,
+    so memory use does not grow with the number of repeated results.
+    """
+
+    def __init__(
+            self,
+            sink: ResultSink,
+            more_than: int) -> None:
+        super().__init__()
+        self._sink = sink
+        self._more_than = more_than
+        self._seen_counts = {}
+
+    def write(self, result: ValidationResult) -> None:
+        seen_key = (result.status, result.message, result.code)
+        seen_count = self._seen_counts.get(seen_key, 0) + 1
+        self._seen_counts[seen_key] = seen_count
+        if seen_count <= self._more_than:
+            self._sink.write(result)
+
+    def flush(self) -> None:
+        self._sink.flush()
+
+    def close(self) -> None:
+        for (status, message, code), seen_count \
+                in self._seen_counts.items():
+            if seen_count > self._more_than:
+                self._sink.write(ValidationResult(
+                    status=status,
+                    code=code,
+                    location='{} further locations'.format(
+                        seen_count - self._more_than),
+                    message=message
+                ))
+        self._seen_counts.clear()
+        self._sink.close()
+
+
+results_table_schema = [
+    """CREATE TABLE IF NOT EXISTS results (
+        document TEXT NOT NULL,
+        flavour TEXT NOT NULL,
+        validated_at REAL NOT NULL,
+        status INTEGER NOT NULL,
+        code TEXT NOT NULL,
+        location TEXT NOT NULL,
+        message TEXT NOT NULL)""",
+    """CREATE INDEX IF NOT EXISTS results_code_status_document
+        ON results (code, status, document)""",
+    """CREATE INDEX IF NOT EXISTS results_document
+        ON results (document)""",
+]
+"""
+Statements that create the table of results written by
+:py:class:`SqliteResultSink`, if it does not already exist.
+
+``validated_at`` is in seconds since the Unix epoch and ``status`` is the
+integer status, such as
+:py:data:`ERROR<src.validationLogging.validationResult.ERROR>`.
+"""
+
+
+def open_results_database(path: str) -> sqlite3.Connection:
+    """
+    Opens, creating if need be, a SQLite database of validation results
+    in write-ahead log mode, so that it can be read while results are
+    being written.
+    """
+    # Wait for other writers rather than failing straight away
+    connection = sqlite3.connect(path, timeout=30)
+    connection.execute('PRAGMA journal_mode=WAL')
+    connection.execute('PRAGMA synchronous=NORMAL')
+    with connection:
+        for statement in results_table_schema:
+            connection.execute(statement)
+    return connection
+
+
+class SqliteResultSink(ResultSink):
+    """
+    Writes results to the ``results`` table of a SQLite database, made
+    by :py:func:`open_results_database`, as rows for ``document``.
+
+    Any results already stored for ``document`` are replaced. Results are
+    inserted ``batch_size`` at a time, each batch in one transaction.
+
+    If ``connection`` is a path, the database is opened, and closed when
+    the sink is closed.
+    """
+
+    _insert = 'INSERT INTO results ' \
+        '(document, flavour, validated_at, status, code, location, message) ' \
+        'VALUES (?, ?, ?, ?, ?, ?, ?)'
+
+    def __init__(
+            self,
+            connection: sqlite3.Connection | str,
+            document: str,
+            flavour: str,
+            batch_size: int = 1000) -> None:
+        super().__init__()
+        self._own_connection = isinstance(connection, str)
+        self._connection = open_results_database(connection) \
+            if isinstance(connection, str) else connection
+        self._document = document
+        self._flavour = flavour
+        self._validated_at = time.time()
+        self._batch_size = batch_size
+        self._batch = []
+        # Committed with the first batch
+        self._connection.execute(
+            'DELETE FROM results WHERE document = ?', (document,))
+
+    def write(self, result: ValidationResult) -> None:
+        self._batch.append((
+            self._document,
+            self._flavour,
+            self._validated_at,
+            result.status,
+            result.code.name if result.code else '',
+            result.location,
+            result.message))
+        if len(self._batch) >= self._batch_size:
+            self.flush()
+
+    def flush(self) -> None:
+        if len(self._batch) > 0:
+            self._connection.executemany(self._insert, self._batch)
+            self._batch.clear()
+        self._connection.commit()
+
+    def close(self) -> None:
+        """
+        Writes any outstanding results, and closes the database if the
+        sink opened it.
+        """
+        self.flush()
+        if self._own_connection:
+            self._connection.close()
@@ -12,6 +12,7 @@ ValidationCode = Enum(
     preParse_encoding
     preParse_byteOrderMark
     preParse_byteOrderMark_corrupt
+    preParse_compression
     xml_encoding_decl
     xml_entity_decl
     xml_document_validity
@@ -102,5 +103,6 @@ ValidationCode = Enum(
     bbc_timing_minimum_subtitles
     bbc_timing_segment_overlap
     validator_internal_exception
+    validator_resource_limit
     """
     )
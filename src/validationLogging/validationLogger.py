@@ -4,71 +4,339 @@
 
 from io import TextIOWrapper
 from csv import writer as csvWriter
+import contextlib
+import dataclasses
+import functools
 import json
+from random import Random
+from types import MappingProxyType
 from typing import Any
 from .validationCodes import ValidationCode
 from .validationResult import ValidationResult, \
-    GOOD, INFO, WARN, ERROR, SKIP
+    GOOD, INFO, WARN, ERROR, SKIP, CsvStatusStrings, csv_headers
+from .resultSinks import ResultSink
+from .resourceLimits import ResourceLimits
+
+
+class LocationSample:
+    """
+    Bounded sample of the locations of repeated validation results.
+
+    Keeps the first ``first_count`` locations and a uniformly random
+    sample of up to ``random_count`` of the later ones, chosen by
+    reservoir sampling, so that the memory used does not depend on
+    how many locations are added.
+    """
+
+    def __init__(
+            self,
+            first_count: int,
+            random_count: int,
+            rng: Random):
+        self._first_count = first_count
+        self._random_count = random_count
+        self._rng = rng
+        self._first = []
+        self._reservoir = []
+        self.count = 0
+
+    def add(self, location: str):
+        self.count += 1
+        if len(self._first) < self._first_count:
+            self._first.append(location)
+            return
+
+        later_count = self.count - len(self._first)
+        if len(self._reservoir) < self._random_count:
+            self._reservoir.append((later_count, location))
+        else:
+            replace_index = self._rng.randrange(later_count)
+            if replace_index < self._random_count:
+                self._reservoir[replace_index] = (later_count, location)
+
+    def locations(self) -> list[str]:
+        """Returns the sampled locations in the order they were added."""
+        return self._first + [
+            location for _, location in sorted(self._reservoir)]
+
+    def describe(self) -> str:
+        return '{} locations including {}'.format(
+            self.count, '; '.join(self.locations()))
 
 
 class ValidationLogger(list[ValidationResult]):
+    """
+    List of validation results.
+
+    Every appended result is also counted by code and status, and
+    passed to each attached
+    :py:class:`ResultSink<src.validationLogging.resultSinks.ResultSink>`.
+    If ``retain_results`` is False, results are counted and passed to
+    the sinks but not kept in the list.
+
+    Results whose status is below ``min_status`` are counted but not
+    built, retained or passed to the sinks. A message logged with
+    ``message_args`` is only formatted with them if the result is kept,
+    so that checks that log a result for every element do not format
+    messages that would be thrown away.
+
+    If ``collate_more_than`` is more than zero, retained results are
+    collated as they are appended: once more than ``collate_more_than``
+    results have the same status, message and code they are replaced,
+    at the position of the first of them, by a single result whose
+    location gives the number of locations and a
+    :py:class:`LocationSample` of them. The sample is seeded so that
+    the same input gives the same output. So that collating stays cheap
+    however many results are retained or collated, the replaced results
+    are only removed, and the collated locations only described, when
+    the list is next used: every list method does so first.
+
+    If ``resource_limits`` is set, it is consulted before each result
+    is counted, and may raise
+    :py:class:`ResourceLimitExceeded<src.validationLogging.resourceLimits.ResourceLimitExceeded>`
+    to stop the running check.
+    """
+
+    # Until __init__ sets them, or an unpickled logger's attributes are
+    # restored, which happens after its results are
+    _removed_ids = frozenset()
+    _undescribed = MappingProxyType({})
+
+    def __init__(
+            self,
+            *args,
+            sinks: list[ResultSink] | None = None,
+            retain_results: bool = True,
+            collate_more_than: int = 0,
+            collate_sample_first: int = 3,
+            collate_sample_random: int = 2,
+            min_status: int = GOOD,
+            resource_limits: ResourceLimits | None = None):
+        super().__init__(*args)
+        self._min_status = min_status
+        self._resource_limits = resource_limits
+        self._sinks = [] if sinks is None else sinks
+        self._retain_results = retain_results
+        self._code_status_counts = {}
+        self._result_count = 0
+        self._collate_more_than = collate_more_than
+        self._collate_sample_first = collate_sample_first
+        self._collate_sample_random = collate_sample_random
+        self._collate_rng = Random(0)
+        # Map of (status, message, code) to the results retained so far,
+        # or to a (collated result, location sample) tuple once collated
+        self._collations = {}
+        # Identities of the retained results that collation has replaced
+        self._removed_ids = set()
+        # Collations with locations added since the collated result's
+        # location was last described
+        self._undescribed = {}
+        for validation_result in self:
+            self._count(validation_result)
+
+    def _collate(self, validation_result: ValidationResult):
+        collate_key = (
+            validation_result.status,
+            validation_result.message,
+            validation_result.code)
+        collation = self._collations.get(collate_key)
+        if collation is None:
+            # A copy, which becomes the collated result if there are
+            # enough alike, so that the appended result is not changed
+            first_result = dataclasses.replace(validation_result)
+            self._collations[collate_key] = [first_result]
+            super().append(first_result)
+        elif isinstance(collation, tuple):
+            collation[1].add(validation_result.location)
+            self._undescribed[collate_key] = collation
+        elif len(collation) < self._collate_more_than:
+            collation.append(validation_result)
+            super().append(validation_result)
+        else:
+            # The first retained result becomes the collated one, and
+            # the others are removed when the list is next used
+            location_sample = LocationSample(
+                first_count=self._collate_sample_first,
+                random_count=self._collate_sample_random,
+                rng=self._collate_rng)
+            for retained_result in collation:
+                location_sample.add(retained_result.location)
+            location_sample.add(validation_result.location)
+            collated_result = collation[0]
+            collated_result.location = location_sample.describe()
+            self._removed_ids.update(id(r) for r in collation[1:])
+            self._collations[collate_key] = \
+                (collated_result, location_sample)
+
+    def _settle(self):
+        """
+        Removes the results that collation has replaced and describes
+        the locations of the collated results that have been added to.
+        """
+        if len(self._removed_ids) > 0:
+            removed_ids = self._removed_ids
+            super().__setitem__(slice(None), [
+                r for r in super().__iter__() if id(r) not in removed_ids])
+            self._removed_ids = set()
+        if len(self._undescribed) > 0:
+            for collated_result, location_sample \
+                    in self._undescribed.values():
+                collated_result.location = location_sample.describe()
+            self._undescribed.clear()
+
+    def _count(self, validation_result: ValidationResult):
+        self._countOnly(
+            code=validation_result.code,
+            status=validation_result.status)
+
+    def _countOnly(self, code: ValidationCode | None, status: int):
+        if self._resource_limits is not None:
+            self._resource_limits.checkResult(self._result_count)
+        count_key = (code, status)
+        self._code_status_counts[count_key] = \
+            self._code_status_counts.get(count_key, 0) + 1
+        self._result_count += 1
+
+    def isEnabledFor(self, status: int) -> bool:
+        """Returns True if results with the status will be kept."""
+        return status >= self._min_status
+
+    def _uninterrupted(self):
+        # The time limit must not interrupt a result half logged
+        if self._resource_limits is None:
+            return contextlib.nullcontext()
+        return self._resource_limits.uninterrupted()
+
     def append(self, validation_result: ValidationResult):
-        super().append(validation_result)
+        with self._uninterrupted():
+            self._append(validation_result)
 
-    def good(self,
+    def _append(self, validation_result: ValidationResult):
+        if validation_result.status < self._min_status:
+            self._countOnly(
+                code=validation_result.code,
+                status=validation_result.status)
+            return
+        self._count(validation_result)
+        if self._retain_results and self._collate_more_than > 0:
+            self._collate(validation_result)
+        elif self._retain_results:
+            super().append(validation_result)
+        for sink in self._sinks:
+            sink.write(validation_result)
+
+    def codeStatusCount(
+            self,
+            code: ValidationCode | None,
+            status: int) -> int:
+        """
+        Returns the number of results appended with the code and status.
+
+        Includes results that were not retained.
+        """
+        return self._code_status_counts.get((code, status), 0)
+
+    def resultCount(self) -> int:
+        """
+        Returns the number of results appended, for any code and status.
+
+        Includes results that were not retained.
+        """
+        return self._result_count
+
+    def statusCount(self, status: int) -> int:
+        """
+        Returns the number of results appended with the status, for any code.
+
+        Includes results that were not retained.
+        """
+        return sum(
+            count for (_, count_status), count
+            in self._code_status_counts.items()
+            if count_status == status)
+
+    def merge(self, other: 'ValidationLogger'):
+        """
+        Logs the results of another logger as if they had been logged
+        here, in the same order, including those that it only counted.
+
+        Intended for a logger that neither collates nor drops results
+        other than by status, such as one that buffered the results of
+        a single check.
+        """
+        retained_counts = {}
+        with self._uninterrupted():
+            for validation_result in other:
+                count_key = (
+                    validation_result.code, validation_result.status)
+                retained_counts[count_key] = \
+                    retained_counts.get(count_key, 0) + 1
+                self._append(validation_result)
+            for (code, status), count in other._code_status_counts.items():
+                for _ in range(
+                        count - retained_counts.get((code, status), 0)):
+                    self._countOnly(code=code, status=status)
+
+    def addSink(self, sink: ResultSink):
+        self._sinks.append(sink)
+
+    def closeSinks(self):
+        for sink in self._sinks:
+            sink.close()
+
+    def _log(self,
+             status: int,
              location: str,
              message: str,
-             code: ValidationCode = ValidationCode.unclassified):
+             code: ValidationCode,
+             message_args: tuple):
+        if status < self._min_status:
+            # Counted, but neither formatted nor built
+            with self._uninterrupted():
+                self._countOnly(code=code, status=status)
+            return
         self.append(ValidationResult(
-            status=GOOD,
+            status=status,
             code=code,
             location=location,
-            message=message
+            message=message.format(*message_args) if message_args
+            else message
         ))
 
+    def good(self,
+             location: str,
+             message: str,
+             code: ValidationCode = ValidationCode.unclassified,
+             message_args: tuple = ()):
+        self._log(GOOD, location, message, code, message_args)
+
     def info(self,
              location: str,
              message: str,
-             code: ValidationCode = ValidationCode.unclassified):
-        self.append(ValidationResult(
-            status=INFO,
-            code=code,
-            location=location,
-            message=message
-        ))
+             code: ValidationCode = ValidationCode.unclassified,
+             message_args: tuple = ()):
+        self._log(INFO, location, message, code, message_args)
 
     def warn(self,
              location: str,
              message: str,
-             code: ValidationCode = ValidationCode.unclassified):
-        self.append(ValidationResult(
-            status=WARN,
-            code=code,
-            location=location,
-            message=message
-        ))
+             code: ValidationCode = ValidationCode.unclassified,
+             message_args: tuple = ()):
+        self._log(WARN, location, message, code, message_args)
 
     def error(self,
               location: str,
               message: str,
-              code: ValidationCode = ValidationCode.unclassified):
-        self.append(ValidationResult(
-            status=ERROR,
-            code=code,
-            location=location,
-            message=message
-        ))
+              code: ValidationCode = ValidationCode.unclassified,
+              message_args: tuple = ()):
+        self._log(ERROR, location, message, code, message_args)
 
     def skip(self,
-              location: str,
-              message: str,
-              code: ValidationCode = ValidationCode.unclassified):
-        self.append(ValidationResult(
-            status=SKIP,
-            code=code,
-            location=location,
-            message=message
-        ))
+             location: str,
+             message: str,
+             code: ValidationCode = ValidationCode.unclassified,
+             message_args: tuple = ()):
+        self._log(SKIP, location, message, code, message_args)
 
     def collateResults(
             self,
@@ -114,20 +382,12 @@ class ValidationLogger(list[ValidationResult]):
             self,
             stream: TextIOWrapper,
             ):
-        headers = ['status', 'code', 'location', 'message']
-        status_string_map = {
-            GOOD: 'Pass',
-            INFO: 'Info',
-            WARN: 'Warn',
-            ERROR: 'Fail',
-            SKIP: 'Skip',
-        }
         stream.reconfigure(newline='')
         csv_writer = csvWriter(stream)
-        csv_writer.writerow(headers)
+        csv_writer.writerow(csv_headers)
         for result in self:
             csv_writer.writerow([
-                status_string_map.get(result.status),
+                CsvStatusStrings.get(result.status),
                 result.code.name if result.code else '',
                 result.location,
                 result.message
@@ -142,3 +402,34 @@ class ValidationLogger(list[ValidationResult]):
                 [validation_result.asDict() for validation_result in self]
             )
         )
+
+    def write_ndjson(
+            self,
+            stream: TextIOWrapper,
+            ):
+        encoder = json.JSONEncoder()
+        for validation_result in self:
+            stream.write(encoder.encode(validation_result.asDict()) + '\n')
+
+
+def _settling(method):
+    # Wraps a list method so that the list is settled before it is used
+    @functools.wraps(method)
+    def settling_method(self, *args, **kwargs):
+        self._settle()
+        return method(self, *args, **kwargs)
+    return settling_method
+
+
+# Every inherited list method but append, which only adds to the end,
+# sees the list as if the results that collation replaced had been
+# removed straight away
+for _method_name in [
+        '__add__', '__contains__', '__delitem__', '__eq__', '__ge__',
+        '__getitem__', '__gt__', '__iadd__', '__imul__', '__iter__',
+        '__le__', '__len__', '__lt__', '__mul__', '__ne__',
+        '__reduce_ex__', '__repr__', '__reversed__', '__rmul__',
+        '__setitem__', 'clear', 'copy', 'count', 'extend', 'index',
+        'insert', 'pop', 'remove', 'reverse', 'sort']:
+    setattr(ValidationLogger, _method_name,
+            _settling(getattr(list, _method_name)))
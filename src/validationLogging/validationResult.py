@@ -27,6 +27,22 @@ StatusStrings = {
 Map of Validation status codes to human readable strings
 """
 
+CsvStatusStrings = {
+    GOOD: 'Pass',
+    INFO: 'Info',
+    WARN: 'Warn',
+    ERROR: 'Fail',
+    SKIP: 'Skip',
+}
+"""
+Map of Validation status codes to the strings used in CSV output
+"""
+
+csv_headers = ['status', 'code', 'location', 'message']
+"""
+Column headers used in CSV output
+"""
+
 
 @dataclass
 class ValidationResult:
@@ -8,31 +8,27 @@ from .validationResult import ERROR, WARN, SKIP
 
 
 class ValidationPassChecker():
+    name: str = ''
     _check_codes: list[ValidationCode] = []
 
     @classmethod
     def failuresAndWarningsAndSkips(
             cls,
             log: ValidationLogger) -> tuple[int, int, int]:
-        fails = [
-            v for v in log
-            if v.code in cls._check_codes
-            and v.status == ERROR
-        ]
-        warns = [
-            v for v in log
-            if v.code in cls._check_codes
-            and v.status == WARN
-        ]
-        skips = [
-            v for v in log
-            if v.code in cls._check_codes
-            and v.status == SKIP
-        ]
-        return len(fails), len(warns), len(skips)
+        fails = sum(
+            log.codeStatusCount(code=code, status=ERROR)
+            for code in cls._check_codes)
+        warns = sum(
+            log.codeStatusCount(code=code, status=WARN)
+            for code in cls._check_codes)
+        skips = sum(
+            log.codeStatusCount(code=code, status=SKIP)
+            for code in cls._check_codes)
+        return fails, warns, skips
 
 
 class XmlPassChecker(ValidationPassChecker):
+    name = 'XML'
     _check_codes: list[ValidationCode] = [
         ValidationCode.preParse_nullBytes,
         ValidationCode.preParse_encoding,
@@ -45,6 +41,7 @@ class XmlPassChecker(ValidationPassChecker):
 
 
 class TtmlPassChecker(ValidationPassChecker):
+    name = 'TTML'
     _check_codes: list[ValidationCode] = [
         ValidationCode.xml_root_element,
         ValidationCode.xml_tt_namespace,
@@ -71,6 +68,7 @@ class TtmlPassChecker(ValidationPassChecker):
 
 
 class DaptPassChecker(ValidationPassChecker):
+    name = 'DAPT'
     _check_codes: list[ValidationCode] = [
         ValidationCode.xml_xsd,
         ValidationCode.xml_encoding_decl,
@@ -101,6 +99,7 @@ class DaptPassChecker(ValidationPassChecker):
 
 
 class EbuttdPassChecker(ValidationPassChecker):
+    name = 'EBU-TT-D'
     _check_codes: list[ValidationCode] = [
         ValidationCode.xml_xsd,
         ValidationCode.ttml_attribute_styling_attribute,
@@ -127,6 +126,7 @@ class EbuttdPassChecker(ValidationPassChecker):
 
 
 class BbcPassChecker(ValidationPassChecker):
+    name = 'BBC'
     _check_codes: list[ValidationCode] = [
         ValidationCode.bbc_block_backgroundColor_constraint,
         ValidationCode.bbc_region_attributes_constraint,
@@ -147,3 +147,13 @@ class BbcPassChecker(ValidationPassChecker):
         ValidationCode.bbc_timing_minimum_subtitles,
         ValidationCode.bbc_timing_segment_overlap,
     ]
+
+
+# Pass checkers by the name used to select them on the command line
+pass_checkers: dict[str, type[ValidationPassChecker]] = {
+    'xml': XmlPassChecker,
+    'ttml': TtmlPassChecker,
+    'ebuttd': EbuttdPassChecker,
+    'dapt': DaptPassChecker,
+    'bbc': BbcPassChecker,
+}
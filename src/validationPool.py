@@ -0,0 +1,118 @@
+# SPDX-FileCopyrightText: Copyright © 2026 BBC
+#
+# SPDX-License-Identifier: BSD-3-Clause
+
+"""
+Executors of warm validation workers.
+
+A warm worker has imported the checks, built the schemas and built the
+constraint set for each flavour before it is given its first document,
+so that no document pays for those costs. Thread workers share one
+copy of the schemas; process workers each build their own, but can
+validate in parallel.
+
+From Python 3.14, interpreter workers each run in their own
+sub-interpreter of this process, so they can validate in parallel like
+process workers, without starting a process for each worker or sending
+documents and reports between processes. Each still builds its own
+schemas. The ``interpreter`` kind is only in :py:data:`executor_kinds`
+when it is available.
+"""
+
+from collections.abc import Iterable, Iterator
+from concurrent.futures import Executor, ProcessPoolExecutor, \
+    ThreadPoolExecutor
+from src.validator import ValidationOptions, ValidationReport, \
+    ValidationSource, constraint_set, flavours, validate
+
+try:
+    from concurrent.futures import InterpreterPoolExecutor
+except ImportError:  # Before Python 3.14
+    InterpreterPoolExecutor = None
+
+executor_kinds = ['thread', 'process'] \
+    + (['interpreter'] if InterpreterPoolExecutor is not None else [])
+
+
+def warm_worker(options: ValidationOptions | None = None):
+    """
+    Builds the default constraint set of every flavour, and those for
+    the segment duration and timing of ``options``, if given.
+
+    The epoch of each document is passed to the checks as it is
+    validated, so one constraint set serves every segment.
+    """
+    for flavour in flavours:
+        constraint_set(flavour)
+        if options is not None:
+            constraint_set(
+                flavour,
+                segment_dur=options.segment_dur,
+                segment_relative_timing=options.segment_relative_timing)
+
+
+def validate_in_worker(
+        source: ValidationSource,
+        flavour: str,
+        options: ValidationOptions | None) -> ValidationReport:
+    """
+    Validates a document in an executor worker.
+
+    Result sinks cannot be passed to process or interpreter workers, so
+    ``options`` should not have any when using those executors. The
+    parsed document of a gate tier report is not returned, since copying
+    it back from a worker would cost more than parsing it again.
+    """
+    report = validate(source=source, flavour=flavour, options=options)
+    report.parsed = None
+    return report
+
+
+def make_executor(
+        kind: str = 'thread',
+        max_workers: int | None = None) -> Executor:
+    """
+    Returns an executor of the given kind, one of
+    :py:data:`executor_kinds`, whose workers are warmed by
+    :py:func:`warm_worker` when they start.
+    """
+    match kind:
+        case 'thread':
+            # Warm this thread too, so that workers do not race to
+            # build the same constraint sets
+            warm_worker()
+            return ThreadPoolExecutor(
+                max_workers=max_workers,
+                initializer=warm_worker)
+        case 'process':
+            return ProcessPoolExecutor(
+                max_workers=max_workers,
+                initializer=warm_worker)
+        case 'interpreter':
+            if InterpreterPoolExecutor is None:
+                raise ValueError(
+                    'Interpreter executors need Python 3.14 or later')
+            # The documents and reports are pickled to pass them between
+            # interpreters, which for bytes is a single copy
+            return InterpreterPoolExecutor(
+                max_workers=max_workers,
+                initializer=warm_worker)
+    raise ValueError('Executor kind {} not recognised'.format(kind))
+
+
+def validate_batch(
+        executor: Executor,
+        sources: Iterable[ValidationSource],
+        flavour: str = 'bbc',
+        options: ValidationOptions | None = None) \
+        -> Iterator[ValidationReport]:
+    """
+    Validates the documents on the executor, yielding their reports in
+    the same order as the sources.
+    """
+    sources = list(sources)
+    return executor.map(
+        validate_in_worker,
+        sources,
+        [flavour] * len(sources),
+        [options] * len(sources))
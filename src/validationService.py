@@ -0,0 +1,354 @@
+# SPDX-FileCopyrightText: Copyright © 2026 BBC
+#
+# SPDX-License-Identifier: BSD-3-Clause
+
+"""
+Long-running HTTP validation service.
+
+``POST /validate`` validates the TTML document in the request body and
+responds with the results as JSON or CSV. Query parameters select the
+flavour and the segment and vertical options of ``validate-ttml``.
+``GET /health`` reports that the service is running and ``GET /ready``
+that its workers are warm.
+
+Documents are validated by a pool of warm workers, made by
+:py:func:`make_executor<src.validationPool.make_executor>`. At most
+``max_queue`` documents are accepted at once, counting those being
+validated, including those whose requests have timed out but whose
+workers have not yet stopped, and those waiting for a worker; further
+requests are refused with 503 so that a busy service does not build up
+an unbounded backlog.
+"""
+
+from concurrent.futures import Executor, TimeoutError as FutureTimeoutError
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+import argparse
+import io
+import json
+import logging
+import os
+import sys
+import threading
+from src.ttmlValidator import default_args, get_epoch
+from src.validationPool import executor_kinds, make_executor, \
+    validate_in_worker, warm_worker
+from src.validator import ValidationOptions, ValidationReport, flavours
+
+output_formats = ['json', 'csv']
+
+
+class ServiceBusy(Exception):
+    """Raised when the service already has as many requests as it accepts."""
+
+
+class ValidationService:
+    """
+    Validates documents on a pool of warm workers, accepting at most
+    ``max_queue`` documents at once.
+
+    If ``timeout`` is set, a document that takes longer than ``timeout``
+    seconds raises ``TimeoutError``, and the worker is asked to stop
+    through the ``max_seconds`` resource limit.
+    """
+
+    def __init__(
+            self,
+            executor: Executor | None = None,
+            kind: str = 'process',
+            max_workers: int | None = None,
+            max_queue: int = 16,
+            timeout: float | None = None,
+            max_bytes: int = 0):
+        self._max_workers = max_workers or os.process_cpu_count() or 1
+        self._own_executor = executor is None
+        self._executor = make_executor(
+            kind=kind, max_workers=self._max_workers) \
+            if executor is None else executor
+        self._slots = threading.BoundedSemaphore(max_queue)
+        self.timeout = timeout
+        self.max_bytes = max_bytes
+        self._warm_futures = [
+            self._executor.submit(warm_worker)
+            for _ in range(self._max_workers)]
+
+    def isReady(self) -> bool:
+        """
+        Returns True once the warm-up jobs submitted when the service
+        started have finished.
+
+        One job is submitted for each worker, but a worker may run more
+        than one of them, so this does not show that every worker is
+        warm. Workers made by
+        :py:func:`make_executor<src.validationPool.make_executor>` warm
+        themselves when they start, before running any document.
+        """
+        return all(
+            future.done() and future.exception() is None
+            for future in self._warm_futures)
+
+    def validate(
+            self,
+            document: bytes,
+            flavour: str,
+            options: ValidationOptions) -> ValidationReport:
+        """
+        Validates the document on a worker, raising
+        :py:class:`ServiceBusy` if no more documents can be accepted.
+        """
+        if not self._slots.acquire(blocking=False):
+            raise ServiceBusy()
+        try:
+            if self.timeout is not None and \
+               (options.max_seconds <= 0
+                    or options.max_seconds > self.timeout):
+                options.max_seconds = self.timeout
+            future = self._executor.submit(
+                validate_in_worker, document, flavour, options)
+        except BaseException:
+            self._slots.release()
+            raise
+        # A job that has started cannot be cancelled, so the slot is held
+        # until it finishes, even if the request times out first
+        future.add_done_callback(lambda _: self._slots.release())
+        try:
+            return future.result(timeout=self.timeout)
+        except FutureTimeoutError:
+            future.cancel()
+            raise TimeoutError(
+                'Validation took longer than {}s'.format(self.timeout))
+
+    def close(self):
+        if self._own_executor:
+            self._executor.shutdown(wait=True, cancel_futures=True)
+
+
+def _bool_parameter(value: str) -> bool:
+    match value.lower():
+        case 'true' | '1' | 'yes':
+            return True
+        case 'false' | '0' | 'no' | '':
+            return False
+    raise ValueError('{} is not true or false'.format(value))
+
+
+def request_options(query: str) -> tuple[str, str, ValidationOptions]:
+    """
+    Returns the flavour, output format and validation options given by
+    the query string of a validation request.
+
+    Raises ValueError if a parameter is not valid.
+    """
+    parameters = {
+        name: values[-1]
+        for name, values in parse_qs(query, keep_blank_values=True).items()}
+    flavour = parameters.get('flavour', 'bbc')
+    if flavour not in flavours + ['auto']:
+        raise ValueError('flavour must be one of {}'.format(
+            ', '.join(flavours + ['auto'])))
+    output_format = parameters.get('format', 'json')
+    if output_format not in output_formats:
+        raise ValueError('format must be one of {}'.format(
+            ', '.join(output_formats)))
+
+    # As for validate-ttml -segment, the segment number is taken from
+    # the beginning of the document's file name
+    segdur = float(parameters.get('segdur', '3.84'))
+    segment = _bool_parameter(parameters.get('segment', 'false'))
+    epoch = 0.0
+    segment_dur = None
+    if segment:
+        name = parameters.get('name')
+        if name is None:
+            raise ValueError('segment requires the document name')
+        epoch = get_epoch(
+            default_args(segment=True, segdur=segdur), filename=name)
+        segment_dur = segdur
+
+    options = ValidationOptions(
+        epoch=epoch,
+        segment_dur=segment_dur,
+        segment_relative_timing=_bool_parameter(
+            parameters.get('segment_relative_timing', 'false')),
+        vertical=_bool_parameter(parameters.get('vertical', 'false')),
+        collate_more_than=int(parameters.get('collate_more_than', '5')),
+    )
+    return flavour, output_format, options
+
+
+def format_report(report: ValidationReport, output_format: str) -> str:
+    if output_format == 'csv':
+        out = io.TextIOWrapper(io.BytesIO(), encoding='utf-8')
+        report.results.write_csv(out)
+        out.flush()
+        return out.buffer.getvalue().decode('utf-8')
+    return json.dumps(report.asDict())
+
+
+class ValidationRequestHandler(BaseHTTPRequestHandler):
+    """Handles requests for the :py:class:`ValidationService`."""
+
+    server_version = 'ttml-validator'
+
+    def _respond(
+            self,
+            status: HTTPStatus,
+            body: str,
+            content_type: str = 'application/json',
+            headers: dict[str, str] | None = None):
+        body_bytes = body.encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', content_type + '; charset=utf-8')
+        self.send_header('Content-Length', str(len(body_bytes)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body_bytes)
+
+    def _respondError(self, status: HTTPStatus, message: str, **kwargs):
+        self._respond(status, json.dumps({'error': message}), **kwargs)
+
+    def log_message(self, format, *args):
+        logging.info('%s - %s', self.address_string(), format % args)
+
+    def do_GET(self):
+        service = self.server.service  # ty:ignore[unresolved-attribute]
+        match urlsplit(self.path).path:
+            case '/health':
+                self._respond(HTTPStatus.OK, json.dumps({'status': 'ok'}))
+            case '/ready':
+                if service.isReady():
+                    self._respond(
+                        HTTPStatus.OK, json.dumps({'status': 'ready'}))
+                else:
+                    self._respond(
+                        HTTPStatus.SERVICE_UNAVAILABLE,
+                        json.dumps({'status': 'warming'}))
+            case _:
+                self._respondError(HTTPStatus.NOT_FOUND, 'Not found')
+
+    def do_POST(self):
+        service = self.server.service  # ty:ignore[unresolved-attribute]
+        url = urlsplit(self.path)
+        if url.path != '/validate':
+            self._respondError(HTTPStatus.NOT_FOUND, 'Not found')
+            return
+
+        try:
+            flavour, output_format, options = request_options(url.query)
+        except ValueError as e:
+            self._respondError(HTTPStatus.BAD_REQUEST, str(e))
+            return
+
+        content_length = self.headers.get('Content-Length', '')
+        if not content_length.isdigit():
+            self._respondError(
+                HTTPStatus.LENGTH_REQUIRED, 'Content-Length is required')
+            return
+        length = int(content_length)
+        if 0 < service.max_bytes < length:
+            self._respondError(
+                HTTPStatus.REQUEST_ENTITY_TOO_LARGE,
+                'Document is larger than the limit of {} bytes'.format(
+                    service.max_bytes))
+            return
+        document = self.rfile.read(length)
+
+        try:
+            report = service.validate(
+                document=document, flavour=flavour, options=options)
+        except ServiceBusy:
+            self._respondError(
+                HTTPStatus.SERVICE_UNAVAILABLE,
+                'Too many requests in progress',
+                headers={'Retry-After': '1'})
+            return
+        except TimeoutError as e:
+            self._respondError(HTTPStatus.GATEWAY_TIMEOUT, str(e))
+            return
+
+        self._respond(
+            HTTPStatus.OK,
+            format_report(report, output_format),
+            content_type='text/csv' if output_format == 'csv'
+            else 'application/json',
+            headers={'X-Document-Valid': 'true' if report.valid else 'false'})
+
+
+def make_server(
+        service: ValidationService,
+        host: str = '127.0.0.1',
+        port: int = 8080) -> ThreadingHTTPServer:
+    """
+    Returns an HTTP server for the service. Use port 0 to listen on any
+    free port, which can be found from ``server.server_address``.
+    """
+    server = ThreadingHTTPServer((host, port), ValidationRequestHandler)
+    server.service = service  # ty:ignore[unresolved-attribute]
+    return server
+
+
+def main():
+    logging.getLogger().setLevel(logging.INFO)
+    parser = argparse.ArgumentParser(
+        description='Run an HTTP service that validates TTML documents')
+    parser.add_argument(
+        '-host',
+        default='127.0.0.1',
+        help='Address to listen on (default 127.0.0.1)')
+    parser.add_argument(
+        '-port',
+        type=int,
+        default=8080,
+        help='Port to listen on (default 8080)')
+    parser.add_argument(
+        '-executor',
+        default='process',
+        choices=executor_kinds,
+        help='Kind of worker pool (default process)')
+    parser.add_argument(
+        '-workers',
+        type=int,
+        default=None,
+        help='Number of workers (default the number of CPUs)')
+    parser.add_argument(
+        '-max_queue',
+        type=int,
+        default=16,
+        help='Most requests accepted at once, including those waiting '
+             'for a worker; others get 503 (default 16)')
+    parser.add_argument(
+        '-timeout',
+        type=float,
+        default=None,
+        help='Seconds to allow for validating each document, after which '
+             'the response is 504')
+    parser.add_argument(
+        '-max_bytes',
+        type=int,
+        default=0,
+        help='If more than zero, refuse documents larger than this with 413')
+    args = parser.parse_args()
+
+    service = ValidationService(
+        kind=args.executor,
+        max_workers=args.workers,
+        max_queue=args.max_queue,
+        timeout=args.timeout,
+        max_bytes=args.max_bytes)
+    server = make_server(service=service, host=args.host, port=args.port)
+    logging.info('Listening on http://{}:{}/'.format(
+        *server.server_address[:2]))
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        service.close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
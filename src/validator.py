@@ -0,0 +1,1189 @@
+# SPDX-FileCopyrightText: Copyright © 2026 BBC
+#
+# SPDX-License-Identifier: BSD-3-Clause
+
+"""
+Library interface to the validator.
+
+:py:func:`validate` validates a document given as bytes, a path or an
+already parsed element tree, and returns a :py:class:`ValidationReport`
+holding the results, without writing any output. The command line
+:py:func:`validate_ttml<src.ttmlValidator.validate_ttml>` is built on it.
+
+The checks are split into two tiers. The ``gate`` tier reads and parses
+the document and checks its structure, root element and namespace and
+schema, which is enough to accept or reject it quickly; the ``full``
+tier checks its styles, regions and timing. Either tier can be run on
+its own with :py:attr:`ValidationOptions.tier`, and the full tier can be
+resumed with :py:func:`resume` from the document that the gate tier
+parsed, without reading, parsing or indexing it again.
+
+The ``auto`` flavour picks the flavour of each document with
+:py:func:`detect_flavour` once it has been parsed, and
+:py:func:`validate_flavours` validates a document as several flavours
+from a single read, pre-parse and parse.
+"""
+
+import copy
+import functools
+import io
+import os
+from concurrent.futures import ThreadPoolExecutor
+import xml.etree.ElementTree as ElementTree
+from contextlib import nullcontext
+from xml.etree.ElementTree import Element
+from src.checkProfiler import CheckProfile, CheckProfiler, unwrapped
+from src.checkScheduler import CheckScheduler
+from src.compressedInput import CompressionError, decompressed_bytes, \
+    read_decompressed
+from src.constraintSets.constraintSet import ConstraintSet
+from src.constraintSets.bbcConstraints import BbcSubtitleConstraintSet
+from src.constraintSets.daptConstraints import DaptConstraintSet
+from src.validationLogging.errorBudget import ErrorBudget
+from src.validationLogging.resourceLimits import ResourceLimits, \
+    ResourceLimitExceeded
+from src.validationLogging.resultSinks import ResultSink
+from src.validationLogging.validationCodes import ValidationCode
+from src.validationLogging.validationLogger import ValidationLogger
+from src.validationLogging.validationResult import GOOD
+from src.validationLogging.validationSummariser import pass_checkers
+from src.xmlChecks.daptUtils import ns_daptm
+from src.xmlChecks.ttmlUtils import ns_ttp
+from src.xmlUtils import get_namespace, make_qname
+
+flavours = ['bbc', 'dapt']
+
+# Content profile designators starting with this are DAPT profiles
+dapt_profile_prefix = 'http://www.w3.org/ns/ttml/profile/dapt'
+
+tiers = ['gate', 'full']
+
+
+class ParsedDocument:
+    """
+    A parsed document, with the context built for its checks, such as
+    the ``document_index`` shared by the checks of every flavour.
+
+    A document parsed by the gate tier, whose ``checked_tier`` is
+    ``gate``, has the context its checks built, such as the map of
+    ``xml:id`` values to elements, and the full tier of its flavour is
+    resumed from it. A document made by :py:func:`parse_document` has
+    not been checked, so has no flavour, and can be validated as any
+    flavour: the ``results`` of reading and parsing it are logged again
+    in each report, with its validity so far and the reason validation
+    stopped, if it did, in which case ``root`` may be None.
+
+    The tree is not copied when it is validated, so any changes that the
+    checks make to it are kept.
+    """
+
+    def __init__(
+            self,
+            root: Element | None,
+            context: dict,
+            flavour: str | None,
+            options: 'ValidationOptions',
+            checked_tier: str | None = 'gate',
+            results: ValidationLogger | None = None,
+            valid: bool = True,
+            stop_reason: str | None = None):
+        self.root = root
+        self.context = context
+        self.flavour = flavour
+        self.options = options
+        self.checked_tier = checked_tier
+        self.results = results
+        self.valid = valid
+        self.stop_reason = stop_reason
+
+
+ValidationSource = bytes | bytearray | memoryview | os.PathLike \
+    | io.IOBase | Element | ParsedDocument
+
+
+class ValidationOptions:
+    """
+    Options for :py:func:`validate`, matching the command line options.
+
+    :param epoch: expected begin time of the document in seconds, for
+        segments
+    :param segment_dur: segment duration in seconds, or None if the
+        document is not a segment
+    :param segment_relative_timing: True if times in the document are
+        relative to the segment begin time
+    :param vertical: True if the subtitles are for vertical video
+    :param collate_more_than: if more than zero, collate results when
+        there are more than this many alike
+    :param collate_sample_first: first locations listed for each
+        collated result
+    :param collate_sample_random: randomly sampled later locations
+        listed for each collated result
+    :param min_status: only keep results with this status or more severe
+    :param max_errors: if more than zero, stop after this many errors
+    :param fail_fast: names of the pass checkers, or ``any``, to stop
+        after the first error of
+    :param max_bytes: input size limit, disabled if zero
+    :param max_elements: element count limit, disabled if zero
+    :param max_depth: element nesting limit, disabled if zero
+    :param max_results: result count limit, disabled if zero
+    :param max_seconds: wall clock time limit, disabled if zero
+    :param include: validation code prefixes or check class names; if
+        any are given, only the checks needed for the matching codes run
+    :param exclude: validation code prefixes or check class names whose
+        codes are not checked
+    :param check_workers: if more than one, run XML checks that do not
+        depend on each other at the same time on this many threads
+    :param profile: if True, profile each check
+    :param profile_memory: if True, also profile memory use, which runs
+        the checks one at a time
+    :param sinks: result sinks to pass each result to as it is logged
+    :param retain_results: if False, only pass results to the sinks
+    :param tier: ``all`` to run every check, or the tier of checks to
+        run, ``gate`` or ``full``
+    """
+
+    def __init__(
+            self,
+            epoch: float = 0.0,
+            segment_dur: float | None = None,
+            segment_relative_timing: bool = False,
+            vertical: bool = False,
+            collate_more_than: int = 0,
+            collate_sample_first: int = 3,
+            collate_sample_random: int = 2,
+            min_status: int = GOOD,
+            max_errors: int = 0,
+            fail_fast: list[str] | None = None,
+            max_bytes: int = 0,
+            max_elements: int = 0,
+            max_depth: int = 0,
+            max_results: int = 0,
+            max_seconds: float = 0,
+            include: list[str] | None = None,
+            exclude: list[str] | None = None,
+            check_workers: int = 0,
+            profile: bool = False,
+            profile_memory: bool = False,
+            sinks: list[ResultSink] | None = None,
+            retain_results: bool = True,
+            tier: str = 'all'):
+        self.epoch = epoch
+        self.segment_dur = segment_dur
+        self.segment_relative_timing = segment_relative_timing
+        self.vertical = vertical
+        self.collate_more_than = collate_more_than
+        self.collate_sample_first = collate_sample_first
+        self.collate_sample_random = collate_sample_random
+        self.min_status = min_status
+        self.max_errors = max_errors
+        self.fail_fast = [] if fail_fast is None else fail_fast
+        self.max_bytes = max_bytes
+        self.max_elements = max_elements
+        self.max_depth = max_depth
+        self.max_results = max_results
+        self.max_seconds = max_seconds
+        self.include = [] if include is None else include
+        self.exclude = [] if exclude is None else exclude
+        self.check_workers = check_workers
+        self.profile = profile
+        self.profile_memory = profile_memory
+        self.sinks = [] if sinks is None else sinks
+        self.retain_results = retain_results
+        self.tier = tier
+
+    def errorBudget(self) -> ErrorBudget:
+        max_errors = self.max_errors
+        if 'any' in self.fail_fast:
+            max_errors = 1
+        return ErrorBudget(
+            max_errors=max_errors,
+            fail_fast=[
+                pass_checkers[name] for name in self.fail_fast
+                if name != 'any'])
+
+    def resourceLimits(self) -> ResourceLimits:
+        return ResourceLimits(
+            max_bytes=self.max_bytes,
+            max_elements=self.max_elements,
+            max_depth=self.max_depth,
+            max_results=self.max_results,
+            max_seconds=self.max_seconds)
+
+    def validationLogger(
+            self,
+            resource_limits: ResourceLimits) -> ValidationLogger:
+        if not self.retain_results:
+            return ValidationLogger(
+                sinks=list(self.sinks),
+                retain_results=False,
+                min_status=self.min_status,
+                resource_limits=resource_limits)
+        return ValidationLogger(
+            sinks=list(self.sinks),
+            collate_more_than=max(self.collate_more_than or 0, 0),
+            collate_sample_first=self.collate_sample_first,
+            collate_sample_random=self.collate_sample_random,
+            min_status=self.min_status,
+            resource_limits=resource_limits)
+
+
+class ValidationReport:
+    """
+    The outcome of :py:func:`validate`.
+
+    ``results`` holds the validation results, including the document
+    validity summaries, and can write them out in any of the output
+    formats. ``profiler`` holds the check profiles if profiling was
+    requested, otherwise it is None.
+
+    ``tier`` is the tier of checks that produced the report, or ``all``.
+    A report of the gate tier holds the ``parsed`` document, from which
+    the full tier can be resumed with :py:func:`resume`, unless the
+    document could not be parsed or validation stopped early. A report
+    of the full tier that read the document itself holds the
+    ``prerequisites``, the results of reading and parsing it and of the
+    gate checks that the full tier needed, which do not count towards
+    its validity; otherwise it is None.
+    """
+
+    def __init__(
+            self,
+            flavour: str,
+            valid: bool,
+            failures: int,
+            skips: int,
+            results: ValidationLogger,
+            profiler: CheckProfiler | None = None,
+            tier: str = 'all',
+            parsed: ParsedDocument | None = None,
+            prerequisites: ValidationLogger | None = None):
+        self.flavour = flavour
+        self.valid = valid
+        self.failures = failures
+        self.skips = skips
+        self.results = results
+        self.profiler = profiler
+        self.tier = tier
+        self.parsed = parsed
+        self.prerequisites = prerequisites
+
+    def exitCode(self) -> int:
+        """
+        Returns 0 if the document is valid, otherwise the number of
+        failures, or 1 if it was not fully checked.
+        """
+        return 0 if self.valid else max(self.failures, 1)
+
+    def asDict(self) -> dict:
+        return {
+            'flavour': self.flavour,
+            'tier': self.tier,
+            'valid': self.valid,
+            'failures': self.failures,
+            'skips': self.skips,
+            'results': [result.asDict() for result in self.results],
+        }
+
+
+def constraint_set(
+        flavour: str,
+        epoch: float = 0.0,
+        segment_dur: float | None = None,
+        segment_relative_timing: bool = False) -> ConstraintSet:
+    """
+    Returns the constraint set for the flavour and timing parameters.
+
+    Constraint sets are cached, so that validating many documents with
+    the same parameters reuses the same checks. Validation gives the
+    timing checks each document's epoch in their context, so it uses the
+    constraint set for epoch 0 whatever the epoch, and a segment of a
+    new epoch does not build another one. ``epoch`` is the epoch of
+    checks run without one in their context.
+    """
+    # Always pass every argument in the same way, so that calls that
+    # give them differently share the same cache entry
+    return _cached_constraint_set(
+        flavour, float(epoch), segment_dur, segment_relative_timing)
+
+
+@functools.lru_cache(maxsize=4)
+def _check_executor(check_workers: int) -> ThreadPoolExecutor:
+    # Shared by all documents validated with the same number of check
+    # workers, so that threads are not started for each document
+    return ThreadPoolExecutor(
+        max_workers=check_workers, thread_name_prefix='check')
+
+
+@functools.lru_cache(maxsize=32)
+def _cached_constraint_set(
+        flavour: str,
+        epoch: float,
+        segment_dur: float | None,
+        segment_relative_timing: bool) -> ConstraintSet:
+    match flavour:
+        case 'bbc':
+            return BbcSubtitleConstraintSet(
+                epoch=epoch,
+                segment_dur=segment_dur,
+                segment_relative_timing=segment_relative_timing
+            )
+        case 'dapt':
+            return DaptConstraintSet(
+                epoch=epoch,
+                segment_dur=segment_dur,
+                segment_relative_timing=segment_relative_timing
+            )
+    raise ValueError('Flavour {} not recognised'.format(flavour))
+
+
+def detect_flavour(root: Element | None) -> str:
+    """
+    Returns the flavour of a parsed document: ``dapt`` if the root
+    element's ``ttp:contentProfiles`` names a DAPT profile or it has an
+    attribute in the DAPT metadata namespace, such as
+    ``daptm:scriptType``, otherwise ``bbc``, including if the document
+    could not be parsed.
+    """
+    if root is None:
+        return 'bbc'
+    content_profiles = root.get(make_qname(ns_ttp, 'contentProfiles'), '')
+    if any(profile.startswith(dapt_profile_prefix)
+           for profile in content_profiles.split()):
+        return 'dapt'
+    if any(get_namespace(name) == ns_daptm for name in root.attrib):
+        return 'dapt'
+    return 'bbc'
+
+
+def parse_document(
+        source: ValidationSource,
+        options: ValidationOptions | None = None,
+        flavour: str = 'bbc') -> ParsedDocument:
+    """
+    Reads, checks and parses a document once, so that it can be
+    validated as several flavours, or as the flavour detected from it,
+    without doing so again.
+
+    The pre-parse checks of ``flavour`` are run; every flavour has the
+    same ones. The results are not collated or passed to sinks until
+    the document is validated. Reading and parsing are not profiled.
+    An element given as the source is copied, since the checks of some
+    flavours change the parsed tree.
+    """
+    if isinstance(source, Element):
+        source = copy.deepcopy(source)
+    return _validate(
+        source=source, flavour=flavour, options=options, parse_only=True)
+
+
+def validate_flavours(
+        source: ValidationSource,
+        flavours_to_validate: list[str],
+        options: ValidationOptions | None = None
+        ) -> dict[str, ValidationReport]:
+    """
+    Validates a document as each of the flavours, returning a report for
+    each, in the order given.
+
+    The document is read, checked before parsing and parsed once, and
+    the tree and the ``document_index`` built from it are shared by the
+    checks of every flavour. Flavours whose checks do not change the
+    tree, such as ``bbc``, are validated first; a flavour whose checks
+    do, such as ``dapt`` with its pruner, is validated on the shared tree
+    if it is the last and the tree was parsed from the source, otherwise
+    on a copy of it, so that an element passed as the source is never
+    changed.
+
+    Raises ValueError as for :py:func:`validate`, including for ``auto``.
+    """
+    flavours_to_validate = list(dict.fromkeys(flavours_to_validate))
+    if options is None:
+        options = ValidationOptions()
+    for flavour in flavours_to_validate:
+        if flavour not in flavours:
+            raise ValueError('Flavour {} not recognised'.format(flavour))
+    constraint_sets = {
+        flavour: constraint_set(
+            flavour=flavour,
+            segment_dur=options.segment_dur,
+            segment_relative_timing=options.segment_relative_timing)
+        for flavour in flavours_to_validate}
+    pre_parse_types = set(
+        tuple(type(check) for check in constraints.preParseChecks())
+        for constraints in constraint_sets.values())
+    if len(pre_parse_types) > 1:
+        # Only the document can be shared
+        if isinstance(source, io.IOBase):
+            source = source.read()
+        return {
+            flavour: validate(source, flavour=flavour, options=options)
+            for flavour in flavours_to_validate}
+
+    # Not parse_document, which would copy an element source that the
+    # flavours that only read it can share
+    parsed = _validate(
+        source=source,
+        flavour=flavours_to_validate[0],
+        options=options,
+        parse_only=True)
+    modifying = [
+        flavour for flavour in flavours_to_validate
+        if any(check.modifiesTree()
+               for check in constraint_sets[flavour].xmlChecks())]
+    reports = {}
+    for flavour in flavours_to_validate:
+        if flavour not in modifying:
+            reports[flavour] = _validate(parsed, flavour, options)
+    # An element source is shared with the caller, so is never changed
+    shared_last = not isinstance(source, Element)
+    for flavour in modifying:
+        flavour_parsed = parsed
+        if (flavour != modifying[-1] or not shared_last) \
+                and parsed.root is not None:
+            flavour_parsed = ParsedDocument(
+                root=copy.deepcopy(parsed.root),
+                context={'document_index': {}},
+                flavour=None,
+                options=options,
+                checked_tier=None,
+                results=parsed.results,
+                valid=parsed.valid,
+                stop_reason=parsed.stop_reason)
+        reports[flavour] = _validate(flavour_parsed, flavour, options)
+    return {flavour: reports[flavour] for flavour in flavours_to_validate}
+
+
+def validate(
+        source: ValidationSource,
+        flavour: str = 'bbc',
+        options: ValidationOptions | None = None) -> ValidationReport:
+    """
+    Validates a document as the flavour, ``bbc``, ``dapt`` or ``auto``
+    to use the flavour detected by :py:func:`detect_flavour`.
+
+    The source may be the document as bytes, the path of a file or a
+    binary stream to read it from, or an already parsed root element.
+    The pre-parse checks work on bytes, so they are not run for a parsed
+    element; an element is copied before it is checked if any of the
+    checks to run modify the tree, such as the DAPT pruner, and is
+    otherwise only read.
+
+    Bytes, files and streams compressed with gzip or zstd are detected by
+    :py:mod:`src.compressedInput` and decompressed as they are read, and
+    ``max_bytes`` limits the decompressed size. Input that cannot be
+    decompressed is reported as a ``preParse_compression`` error.
+
+    If ``options`` selects checks with ``include`` or ``exclude``, the
+    codes that none of the checks run can log are reported as skipped,
+    so that the document validity summaries do not claim that the
+    document was fully checked, and the report is not valid, with an
+    exit code of at least 1, since the document is not known to be.
+
+    If ``options`` selects a ``tier``, only the checks of that tier are
+    reported, and the codes of the other tier are neither checked nor
+    reported as skipped. The document validity summaries are logged at a
+    location that names the tier, and say only whether the tier's checks
+    found failures, not whether the document meets the flavour's
+    requirements. The full tier reads and parses the document itself,
+    and runs the gate checks that it needs, keeping their results apart
+    as the report's ``prerequisites``, unless the source is the
+    :py:class:`ParsedDocument` left by the gate tier, as passed by
+    :py:func:`resume`.
+
+    Raises ValueError if the flavour or tier is not recognised, or a
+    parsed document is given for a tier other than the full tier or
+    another flavour,
+    :py:class:`CheckSelectionError<src.checkScheduler.CheckSelectionError>`
+    if a selection pattern matches nothing, and TypeError if the source
+    is not one of the accepted types.
+    """
+    if flavour == 'auto':
+        if isinstance(source, ParsedDocument) and source.flavour is not None:
+            flavour = source.flavour
+        elif isinstance(source, Element):
+            flavour = detect_flavour(source)
+        else:
+            if not isinstance(source, ParsedDocument):
+                source = parse_document(source, options=options)
+            flavour = detect_flavour(source.root)
+    return _validate(source=source, flavour=flavour, options=options)
+
+
+def _check_codes(checks: list) -> list[ValidationCode]:
+    return [code for check in checks for code in check.validationCodes()]
+
+
+class _ValidationRun:
+    """
+    The state that the stages of validating one document share: the
+    results logged so far, the limits and error budget that decide
+    whether to stop, the document's validity so far and the reason
+    validation stopped, if it has.
+    """
+
+    def __init__(
+            self,
+            validation_results: ValidationLogger,
+            resource_limits: ResourceLimits,
+            error_budget: ErrorBudget,
+            profiler: CheckProfiler | None = None,
+            stage_profiles: dict[str, CheckProfile] | None = None):
+        self.validation_results = validation_results
+        self.resource_limits = resource_limits
+        self.error_budget = error_budget
+        self.profiler = profiler
+        self.stage_profiles = {} if stage_profiles is None \
+            else stage_profiles
+        self.valid = True
+        self.stop_reason = None
+
+    def measure(self, stage: str):
+        # Only measure the decode and parse stages if profiling
+        if self.profiler is None or stage not in self.stage_profiles:
+            return nullcontext()
+        return self.profiler.measure(
+            profile=self.stage_profiles[stage],
+            validation_results=self.validation_results)
+
+    def checkStop(self) -> str | None:
+        """
+        Sets and returns the reason to stop validating, if a resource
+        limit has been reached or the error budget is spent, or None.
+        """
+        limit_reason = self.resource_limits.exceeded()
+        if limit_reason is not None:
+            self.valid = False
+            self.resource_limits.record(self.validation_results)
+            self.stop_reason = limit_reason
+        else:
+            self.stop_reason = self.error_budget.stopReason(
+                self.validation_results)
+        return self.stop_reason
+
+    def skipRemaining(self, remaining_codes: list[ValidationCode]):
+        """Logs the codes that will not be checked, if stopped."""
+        if self.stop_reason is not None:
+            self.error_budget.skipCodes(
+                validation_results=self.validation_results,
+                codes=remaining_codes,
+                reason=self.stop_reason)
+
+
+def _select_checks(
+        constraints: ConstraintSet,
+        options: ValidationOptions,
+        resumed: bool,
+        parse_only: bool,
+        prerequisites: bool) -> tuple[list[int], set[int] | None, str]:
+    """
+    Returns the indices of the XML checks to run, in the order to run
+    them, the indices of the checks of the tier being run, or None if
+    every tier is, and the location to log the summaries at.
+    """
+    scheduler = constraints.checkScheduler()
+    if options.include or options.exclude:
+        check_order = scheduler.select(
+            include=options.include, exclude=options.exclude)
+    else:
+        check_order = scheduler.order()
+    if parse_only:
+        return [], None, 'Document'
+    if options.tier == 'all':
+        return check_order, None, 'Document'
+    if options.tier not in tiers:
+        raise ValueError('Tier {} not recognised'.format(options.tier))
+
+    tier_checks = set(constraints.tierChecks(options.tier))
+    if resumed:
+        # The checks of the gate tier have already run
+        return [index for index in check_order if index in tier_checks], \
+            tier_checks, 'Document ({} tier)'.format(options.tier)
+    if prerequisites:
+        full_checks = set(constraints.tierChecks('full'))
+        check_order = [
+            index for index in scheduler.neededForChecks(
+                index for index in check_order if index in full_checks)
+            if index not in full_checks]
+        return check_order, set(check_order), \
+            'Document (gate tier prerequisites)'
+    return scheduler.neededForChecks(
+        index for index in check_order if index in tier_checks), \
+        tier_checks, 'Document ({} tier)'.format(options.tier)
+
+
+def _read_source(
+        source: ValidationSource,
+        resource_limits: ResourceLimits,
+        copy_element: bool
+        ) -> tuple[Element | None, bytes | None, str | None]:
+    """
+    Returns the root element of a source that is already parsed, or the
+    bytes of one that is not, decompressed and read up to the input size
+    limit, and the reason it could not be decompressed, if it could not.
+    """
+    try:
+        if isinstance(source, ParsedDocument):
+            return source.root, None, None
+        if isinstance(source, Element):
+            # The caller's tree is only read, unless a check that
+            # modifies it runs
+            return copy.deepcopy(source) if copy_element else source, \
+                None, None
+        if isinstance(source, (bytes, bytearray, memoryview)):
+            return None, decompressed_bytes(
+                source, resource_limits.readLimit()), None
+        if isinstance(source, os.PathLike):
+            with open(source, 'rb') as source_file:
+                return None, read_decompressed(
+                    source_file, resource_limits.readLimit()), None
+        if isinstance(source, io.IOBase):
+            return None, read_decompressed(
+                source, resource_limits.readLimit()), None
+    except CompressionError as e:
+        return None, None, str(e)
+    raise TypeError('Cannot validate a {}'.format(type(source).__name__))
+
+
+def _merge_parsed(
+        run: _ValidationRun,
+        source: ParsedDocument,
+        resumed: bool,
+        xml_codes: list[ValidationCode]):
+    """
+    Logs the results of reading and parsing a parsed document again, and
+    takes its validity and the reason validation stopped, if it did.
+    """
+    if source.results is not None:
+        try:
+            run.validation_results.merge(source.results)
+        except ResourceLimitExceeded:
+            pass
+        run.valid = source.valid
+        run.stop_reason = source.stop_reason or run.checkStop()
+        run.skipRemaining(xml_codes)
+    if resumed and source.root is None:
+        run.valid = False
+        run.stop_reason = source.stop_reason
+        run.skipRemaining(xml_codes)
+
+
+def _pre_parse(
+        run: _ValidationRun,
+        pre_parse_checks: list,
+        in_bytes: bytes | None,
+        compression_error: str | None,
+        xml_codes: list[ValidationCode]) -> bytes | None:
+    """
+    Runs the pre-parse checks on the input, returning it as they leave
+    it, or None if validation has stopped.
+    """
+    unparsed_codes = [
+        ValidationCode.preParse_encoding, ValidationCode.xml_parse] \
+        + xml_codes
+    if compression_error is not None:
+        run.valid = False
+        run.validation_results.error(
+            location='Unparsed file',
+            message=compression_error,
+            code=ValidationCode.preParse_compression
+        )
+        run.stop_reason = compression_error
+        run.skipRemaining(_check_codes(pre_parse_checks) + unparsed_codes)
+        return None
+    if run.resource_limits.checkBytes(len(in_bytes)) is not None:
+        run.checkStop()
+        run.skipRemaining(_check_codes(pre_parse_checks) + unparsed_codes)
+        return None
+    for check_index, pre_parse_check in enumerate(pre_parse_checks):
+        current_check_name = ''
+        interrupted = False
+        try:
+            current_check_name = type(unwrapped(pre_parse_check)).__name__
+            with run.resource_limits.interruptible():
+                (check_valid, in_bytes) = \
+                    pre_parse_check.run(in_bytes, run.validation_results)
+            run.valid &= check_valid
+        except ResourceLimitExceeded:
+            interrupted = True
+        except Exception as e:
+            run.valid = False
+            run.validation_results.error(
+                location='While running ' + current_check_name,
+                message='Exception raised: ' + str(e),
+                code=ValidationCode.validator_internal_exception
+            )
+        if run.checkStop() is not None:
+            # An interrupted check is incomplete, so is skipped too
+            run.skipRemaining(
+                _check_codes(pre_parse_checks[
+                    check_index if interrupted else check_index + 1:])
+                + unparsed_codes)
+            return None
+    return in_bytes
+
+
+def _parse(
+        run: _ValidationRun,
+        in_bytes: bytes,
+        xml_codes: list[ValidationCode]) -> Element | None:
+    """
+    Decodes and parses the input, returning the root element, or None
+    if it could not be parsed or validation has stopped.
+    """
+    try:
+        with run.measure('decode'):
+            in_xml_str = str(in_bytes, encoding='utf-8', errors='strict')
+    except Exception as e:
+        run.valid = False
+        run.validation_results.error(
+            location='Unknown',
+            message='Could not decode into UTF-8: ' + str(e),
+            code=ValidationCode.preParse_encoding
+        )
+        in_xml_str = ''
+    if run.checkStop() is not None:
+        run.skipRemaining([ValidationCode.xml_parse] + xml_codes)
+        return None
+    try:
+        with run.measure('parse'), run.resource_limits.interruptible():
+            if not run.resource_limits.limitsTree() \
+                    and not run.resource_limits.limitsTime():
+                return ElementTree.fromstring(in_xml_str)
+            # Parsed a chunk at a time, so that it can be interrupted
+            root = _parse_within_limits(in_xml_str, run.resource_limits)
+    except ResourceLimitExceeded:
+        root = None
+    except Exception as e:
+        run.valid = False
+        run.validation_results.error(
+            location='Document',
+            message='Could not parse XML: ' + str(e),
+            code=ValidationCode.xml_parse
+        )
+        return None
+    if root is None and run.checkStop() is not None:
+        # Parsing stopped at a limit, so the document was not fully
+        # parsed
+        run.skipRemaining([ValidationCode.xml_parse] + xml_codes)
+    return root
+
+
+# Characters of the document parsed at a time when counting elements
+_parse_chunk_size = 65536
+
+
+def _parse_within_limits(
+        in_xml_str: str,
+        resource_limits: ResourceLimits) -> Element | None:
+    """
+    Parses the document, counting the elements and their nesting as each
+    starts, and returns the root element, or None as soon as a limit is
+    passed, without building the rest of the tree.
+    """
+    parser = ElementTree.XMLPullParser(events=('start', 'end'))
+    root = None
+    element_count = 0
+    depth = 0
+    for offset in range(0, len(in_xml_str), _parse_chunk_size):
+        parser.feed(in_xml_str[offset:offset + _parse_chunk_size])
+        for event, element in parser.read_events():
+            if event == 'end':
+                depth -= 1
+                continue
+            element_count += 1
+            depth += 1
+            if root is None:
+                root = element
+            if resource_limits.checkElement(element_count, depth) \
+                    is not None:
+                return None
+    parser.close()
+    return root
+
+
+def _parse_source(
+        run: _ValidationRun,
+        root: Element | None,
+        in_bytes: bytes | None,
+        compression_error: str | None,
+        pre_parse_checks: list,
+        xml_codes: list[ValidationCode],
+        already_parsed: bool) -> Element | None:
+    """
+    Runs the pre-parse checks on the input read, if any, and parses it
+    within the resource limits, or checks the tree of an element source
+    against them, returning the root element, or None if there is none.
+    """
+    if in_bytes is not None or compression_error is not None:
+        in_bytes = _pre_parse(
+            run, pre_parse_checks, in_bytes, compression_error, xml_codes)
+        if in_bytes is not None:
+            root = _parse(run, in_bytes, xml_codes)
+    elif run.stop_reason is None and not already_parsed:
+        run.validation_results.info(
+            location='Document',
+            message='Document was already parsed, so the pre-parse '
+                    'checks were not run',
+            code=ValidationCode.xml_parse
+        )
+        # Parsed by the caller, so not yet checked against the limits
+        run.resource_limits.checkTree(root)
+    if run.stop_reason is None:
+        run.checkStop()
+        run.skipRemaining(xml_codes)
+    return root
+
+
+def _profiled_checks(
+        options: ValidationOptions,
+        pre_parse_checks: list,
+        xml_checks: list
+        ) -> tuple[CheckProfiler | None, list, list, dict[str, CheckProfile]]:
+    """
+    Returns the profiler, if profiling, the checks wrapped to be
+    profiled by it and the profiles of the decode and parse stages.
+    """
+    if not options.profile:
+        return None, pre_parse_checks, xml_checks, {}
+    profiler = CheckProfiler(trace_memory=options.profile_memory)
+    pre_parse_checks = [
+        profiler.profilePreParseCheck(check) for check in pre_parse_checks]
+    stage_profiles = {
+        stage: profiler.newProfile(stage) for stage in ['decode', 'parse']}
+    xml_checks = [profiler.profileXmlCheck(check) for check in xml_checks]
+    return profiler, pre_parse_checks, xml_checks, stage_profiles
+
+
+def _check_context(
+        source: ValidationSource,
+        options: ValidationOptions) -> dict:
+    # The context built by the gate tier is kept when resuming, so that
+    # the document is not indexed again
+    context = dict(source.context) if isinstance(source, ParsedDocument) \
+        else {'document_index': {}}
+    context["args"] = {
+        "vertical": True if options.vertical else False,
+        "epoch": options.epoch,
+    }
+    return context
+
+
+def _skip_unselected(
+        run: _ValidationRun,
+        constraints: ConstraintSet,
+        xml_checks: list,
+        tier_checks: set[int] | None):
+    """
+    Logs the codes that none of the checks to run can log as skipped,
+    leaving the codes of another tier to it.
+    """
+    selected_codes = set(_check_codes(xml_checks))
+    candidate_codes = constraints.checkScheduler().validationCodes() \
+        if tier_checks is None \
+        else list(dict.fromkeys(_check_codes([
+            constraints.xmlChecks()[index]
+            for index in sorted(tier_checks)])))
+    for code in candidate_codes:
+        if code not in selected_codes:
+            # A document that was not fully checked is not known to be
+            # valid, as when validation stops early
+            run.valid = False
+            run.validation_results.skip(
+                location='Document',
+                message='Not checked because it was not selected',
+                code=code
+            )
+
+
+def _run_xml_check(
+        xml_check,
+        root: Element,
+        context: dict,
+        check_results: ValidationLogger,
+        resource_limits: ResourceLimits) -> tuple[bool, bool]:
+    # Returns whether the check passed and whether it was interrupted
+    current_check_name = ''
+    try:
+        current_check_name = type(unwrapped(xml_check)).__name__
+        with resource_limits.interruptible():
+            passed = xml_check.run(
+                input=root,
+                context=context,
+                validation_results=check_results
+            )
+        if unwrapped(xml_check).modifiesTree():
+            # The index no longer matches the tree, and may be
+            # shared with another flavour's copy of the context
+            context['document_index'] = {}
+        return passed, False
+    except ResourceLimitExceeded:
+        return True, True
+    except Exception as e:
+        check_results.error(
+            location='While running ' + current_check_name,
+            message='Exception raised: ' + str(e),
+            code=ValidationCode.validator_internal_exception
+        )
+        return False, False
+
+
+def _serial_xml_check_outcomes(
+        run: _ValidationRun,
+        root: Element,
+        context: dict,
+        xml_checks: list):
+    for position, xml_check in enumerate(xml_checks):
+        check_valid, interrupted = _run_xml_check(
+            xml_check, root, context, run.validation_results,
+            run.resource_limits)
+        yield position, check_valid, interrupted
+
+
+def _concurrent_xml_check_outcomes(
+        run: _ValidationRun,
+        root: Element,
+        context: dict,
+        xml_checks: list,
+        check_order: list[int],
+        scheduler: CheckScheduler,
+        check_workers: int,
+        min_status: int):
+    check_positions = {
+        index: position for position, index in enumerate(check_order)}
+
+    def run_buffered_xml_check(index: int):
+        # Results are kept apart until they can be merged in order
+        check_results = ValidationLogger(
+            min_status=min_status,
+            resource_limits=run.resource_limits)
+        check_valid, interrupted = _run_xml_check(
+            xml_checks[check_positions[index]], root, context,
+            check_results, run.resource_limits)
+        return check_valid, interrupted, check_results
+
+    outcomes = scheduler.runConcurrently(
+        executor=_check_executor(check_workers),
+        run_check=run_buffered_xml_check,
+        indices=check_order)
+    try:
+        for index, (check_valid, interrupted, check_results) in outcomes:
+            try:
+                run.validation_results.merge(check_results)
+            except ResourceLimitExceeded:
+                interrupted = True
+            yield check_positions[index], check_valid, interrupted
+    finally:
+        outcomes.close()
+
+
+def _run_xml_checks(
+        run: _ValidationRun,
+        root: Element,
+        context: dict,
+        xml_checks: list,
+        check_order: list[int],
+        scheduler: CheckScheduler,
+        check_workers: int,
+        min_status: int):
+    """
+    Runs the XML checks, in the scheduled order or, with more than one
+    check worker, those that do not depend on each other at the same
+    time, logging their results in the scheduled order, until they have
+    all run or validation stops.
+    """
+    if check_workers > 1:
+        outcomes = _concurrent_xml_check_outcomes(
+            run, root, context, xml_checks, check_order, scheduler,
+            check_workers, min_status)
+    else:
+        outcomes = _serial_xml_check_outcomes(run, root, context, xml_checks)
+    try:
+        for position, check_valid, interrupted in outcomes:
+            run.valid &= check_valid
+            remaining_checks = xml_checks[
+                position if interrupted else position + 1:]
+            if len(remaining_checks) == 0:
+                break
+            if run.checkStop() is not None:
+                run.skipRemaining(_check_codes(remaining_checks))
+                break
+    finally:
+        # Stops any checks that have not started
+        outcomes.close()
+
+
+def _summarise(
+        run: _ValidationRun,
+        constraints: ConstraintSet,
+        tier: str,
+        tier_checks: set[int] | None,
+        summary_location: str) -> tuple[int, int]:
+    """
+    Logs the document validity summaries, returning the numbers of
+    failures and skips.
+    """
+    if tier_checks is None:
+        total_fails, total_skips = constraints.summarise(
+            run.validation_results, location=summary_location)
+    else:
+        total_fails, total_skips = constraints.summariseTier(
+            run.validation_results, tier=tier, location=summary_location)
+    if run.valid != (total_fails == 0 and total_skips == 0):
+        run.validation_results.error(
+            location='Document validity summaries',
+            message='Overall validity {} mismatch'.format(run.valid),
+            code=ValidationCode.validator_internal_exception
+        )
+    return total_fails, total_skips
+
+
+def _validate_full_tier(
+        source: ValidationSource,
+        flavour: str,
+        options: ValidationOptions) -> ValidationReport:
+    # Read and parse the document, and run the gate checks whose context
+    # the full tier uses, as the gate tier would, keeping their results
+    # apart from those of the full tier
+    prerequisite_options = copy.copy(options)
+    prerequisite_options.tier = 'gate'
+    prerequisite_options.sinks = []
+    prerequisite_options.retain_results = True
+    prerequisite_options.profile = False
+    prerequisite_report = _validate(
+        source, flavour, prerequisite_options, prerequisites=True)
+    parsed = prerequisite_report.parsed or ParsedDocument(
+        root=None,
+        context={},
+        flavour=flavour,
+        options=options,
+        stop_reason='the document was not parsed, or the gate tier '
+                    'checks that the full tier needs did not finish')
+    report = _validate(parsed, flavour, options)
+    report.prerequisites = prerequisite_report.results
+    return report
+
+
+def _validate(
+        source: ValidationSource,
+        flavour: str,
+        options: ValidationOptions | None,
+        parse_only: bool = False,
+        prerequisites: bool = False) -> ValidationReport | ParsedDocument:
+    # If parse_only, stops before the XML checks and returns the parsed
+    # document with the results so far. If prerequisites, runs only the
+    # gate checks that the full tier needs.
+    if options is None:
+        options = ValidationOptions()
+    parsed_source = isinstance(source, ParsedDocument)
+    resumed = parsed_source and source.checked_tier == 'gate'
+    if resumed and (options.tier != 'full' or source.flavour != flavour):
+        raise ValueError(
+            'Only the full tier of a {} document can be resumed'.format(
+                source.flavour))
+    if options.tier == 'full' and not resumed and not parse_only:
+        return _validate_full_tier(source, flavour, options)
+    constraints = constraint_set(
+        flavour=flavour,
+        segment_dur=options.segment_dur,
+        segment_relative_timing=options.segment_relative_timing)
+    check_order, tier_checks, summary_location = _select_checks(
+        constraints, options, resumed=resumed, parse_only=parse_only,
+        prerequisites=prerequisites)
+    # Checks are run, and their results logged, in the scheduled order
+    xml_checks = [constraints.xmlChecks()[index] for index in check_order]
+
+    resource_limits = options.resourceLimits()
+    resource_limits.start()
+    root, in_bytes, compression_error = _read_source(
+        source, resource_limits,
+        copy_element=any(check.modifiesTree() for check in xml_checks))
+
+    profiler, pre_parse_checks, xml_checks, stage_profiles = \
+        _profiled_checks(options, constraints.preParseChecks(), xml_checks)
+    if parse_only:
+        # Logged again, and collated, for each flavour
+        validation_results = ValidationLogger(
+            min_status=options.min_status,
+            resource_limits=resource_limits)
+    else:
+        validation_results = options.validationLogger(resource_limits)
+    run = _ValidationRun(
+        validation_results=validation_results,
+        resource_limits=resource_limits,
+        error_budget=options.errorBudget(),
+        profiler=profiler,
+        stage_profiles=stage_profiles)
+    xml_codes = _check_codes(xml_checks)
+
+    if parsed_source:
+        _merge_parsed(run, source, resumed, xml_codes)
+    if profiler is not None:
+        profiler.start()
+    root = _parse_source(
+        run, root, in_bytes, compression_error, pre_parse_checks, xml_codes,
+        already_parsed=parsed_source)
+    context = _check_context(source, options)
+    if parse_only:
+        resource_limits.stop()
+        return ParsedDocument(
+            root=root,
+            context=context,
+            flavour=None,
+            options=options,
+            checked_tier=None,
+            results=validation_results,
+            valid=run.valid,
+            stop_reason=run.stop_reason)
+
+    _skip_unselected(run, constraints, xml_checks, tier_checks)
+    if root is not None and run.stop_reason is None:
+        # Memory is traced for the whole process, so can only be
+        # attributed to a check if one runs at a time
+        _run_xml_checks(
+            run, root, context, xml_checks, check_order,
+            constraints.checkScheduler(),
+            check_workers=1 if options.profile and options.profile_memory
+            else options.check_workers,
+            min_status=options.min_status)
+    resource_limits.stop()
+    if profiler is not None:
+        profiler.stop()
+
+    total_fails, total_skips = _summarise(
+        run, constraints, options.tier, tier_checks, summary_location)
+    return ValidationReport(
+        flavour=flavour,
+        valid=run.valid,
+        failures=total_fails,
+        skips=total_skips,
+        results=validation_results,
+        profiler=profiler,
+        tier=options.tier,
+        parsed=ParsedDocument(
+            root=root, context=context, flavour=flavour, options=options)
+        if options.tier == 'gate' and root is not None
+        and run.stop_reason is None else None)
+
+
+def resume(
+        report: ValidationReport,
+        options: ValidationOptions | None = None) -> ValidationReport:
+    """
+    Runs the full tier of checks on the document parsed by the gate tier
+    that produced ``report``, returning a report of the full tier alone.
+
+    ``options`` default to those the gate tier was run with, including
+    its sinks; either way the ``full`` tier is run.
+
+    Raises ValueError if ``report`` is not from the gate tier or has no
+    parsed document, because the document could not be parsed or
+    validation stopped early.
+    """
+    if report.tier != 'gate' or report.parsed is None:
+        raise ValueError(
+            'Only a gate tier report of a parsed document can be resumed')
+    options = copy.copy(
+        report.parsed.options if options is None else options)
+    options.tier = 'full'
+    return validate(
+        source=report.parsed, flavour=report.flavour, options=options)
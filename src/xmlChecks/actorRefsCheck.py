@@ -16,6 +16,11 @@ class actorRefsCheck(XmlCheck):
     an ancestor agent of the element.
     """
 
+    _validationCodes = [
+        ValidationCode.ttml_metadata_actor_reference,
+    ]
+    _readsContext = ['root_ns']
+
     def run(
             self,
             input: Element,
@@ -30,29 +35,46 @@ class actorRefsCheck(XmlCheck):
         ttm_agent_el_tag = make_qname(metadata_ns, 'agent')
         ttm_actor_el_tag = make_qname(metadata_ns, 'actor')
 
-        # Find all descendant ttm:agent elements
-        agents = input.findall('.//{}'.format(ttm_agent_el_tag))
+        # Walk the tree once, keeping the document order positions of
+        # the ancestor ttm:agent elements by xml:id, and find each
+        # ttm:actor element whose agent attribute is one of them
+        ancestor_agents = {}
+        actor_refs = []
+        agent_count = 0
+        # Each element's children, and the xml:id it is an agent with
+        stack = [(iter(input), None)]
+        while len(stack) > 0:
+            children, ancestor_id = stack[-1]
+            child = next(children, None)
+            if child is None:
+                stack.pop()
+                if ancestor_id is not None:
+                    ancestor_agents[ancestor_id].pop()
+                continue
+            child_agent_id = None
+            if child.tag == ttm_actor_el_tag:
+                for agent_index in ancestor_agents.get(
+                        child.get('agent'), []):
+                    actor_refs.append((agent_index, child.get('agent')))
+            elif child.tag == ttm_agent_el_tag:
+                child_agent_id = child.get(xmlIdAttr)
+                if child_agent_id is not None:
+                    ancestor_agents.setdefault(child_agent_id, []).append(
+                        agent_count)
+                agent_count += 1
+            stack.append((iter(child), child_agent_id))
 
-        # For each ttm:agent element, find its descendant ttm:actor elements
-        # whose agent attribute is that parent ttm:agent's xml:id
-        for agent in agents:
-            agent_id = agent.get(xmlIdAttr)
-            if agent_id is not None:
-                xpath_str = './/{}[@{}=\'{}\']'.format(
-                    ttm_actor_el_tag,
-                    'agent',
-                    agent_id
-                )
-                actors = agent.findall(xpath_str)
-                for actor in actors:
-                    validation_results.error(
-                        location='ttm:agent element with xml:id={}'.format(
-                            agent_id),
-                        message='ttm:actor element found with agent pointing '
-                                'to ancestor ttm:agent element',
-                        code=ValidationCode.ttml_metadata_actor_reference
-                    )
-                    valid = False
+        # Reported for each ttm:agent element in document order
+        actor_refs.sort(key=lambda actor_ref: actor_ref[0])
+        for _, agent_id in actor_refs:
+            validation_results.error(
+                location='ttm:agent element with xml:id={}'.format(
+                    agent_id),
+                message='ttm:actor element found with agent pointing '
+                        'to ancestor ttm:agent element',
+                code=ValidationCode.ttml_metadata_actor_reference
+            )
+            valid = False
 
         if valid:
             validation_results.good(
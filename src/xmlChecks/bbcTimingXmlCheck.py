@@ -1,9 +1,8 @@
 # SPDX-FileCopyrightText: Copyright © 2026 BBC
 #
 # SPDX-License-Identifier: BSD-3-Clause
-import logging
 
-from math import floor
+from math import floor, inf
 from src.validationLogging.validationCodes import ValidationCode
 from src.validationLogging.validationLogger import ValidationLogger
 from xml.etree.ElementTree import Element
@@ -14,6 +13,7 @@ from .ttmlUtils import ns_ttml
 from src.timeExpression import TimeExpressionHandler
 from src.styleAttribs import two_percent_vals_regex
 from operator import itemgetter
+from heapq import heappop, heappush
 import traceback
 
 timing_attr_keys = [
@@ -42,6 +42,21 @@ class bbcTimingCheck(XmlCheck):
     * Are the gaps between subtitles long enough or zero?
     """
 
+    _validationCodes = [
+        ValidationCode.ebuttd_timing_attribute_constraint,
+        ValidationCode.bbc_timing_minimum_subtitles,
+        ValidationCode.ebuttd_overlapping_region_constraint,
+        ValidationCode.bbc_timing_gaps,
+        ValidationCode.bbc_timing_segment_overlap,
+        ValidationCode.ttml_document_timing,
+    ]
+    _readsContext = [
+        'root_ns',
+        'args',
+        'elements_to_region_id_map',
+        'region_id_to_css_map',
+    ]
+
     _min_short_gap = 0.8
     _desired_min_gap = 1.5
     _min_count_early_begins = 2
@@ -190,13 +205,14 @@ class bbcTimingCheck(XmlCheck):
     def _checkEnoughSubsAtBeginning(
             self,
             time_el_map: dict[float, list[tuple[Element, float]]],
+            epoch: float,
             validation_results: ValidationLogger,
             ) -> bool:
         valid = True
 
         count_early_begins = 0
 
-        early_begin_threshold = self._early_begin_threshold + self._epoch
+        early_begin_threshold = self._early_begin_threshold + epoch
         for begin, el_list in time_el_map.items():
             if begin >= early_begin_threshold:
                 continue
@@ -294,111 +310,72 @@ class bbcTimingCheck(XmlCheck):
             validation_results: ValidationLogger,
             ) -> bool:
 
-        # Inner function to reduce duplication later
-        def validateOverlap(
-                r_id1: str,
-                r_id2: str,
-                region_overlaps: dict[str, list[str]],
-                validation_results: ValidationLogger) -> bool:
-            if self._regionsOverlap(
-               r_id1=el_region,
-               r_id2=oel_region,
-               region_overlaps=region_overlaps):
-                validation_results.error(
-                    location='<{}> xml:id={} region={} and '
-                             '<{}> xml:id={} region={}'
-                             .format(
-                                el.tag,
-                                el.get(xmlIdAttr, 'omitted'),
-                                el_region,
-                                oel.tag,
-                                oel.get(xmlIdAttr, 'omitted'),
-                                oel_region
-                                ),
-                    message='Elements overlap spatially '
-                            'and temporally',
-                    code=ValidationCode.ebuttd_overlapping_region_constraint
-                )
-                return False
-            return True
-
-        valid = True
-
         # Identify any regions that might overlap
         region_overlaps = self._getOverlappingRegions(
             region_id_to_css_map=region_id_to_css_map)
+        region_overlap_sets = {
+            region_id: set(overlap_region_ids)
+            for region_id, overlap_region_ids in region_overlaps.items()}
+
+        # Sweep the p elements associated with any of those regions in
+        # begin order, keeping those that are still active, i.e. that
+        # begin at the same time or end after the current begin, by
+        # region, so that only the pairs of elements in different
+        # regions that overlap both spatially and temporally are visited
+        overlapping_pairs = []
+        active_by_region = {}
+        active_ends = []
+        position = 0
+        for begin in sorted(time_el_map.keys()):
+            while len(active_ends) > 0 and active_ends[0][0] <= begin:
+                _, active_position, active_region = heappop(active_ends)
+                region_active = active_by_region[active_region]
+                del region_active[active_position]
+                if len(region_active) == 0:
+                    del active_by_region[active_region]
+            for el, end in time_el_map[begin]:
+                el_region = el_region_id_map.get(el)
+                if el_region not in region_overlaps \
+                        or get_unqualified_name(el.tag) != 'p':
+                    continue
+                for active_region, region_active in \
+                        active_by_region.items():
+                    if active_region == el_region \
+                            or active_region \
+                            not in region_overlap_sets[el_region]:
+                        continue
+                    for active_position, active_el in \
+                            region_active.items():
+                        overlapping_pairs.append(
+                            (active_position, position, active_el, el))
+                active_by_region.setdefault(el_region, {})[position] = el
+                # An element without an end stays active
+                heappush(
+                    active_ends,
+                    (inf if end is None else end, position, el_region))
+                position += 1
+
+        # Reported for each element in begin order, with the elements
+        # it overlaps in begin order
+        overlapping_pairs.sort(key=itemgetter(0, 1))
+        for _, _, el, oel in overlapping_pairs:
+            validation_results.error(
+                location='<{}> xml:id={} region={} and '
+                         '<{}> xml:id={} region={}'
+                         .format(
+                            el.tag,
+                            el.get(xmlIdAttr, 'omitted'),
+                            el_region_id_map[el],
+                            oel.tag,
+                            oel.get(xmlIdAttr, 'omitted'),
+                            el_region_id_map[oel]
+                            ),
+                message='Elements overlap spatially '
+                        'and temporally',
+                code=ValidationCode.ebuttd_overlapping_region_constraint
+            )
 
-        # Find the subset of p elements that are associated
-        # with any of those regions
-        potential_overlap_elements = {
-            k: v for k, v in el_region_id_map.items() if v in region_overlaps
-            }
-
-        # For each p element, check if any other p elements are
-        # selected into an overlapping region and overlap temporally
-        # - if so, that's a validation error
-        filtered_time_el_map: dict[float, list[tuple[Element[str], float]]] = {
-            begin: [
-                (el, end) for el, end in el_end_list
-                if el in potential_overlap_elements
-                and get_unqualified_name(el.tag) == 'p'
-                ]
-            for begin, el_end_list in time_el_map.items()
-        }
-
-        sorted_begins = sorted(filtered_time_el_map.keys())
-        # Go through the filtered time element map finding
-        # all groups of elements that temporally overlap and
-        # have regions that spatially overlap
-        num_begins = len(sorted_begins)
-        for el_begin_index in range(num_begins):
-            el_end_list = \
-                filtered_time_el_map.get(sorted_begins[el_begin_index], [])
-            num_ends = len(el_end_list)
-            for el_end_index in range(num_ends):
-                el, end = el_end_list[el_end_index]
-                el_region = el_region_id_map[el]
-
-                # First check other elements with same begin,
-                # which by definition overlap temporally
-                for oei in range(el_end_index + 1, num_ends):
-                    oel, oend = el_end_list[oei]
-                    oel_region = el_region_id_map[oel]
-                    valid &= validateOverlap(
-                        r_id1=el_region,
-                        r_id2=oel_region,
-                        region_overlaps=region_overlaps,
-                        validation_results=validation_results)
-
-                # Then check for elements with later begins
-                for obi in range(el_begin_index + 1, num_begins):
-                    ob = sorted_begins[obi]
-                    if end > ob and ob in filtered_time_el_map:
-                        oell = filtered_time_el_map.get(ob, {})
-                        for oel, oend in oell:
-                            # These temporally overlap
-                            # If el and oel have different regions
-                            # and their regions overlap, we have found
-                            # an invalid condition
-
-                            # their regions are in el_to_region_map
-                            oel_region = el_region_id_map[oel]
-                            valid &= validateOverlap(
-                                r_id1=el_region,
-                                r_id2=oel_region,
-                                region_overlaps=region_overlaps,
-                                validation_results=validation_results)
-                    elif end > ob and ob not in filtered_time_el_map:
-                        logging.error(
-                            'Internal error: _checkForOverlappingRegions ob '
-                            'not in filtered_time_el_map')
-                    else:
-                        # Since it's an ordered list, we can skip
-                        # all the later begin times: they also
-                        # won't be earlier than end
-                        break
-
-        return valid
+        return len(overlapping_pairs) == 0
 
     def _checkForShortGaps(
             self,
@@ -451,11 +428,12 @@ class bbcTimingCheck(XmlCheck):
             self,
             doc_begin: float,
             doc_end: float | None,
+            epoch: float,
             validation_results: ValidationLogger) -> bool:
         valid = True
 
         if self._segment_dur is not None:
-            epoch = 0 if self._segment_relative_timing else self._epoch
+            epoch = 0 if self._segment_relative_timing else epoch
             max_end = epoch + self._segment_dur
 
             if doc_begin > max_end or \
@@ -484,6 +462,9 @@ class bbcTimingCheck(XmlCheck):
             validation_results: ValidationLogger) -> bool:
         tt_ns = \
             context.get('root_ns', ns_ttml)
+        # Given for each document, so that segments with different
+        # epochs can share the check
+        epoch = context.get('args', {}).get('epoch', self._epoch)
 
         valid = True
 
@@ -526,6 +507,7 @@ class bbcTimingCheck(XmlCheck):
                or self._early_begin_threshold <= self._segment_dur:
                 valid &= self._checkEnoughSubsAtBeginning(
                     time_el_map=time_el_map,
+                    epoch=epoch,
                     validation_results=validation_results
                 )
             else:
@@ -539,6 +521,7 @@ class bbcTimingCheck(XmlCheck):
                 valid &= self._checkSubsOverlapSegment(
                     doc_begin=doc_begin,
                     doc_end=doc_end,
+                    epoch=epoch,
                     validation_results=validation_results
                 )
 
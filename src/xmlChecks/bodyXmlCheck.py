@@ -17,12 +17,17 @@ class bodyCheck(XmlCheck):
     Checks body element and content descendants
     """
 
+    _validationCodes = [
+        ValidationCode.ttml_element_body,
+    ]
+    _readsContext = ['root_ns']
+
     _subChecks = []
 
     def __init__(self,
-                 sub_checks: list[XmlCheck] = []):
+                 sub_checks: list[XmlCheck] | None = None):
         super().__init__()
-        self._subChecks = sub_checks
+        self._subChecks = [] if sub_checks is None else list(sub_checks)
 
     def run(
             self,
@@ -17,6 +17,11 @@ class copyrightCheck(XmlCheck):
     Checks presence of copyright element in head
     """
 
+    _validationCodes = [
+        ValidationCode.ttml_metadata_copyright,
+    ]
+    _readsContext = ['root_ns']
+
     def __init__(self,
                  copyright_required: bool = False) -> None:
         super().__init__()
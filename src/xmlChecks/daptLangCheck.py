@@ -21,6 +21,11 @@ class daptLangAudioNonMatchingCheck(XmlCheck):
     its parent's computed xml:lang
     """
 
+    _validationCodes = [
+        ValidationCode.dapt_lang_audio,
+    ]
+    _readsContext = ['root_ns']
+
     def __init__(self) -> None:
         super().__init__()
 
@@ -104,6 +109,10 @@ class nonEmptyLangRootCheck(XmlCheck):
     Checks xml:lang attribute is present and is not empty
     """
 
+    _validationCodes = [
+        ValidationCode.dapt_lang_root,
+    ]
+
     def __init__(self) -> None:
         super().__init__()
 
@@ -55,6 +55,20 @@ class daptTimingCheck(XmlCheck):
     * In case this is in a segment, do the times overlap the segment interval?
     """
 
+    _validationCodes = [
+        ValidationCode.dapt_timing_timecontainer,
+        ValidationCode.ttml_timing_attribute_syntax,
+        ValidationCode.dapt_timing_attribute_constraint,
+        ValidationCode.dapt_timing_framerate,
+        ValidationCode.dapt_timing_tickrate,
+        ValidationCode.dapt_timing_segment_overlap,
+        ValidationCode.dapt_timing_origin_timecode,
+        ValidationCode.dapt_timing_start_of_programme_timecode,
+        ValidationCode.dapt_timing_timecode_offset,
+        ValidationCode.ttml_document_timing,
+    ]
+    _readsContext = ['root_ns', 'args']
+
     def __init__(self,
                  epoch: float = 0.0,
                  segment_dur: float | None = None,
@@ -177,7 +191,7 @@ class daptTimingCheck(XmlCheck):
                             el.get(timing_attr)),
                         code=ValidationCode.dapt_timing_attribute_constraint
                     )
-                if not self._frameRateSpecified \
+                if not te.frameRateSpecified() \
                    and te.usesFrames(time_expression=time_val):
                     valid = False
                     validation_results.error(
@@ -189,7 +203,7 @@ class daptTimingCheck(XmlCheck):
                                 .format(timing_attr, time_val),
                         code=ValidationCode.dapt_timing_framerate
                     )
-                if not self._tickRateSpecified \
+                if not te.tickRateSpecified() \
                    and te.usesTicks(time_expression=time_val):
                     valid = False
                     validation_results.error(
@@ -306,9 +320,6 @@ class daptTimingCheck(XmlCheck):
             if preferredTickRateKey in tt.keys() \
             else 'tickRate'
 
-        self._frameRateSpecified = frameRateKey in tt.keys()
-        self._tickRateSpecified = tickRateKey in tt.keys()
-
         return TimeExpressionHandler(
             framerate=tt.get(frameRateKey),
             framerate_multiplier=tt.get(frameRateMultiplierKey),
@@ -319,11 +330,12 @@ class daptTimingCheck(XmlCheck):
             self,
             doc_begin: float,
             doc_end: float,
+            epoch: float,
             validation_results: ValidationLogger) -> bool:
         valid = True
 
         if self._segment_dur is not None:
-            epoch = 0 if self._segment_relative_timing else self._epoch
+            epoch = 0 if self._segment_relative_timing else epoch
             max_end = epoch + self._segment_dur
 
             if doc_begin > max_end or \
@@ -417,7 +429,7 @@ class daptTimingCheck(XmlCheck):
                     code=ValidationCode.dapt_timing_origin_timecode
                 )
             else:
-                if not self._frameRateSpecified:
+                if not te.frameRateSpecified():
                     valid = False
                     validation_results.error(
                         location=dsop_path,
@@ -439,7 +451,7 @@ class daptTimingCheck(XmlCheck):
                 )
             else:
                 if te.usesFrames(time_expression=dsop) \
-                   and not self._frameRateSpecified:
+                   and not te.frameRateSpecified():
                     valid = False
                     validation_results.error(
                         location=dsop_path,
@@ -448,7 +460,7 @@ class daptTimingCheck(XmlCheck):
                         code=ValidationCode.dapt_timing_framerate
                     )
                 if te.usesTicks(time_expression=dsop) \
-                   and not self._tickRateSpecified:
+                   and not te.tickRateSpecified():
                     valid = False
                     validation_results.error(
                         location=dsop_path,
@@ -490,6 +502,9 @@ class daptTimingCheck(XmlCheck):
             validation_results: ValidationLogger) -> bool:
         tt_ns = \
             context.get('root_ns', ns_ttml)
+        # Given for each document, so that segments with different
+        # epochs can share the check
+        epoch = context.get('args', {}).get('epoch', self._epoch)
 
         valid = True
 
@@ -533,6 +548,7 @@ class daptTimingCheck(XmlCheck):
             valid &= self._checkTimedContentOverlapsSegment(
                 doc_begin=doc_begin,
                 doc_end=doc_end,
+                epoch=epoch,
                 validation_results=validation_results
             )
 
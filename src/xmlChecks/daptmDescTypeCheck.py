@@ -20,6 +20,11 @@ class daptmDescTypeCheck(XmlCheck):
     Checks values of daptm:descType attribute on ttm:descType elements
     """
 
+    _validationCodes = [
+        ValidationCode.dapt_metadata_desctype_validity,
+    ]
+    _readsContext = ['root_ns']
+
     def __init__(self) -> None:
         super().__init__()
 
@@ -35,6 +35,13 @@ class daptmRepresentsCheck(XmlCheck):
     Checks values of dapt:scriptRepresents and daptm:represents attributes
     """
 
+    _validationCodes = [
+        ValidationCode.dapt_metadata_scriptRepresents,
+        ValidationCode.dapt_metadata_represents,
+        ValidationCode.dapt_metadata_content_descriptor,
+    ]
+    _readsContext = ['root_ns']
+
     def __init__(self) -> None:
         super().__init__()
 
@@ -125,6 +132,12 @@ class daptmRepresentsCheck(XmlCheck):
             './/{}[@{}]'.format('*', represents_attr_tag)
         )
 
+        # A descriptor is a subtype of any value that tokenises to one of
+        # its leading token sequences, so each is looked up once
+        tokenised_scriptRepresents_vals = set(
+            tuple(_tokenise_content_descriptor(val))
+            for val in scriptRepresents_vals)
+
         for el in els:
             if el.tag not in permitted_represents_el_tags:
                 valid = False
@@ -146,14 +159,12 @@ class daptmRepresentsCheck(XmlCheck):
                     code=ValidationCode.dapt_metadata_content_descriptor
                 )
 
-            is_subtype_of_scriptRepresents = False
-            for parent in scriptRepresents_vals:
-                is_subtype_of_scriptRepresents |= \
-                    _is_content_descriptor_subtype(
-                        subtype=represents_val,
-                        parent=parent)
-                if is_subtype_of_scriptRepresents:
-                    break
+            represents_tokens = tuple(
+                _tokenise_content_descriptor(represents_val))
+            is_subtype_of_scriptRepresents = any(
+                represents_tokens[0:length]
+                in tokenised_scriptRepresents_vals
+                for length in range(1, len(represents_tokens) + 1))
 
             if not is_subtype_of_scriptRepresents:
                 valid = False
@@ -17,13 +17,19 @@ class divCheck(XmlCheck):
     Checks the div element
     """
 
+    _validationCodes = [
+        ValidationCode.ebuttd_empty_body_constraint,
+        ValidationCode.ebuttd_nested_div_constraint,
+    ]
+    _readsContext = ['root_ns']
+
     _subChecks = []
 
     def __init__(self,
-                 sub_checks: list[XmlCheck] = [],
+                 sub_checks: list[XmlCheck] | None = None,
                  recurse_div_children: bool = True):
         super().__init__()
-        self._subChecks = sub_checks
+        self._subChecks = [] if sub_checks is None else list(sub_checks)
         self._recurse_div_children = recurse_div_children
 
     def run(
@@ -15,12 +15,18 @@ class headCheck(XmlCheck):
     Checks presence of several elements in /tt/head.
     """
 
+    _validationCodes = [
+        ValidationCode.ebuttd_head_element_constraint,
+        ValidationCode.ttml_element_head,
+    ]
+    _readsContext = ['root_ns']
+
     _subChecks = []
 
     def __init__(self,
-                 sub_checks: list[XmlCheck] = []):
+                 sub_checks: list[XmlCheck] | None = None):
         super().__init__()
-        self._subChecks = sub_checks
+        self._subChecks = [] if sub_checks is None else list(sub_checks)
 
     def run(
             self,
@@ -15,6 +15,13 @@ class inlineStyleAttributesCheck(XmlCheck):
     """
     Checks for inline style attributes on body, div, p and span.
     """
+
+    _validationCodes = [
+        ValidationCode.ebuttd_inline_styling_constraint,
+        ValidationCode.ttml_attribute_styling_attribute,
+    ]
+    _readsContext = ['root_ns']
+
     def run(
             self,
             input: Element,
@@ -16,6 +16,15 @@ class layoutCheck(XmlCheck):
     Checks presence and contents of layout element
     """
 
+    _validationCodes = [
+        ValidationCode.ebuttd_layout_element_constraint,
+        ValidationCode.ttml_element_layout,
+        ValidationCode.ttml_element_region,
+        ValidationCode.ebuttd_region_element_constraint,
+    ]
+    _providesContext = ['id_to_region_map']
+    _readsContext = ['root_ns']
+
     def run(
             self,
             input: Element,
@@ -27,14 +27,19 @@ def get_unqualified_name(tag: str) -> str:
 
 class Pruner(XmlCheck):
 
+    _validationCodes = [
+        ValidationCode.xml_prune,
+    ]
+    _modifiesTree = True
+
     def __init__(
             self,
-            no_prune_namespaces: set[str] = set(),
-            no_prune_no_namespace_attributes: set[str] = set()
+            no_prune_namespaces: set[str] | None = None,
+            no_prune_no_namespace_attributes: set[str] | None = None
     ) -> None:
-        self._no_prune_namespaces = no_prune_namespaces
+        self._no_prune_namespaces = frozenset(no_prune_namespaces or ())
         self._no_prune_no_namespace_attributes = \
-            no_prune_no_namespace_attributes
+            frozenset(no_prune_no_namespace_attributes or ())
 
     def run(
         self,
@@ -59,6 +59,25 @@ class regionRefsXmlCheck(XmlCheck):
     on region elements.
     """
 
+    _validationCodes = [
+        ValidationCode.ebuttd_region_attributes_constraint,
+        ValidationCode.bbc_region_attributes_constraint,
+        ValidationCode.ttml_attribute_styling_attribute,
+        ValidationCode.bbc_region_backgroundColor_constraint,
+        ValidationCode.ebuttd_region_position_constraint,
+        ValidationCode.bbc_region_position_constraint,
+        ValidationCode.bbc_region_overflow_constraint,
+        ValidationCode.ttml_layout_region_association,
+        ValidationCode.ttml_element_region,
+        ValidationCode.ttml_styling_attribute_applicability,
+    ]
+    _providesContext = [
+        'elements_to_region_id_map',
+        'region_id_to_css_map',
+    ]
+    _requiresContext = ['id_to_region_map', 'id_to_style_attribs_map']
+    _readsContext = ['root_ns', 'args']
+
     def _gather_region_refs(
             self,
             input: Element,
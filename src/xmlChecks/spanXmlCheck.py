@@ -18,15 +18,21 @@ class spanCheck(XmlCheck):
     Checks the span element
     """
 
+    _validationCodes = [
+        ValidationCode.bbc_text_span_constraint,
+        ValidationCode.ebuttd_nested_span_constraint,
+    ]
+    _readsContext = ['root_ns']
+
     _subChecks = []
 
     def __init__(self,
-                 sub_checks: list[XmlCheck] = [],
+                 sub_checks: list[XmlCheck] | None = None,
                  require_text_in_span: bool = True,
                  permit_nested_spans: bool = False,
                  ):
         super().__init__()
-        self._subChecks = sub_checks
+        self._subChecks = [] if sub_checks is None else list(sub_checks)
         self._require_text_in_span = require_text_in_span
         self._permit_nested_spans = permit_nested_spans
 
@@ -36,6 +36,30 @@ class styleRefsXmlCheck(XmlCheck):
     Checks for unreferenced styles and inappropriate style attributes.
     """
 
+    _validationCodes = [
+        ValidationCode.ttml_styling_referential_chained,
+        ValidationCode.ttml_styling_attribute_applicability,
+        ValidationCode.ttml_attribute_styling_attribute,
+        ValidationCode.bbc_block_backgroundColor_constraint,
+        ValidationCode.bbc_text_fontFamily_constraint,
+        ValidationCode.bbc_text_fontSize_constraint,
+        ValidationCode.bbc_text_lineHeight_constraint,
+        ValidationCode.ebuttd_multiRowAlign,
+        ValidationCode.bbc_text_multiRowAlign_constraint,
+        ValidationCode.bbc_text_linePadding_constraint,
+        ValidationCode.bbc_text_fillLineGap_constraint,
+        ValidationCode.bbc_text_color_constraint,
+        ValidationCode.bbc_text_backgroundColor_constraint,
+        ValidationCode.bbc_text_fontStyle_constraint,
+        ValidationCode.ttml_styling,
+        ValidationCode.ttml_element_style,
+        ValidationCode.ttml_styling_reference,
+        ValidationCode.ttml_element_body,
+    ]
+    _providesContext = ['id_to_style_attribs_map']
+    _requiresContext = ['id_to_style_map']
+    _readsContext = ['root_ns', 'args', 'cellResolution']
+
     def _gather_style_refs(
             self,
             input: Element,
@@ -59,14 +83,14 @@ class styleRefsXmlCheck(XmlCheck):
             style_el: Element,
             id_to_style_map: dict[str, Element],
             style_attrib_map: dict[str, str],
-            visited_styles: list[str],
+            visited_styles: set[str],
             validation_results: ValidationLogger,
             ) -> bool:
         valid = True
         style_refs = style_el.get('style', '').split()
         for style_ref in style_refs:
             if style_ref not in visited_styles:
-                visited_styles.append(style_ref)
+                visited_styles.add(style_ref)
                 valid &= self._get_style_attrib_map(
                     id_to_style_map[style_ref],
                     id_to_style_map=id_to_style_map,
@@ -89,6 +113,55 @@ class styleRefsXmlCheck(XmlCheck):
 
         return valid
 
+    def _resolve_acyclic_styles(
+            self,
+            id_to_style_map: dict[str, Element],
+            id_to_styleattribs_map: dict[str, dict[str, str]],
+            ) -> set[str]:
+        """
+        Resolves the attributes of each style that does not reach a
+        cycle of style references once, from those of the styles it
+        references, and returns the ids of the styles that do.
+        """
+        visiting, done = 1, 2
+        state = {}
+        reaches_cycle = set()
+        for start_id in id_to_style_map:
+            if start_id in state:
+                continue
+            state[start_id] = visiting
+            # Iterative, so that long chains of styles do not recurse
+            stack = [(start_id, iter(
+                id_to_style_map[start_id].get('style', '').split()))]
+            while len(stack) > 0:
+                style_id, style_refs = stack[-1]
+                for style_ref in style_refs:
+                    ref_state = state.get(style_ref)
+                    if ref_state is None:
+                        state[style_ref] = visiting
+                        stack.append((style_ref, iter(
+                            id_to_style_map[style_ref].get('style', '')
+                            .split())))
+                        break
+                    if ref_state == visiting or style_ref in reaches_cycle:
+                        reaches_cycle.add(style_id)
+                else:
+                    stack.pop()
+                    state[style_id] = done
+                    if style_id in reaches_cycle:
+                        if len(stack) > 0:
+                            reaches_cycle.add(stack[-1][0])
+                        continue
+                    style_el = id_to_style_map[style_id]
+                    attrib_map = {}
+                    for style_ref in style_el.get('style', '').split():
+                        attrib_map.update(id_to_styleattribs_map[style_ref])
+                    for key, value in style_el.items():
+                        if key != 'style':
+                            attrib_map[key] = value
+                    id_to_styleattribs_map[style_id] = attrib_map
+        return reaches_cycle
+
     def _gather_style_attribs(
             self,
             id_to_style_map: dict[str, Element],
@@ -97,9 +170,16 @@ class styleRefsXmlCheck(XmlCheck):
             ) -> bool:
         valid = True
 
+        reaches_cycle = self._resolve_acyclic_styles(
+            id_to_style_map=id_to_style_map,
+            id_to_styleattribs_map=id_to_styleattribs_map)
         for id, style_el in id_to_style_map.items():
+            if id not in reaches_cycle:
+                continue
+            # Walked from each style, so that every style that reaches
+            # a cycle reports it
             attrib_map = {}
-            visited = []
+            visited = set()
             valid &= self._get_style_attrib_map(
                 style_el=style_el,
                 id_to_style_map=id_to_style_map,
@@ -294,8 +374,8 @@ class styleRefsXmlCheck(XmlCheck):
                 validation_results.good(
                     location=validation_location,
                     message='Computed fontSize {:.3f}rh '
-                            '(within BBC-allowed range)'
-                            .format(c_font_size_val),
+                            '(within BBC-allowed range)',
+                    message_args=(c_font_size_val,),
                     code=ValidationCode.bbc_text_fontSize_constraint
                 )
 
@@ -339,8 +419,8 @@ class styleRefsXmlCheck(XmlCheck):
                 validation_results.info(
                     location=validation_location,
                     message='Computed multiRowAlign set to {}, '
-                            'matches textAlign'
-                            .format(c_mra),
+                            'matches textAlign',
+                    message_args=(c_mra,),
                     code=ValidationCode.ebuttd_multiRowAlign
                 )
             elif c_mra != 'auto':
@@ -373,8 +453,9 @@ class styleRefsXmlCheck(XmlCheck):
             else:
                 validation_results.good(
                     location=validation_location,
-                    message='Computed linePadding {} within BBC-allowed range'
-                            .format(c_lp),
+                    message='Computed linePadding {} within BBC-allowed '
+                            'range',
+                    message_args=(c_lp,),
                     code=ValidationCode.bbc_text_linePadding_constraint
                 )
 
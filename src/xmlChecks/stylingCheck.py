@@ -16,6 +16,15 @@ class stylingCheck(XmlCheck):
     Checks presence and contents of styling element
     """
 
+    _validationCodes = [
+        ValidationCode.ebuttd_styling_element_constraint,
+        ValidationCode.ttml_element_styling,
+        ValidationCode.ttml_element_style,
+        ValidationCode.ebuttd_style_element_constraint,
+    ]
+    _providesContext = ['id_to_style_map']
+    _readsContext = ['root_ns']
+
     def run(
             self,
             input: Element,
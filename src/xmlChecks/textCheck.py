@@ -16,6 +16,10 @@ class noTextChildren(XmlCheck):
     Checks that element has no text children
     """
 
+    _validationCodes = [
+        ValidationCode.bbc_text_span_constraint,
+    ]
+
     def run(
             self,
             input: Element,
@@ -46,6 +50,11 @@ class checkLineBreaks(XmlCheck):
     Checks for line breaks instead of <br> elements
     """
 
+    _validationCodes = [
+        ValidationCode.ttml_element_br,
+    ]
+    _readsContext = ['root_ns']
+
     def run(
             self,
             input: Element,
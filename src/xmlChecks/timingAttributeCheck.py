@@ -54,6 +54,11 @@ class noTimingAttributeCheck(XmlCheck):
     Checks there are no timing attributes on the input element
     """
 
+    _validationCodes = [
+        ValidationCode.ebuttd_timing_attribute_constraint,
+    ]
+    _providesContext = ['parent_timing']
+
     def run(
             self,
             input: Element,
@@ -82,6 +87,11 @@ class noNestedTimedElementsCheck(XmlCheck):
     Checks for nested elements that have timing attributes
     """
 
+    _validationCodes = [
+        ValidationCode.ebuttd_nested_timing_constraint,
+    ]
+    _providesContext = ['parent_timing']
+
     def run(
             self,
             input: Element,
@@ -14,6 +14,12 @@ import re
 
 
 class ttTagAndNamespaceCheck(XmlCheck):
+    _validationCodes = [
+        ValidationCode.xml_tt_namespace,
+        ValidationCode.xml_root_element,
+    ]
+    _providesContext = ['root_ns']
+
     def run(
             self,
             input: Element,
@@ -59,6 +65,11 @@ class ttTagAndNamespaceCheck(XmlCheck):
 
 
 class timeBaseCheck(XmlCheck):
+    _validationCodes = [
+        ValidationCode.ebuttd_parameter_timeBase,
+    ]
+    _readsContext = ['root_ns']
+
     default_timeBase = 'media'
 
     def __init__(self,
@@ -112,6 +123,10 @@ class timeBaseCheck(XmlCheck):
 
 
 class activeAreaCheck(XmlCheck):
+    _validationCodes = [
+        ValidationCode.imsc_parameter_activeArea,
+    ]
+
     activeArea_re = re.compile(
         r'^(?P<leftOffset>[\d]+(\.[\d]+)?)%[\s]+'
         r'(?P<topOffset>[\d]+(\.[\d]+)?)%[\s]+'
@@ -187,6 +202,12 @@ class activeAreaCheck(XmlCheck):
 
 
 class cellResolutionCheck(XmlCheck):
+    _validationCodes = [
+        ValidationCode.ttml_parameter_cellResolution,
+    ]
+    _providesContext = ['cellResolution']
+    _readsContext = ['root_ns']
+
     cellResolution_re = re.compile(
         r'^(?P<horizontal>[\d]+)[\s]+'
         r'(?P<vertical>[\d]+)$')
@@ -273,6 +294,11 @@ class cellResolutionCheck(XmlCheck):
 
 class contentProfilesCheck(XmlCheck):
 
+    _validationCodes = [
+        ValidationCode.ttml_parameter_contentProfiles,
+    ]
+    _readsContext = ['root_ns']
+
     def __init__(self,
                  contentProfiles_atleastonelist: list[str] = [],
                  contentProfiles_denylist: list[str] = [],
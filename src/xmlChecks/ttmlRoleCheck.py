@@ -19,6 +19,11 @@ class ttmlRoleTypeCheck(XmlCheck):
     Checks values of ttm:role attribute
     """
 
+    _validationCodes = [
+        ValidationCode.ttml_metadata_role,
+    ]
+    _readsContext = ['root_ns']
+
     def __init__(self) -> None:
         super().__init__()
 
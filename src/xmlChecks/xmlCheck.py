@@ -3,10 +3,77 @@
 # SPDX-License-Identifier: BSD-3-Clause
 
 from src.validationLogging.validationLogger import ValidationLogger
+from src.validationLogging.validationCodes import ValidationCode
 from xml.etree.ElementTree import Element
 
 
 class XmlCheck:
+    _validationCodes: list[ValidationCode] = []
+    _subChecks: list['XmlCheck'] = []
+
+    # The context keys that the check sets, those that it needs another
+    # check to have set, and those that it uses if they have been set,
+    # falling back to a default otherwise
+    _providesContext: list[str] = []
+    _requiresContext: list[str] = []
+    _readsContext: list[str] = []
+
+    # True if the check changes the document tree
+    _modifiesTree: bool = False
+
+    def subChecks(self) -> list['XmlCheck']:
+        """Returns the checks that this check runs on descendant elements."""
+        return self._subChecks
+
+    def validationCodes(self) -> list[ValidationCode]:
+        """Returns the codes that this check and its sub-checks can log."""
+        codes = list(self._validationCodes)
+        for sub_check in self.subChecks():
+            codes.extend(
+                code for code in sub_check.validationCodes()
+                if code not in codes)
+        return codes
+
+    def providesContext(self) -> list[str]:
+        """
+        Returns the context keys that this check and its sub-checks set.
+        """
+        keys = list(self._providesContext)
+        for sub_check in self.subChecks():
+            keys.extend(
+                key for key in sub_check.providesContext()
+                if key not in keys)
+        return keys
+
+    def requiresContext(self) -> list[str]:
+        """
+        Returns the context keys that this check and its sub-checks need
+        another check to have set before they run.
+        """
+        return self._externalKeys('_requiresContext', 'requiresContext')
+
+    def readsContext(self) -> list[str]:
+        """
+        Returns the context keys that this check and its sub-checks use if
+        another check has set them, and otherwise do without.
+        """
+        return self._externalKeys('_readsContext', 'readsContext')
+
+    def _externalKeys(self, own_attribute: str, method: str) -> list[str]:
+        # Keys that are set within this check are not needed from others
+        provided = self.providesContext()
+        keys = [key for key in getattr(self, own_attribute)
+                if key not in provided]
+        for sub_check in self.subChecks():
+            keys.extend(
+                key for key in getattr(sub_check, method)()
+                if key not in keys and key not in provided)
+        return keys
+
+    def modifiesTree(self) -> bool:
+        """Returns True if this check or its sub-checks change the tree."""
+        return self._modifiesTree or any(
+            sub_check.modifiesTree() for sub_check in self.subChecks())
 
     def run(
             self,
@@ -16,6 +16,10 @@ class requireXmlId(XmlCheck):
     Checks that element has an xml:id attribute
     """
 
+    _validationCodes = [
+        ValidationCode.ebuttd_p_xml_id_constraint,
+    ]
+
     def run(
             self,
             input: Element,
@@ -37,6 +41,10 @@ class requireXmlId(XmlCheck):
 
 
 class unqualifiedIdAttributeCheck(XmlCheck):
+    _validationCodes = [
+        ValidationCode.xml_id_unqualified,
+    ]
+
     def run(
             self,
             input: Element,
@@ -73,6 +81,12 @@ class unqualifiedIdAttributeCheck(XmlCheck):
 
 class duplicateXmlIdCheck(XmlCheck):
 
+    _validationCodes = [
+        ValidationCode.xml_id_unique,
+    ]
+    _providesContext = ['xmlId_to_element_map']
+    _readsContext = ['document_index']
+
     @classmethod
     def _gatherXmlId(cls, e: Element, m: dict[str, list]):
         xmlId = e.get(xmlIdAttr)
@@ -86,10 +100,15 @@ class duplicateXmlIdCheck(XmlCheck):
             input: Element,
             context: dict,
             validation_results: ValidationLogger) -> bool:
-        xmlIdToElementMap = {}
-
-        for e in input.iter():
-            duplicateXmlIdCheck._gatherXmlId(e=e, m=xmlIdToElementMap)
+        # The map is kept in the document index, if there is one, so that
+        # validating the same tree as another flavour does not rebuild it
+        document_index = context.get('document_index', {})
+        xmlIdToElementMap = document_index.get('xmlId_to_element_map')
+        if xmlIdToElementMap is None:
+            xmlIdToElementMap = {}
+            for e in input.iter():
+                duplicateXmlIdCheck._gatherXmlId(e=e, m=xmlIdToElementMap)
+            document_index['xmlId_to_element_map'] = xmlIdToElementMap
 
         valid = True
         for (xmlId, elist) in xmlIdToElementMap.items():
@@ -160,6 +179,14 @@ class IDREFSelementApplicabilityCheck(XmlCheck):
     Checks that IDREFS attributes dereference to an appropriate element.
     """
 
+    _validationCodes = [
+        ValidationCode.ttml_idref_element_applicability,
+        ValidationCode.ttml_idref_empty,
+        ValidationCode.ttml_idref_too_many,
+    ]
+    _requiresContext = ['xmlId_to_element_map']
+    _readsContext = ['root_ns']
+
     def run(
             self,
             input: Element,
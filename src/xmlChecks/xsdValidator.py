@@ -11,6 +11,10 @@ from xmlschema import XMLSchemaValidationError, XMLSchema
 
 class xsdValidator(XmlCheck):
 
+    _validationCodes = [
+        ValidationCode.xml_xsd,
+    ]
+
     def __init__(self,
                  xml_schema: XMLSchema,
                  schema_name: str) -> None:
@@ -0,0 +1,170 @@
+# SPDX-FileCopyrightText: Copyright © 2026 BBC
+#
+# SPDX-License-Identifier: BSD-3-Clause
+
+from concurrent.futures import ThreadPoolExecutor
+from unittest import TestCase
+import csv
+import io
+import json
+import tarfile
+import zipfile
+from benchmarks.ttmlGenerator import DocumentShape, generate
+from src.archiveInput import ArchiveError, archive_members, validate_archive
+from src.ttmlValidator import default_args, validate_ttml_archive
+from src.validator import ValidationOptions
+
+
+class namedTestBuffer(io.BytesIO):
+    name = 'namedTestBuffer'
+
+
+class pipeBuffer(io.BytesIO):
+    """Buffer that cannot seek, like a pipe."""
+
+    def seekable(self) -> bool:
+        return False
+
+
+def make_documents() -> dict[str, bytes]:
+    return {
+        'bundle/1.xml': generate(
+            flavour='bbc', shape=DocumentShape(subtitles=3), seed=1),
+        'bundle/2.xml': generate(
+            flavour='bbc', shape=DocumentShape(subtitles=10), valid=False,
+            seed=1),
+        'bundle/readme.txt': b'Not a TTML document',
+    }
+
+
+def make_tar(documents: dict[str, bytes], mode: str = 'w:gz') -> bytes:
+    out = io.BytesIO()
+    with tarfile.open(fileobj=out, mode=mode) as tar_file:
+        directory = tarfile.TarInfo('bundle')
+        directory.type = tarfile.DIRTYPE
+        tar_file.addfile(directory)
+        for name, content in documents.items():
+            info = tarfile.TarInfo(name)
+            info.size = len(content)
+            tar_file.addfile(info, io.BytesIO(content))
+    return out.getvalue()
+
+
+def make_zip(documents: dict[str, bytes]) -> bytes:
+    out = io.BytesIO()
+    with zipfile.ZipFile(out, 'w', compression=zipfile.ZIP_DEFLATED) \
+            as zip_file:
+        zip_file.writestr('bundle/', b'')
+        for name, content in documents.items():
+            zip_file.writestr(name, content)
+    return out.getvalue()
+
+
+class testArchiveInput(TestCase):
+
+    maxDiff = None
+
+    def test_archive_members(self):
+        documents = make_documents()
+        archives = {
+            'tar': make_tar(documents, mode='w'),
+            'tar.gz': make_tar(documents),
+            'zip': make_zip(documents),
+        }
+        for kind, archive in archives.items():
+            for stream_type in [io.BytesIO, pipeBuffer]:
+                with self.subTest(kind=kind, stream=stream_type.__name__):
+                    self.assertEqual(
+                        dict(archive_members(stream_type(archive))),
+                        documents)
+                    self.assertEqual(
+                        [name for name, _ in archive_members(
+                            stream_type(archive), member_glob='*.xml')],
+                        ['bundle/1.xml', 'bundle/2.xml'])
+                    self.assertEqual(
+                        [content for _, content in archive_members(
+                            stream_type(archive),
+                            member_glob='*.txt',
+                            read_limit=3)],
+                        [b'Not'])
+
+    def test_not_an_archive(self):
+        for stream_type in [io.BytesIO, pipeBuffer]:
+            with self.subTest(stream=stream_type.__name__):
+                with self.assertRaises(ArchiveError):
+                    list(archive_members(stream_type(b'<tt/>' * 200)))
+
+    def test_validate_archive(self):
+        archive = make_tar(make_documents())
+        reports = list(validate_archive(
+            io.BytesIO(archive), member_glob='*.xml'))
+        self.assertEqual(
+            [(name, report.valid) for name, report in reports],
+            [('bundle/1.xml', True), ('bundle/2.xml', False)])
+
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            pooled_reports = list(validate_archive(
+                io.BytesIO(archive),
+                member_glob='*.xml',
+                executor=executor,
+                max_pending=1))
+        self.assertEqual(
+            [(name, list(report.results)) for name, report in pooled_reports],
+            [(name, list(report.results)) for name, report in reports])
+
+    def test_member_options(self):
+        archive = make_zip(make_documents())
+        names = []
+
+        def member_options(name: str) -> ValidationOptions:
+            names.append(name)
+            return ValidationOptions(max_bytes=10)
+
+        reports = list(validate_archive(
+            io.BytesIO(archive),
+            member_glob='*.xml',
+            member_options=member_options))
+        self.assertEqual(names, ['bundle/1.xml', 'bundle/2.xml'])
+        self.assertFalse(any(report.valid for _, report in reports))
+
+    def _validate(self, archive: bytes, **kwargs) -> tuple[int, str]:
+        results_out = io.TextIOWrapper(
+            buffer=namedTestBuffer(), encoding='utf-8', newline='\n')
+        options = dict(
+            ttml_in=namedTestBuffer(archive),
+            results_out=results_out,
+            csv=False,
+            json=False,
+            segment=False,
+            segdur=3.84,
+            segment_relative_timing=False,
+            vertical=False,
+            collate_more_than=0,
+            flavour='bbc',
+            member_glob='*.xml',
+            workers=1,
+            executor='thread')
+        options.update(kwargs)
+        result = validate_ttml_archive(default_args(**options))
+        results_out.seek(0)
+        return result, results_out.read()
+
+    def test_results_keyed_by_member(self):
+        archive = make_tar(make_documents())
+        result, text = self._validate(archive, csv=True)
+        self.assertEqual(result, 1)
+        rows = list(csv.reader(io.StringIO(text)))
+        self.assertEqual(
+            rows[0], ['member', 'status', 'code', 'location', 'message'])
+        self.assertEqual(
+            sorted(set(row[0] for row in rows[1:])),
+            ['bundle/1.xml', 'bundle/2.xml'])
+
+        result, text = self._validate(archive, json=True, workers=2)
+        reports = json.loads(text)
+        self.assertEqual(
+            {name: report['valid'] for name, report in reports.items()},
+            {'bundle/1.xml': True, 'bundle/2.xml': False})
+
+        _, text = self._validate(archive, json=True, member_glob='none')
+        self.assertEqual(json.loads(text), {})
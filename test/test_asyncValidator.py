@@ -0,0 +1,125 @@
+# SPDX-FileCopyrightText: Copyright © 2026 BBC
+#
+# SPDX-License-Identifier: BSD-3-Clause
+
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from unittest import IsolatedAsyncioTestCase
+import threading
+import time
+from benchmarks.ttmlGenerator import DocumentShape, generate
+from src.asyncValidator import AsyncValidator
+from src.validator import ValidationOptions
+
+
+class countingExecutor(ThreadPoolExecutor):
+    """Records the most tasks that were running at once."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._lock = threading.Lock()
+        self.running = 0
+        self.max_running = 0
+
+    def submit(self, fn, /, *args, **kwargs):
+        def counted():
+            with self._lock:
+                self.running += 1
+                self.max_running = max(self.max_running, self.running)
+            try:
+                # Hold the slot long enough for others to start
+                time.sleep(0.01)
+                return fn(*args, **kwargs)
+            finally:
+                with self._lock:
+                    self.running -= 1
+        return super().submit(counted)
+
+
+class blockingExecutor(ThreadPoolExecutor):
+    """Holds every submitted task until released, counting them."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.release = threading.Event()
+        self.submitted = 0
+
+    def submit(self, fn, /, *args, **kwargs):
+        def blocked():
+            self.release.wait(timeout=10)
+            return fn(*args, **kwargs)
+        self.submitted += 1
+        return super().submit(blocked)
+
+
+class testAsyncValidator(IsolatedAsyncioTestCase):
+
+    async def test_validate(self):
+        document = generate(flavour='dapt', shape=DocumentShape(subtitles=3))
+        async with AsyncValidator(max_workers=2) as validator:
+            report = await validator.validate(document, flavour='dapt')
+        self.assertTrue(report.valid)
+
+    async def test_validate_many_respects_concurrency_limit(self):
+        documents = [
+            generate(
+                flavour='bbc',
+                shape=DocumentShape(subtitles=3),
+                valid=index % 3 != 0,
+                seed=index)
+            for index in range(9)]
+        executor = countingExecutor(max_workers=8)
+        try:
+            validator = AsyncValidator(executor=executor, max_concurrent=2)
+            reports = await validator.validate_many(documents, flavour='bbc')
+            await validator.close()
+        finally:
+            executor.shutdown()
+        self.assertEqual(
+            [report.valid for report in reports],
+            [index % 3 != 0 for index in range(9)])
+        self.assertLessEqual(executor.max_running, 2)
+        self.assertGreater(executor.max_running, 0)
+
+    async def test_timeout(self):
+        document = generate(
+            flavour='bbc', shape=DocumentShape(subtitles=2000))
+        async with AsyncValidator(max_workers=1) as validator:
+            with self.assertRaises(TimeoutError):
+                await validator.validate(document, timeout=0.05)
+            # The resource limit stops the timed out validation, so the
+            # worker is soon free for the next document
+            started = time.monotonic()
+            report = await validator.validate(
+                generate(flavour='bbc', shape=DocumentShape(subtitles=3)))
+            self.assertLess(time.monotonic() - started, 5)
+        self.assertTrue(report.valid)
+
+    async def test_timed_out_jobs_count_against_the_limit(self):
+        document = generate(flavour='bbc', shape=DocumentShape(subtitles=3))
+        executor = blockingExecutor(max_workers=2)
+        self.addCleanup(executor.shutdown)
+        self.addCleanup(executor.release.set)
+        validator = AsyncValidator(executor=executor, max_concurrent=1)
+        with self.assertRaises(TimeoutError):
+            await validator.validate(document, timeout=0.05)
+        # The timed out job is still running, so holds the only slot
+        with self.assertRaises(TimeoutError):
+            await asyncio.wait_for(validator.validate(document), timeout=0.2)
+        self.assertEqual(executor.submitted, 1)
+        executor.release.set()
+        report = await asyncio.wait_for(
+            validator.validate(document), timeout=10)
+        self.assertTrue(report.valid)
+        self.assertEqual(executor.submitted, 2)
+
+    def test_timeout_sets_resource_limit(self):
+        options = ValidationOptions(max_seconds=10)
+        limited = AsyncValidator._limitedOptions(options, timeout=2)
+        self.assertEqual(limited.max_seconds, 2)
+        self.assertEqual(options.max_seconds, 10)
+        self.assertIs(AsyncValidator._limitedOptions(options, None), options)
+        self.assertEqual(
+            AsyncValidator._limitedOptions(
+                ValidationOptions(max_seconds=1), timeout=2).max_seconds,
+            1)
@@ -0,0 +1,150 @@
+# SPDX-FileCopyrightText: Copyright © 2026 BBC
+#
+# SPDX-License-Identifier: BSD-3-Clause
+
+from unittest import TestCase
+import io
+import json
+import xml.etree.ElementTree as ElementTree
+from src.checkProfiler import CheckProfiler, unwrapped
+from src.preParseChecks.preParseCheck import NullByteCheck
+from src.ttmlValidator import default_args, validate_ttml
+from src.validationLogging.validationLogger import ValidationLogger
+import src.xmlChecks.headXmlCheck as headXmlCheck
+import src.xmlChecks.copyrightCheck as copyrightCheck
+import src.xmlChecks.layoutCheck as layoutCheck
+
+
+class namedTestBuffer(io.BytesIO):
+    name = 'namedTestBuffer'
+
+
+class testCheckProfiler(TestCase):
+
+    maxDiff = None
+
+    input_xml = """<?xml version="1.0" encoding="UTF-8"?>
+<tt xml:lang="en-GB"
+    xmlns="http://www.w3.org/ns/ttml"
+    xmlns:tts="http://www.w3.org/ns/ttml#styling"
+    xmlns:ttm="http://www.w3.org/ns/ttml#metadata">
+<head>
+    <ttm:copyright>valid</ttm:copyright>
+    <layout>
+        <region xml:id="r1" tts:origin="10% 10%"/>
+    </layout>
+</head>
+<body/>
+</tt>
+"""
+
+    def _headCheck(self) -> headXmlCheck.headCheck:
+        return headXmlCheck.headCheck(
+            sub_checks=[
+                copyrightCheck.copyrightCheck(copyright_required=False),
+                layoutCheck.layoutCheck(),
+            ]
+        )
+
+    def test_profile_xml_check_with_sub_checks(self):
+        head_check = self._headCheck()
+        original_sub_checks = list(head_check.subChecks())
+        profiler = CheckProfiler()
+        profiled_check = profiler.profileXmlCheck(head_check)
+
+        vr = ValidationLogger()
+        valid = profiled_check.run(
+            input=ElementTree.fromstring(self.input_xml),
+            context={},
+            validation_results=vr
+        )
+
+        self.assertTrue(valid)
+        self.assertIs(unwrapped(profiled_check).subChecks()[0].profiled_check,
+                      original_sub_checks[0])
+        self.assertEqual(head_check.subChecks(), original_sub_checks)
+        self.assertEqual(
+            profiled_check.validationCodes(),
+            head_check.validationCodes())
+
+        profiles = {
+            profile.name: profile for profile in profiler.profiles()}
+        self.assertEqual(
+            list(profiles.keys()),
+            [
+                'headCheck',
+                'headCheck/copyrightCheck',
+                'headCheck/layoutCheck',
+            ])
+        self.assertEqual(profiles['headCheck'].results, len(vr))
+        self.assertEqual(
+            profiles['headCheck'].results,
+            1
+            + profiles['headCheck/copyrightCheck'].results
+            + profiles['headCheck/layoutCheck'].results)
+        for profile in profiles.values():
+            with self.subTest(check=profile.name):
+                self.assertEqual(profile.calls, 1)
+                self.assertGreater(profile.wall_ns, 0)
+                self.assertIsNone(profile.peak_allocated_bytes)
+
+    def test_profile_memory(self):
+        profiler = CheckProfiler(trace_memory=True)
+        profiled_check = profiler.profileXmlCheck(self._headCheck())
+        profiler.start()
+        try:
+            profiled_check.run(
+                input=ElementTree.fromstring(self.input_xml),
+                context={},
+                validation_results=ValidationLogger()
+            )
+        finally:
+            profiler.stop()
+
+        for profile in profiler.profiles():
+            with self.subTest(check=profile.name):
+                self.assertIsNotNone(profile.peak_allocated_bytes)
+        outer, *inner = profiler.profiles()
+        for profile in inner:
+            self.assertGreaterEqual(
+                outer.peak_allocated_bytes, profile.peak_allocated_bytes)
+
+    def test_profile_pre_parse_check(self):
+        profiler = CheckProfiler()
+        profiled_check = profiler.profilePreParseCheck(NullByteCheck())
+        vr = ValidationLogger()
+        for _ in range(2):
+            valid, output = profiled_check.run(b'a\x00b', vr)
+            self.assertFalse(valid)
+            self.assertEqual(output, b'ab')
+        profile = profiler.profiles()[0]
+        self.assertEqual(profile.name, 'NullByteCheck')
+        self.assertEqual(profile.calls, 2)
+        self.assertEqual(profile.results, 2)
+
+    def test_validate_ttml_writes_profile(self):
+        results_out = io.TextIOWrapper(
+            buffer=namedTestBuffer(), encoding='utf-8', newline='\n')
+        profile_out = io.StringIO()
+        args = default_args(
+            ttml_in=namedTestBuffer(self.input_xml.encode('utf-8')),
+            results_out=results_out,
+            csv=False,
+            json=False,
+            segment=False,
+            segdur=3.84,
+            segment_relative_timing=False,
+            vertical=False,
+            collate_more_than=0,
+            flavour='bbc',
+            profile_out=profile_out,
+        )
+        validate_ttml(args)
+        profiles = json.loads(profile_out.getvalue())
+        check_names = [profile['check'] for profile in profiles]
+        self.assertEqual(check_names[0], 'ByteOrderMarkCheck')
+        self.assertIn('parse', check_names)
+        self.assertIn('headCheck/layoutCheck', check_names)
+        self.assertIn('bodyCheck/divCheck', check_names)
+        self.assertNotIn('profiledXmlCheck', results_out.buffer.getvalue()
+                         .decode('utf-8'))
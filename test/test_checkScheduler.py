@@ -0,0 +1,345 @@
+# SPDX-FileCopyrightText: Copyright © 2026 BBC
+#
+# SPDX-License-Identifier: BSD-3-Clause
+
+from concurrent.futures import ThreadPoolExecutor
+from unittest import TestCase
+import threading
+import time
+from benchmarks.ttmlGenerator import DocumentShape, generate
+from src.checkScheduler import CheckScheduler, CheckSelectionError, \
+    ContextContractError
+from src.validationLogging.validationCodes import ValidationCode
+from src.validationLogging.validationResult import ERROR, SKIP
+from src.validator import ValidationOptions, constraint_set, validate
+from src.xmlChecks.bodyXmlCheck import bodyCheck
+from src.xmlChecks.timingAttributeCheck import noTimingAttributeCheck
+from src.xmlChecks.xmlCheck import XmlCheck
+
+
+class contractCheck(XmlCheck):
+    """Check that only declares a context contract."""
+
+    def __init__(
+            self,
+            name: str,
+            provides: list[str] | None = None,
+            requires: list[str] | None = None,
+            reads: list[str] | None = None,
+            modifies_tree: bool = False,
+            codes: list[ValidationCode] | None = None):
+        super().__init__()
+        self.name = name
+        self._providesContext = provides or []
+        self._requiresContext = requires or []
+        self._readsContext = reads or []
+        self._modifiesTree = modifies_tree
+        self._validationCodes = codes or []
+
+
+class testCheckScheduler(TestCase):
+
+    def test_requires_orders_after_provider(self):
+        scheduler = CheckScheduler([
+            contractCheck('a', requires=['x']),
+            contractCheck('b', provides=['x']),
+            contractCheck('c'),
+        ])
+        self.assertEqual(scheduler.order(), [1, 0, 2])
+        self.assertEqual(scheduler.dependencies(0), {1})
+        self.assertEqual(scheduler.dependencies(2), set())
+
+    def test_reads_keep_the_order_given(self):
+        scheduler = CheckScheduler([
+            contractCheck('early', reads=['x']),
+            contractCheck('provider', provides=['x']),
+            contractCheck('late', reads=['x']),
+        ])
+        self.assertEqual(scheduler.order(), [0, 1, 2])
+        self.assertEqual(scheduler.dependencies(1), {0})
+        self.assertEqual(scheduler.dependencies(2), {1})
+
+    def test_tree_modifying_check_is_a_barrier(self):
+        scheduler = CheckScheduler([
+            contractCheck('a'),
+            contractCheck('b'),
+            contractCheck('pruner', modifies_tree=True),
+            contractCheck('c'),
+        ])
+        self.assertEqual(scheduler.dependencies(2), {0, 1})
+        self.assertEqual(scheduler.dependencies(3), {2})
+
+    def test_pipeline_keys_need_no_provider(self):
+        scheduler = CheckScheduler([contractCheck('a', requires=['args'])])
+        self.assertEqual(scheduler.order(), [0])
+
+    def test_contract_errors(self):
+        cases = {
+            'missing provider': [contractCheck('a', requires=['x'])],
+            'two providers': [
+                contractCheck('a', provides=['x']),
+                contractCheck('b', provides=['x'])],
+            'provides a pipeline key': [
+                contractCheck('a', provides=['args'])],
+            'cycle': [
+                contractCheck('a', provides=['x'], requires=['y']),
+                contractCheck('b', provides=['y'], requires=['x'])],
+        }
+        for name, checks in cases.items():
+            with self.subTest(case=name):
+                with self.assertRaises(ContextContractError) as cm:
+                    CheckScheduler(checks)
+                self.assertEqual(len(cm.exception.problems), 1)
+
+    def test_all_problems_reported(self):
+        with self.assertRaises(ContextContractError) as cm:
+            CheckScheduler([
+                contractCheck('a', requires=['x']),
+                contractCheck('b', requires=['y']),
+            ])
+        self.assertEqual(len(cm.exception.problems), 2)
+
+    def test_sub_check_contracts(self):
+        check = bodyCheck(sub_checks=[noTimingAttributeCheck()])
+        self.assertIn('parent_timing', check.providesContext())
+        self.assertNotIn('parent_timing', check.requiresContext())
+        self.assertNotIn('parent_timing', check.readsContext())
+        self.assertIn('root_ns', check.readsContext())
+
+    def test_needed_for(self):
+        scheduler = CheckScheduler([
+            contractCheck('early', reads=['x'],
+                          codes=[ValidationCode.xml_xsd]),
+            contractCheck('provider', provides=['x'],
+                          codes=[ValidationCode.xml_prune]),
+            contractCheck('pruner', modifies_tree=True),
+            contractCheck('late', requires=['x'],
+                          codes=[ValidationCode.bbc_timing_gaps]),
+        ])
+        self.assertEqual(
+            scheduler.neededFor([ValidationCode.bbc_timing_gaps]), [1, 2, 3])
+        # Checks that only run before a provider do not need it
+        self.assertEqual(scheduler.neededFor([ValidationCode.xml_xsd]), [0])
+        self.assertEqual(scheduler.neededForChecks([3, 0]), [0, 1, 2, 3])
+
+    def test_codes_matching(self):
+        scheduler = constraint_set('bbc').checkScheduler()
+        # Class names, including those of sub-checks
+        self.assertIn(
+            ValidationCode.bbc_timing_gaps,
+            scheduler.codesMatching('bbcTimingCheck'))
+        self.assertIn(
+            ValidationCode.ebuttd_nested_span_constraint,
+            scheduler.codesMatching('spanCheck'))
+        self.assertNotIn(
+            ValidationCode.ttml_element_body,
+            scheduler.codesMatching('spanCheck'))
+        # Code name prefixes
+        codes = scheduler.codesMatching('bbc_timing')
+        self.assertGreater(len(codes), 1)
+        self.assertTrue(all(
+            code.name.startswith('bbc_timing') for code in codes))
+        with self.assertRaises(CheckSelectionError):
+            scheduler.codesMatching('no_such_code')
+
+    def test_select(self):
+        scheduler = CheckScheduler([
+            contractCheck('provider', provides=['x'],
+                          codes=[ValidationCode.xml_prune]),
+            contractCheck('other', codes=[ValidationCode.xml_xsd]),
+            contractCheck('user', requires=['x'],
+                          codes=[ValidationCode.bbc_timing_gaps]),
+        ])
+        self.assertEqual(scheduler.select(), [0, 1, 2])
+        # Prerequisites are included
+        self.assertEqual(scheduler.select(include=['bbc_timing']), [0, 2])
+        # Even if excluded
+        self.assertEqual(
+            scheduler.select(include=['bbc_timing'], exclude=['xml_prune']),
+            [0, 2])
+        self.assertEqual(scheduler.select(exclude=['xml_xsd']), [0, 2])
+        self.assertEqual(scheduler.select(exclude=['bbc_timing']), [0, 1])
+        self.assertEqual(scheduler.select(include=['contractCheck']),
+                         [0, 1, 2])
+
+    def test_constraint_sets_keep_their_order(self):
+        for flavour in ['bbc', 'dapt']:
+            with self.subTest(flavour=flavour):
+                constraints = constraint_set(flavour)
+                scheduler = constraints.checkScheduler()
+                self.assertEqual(
+                    scheduler.order(),
+                    list(range(len(constraints.xmlChecks()))))
+
+    def test_gate_tier_does_not_need_the_full_tier(self):
+        for flavour in ['bbc', 'dapt']:
+            with self.subTest(flavour=flavour):
+                constraints = constraint_set(flavour)
+                scheduler = constraints.checkScheduler()
+                gate_checks = constraints.tierChecks('gate')
+                full_checks = constraints.tierChecks('full')
+                self.assertGreater(len(gate_checks), 0)
+                self.assertGreater(len(full_checks), 0)
+                self.assertEqual(
+                    sorted(gate_checks + full_checks),
+                    list(range(len(constraints.xmlChecks()))))
+                self.assertEqual(
+                    scheduler.neededForChecks(gate_checks), gate_checks)
+
+    def test_run_concurrently(self):
+        scheduler = CheckScheduler([
+            contractCheck('slow'),
+            contractCheck('fast'),
+            contractCheck('dependant', requires=['x']),
+            contractCheck('provider', provides=['x']),
+        ])
+        lock = threading.Lock()
+        running = set()
+        started_with = {}
+        dependant_started = threading.Event()
+
+        def run_check(index: int) -> int:
+            with lock:
+                started_with[index] = set(running)
+                running.add(index)
+            if index == 0:
+                # Keep running until the dependant has started
+                dependant_started.wait(timeout=5)
+            elif index == 2:
+                dependant_started.set()
+            else:
+                time.sleep(0.01)
+            with lock:
+                running.discard(index)
+            return index * 10
+
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            outcomes = list(scheduler.runConcurrently(
+                executor=executor, run_check=run_check))
+
+        # Yielded in the scheduled order, whatever order they finished in
+        self.assertEqual(outcomes, [(0, 0), (1, 10), (3, 30), (2, 20)])
+        # The dependant only started once its provider had finished
+        self.assertNotIn(3, started_with[2])
+        self.assertIn(0, started_with[2])
+
+    def test_run_concurrently_stops_early(self):
+        scheduler = CheckScheduler([
+            contractCheck('a', provides=['x']),
+            contractCheck('b', requires=['x']),
+        ])
+        calls = []
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            outcomes = scheduler.runConcurrently(
+                executor=executor, run_check=calls.append)
+            next(outcomes)
+            outcomes.close()
+        self.assertEqual(calls, [0])
+
+    def test_concurrent_validation_matches_serial(self):
+        for flavour in ['bbc', 'dapt']:
+            for valid in [True, False]:
+                document = generate(
+                    flavour=flavour,
+                    shape=DocumentShape(subtitles=10, regions=2),
+                    valid=valid,
+                    seed=1)
+                for extra_options in [{}, {'max_errors': 1}]:
+                    with self.subTest(
+                            flavour=flavour,
+                            valid=valid,
+                            options=extra_options):
+                        serial = validate(
+                            document,
+                            flavour=flavour,
+                            options=ValidationOptions(
+                                collate_more_than=3, **extra_options))
+                        concurrent = validate(
+                            document,
+                            flavour=flavour,
+                            options=ValidationOptions(
+                                collate_more_than=3,
+                                check_workers=4,
+                                **extra_options))
+                        self.assertEqual(concurrent.valid, serial.valid)
+                        self.assertEqual(
+                            concurrent.failures, serial.failures)
+                        self.assertListEqual(
+                            list(concurrent.results), list(serial.results))
+
+    def test_selected_validation(self):
+        document = generate(
+            flavour='bbc',
+            shape=DocumentShape(subtitles=10, regions=2),
+            valid=True,
+            seed=1)
+        report = validate(
+            document,
+            options=ValidationOptions(
+                include=['bbcTimingCheck'], profile=True))
+        ran = set(
+            profile.name for profile in report.profiler.profiles()
+            if profile.calls > 0)
+        self.assertIn('bbcTimingCheck', ran)
+        self.assertIn('regionRefsXmlCheck', ran)
+        self.assertNotIn('xsdValidator', ran)
+        self.assertNotIn('inlineStyleAttributesCheck', ran)
+
+        skipped = set(
+            result.code for result in report.results
+            if result.status == SKIP
+            and result.message == 'Not checked because it was not selected')
+        self.assertIn(ValidationCode.xml_xsd, skipped)
+        self.assertNotIn(ValidationCode.bbc_timing_gaps, skipped)
+        # The summaries say the document was not fully checked
+        self.assertIn(
+            (ValidationCode.xml_document_validity, SKIP),
+            [(result.code, result.status) for result in report.results])
+        # and that it is not known to be valid
+        self.assertFalse(report.valid)
+        self.assertEqual(report.exitCode(), 1)
+        self.assertNotIn(
+            ValidationCode.validator_internal_exception,
+            [result.code for result in report.results])
+
+    def test_excluded_failures_are_not_reported(self):
+        document = generate(
+            flavour='bbc',
+            shape=DocumentShape(subtitles=10, regions=2),
+            valid=False,
+            seed=4)
+        full = validate(document)
+        self.assertIn(
+            (ValidationCode.xml_xsd, ERROR),
+            [(result.code, result.status) for result in full.results])
+        report = validate(
+            document, options=ValidationOptions(exclude=['xsdValidator']))
+        self.assertEqual(
+            [result.status for result in report.results
+             if result.code == ValidationCode.xml_xsd],
+            [SKIP])
+        self.assertFalse(report.valid)
+        self.assertEqual(report.exitCode(), max(report.failures, 1))
+        self.assertGreater(report.exitCode(), 0)
+        self.assertNotIn(
+            ValidationCode.validator_internal_exception,
+            [result.code for result in report.results])
+
+    def test_selected_concurrent_validation_matches_serial(self):
+        document = generate(
+            flavour='bbc',
+            shape=DocumentShape(subtitles=10, regions=2),
+            valid=False,
+            seed=0)
+        selection = {'include': ['ttml_layout', 'bbcTimingCheck'],
+                     'exclude': ['bbc_timing_gaps']}
+        serial = validate(document, options=ValidationOptions(**selection))
+        concurrent = validate(
+            document,
+            options=ValidationOptions(check_workers=4, **selection))
+        self.assertEqual(concurrent.valid, serial.valid)
+        self.assertListEqual(list(concurrent.results), list(serial.results))
+
+    def test_unknown_selection(self):
+        with self.assertRaises(CheckSelectionError):
+            validate(b'', options=ValidationOptions(include=['no_such_code']))
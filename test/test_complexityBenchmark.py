@@ -0,0 +1,62 @@
+# SPDX-FileCopyrightText: Copyright © 2026 BBC
+#
+# SPDX-License-Identifier: BSD-3-Clause
+
+from unittest import TestCase
+import logging
+from benchmarks.complexityBenchmark import ComplexityCase, default_cases, \
+    exponent_margin, fit_exponent, run_case
+
+
+class testComplexityBenchmark(TestCase):
+
+    def test_fit_exponent(self):
+        sizes = [10, 20, 40, 80]
+        for exponent in [0, 1, 2, 1.5]:
+            with self.subTest(exponent=exponent):
+                times = [0.001 * size ** exponent for size in sizes]
+                self.assertAlmostEqual(
+                    fit_exponent(sizes=sizes, times=times), exponent)
+
+    def test_fit_exponent_needs_different_sizes(self):
+        with self.assertRaises(ValueError):
+            fit_exponent(sizes=[10], times=[0.1])
+        with self.assertRaises(ValueError):
+            fit_exponent(sizes=[10, 10], times=[0.1, 0.2])
+
+    def test_bound_is_intended_complexity(self):
+        bounds = {case.name: case.max_exponent for case in default_cases}
+        self.assertEqual(bounds['region_overlap_pairs'], 2 + exponent_margin)
+        for name in ['temporal_overlap', 'style_chain', 'nested_agents',
+                     'represents_descriptors']:
+            self.assertEqual(bounds[name], 1 + exponent_margin)
+        with self.assertRaises(ValueError):
+            ComplexityCase(
+                name='cubic',
+                builder=None,
+                flavour='bbc',
+                check_name='bbcTimingCheck',
+                complexity='n**3',
+                sizes=[4, 8])
+
+    def test_cases_measure_their_check(self):
+        logging.disable(logging.CRITICAL)
+        try:
+            for case in default_cases:
+                with self.subTest(case=case.name):
+                    small_case = ComplexityCase(
+                        name=case.name,
+                        builder=case.builder,
+                        flavour=case.flavour,
+                        check_name=case.check_name,
+                        complexity=case.complexity,
+                        sizes=[4, 8])
+                    result = run_case(case=small_case, repeat=1)
+                    self.assertEqual(result['sizes'], [4, 8])
+                    for seconds in result['seconds']:
+                        self.assertGreater(seconds, 0)
+                    result = run_case(
+                        case=small_case, repeat=1, max_exponent=-100)
+                    self.assertFalse(result['passed'])
+        finally:
+            logging.disable(logging.NOTSET)
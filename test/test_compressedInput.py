@@ -0,0 +1,128 @@
+# SPDX-FileCopyrightText: Copyright © 2026 BBC
+#
+# SPDX-License-Identifier: BSD-3-Clause
+
+from pathlib import Path
+from unittest import TestCase, skipIf
+import gzip
+import io
+import tarfile
+import tempfile
+from benchmarks.ttmlGenerator import DocumentShape, generate
+from src.archiveInput import validate_archive
+from src.compressedInput import CompressionError, decompressed_bytes, \
+    detect_compression, read_decompressed, zstd
+from src.validationLogging.validationResult import ERROR
+from src.validator import ValidationOptions, validate
+
+
+class pipeBuffer(io.BytesIO):
+    """Buffer that cannot seek, like a pipe."""
+
+    def seekable(self) -> bool:
+        return False
+
+
+def compressors() -> dict:
+    kinds = {'gzip': gzip.compress}
+    if zstd is not None:
+        kinds['zstd'] = zstd.compress
+    return kinds
+
+
+class testCompressedInput(TestCase):
+
+    def setUp(self):
+        self.document = generate(
+            flavour='bbc', shape=DocumentShape(subtitles=3), seed=2)
+
+    def test_detect_compression(self):
+        self.assertEqual(detect_compression(gzip.compress(b'<tt/>')), 'gzip')
+        self.assertEqual(
+            detect_compression(b'\x28\xb5\x2f\xfd\x00'), 'zstd')
+        self.assertIsNone(detect_compression(b'<tt/>'))
+        self.assertIsNone(detect_compression(b''))
+
+    def test_read_decompressed(self):
+        for kind, compress in compressors().items():
+            compressed = compress(self.document)
+            for stream_type in [io.BytesIO, pipeBuffer]:
+                with self.subTest(kind=kind, stream=stream_type.__name__):
+                    self.assertEqual(
+                        read_decompressed(stream_type(compressed)),
+                        self.document)
+                    self.assertEqual(
+                        read_decompressed(
+                            stream_type(compressed), read_limit=10),
+                        self.document[:10])
+            self.assertEqual(
+                decompressed_bytes(compressed), self.document)
+
+    def test_uncompressed_input_is_unchanged(self):
+        for stream_type in [io.BytesIO, pipeBuffer]:
+            with self.subTest(stream=stream_type.__name__):
+                self.assertEqual(
+                    read_decompressed(stream_type(self.document)),
+                    self.document)
+                self.assertEqual(
+                    read_decompressed(stream_type(b'<t')), b'<t')
+        self.assertEqual(decompressed_bytes(b''), b'')
+
+    @skipIf(zstd is not None, 'zstd is available')
+    def test_zstd_unavailable(self):
+        with self.assertRaises(CompressionError):
+            read_decompressed(io.BytesIO(b'\x28\xb5\x2f\xfd\x00\x00'))
+
+    def test_corrupt_input(self):
+        truncated = gzip.compress(self.document)[:-20]
+        with self.assertRaises(CompressionError):
+            read_decompressed(io.BytesIO(truncated))
+        with self.assertRaises(CompressionError):
+            decompressed_bytes(b'\x1f\x8bnot gzip')
+
+    def test_validate_compressed_sources(self):
+        compressed = gzip.compress(self.document)
+        with tempfile.TemporaryDirectory() as directory:
+            path = Path(directory) / 'document.xml.gz'
+            path.write_bytes(compressed)
+            sources = {
+                'bytes': compressed,
+                'path': path,
+                'stream': pipeBuffer(compressed),
+            }
+            for name, source in sources.items():
+                with self.subTest(source=name):
+                    report = validate(source=source)
+                    self.assertTrue(report.valid)
+
+    def test_validate_corrupt_source(self):
+        report = validate(source=gzip.compress(self.document)[:-20])
+        self.assertFalse(report.valid)
+        self.assertIn(
+            ('preParse_compression', ERROR),
+            [(result.code.name, result.status)
+             for result in report.results])
+
+    def test_limit_applies_to_decompressed_size(self):
+        # Highly compressible, so much smaller than the limit when
+        # compressed
+        compressed = gzip.compress(
+            self.document.replace(b'</tt>', b' ' * 100000 + b'</tt>'))
+        self.assertLess(len(compressed), 50000)
+        report = validate(
+            source=compressed,
+            options=ValidationOptions(max_bytes=50000))
+        self.assertFalse(report.valid)
+
+    def test_compressed_archive_member(self):
+        content = gzip.compress(self.document)
+        archive = io.BytesIO()
+        with tarfile.open(fileobj=archive, mode='w') as tar_file:
+            info = tarfile.TarInfo('document.xml.gz')
+            info.size = len(content)
+            tar_file.addfile(info, io.BytesIO(content))
+        archive.seek(0)
+        reports = list(validate_archive(archive))
+        self.assertEqual(
+            [(name, report.valid) for name, report in reports],
+            [('document.xml.gz', True)])
@@ -0,0 +1,39 @@
+# SPDX-FileCopyrightText: Copyright © 2026 BBC
+#
+# SPDX-License-Identifier: BSD-3-Clause
+
+from unittest import TestCase
+from src.constraintSets.bbcConstraints import BbcSubtitleConstraintSet
+from src.constraintSets.daptConstraints import DaptConstraintSet
+
+
+class testConstraintSets(TestCase):
+
+    @staticmethod
+    def _allChecks(checks: list) -> list:
+        all_checks = []
+        for check in checks:
+            all_checks.append(check)
+            if hasattr(check, 'subChecks'):
+                all_checks.extend(
+                    testConstraintSets._allChecks(check.subChecks()))
+        return all_checks
+
+    def test_checks_built_per_instance(self):
+        for constraint_set_class in [
+                BbcSubtitleConstraintSet, DaptConstraintSet]:
+            with self.subTest(constraint_set=constraint_set_class.__name__):
+                first = constraint_set_class()
+                second = constraint_set_class(epoch=10.0)
+                self.assertEqual(
+                    len(second.xmlChecks()), len(first.xmlChecks()))
+                self.assertEqual(
+                    [type(check) for check in second.xmlChecks()],
+                    [type(check) for check in first.xmlChecks()])
+                first_ids = set(
+                    id(check) for check in self._allChecks(
+                        first.preParseChecks() + first.xmlChecks()))
+                second_ids = set(
+                    id(check) for check in self._allChecks(
+                        second.preParseChecks() + second.xmlChecks()))
+                self.assertEqual(first_ids & second_ids, set())
@@ -5,11 +5,10 @@
 # from _typeshed import ReadableBuffer
 from typing import Any
 from unittest import TestCase
-from argparse import Namespace
 import io
 import json
 import os
-from src.ttmlValidator import validate_ttml
+from src.ttmlValidator import default_args, validate_ttml
 
 
 dapt_tests_path = os.path.join(
@@ -60,7 +59,7 @@ class testDAPT(TestCase):
         with open(path, 'rb') as test_file:
             results_out = io.TextIOWrapper(
                 buffer=namedTestBuffer(), encoding='utf-8', newline='\n')
-            args = Namespace(
+            args = default_args(
                 ttml_in=test_file,
                 results_out=results_out,
                 # results_out=sys.stdout,
@@ -0,0 +1,141 @@
+# SPDX-FileCopyrightText: Copyright © 2026 BBC
+#
+# SPDX-License-Identifier: BSD-3-Clause
+
+from pathlib import Path
+from unittest import TestCase, skipUnless
+import csv
+import io
+import os
+import tempfile
+import threading
+import time
+from benchmarks.ttmlGenerator import DocumentShape, generate
+from src.directoryWatcher import BacklogQueue, InotifyWatcher, \
+    PollingWatcher, inotify_available, validate_watched
+from src.ttmlValidator import default_args, validate_ttml_watch
+
+
+class namedTestBuffer(io.BytesIO):
+    name = 'namedTestBuffer'
+
+
+class testDirectoryWatcher(TestCase):
+
+    def setUp(self):
+        self._dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self._dir.cleanup)
+        self.directory = Path(self._dir.name)
+
+    def _write(self, name: str, content: bytes) -> str:
+        path = self.directory / name
+        path.write_bytes(content)
+        return str(path)
+
+    def test_backlog_queue(self):
+        backlog = BacklogQueue(max_size=2)
+        backlog.put('a', reported_at=1)
+        backlog.put('a', reported_at=2)
+        self.assertEqual(len(backlog), 1)
+        backlog.put('b')
+        with self.assertLogs(level='WARNING'):
+            backlog.put('c')
+        self.assertEqual(backlog.dropped, 1)
+        self.assertEqual(backlog.get()[0], 'b')
+        self.assertEqual(backlog.get()[0], 'c')
+        self.assertIsNone(backlog.get(timeout=0))
+
+        # Closing wakes a waiting get
+        threading.Timer(0.05, backlog.close).start()
+        self.assertIsNone(backlog.get(timeout=5))
+        self.assertTrue(backlog.closed)
+
+    def test_polling_watcher(self):
+        self._write('existing.xml', b'<tt/>')
+        watcher = PollingWatcher(str(self.directory), pattern='*.xml')
+        self.assertEqual(watcher.poll(0), [])
+
+        path = self._write('new.xml', b'<tt')
+        self._write('new.tmp', b'<tt/>')
+        # Not reported until it is the same in two scans
+        self.assertEqual(watcher.poll(0), [])
+        with open(path, 'ab') as new_file:
+            new_file.write(b'/>')
+        self.assertEqual(watcher.poll(0), [])
+        self.assertEqual(watcher.poll(0), [path])
+        self.assertEqual(watcher.poll(0), [])
+
+        # Reported again when modified
+        with open(path, 'ab') as new_file:
+            new_file.write(b'\n')
+        watcher.poll(0)
+        self.assertEqual(watcher.poll(0), [path])
+
+    @skipUnless(inotify_available(), 'inotify is not available')
+    def test_inotify_watcher(self):
+        watcher = InotifyWatcher(str(self.directory), pattern='*.xml')
+        self.addCleanup(watcher.close)
+        self.assertEqual(watcher.poll(0), [])
+        written = self._write('written.xml', b'<tt/>')
+        temporary = self._write('renamed.tmp', b'<tt/>')
+        renamed = str(self.directory / 'renamed.xml')
+        os.rename(temporary, renamed)
+        self.assertEqual(watcher.poll(1), [written, renamed])
+
+    def test_validate_watched(self):
+        backlog = BacklogQueue()
+        document = generate(
+            flavour='bbc', shape=DocumentShape(subtitles=3), seed=2)
+        backlog.put(self._write('1.xml', document))
+        backlog.put(str(self.directory / 'removed.xml'))
+        backlog.put(self._write('2.xml', b'<tt'))
+        backlog.close()
+        with self.assertLogs(level='INFO') as logs:
+            reports = [
+                (Path(path).name, report.valid)
+                for path, report in validate_watched(backlog)]
+        self.assertEqual(reports, [('1.xml', True), ('2.xml', False)])
+        self.assertIn('removed.xml was removed', '\n'.join(logs.output))
+        self.assertIn('Validated 2 files', logs.output[-1])
+
+    def test_validate_ttml_watch(self):
+        document = generate(
+            flavour='bbc', shape=DocumentShape(subtitles=3), seed=2)
+        results_out = io.TextIOWrapper(
+            buffer=namedTestBuffer(), encoding='utf-8', newline='\n')
+        args = default_args(
+            watch=str(self.directory),
+            watch_poll=True,
+            poll_interval=0.01,
+            backlog=8,
+            max_files=2,
+            member_glob='*.xml',
+            results_out=results_out,
+            csv=True,
+            json=False,
+            segment=False,
+            segdur=3.84,
+            segment_relative_timing=False,
+            vertical=False,
+            collate_more_than=0,
+            flavour='bbc')
+
+        def write_files():
+            # After the watcher has scanned the directory
+            time.sleep(0.2)
+            self._write('1.xml', document)
+            self._write('ignored.tmp', b'<tt')
+            time.sleep(0.1)
+            self._write('2.xml', b'<tt')
+
+        writer = threading.Thread(target=write_files)
+        writer.start()
+        result = validate_ttml_watch(args)
+        writer.join()
+        self.assertEqual(result, 1)
+        results_out.seek(0)
+        rows = list(csv.reader(results_out))
+        self.assertEqual(
+            rows[0], ['file', 'status', 'code', 'location', 'message'])
+        self.assertEqual(
+            sorted(set(row[0] for row in rows[1:])), ['1.xml', '2.xml'])
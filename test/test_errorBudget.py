@@ -0,0 +1,158 @@
+# SPDX-FileCopyrightText: Copyright © 2026 BBC
+#
+# SPDX-License-Identifier: BSD-3-Clause
+
+from unittest import TestCase
+import io
+from src.constraintSets.bbcConstraints import BbcSubtitleConstraintSet
+from src.ttmlValidator import default_args, validate_ttml
+from src.validationLogging.errorBudget import ErrorBudget
+from src.validationLogging.validationCodes import ValidationCode
+from src.validationLogging.validationLogger import ValidationLogger
+from src.validationLogging.validationResult import ERROR, SKIP
+import src.validationLogging.validationSummariser as validationSummariser
+
+
+class namedTestBuffer(io.BytesIO):
+    name = 'namedTestBuffer'
+
+
+class testErrorBudget(TestCase):
+
+    maxDiff = None
+
+    def test_unlimited_budget_never_stops(self):
+        error_budget = ErrorBudget()
+        validation_results = ValidationLogger()
+        for _ in range(3):
+            validation_results.error(
+                location='testloc',
+                message='simulated parse failure',
+                code=ValidationCode.xml_parse
+            )
+        self.assertTrue(error_budget.isUnlimited())
+        self.assertIsNone(error_budget.stopReason(validation_results))
+
+    def test_max_errors(self):
+        error_budget = ErrorBudget(max_errors=2)
+        validation_results = ValidationLogger()
+        validation_results.error(
+            location='testloc',
+            message='simulated parse failure',
+            code=ValidationCode.xml_parse
+        )
+        self.assertIsNone(error_budget.stopReason(validation_results))
+        validation_results.warn(
+            location='testloc',
+            message='simulated timing warning',
+            code=ValidationCode.ttml_document_timing
+        )
+        self.assertIsNone(error_budget.stopReason(validation_results))
+        validation_results.error(
+            location='testloc',
+            message='simulated id failure',
+            code=ValidationCode.xml_id_unique
+        )
+        self.assertEqual(
+            error_budget.stopReason(validation_results),
+            '2 errors found, limit is 2')
+        self.assertEqual(validation_results.statusCount(ERROR), 2)
+
+    def test_fail_fast(self):
+        error_budget = ErrorBudget(
+            fail_fast=[validationSummariser.EbuttdPassChecker])
+        validation_results = ValidationLogger()
+        validation_results.error(
+            location='testloc',
+            message='simulated id failure',
+            code=ValidationCode.xml_id_unique
+        )
+        self.assertIsNone(error_budget.stopReason(validation_results))
+        validation_results.error(
+            location='testloc',
+            message='simulated schema failure',
+            code=ValidationCode.xml_xsd
+        )
+        self.assertEqual(
+            error_budget.stopReason(validation_results),
+            'EBU-TT-D check failed')
+
+    def test_skip_codes(self):
+        validation_results = ValidationLogger()
+        ErrorBudget.skipCodes(
+            validation_results=validation_results,
+            codes=[
+                ValidationCode.xml_parse,
+                ValidationCode.xml_id_unique,
+                ValidationCode.xml_parse,
+            ],
+            reason='testing')
+        self.assertEqual(
+            [(r.status, r.code) for r in validation_results],
+            [
+                (SKIP, ValidationCode.xml_parse),
+                (SKIP, ValidationCode.xml_id_unique),
+            ])
+        self.assertEqual(
+            validationSummariser.XmlPassChecker.failuresAndWarningsAndSkips(
+                validation_results),
+            (0, 0, 2))
+
+    def test_check_validation_codes(self):
+        constraint_set = BbcSubtitleConstraintSet()
+        codes = []
+        for check in constraint_set.preParseChecks() \
+                + constraint_set.xmlChecks():
+            codes.extend(check.validationCodes())
+        for pass_checker in [
+                validationSummariser.TtmlPassChecker,
+                validationSummariser.EbuttdPassChecker,
+                validationSummariser.BbcPassChecker]:
+            for code in pass_checker._check_codes:
+                with self.subTest(
+                        pass_checker=pass_checker.name, code=code.name):
+                    self.assertIn(code, codes)
+
+    def _validate(self, in_bytes: bytes, **kwargs) -> tuple[int, str]:
+        results_out = io.TextIOWrapper(
+            buffer=namedTestBuffer(), encoding='utf-8', newline='\n')
+        args = default_args(
+            ttml_in=namedTestBuffer(in_bytes),
+            results_out=results_out,
+            csv=False,
+            json=False,
+            segment=False,
+            segdur=3.84,
+            segment_relative_timing=False,
+            vertical=False,
+            collate_more_than=0,
+            flavour='bbc',
+            **kwargs
+        )
+        result = validate_ttml(args)
+        results_out.seek(0)
+        return result, results_out.read()
+
+    def test_validate_stops_after_parse_failure(self):
+        in_bytes = b'<?xml version="1.0"?>\n<tt xmlns="http://www.w3.org/ns/ttml">'
+        result, results_text = self._validate(in_bytes, fail_fast=['xml'])
+        self.assertEqual(result, 1)
+        results_lines = results_text.splitlines()
+        self.assertIn(
+            'Skip: xml_xsd Document Not checked because validation stopped '
+            'early: XML check failed',
+            results_lines)
+        self.assertIn(
+            'Skip: ttml_document_validity Document 21 TTML checks skipped, '
+            'document validity as TTML unclear with 0 TTML-related '
+            'failures and 0 warnings',
+            results_lines)
+        self.assertNotIn(
+            'Error: validator_internal_exception',
+            results_text)
+
+    def test_validate_without_budget_runs_every_check(self):
+        in_bytes = b'<?xml version="1.0"?>\n<tt xmlns="http://www.w3.org/ns/ttml">'
+        _, results_text = self._validate(in_bytes)
+        self.assertNotIn(
+            'Not checked because validation stopped', results_text)
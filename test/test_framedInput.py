@@ -0,0 +1,115 @@
+# SPDX-FileCopyrightText: Copyright © 2026 BBC
+#
+# SPDX-License-Identifier: BSD-3-Clause
+
+from unittest import TestCase
+import io
+import json
+from benchmarks.ttmlGenerator import DocumentShape, generate
+from src.framedInput import FrameError, length_frames, nul_frames, \
+    read_frames, result_line, validate_frames
+from src.ttmlValidator import default_args, validate_ttml_frames
+
+
+class namedTestBuffer(io.BytesIO):
+    name = 'namedTestBuffer'
+
+
+class tricklingBuffer(io.BytesIO):
+    """Buffer that returns at most 3 bytes at a time, like a slow pipe."""
+
+    def read1(self, size: int = -1) -> bytes:
+        return super().read1(min(size, 3))
+
+
+class testFramedInput(TestCase):
+
+    def setUp(self):
+        self.document = generate(
+            flavour='bbc', shape=DocumentShape(subtitles=3), seed=2)
+
+    def test_nul_frames(self):
+        stream = b'<tt>1</tt>\0<tt>22</tt>\0\0<tt>333</tt>'
+        for stream_type in [io.BytesIO, tricklingBuffer]:
+            with self.subTest(stream=stream_type.__name__):
+                self.assertEqual(
+                    [content for _, content in nul_frames(
+                        stream_type(stream))],
+                    [b'<tt>1</tt>', b'<tt>22</tt>', b'', b'<tt>333</tt>'])
+                self.assertEqual(
+                    [content for _, content in nul_frames(
+                        stream_type(stream), read_limit=4)],
+                    [b'<tt>', b'<tt>', b'', b'<tt>'])
+        self.assertEqual(list(nul_frames(io.BytesIO(b'<tt/>\0'))),
+                         [(None, b'<tt/>')])
+
+    def test_length_frames(self):
+        stream = b'10 first\n<tt>1</tt>\n\n11\n<tt>22</tt>12 third one\n' \
+            b'<tt>333</tt>'
+        self.assertEqual(
+            list(length_frames(io.BytesIO(stream))),
+            [('first', b'<tt>1</tt>'), (None, b'<tt>22</tt>'),
+             ('third one', b'<tt>333</tt>')])
+        # The rest of each document is skipped
+        self.assertEqual(
+            [content for _, content in length_frames(
+                io.BytesIO(stream), read_limit=4)],
+            [b'<tt>', b'<tt>', b'<tt>'])
+
+    def test_bad_frames(self):
+        for stream in [b'ten\n<tt/>', b'-1\n', b'10\n<tt/>', b'5']:
+            with self.subTest(stream=stream):
+                with self.assertRaises(FrameError):
+                    list(length_frames(io.BytesIO(stream)))
+
+    def test_read_frames(self):
+        self.assertEqual(
+            [document_id for document_id, _ in read_frames(
+                io.BytesIO(b'a\0b\0c'), 'nul')],
+            ['1', '2', '3'])
+        self.assertEqual(
+            [document_id for document_id, _ in read_frames(
+                io.BytesIO(b'1 x\na1\nb'), 'length')],
+            ['x', '2'])
+        with self.assertRaises(ValueError):
+            list(read_frames(io.BytesIO(b''), 'netstring'))
+
+    def test_validate_frames(self):
+        stream = io.BytesIO(self.document + b'\0<tt')
+        reports = list(validate_frames(stream, framing='nul'))
+        self.assertEqual(
+            [(document_id, report.valid) for document_id, report in reports],
+            [('1', True), ('2', False)])
+        line = json.loads(result_line(*reports[1]))
+        self.assertEqual(line['id'], '2')
+        self.assertFalse(line['valid'])
+        self.assertEqual(line['exit_status'], reports[1][1].exitCode())
+        self.assertGreater(len(line['results']), 0)
+
+    def test_validate_ttml_frames(self):
+        stream = '{} good.xml\n'.format(len(self.document)).encode() \
+            + self.document + '{}\n'.format(len(self.document)).encode() \
+            + self.document
+        results_out = io.TextIOWrapper(
+            buffer=namedTestBuffer(), encoding='utf-8', newline='\n')
+        result = validate_ttml_frames(default_args(
+            ttml_in=namedTestBuffer(stream),
+            results_out=results_out,
+            frames='length',
+            max_bytes=100,
+            segment=False,
+            segdur=3.84,
+            segment_relative_timing=False,
+            vertical=False,
+            collate_more_than=0,
+            flavour='bbc'))
+        # Both are too large
+        self.assertEqual(result, 2)
+        results_out.seek(0)
+        lines = [json.loads(line) for line in results_out]
+        self.assertEqual(
+            [(line['id'], line['valid']) for line in lines],
+            [('good.xml', False), ('2', False)])
+        self.assertIn(
+            'validator_resource_limit',
+            [result['code'] for result in lines[0]['results']])
@@ -0,0 +1,42 @@
+# SPDX-FileCopyrightText: Copyright © 2026 BBC
+#
+# SPDX-License-Identifier: BSD-3-Clause
+
+from pathlib import Path
+from unittest import TestCase
+import tempfile
+from benchmarks.ioBenchmark import compressions, run_case, write_documents
+from benchmarks.ttmlGenerator import DocumentShape, generate
+
+
+class testIoBenchmark(TestCase):
+
+    def test_run_case(self):
+        documents = [
+            generate(flavour='bbc', shape=DocumentShape(subtitles=5),
+                     seed=seed)
+            for seed in range(3)]
+        with tempfile.TemporaryDirectory() as directory:
+            for compression in compressions:
+                with self.subTest(compression=compression):
+                    case_directory = Path(directory) / compression
+                    case_directory.mkdir()
+                    paths = write_documents(
+                        case_directory, compression, documents)
+                    result = run_case(
+                        compression=compression,
+                        flavour='bbc',
+                        paths=paths,
+                        repeat=2,
+                        validate_documents=True)
+                    self.assertEqual(result['documents'], 3)
+                    self.assertEqual(
+                        result['document_bytes'],
+                        sum(len(document) for document in documents))
+                    self.assertEqual(len(result['read_seconds']), 2)
+                    self.assertEqual(len(result['validate_seconds']), 2)
+                    self.assertGreater(result['read_docs_per_second'], 0)
+                    if compression != 'none':
+                        self.assertLess(
+                            result['bytes_on_disk'],
+                            result['document_bytes'])
@@ -0,0 +1,235 @@
+# SPDX-FileCopyrightText: Copyright © 2026 BBC
+#
+# SPDX-License-Identifier: BSD-3-Clause
+
+from unittest import TestCase
+import csv
+import io
+import struct
+import tempfile
+from benchmarks.ttmlGenerator import DocumentShape, generate
+from src.isobmffInput import IsoBmffError, iter_boxes, mapped_input, \
+    read_tracks, stpp_samples, validate_isobmff
+from src.ttmlValidator import default_args, validate_ttml_isobmff
+
+
+class namedTestBuffer(io.BytesIO):
+    name = 'namedTestBuffer'
+
+
+def box(box_type: bytes, payload: bytes) -> bytes:
+    return struct.pack('>I4s', 8 + len(payload), box_type) + payload
+
+
+def full_box(
+        box_type: bytes, version: int, flags: int, payload: bytes) -> bytes:
+    return box(box_type, struct.pack('>I', version << 24 | flags) + payload)
+
+
+def make_trak(track_id: int, timescale: int, entry_type: bytes) -> bytes:
+    tkhd = full_box(b'tkhd', 0, 7, struct.pack('>III', 0, 0, track_id))
+    mdhd = full_box(b'mdhd', 0, 0, struct.pack('>IIII', 0, 0, timescale, 0))
+    stsd = full_box(
+        b'stsd', 0, 0, struct.pack('>I', 1) + box(entry_type, bytes(8)))
+    stbl = box(b'stbl', stsd)
+    return box(b'trak', tkhd + box(b'mdia', mdhd + box(
+        b'minf', stbl)))
+
+
+def make_init(
+        timescale: int = 1000,
+        default_duration: int | None = 0,
+        default_size: int | None = 0) -> bytes:
+    """
+    An initialisation segment with stpp track 1 and video track 2, with
+    sample defaults for track 1 unless they are None.
+    """
+    mvex = b''
+    if default_duration is not None and default_size is not None:
+        mvex = box(b'mvex', full_box(
+            b'trex', 0, 0,
+            struct.pack('>IIIII', 1, 1, default_duration, default_size, 0)))
+    moov = box(
+        b'moov',
+        make_trak(1, timescale, b'stpp')
+        + make_trak(2, 90000, b'avc1')
+        + mvex)
+    return box(b'ftyp', b'iso6\x00\x00\x00\x00') + moov
+
+
+def make_fragment(
+        decode_time: int,
+        samples: list[bytes],
+        duration: int | None = 3840,
+        sizes: bool = True) -> bytes:
+    """
+    A fragment of track 1 with the samples, after a fragment of track 2
+    with one sample, whose data follows that of track 2 in the mdat box.
+    """
+    other = b'video'
+    mfhd = full_box(b'mfhd', 0, 0, struct.pack('>I', 1))
+
+    def make_moof(data_offset: int) -> bytes:
+        other_traf = box(b'traf', full_box(
+            b'tfhd', 0, 0x020000, struct.pack('>I', 2))
+            + full_box(b'trun', 0, 0x000201, struct.pack(
+                '>IiI', 1, data_offset, len(other))))
+        flags = 0
+        fields = b''
+        sample_format = '>'
+        if duration is not None:
+            flags |= 0x000100
+            sample_format += 'I'
+        if sizes:
+            flags |= 0x000200
+            sample_format += 'I'
+        for sample in samples:
+            values = ([duration] if duration is not None else []) \
+                + ([len(sample)] if sizes else [])
+            if len(values) > 0:
+                fields += struct.pack(sample_format, *values)
+        # No data offset, so the samples follow those of track 2
+        traf = box(b'traf', full_box(
+            b'tfhd', 0, 0, struct.pack('>I', 1))
+            + full_box(b'tfdt', 1, 0, struct.pack('>Q', decode_time))
+            + full_box(b'trun', 0, flags, struct.pack(
+                '>I', len(samples)) + fields))
+        return box(b'moof', mfhd + other_traf + traf)
+
+    data_offset = len(make_moof(0)) + 8
+    return make_moof(data_offset) \
+        + box(b'mdat', other + b''.join(samples))
+
+
+class testIsobmffInput(TestCase):
+
+    def setUp(self):
+        self.document = generate(
+            flavour='bbc', shape=DocumentShape(subtitles=3), seed=2)
+
+    def test_iter_boxes(self):
+        buffer = memoryview(box(b'free', b'abc') + struct.pack(
+            '>I4sQ', 1, b'skip', 20) + b'defg' + box(b'mdat', b''))
+        self.assertEqual(
+            [(box_type, offset, bytes(payload))
+             for box_type, offset, payload in iter_boxes(buffer)],
+            [(b'free', 0, b'abc'), (b'skip', 11, b'defg'),
+             (b'mdat', 31, b'')])
+        with self.assertRaises(IsoBmffError):
+            list(iter_boxes(memoryview(box(b'free', b'abc')[:-1])))
+
+    def test_read_tracks(self):
+        tracks = read_tracks(memoryview(make_init(
+            timescale=90000, default_duration=10, default_size=20)))
+        self.assertEqual(list(tracks), [1])
+        self.assertEqual(tracks[1].timescale, 90000)
+        self.assertEqual(tracks[1].default_sample_duration, 10)
+        self.assertEqual(tracks[1].default_sample_size, 20)
+
+    def test_stpp_samples(self):
+        buffer = memoryview(
+            make_init()
+            + make_fragment(3840, [b'<tt>1</tt>', b'<tt>22</tt>'])
+            + make_fragment(11520, [b'<tt>333</tt>']))
+        samples = list(stpp_samples(buffer))
+        self.assertEqual(
+            [(sample.name, bytes(sample.data), sample.duration_seconds)
+             for sample in samples],
+            [('1/3.840', b'<tt>1</tt>', 3.84),
+             ('1/7.680', b'<tt>22</tt>', 3.84),
+             ('1/11.520', b'<tt>333</tt>', 3.84)])
+
+    def test_separate_init_segment(self):
+        fragment = memoryview(make_fragment(0, [b'<tt/>']))
+        with self.assertRaises(IsoBmffError):
+            list(stpp_samples(fragment))
+        tracks = read_tracks(memoryview(make_init(timescale=10)))
+        self.assertEqual(
+            [sample.begin_seconds
+             for sample in stpp_samples(fragment, tracks)],
+            [0.0])
+
+    def test_trex_defaults(self):
+        samples = [b'<tt>a</tt>', b'<tt>b</tt>']
+        init = make_init(default_duration=2000, default_size=10)
+        buffer = memoryview(
+            init + make_fragment(0, samples, duration=None, sizes=False))
+        self.assertEqual(
+            [(sample.begin, bytes(sample.data))
+             for sample in stpp_samples(buffer)],
+            [(0, samples[0]), (2000, samples[1])])
+
+        # Without a size anywhere the samples cannot be found
+        buffer = memoryview(
+            make_init(default_duration=None, default_size=None)
+            + make_fragment(0, samples, sizes=False))
+        with self.assertRaises(IsoBmffError):
+            list(stpp_samples(buffer))
+
+    def test_sample_past_end(self):
+        buffer = make_init() + make_fragment(0, [b'<tt>1</tt>'])
+        # Cut the mdat box short, keeping its header consistent
+        truncated = buffer[:-4]
+        mdat_offset = truncated.rindex(b'mdat') - 4
+        truncated = truncated[:mdat_offset] + struct.pack(
+            '>I', len(truncated) - mdat_offset) + truncated[mdat_offset + 4:]
+        with self.assertRaises(IsoBmffError):
+            list(stpp_samples(memoryview(truncated)))
+
+    def test_validate_isobmff(self):
+        buffer = memoryview(
+            make_init()
+            + make_fragment(0, [self.document])
+            + make_fragment(1000000, [self.document]))
+        reports = list(validate_isobmff(buffer))
+        # The second document is nowhere near its sample's time
+        self.assertEqual(
+            [(name, report.valid) for name, report in reports],
+            [('1/0.000', True), ('1/1000.000', False)])
+
+    def test_mapped_input(self):
+        content = make_init() + make_fragment(0, [b'<tt/>'])
+        with tempfile.TemporaryFile() as mapped_file:
+            mapped_file.write(content)
+            mapped_file.flush()
+            mapped_file.seek(0)
+            with mapped_input(mapped_file) as view:
+                self.assertEqual(
+                    [bytes(sample.data) for sample in stpp_samples(view)],
+                    [b'<tt/>'])
+        with mapped_input(io.BytesIO(content)) as view:
+            self.assertEqual(bytes(view), content)
+
+    def test_results_keyed_by_sample(self):
+        content = make_fragment(0, [self.document]) \
+            + make_fragment(1000000, [self.document])
+        with tempfile.NamedTemporaryFile() as init_file, \
+                tempfile.NamedTemporaryFile() as segment_file:
+            init_file.write(make_init())
+            init_file.flush()
+            init_file.seek(0)
+            segment_file.write(content)
+            segment_file.flush()
+            segment_file.seek(0)
+            results_out = io.TextIOWrapper(
+                buffer=namedTestBuffer(), encoding='utf-8', newline='\n')
+            result = validate_ttml_isobmff(default_args(
+                ttml_in=segment_file.file,
+                init_segment=init_file.file,
+                results_out=results_out,
+                csv=True,
+                json=False,
+                segment=False,
+                segdur=3.84,
+                segment_relative_timing=False,
+                vertical=False,
+                collate_more_than=0,
+                flavour='bbc'))
+        self.assertEqual(result, 1)
+        results_out.seek(0)
+        rows = list(csv.reader(results_out))
+        self.assertEqual(
+            rows[0], ['sample', 'status', 'code', 'location', 'message'])
+        self.assertEqual(
+            sorted(set(row[0] for row in rows[1:])),
+            ['1/0.000', '1/1000.000'])
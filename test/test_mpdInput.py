@@ -0,0 +1,205 @@
+# SPDX-FileCopyrightText: Copyright © 2026 BBC
+#
+# SPDX-License-Identifier: BSD-3-Clause
+
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from unittest import TestCase
+import io
+import json
+import os
+import tempfile
+from benchmarks.ttmlGenerator import DocumentShape, generate
+from src.mpdInput import MpdError, fill_template, parse_duration, \
+    read_mpd, validate_mpd
+from src.ttmlValidator import default_args, validate_ttml_mpd
+from test.test_isobmffInput import make_fragment, make_init
+
+# Two TTML segments from 0s, then one at 1000s, in a timeline; an MP4
+# representation with segments of fixed duration; and video and WebVTT
+# adaptation sets that are not validated.
+example_mpd = '''<?xml version="1.0" encoding="UTF-8"?>
+<MPD xmlns="urn:mpeg:dash:schema:mpd:2011" type="static"
+     mediaPresentationDuration="PT7.68S">
+  <Period id="1" start="PT0S">
+    <AdaptationSet contentType="video" mimeType="video/mp4">
+      <SegmentTemplate media="video/$Number$.m4s" duration="3840"
+                       timescale="1000"/>
+      <Representation id="video" bandwidth="1000000"/>
+    </AdaptationSet>
+    <AdaptationSet contentType="text" mimeType="text/vtt">
+      <SegmentTemplate media="vtt/$Number$.vtt" duration="3840"
+                       timescale="1000"/>
+      <Representation id="vtt" bandwidth="1000"/>
+    </AdaptationSet>
+    <AdaptationSet contentType="text" mimeType="application/ttml+xml">
+      <BaseURL>subtitles/</BaseURL>
+      <SegmentTemplate media="$RepresentationID$/$Number%03d$.xml"
+                       timescale="1000" startNumber="1">
+        <SegmentTimeline>
+          <S t="0" d="3840" r="1"/>
+          <S t="1000000" d="3840"/>
+        </SegmentTimeline>
+      </SegmentTemplate>
+      <Representation id="en" bandwidth="1000"/>
+    </AdaptationSet>
+    <AdaptationSet contentType="text" mimeType="application/mp4"
+                   codecs="stpp.ttml.etd1">
+      <SegmentTemplate media="$RepresentationID$/$Time$.m4s"
+                       initialization="$RepresentationID$/init.mp4"
+                       duration="3840" timescale="1000"/>
+      <Representation id="mp4" bandwidth="1000"/>
+    </AdaptationSet>
+  </Period>
+</MPD>
+'''
+
+
+class namedTestBuffer(io.BytesIO):
+    name = 'namedTestBuffer'
+
+
+class testMpdInput(TestCase):
+
+    def setUp(self):
+        self._dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self._dir.cleanup)
+        self.directory = Path(self._dir.name)
+        self.document = generate(
+            flavour='bbc', shape=DocumentShape(subtitles=3), seed=2)
+
+    def _write(self, name: str, content: bytes) -> Path:
+        path = self.directory / name
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_bytes(content)
+        return path
+
+    def _write_example(self) -> Path:
+        for number in range(1, 4):
+            self._write(
+                'subtitles/en/{:03d}.xml'.format(number), self.document)
+        self._write('mp4/init.mp4', make_init())
+        for time in [0, 3840]:
+            self._write('mp4/{}.m4s'.format(time), make_fragment(
+                decode_time=time, samples=[self.document]))
+        return self._write('manifest.mpd', example_mpd.encode('utf-8'))
+
+    def _base_url(self) -> str:
+        return self.directory.resolve().as_uri() + '/'
+
+    def test_parse_duration(self):
+        self.assertEqual(parse_duration('PT1H2M3.5S'), 3723.5)
+        self.assertEqual(parse_duration('P1DT0S'), 86400)
+        self.assertEqual(parse_duration('PT0S'), 0)
+        with self.assertRaises(MpdError):
+            parse_duration('P1Y')
+
+    def test_fill_template(self):
+        self.assertEqual(
+            fill_template(
+                '$RepresentationID$/$Number%05d$-$Time$$$.m4s',
+                {'RepresentationID': 'en', 'Number': 42, 'Time': 7}),
+            'en/00042-7$.m4s')
+        with self.assertRaises(MpdError):
+            fill_template('$Time$', {})
+
+    def test_read_mpd(self):
+        with open(self._write_example(), 'rb') as mpd:
+            segments = read_mpd(mpd, base_url=self._base_url())
+        self.assertEqual(
+            [(segment.name, segment.begin_seconds,
+              segment.duration_seconds, segment.kind)
+             for segment in segments],
+            [('en/1', 0.0, 3.84, 'ttml'),
+             ('mp4/1', 0.0, 3.84, 'isobmff'),
+             ('en/2', 3.84, 3.84, 'ttml'),
+             ('mp4/2', 3.84, 3.84, 'isobmff'),
+             ('en/3', 1000.0, 3.84, 'ttml')])
+        self.assertEqual(
+            segments[0].path,
+            str(self.directory.resolve() / 'subtitles/en/001.xml'))
+        self.assertEqual(
+            segments[1].init_path,
+            str(self.directory.resolve() / 'mp4/init.mp4'))
+
+    def test_open_ended_timeline(self):
+        mpd = example_mpd.replace(
+            '<S t="0" d="3840" r="1"/>\n          <S t="1000000" d="3840"/>',
+            '<S t="0" d="3840" r="-1"/>')
+        segments = read_mpd(
+            io.BytesIO(mpd.encode('utf-8')), base_url=self._base_url())
+        # Repeated to the end of the 7.68s period
+        self.assertEqual(
+            [segment.name for segment in segments
+             if segment.representation_id == 'en'],
+            ['en/1', 'en/2'])
+
+    def test_not_local(self):
+        mpd = example_mpd.replace(
+            '<BaseURL>subtitles/</BaseURL>',
+            '<BaseURL>https://example.com/subtitles/</BaseURL>')
+        with self.assertRaises(MpdError):
+            read_mpd(
+                io.BytesIO(mpd.encode('utf-8')), base_url=self._base_url())
+        with self.assertRaises(MpdError):
+            read_mpd(io.BytesIO(b'<tt/>'), base_url=self._base_url())
+
+    def test_validate_mpd(self):
+        with open(self._write_example(), 'rb') as mpd:
+            segments = read_mpd(mpd, base_url=self._base_url())
+        os.remove(self.directory / 'mp4/3840.m4s')
+        results = [
+            (segment.name, [(name, report.valid) for name, report in reports],
+             error is not None)
+            for segment, reports, error in validate_mpd(segments)]
+        # The documents all begin at 0s, so the last is nowhere near the
+        # time of its segment
+        self.assertEqual(results, [
+            ('en/1', [('en/1', True)], False),
+            ('mp4/1', [('mp4/1/1/0.000', True)], False),
+            ('en/2', [('en/2', True)], False),
+            ('mp4/2', [], True),
+            ('en/3', [('en/3', False)], False),
+        ])
+
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            pooled = [
+                (segment.name,
+                 [(name, report.valid) for name, report in reports],
+                 error is not None)
+                for segment, reports, error in validate_mpd(
+                    segments, executor=executor, max_pending=1)]
+        self.assertEqual(pooled, results)
+
+    def test_summary(self):
+        mpd_path = self._write_example()
+        results_out = io.TextIOWrapper(
+            buffer=namedTestBuffer(), encoding='utf-8', newline='\n')
+        summary_out = io.StringIO()
+        with open(mpd_path, 'rb') as mpd:
+            result = validate_ttml_mpd(default_args(
+                ttml_in=mpd,
+                results_out=results_out,
+                summary_out=summary_out,
+                csv=False,
+                json=True,
+                segment=False,
+                segdur=3.84,
+                segment_relative_timing=False,
+                vertical=False,
+                collate_more_than=0,
+                flavour='bbc',
+                workers=2,
+                executor='thread'))
+        self.assertEqual(result, 1)
+        results_out.seek(0)
+        self.assertEqual(
+            {name: report['valid']
+             for name, report in json.loads(results_out.read()).items()},
+            {'en/1': True, 'en/2': True, 'en/3': False,
+             'mp4/1/1/0.000': True, 'mp4/2/1/3.840': True})
+        summary = json.loads(summary_out.getvalue())
+        self.assertEqual(summary['en'], {
+            'segments': 3, 'valid': 2, 'invalid': 1, 'unreadable': 0,
+            'begin': 0.0, 'end': 1003.84, 'discontinuities': 1})
+        self.assertEqual(summary['mp4']['valid'], 2)
@@ -0,0 +1,37 @@
+# SPDX-FileCopyrightText: Copyright © 2026 BBC
+#
+# SPDX-License-Identifier: BSD-3-Clause
+
+from unittest import TestCase
+from benchmarks.poolBenchmark import make_documents, run_case
+from src.validationPool import executor_kinds
+
+
+class testPoolBenchmark(TestCase):
+
+    def test_make_documents(self):
+        documents = make_documents(
+            flavour='bbc', count=3, subtitles=2, seed=0)
+        self.assertEqual(len(documents), 3)
+        self.assertEqual(
+            documents,
+            make_documents(flavour='bbc', count=3, subtitles=2, seed=0))
+
+    def test_run_case(self):
+        documents = make_documents(
+            flavour='bbc', count=4, subtitles=5, seed=0)
+        for kind in executor_kinds:
+            with self.subTest(kind=kind):
+                result = run_case(
+                    kind=kind,
+                    flavour='bbc',
+                    workers=2,
+                    documents=documents,
+                    repeat=2)
+                self.assertEqual(result['kind'], kind)
+                self.assertEqual(result['documents'], 4)
+                self.assertEqual(result['valid'], 2)
+                self.assertEqual(len(result['seconds']), 2)
+                self.assertGreater(result['docs_per_second'], 0)
+                if kind != 'process':
+                    self.assertIsNone(result['peak_worker_rss_bytes'])
@@ -0,0 +1,231 @@
+# SPDX-FileCopyrightText: Copyright © 2026 BBC
+#
+# SPDX-License-Identifier: BSD-3-Clause
+
+from unittest import TestCase
+from unittest.mock import patch
+import io
+import time
+import xml.etree.ElementTree as ElementTree
+from src.ttmlValidator import default_args, validate_ttml
+from src.validationLogging.resourceLimits import ResourceLimits, \
+    ResourceLimitExceeded, TimeLimitInterrupt
+from src.validationLogging.validationCodes import ValidationCode
+from src.validationLogging.validationLogger import ValidationLogger
+from src.validationLogging.validationResult import ERROR, SKIP
+from src.validator import ValidationOptions, validate
+from src.xmlChecks.copyrightCheck import copyrightCheck
+
+
+class namedTestBuffer(io.BytesIO):
+    name = 'namedTestBuffer'
+
+
+class testResourceLimits(TestCase):
+
+    maxDiff = None
+
+    input_xml = b"""<?xml version="1.0" encoding="UTF-8"?>
+<tt xml:lang="en-GB"
+    xmlns="http://www.w3.org/ns/ttml"
+    xmlns:tts="http://www.w3.org/ns/ttml#styling"
+    xmlns:ttm="http://www.w3.org/ns/ttml#metadata">
+<head>
+    <ttm:copyright>valid</ttm:copyright>
+    <layout>
+        <region xml:id="r1" tts:origin="10% 10%"/>
+    </layout>
+</head>
+<body><div><p begin="0s" end="1s" region="r1"><span>Hi</span></p></div></body>
+</tt>
+"""
+
+    def test_unlimited(self):
+        resource_limits = ResourceLimits()
+        resource_limits.start()
+        self.assertTrue(resource_limits.isUnlimited())
+        self.assertEqual(resource_limits.readLimit(), -1)
+        self.assertIsNone(resource_limits.checkBytes(10 ** 9))
+        self.assertIsNone(resource_limits.checkTree(
+            ElementTree.fromstring(self.input_xml)))
+        resource_limits.checkResult(10 ** 9)
+        self.assertIsNone(resource_limits.exceeded())
+
+    def test_check_tree(self):
+        root = ElementTree.fromstring(self.input_xml)
+        self.assertIsNone(
+            ResourceLimits(max_elements=9, max_depth=5).checkTree(root))
+        self.assertEqual(
+            ResourceLimits(max_elements=8).checkTree(root),
+            'document has more than the limit of 8 elements')
+        self.assertEqual(
+            ResourceLimits(max_depth=4).checkTree(root),
+            'document is nested more deeply than the limit of 4 elements')
+
+    def test_parse_stops_at_tree_limits(self):
+        # Malformed at the end, which parsing never reaches
+        hostile = b'<tt>' + b'<p>' * 100000 + b'<'
+        for kwargs, reason in [
+                ({'max_elements': 50},
+                 'document has more than the limit of 50 elements'),
+                ({'max_depth': 20},
+                 'document is nested more deeply than the limit of 20 '
+                 'elements')]:
+            with self.subTest(limit=reason):
+                report = validate(
+                    hostile, flavour='bbc',
+                    options=ValidationOptions(**kwargs))
+                self.assertFalse(report.valid)
+                self.assertEqual(
+                    report.results.codeStatusCount(
+                        ValidationCode.xml_parse, ERROR),
+                    0)
+                self.assertEqual(
+                    report.results.codeStatusCount(
+                        ValidationCode.xml_parse, SKIP),
+                    1)
+                self.assertIn(
+                    'Resource limit reached: ' + reason,
+                    [result.message for result in report.results])
+
+    def test_result_limit_raises_once(self):
+        resource_limits = ResourceLimits(max_results=2)
+        validation_results = ValidationLogger(resource_limits=resource_limits)
+        for _ in range(2):
+            validation_results.good(
+                location='testloc',
+                message='fine',
+                code=ValidationCode.xml_parse)
+        with self.assertRaises(ResourceLimitExceeded):
+            validation_results.good(
+                location='testloc',
+                message='fine',
+                code=ValidationCode.xml_parse)
+        self.assertEqual(validation_results.resultCount(), 2)
+        self.assertEqual(
+            resource_limits.exceeded(), 'result limit of 2 reached')
+
+        # Once reached, the reason can be logged
+        self.assertTrue(resource_limits.record(validation_results))
+        self.assertTrue(resource_limits.record(validation_results))
+        self.assertEqual(
+            validation_results.codeStatusCount(
+                ValidationCode.validator_resource_limit, ERROR),
+            1)
+
+    def test_stop(self):
+        resource_limits = ResourceLimits(max_results=1)
+        validation_results = ValidationLogger(resource_limits=resource_limits)
+        resource_limits.stop()
+        for _ in range(2):
+            validation_results.good(location='testloc', message='fine')
+        self.assertIsNone(resource_limits.exceeded())
+
+    def test_time_limit_interrupts_silent_check(self):
+        def run_without_logging(self, input, context, validation_results):
+            # Stops by itself if it is not interrupted
+            give_up = time.monotonic() + 10
+            while time.monotonic() < give_up:
+                pass
+            return True
+
+        for check_workers in [1, 2]:
+            with self.subTest(check_workers=check_workers), \
+                    patch.object(copyrightCheck, 'run', run_without_logging):
+                started = time.monotonic()
+                report = validate(
+                    self.input_xml, flavour='bbc',
+                    options=ValidationOptions(
+                        max_seconds=0.2, check_workers=check_workers))
+                self.assertLess(time.monotonic() - started, 5)
+                self.assertFalse(report.valid)
+                self.assertIn(
+                    'Resource limit reached: wall clock time limit of 0.2s '
+                    'reached',
+                    [result.message for result in report.results])
+                self.assertEqual(
+                    report.results.codeStatusCount(
+                        ValidationCode.ttml_metadata_copyright, SKIP),
+                    1)
+
+    def test_logging_is_not_interrupted(self):
+        resource_limits = ResourceLimits(max_seconds=0.05)
+        validation_results = ValidationLogger(
+            resource_limits=resource_limits)
+        resource_limits.start()
+        logged = False
+        with self.assertRaises(TimeLimitInterrupt):
+            with resource_limits.interruptible():
+                with resource_limits.uninterrupted():
+                    time.sleep(0.2)
+                    logged = True
+        resource_limits.stop()
+        self.assertTrue(logged)
+        self.assertEqual(
+            resource_limits.exceeded(),
+            'wall clock time limit of 0.05s reached')
+
+        # Logging once the checks have stopped is not interrupted
+        validation_results.good(location='testloc', message='fine')
+        self.assertEqual(validation_results.resultCount(), 1)
+
+    def _validate(self, in_bytes: bytes, **kwargs) -> tuple[int, str]:
+        results_out = io.TextIOWrapper(
+            buffer=namedTestBuffer(), encoding='utf-8', newline='\n')
+        args = default_args(
+            ttml_in=namedTestBuffer(in_bytes),
+            results_out=results_out,
+            csv=False,
+            json=False,
+            segment=False,
+            segdur=3.84,
+            segment_relative_timing=False,
+            vertical=False,
+            collate_more_than=0,
+            flavour='bbc',
+            **kwargs
+        )
+        result = validate_ttml(args)
+        results_out.seek(0)
+        return result, results_out.read()
+
+    def test_validate_within_limits(self):
+        _, unlimited_text = self._validate(self.input_xml)
+        _, limited_text = self._validate(
+            self.input_xml,
+            max_bytes=len(self.input_xml),
+            max_elements=100,
+            max_depth=10,
+            max_results=1000,
+            max_seconds=600)
+        self.assertEqual(limited_text, unlimited_text)
+
+    def test_validate_stops_at_each_limit(self):
+        limits = [
+            ({'max_bytes': 100},
+             'input is larger than the limit of 100 bytes'),
+            ({'max_elements': 5},
+             'document has more than the limit of 5 elements'),
+            ({'max_depth': 3},
+             'document is nested more deeply than the limit of 3 elements'),
+            ({'max_results': 5},
+             'result limit of 5 reached'),
+            ({'max_seconds': 1e-9},
+             'wall clock time limit of 1e-09s reached'),
+        ]
+        for kwargs, reason in limits:
+            with self.subTest(limit=reason):
+                result, results_text = self._validate(
+                    self.input_xml, **kwargs)
+                self.assertGreater(result, 0)
+                results_lines = results_text.splitlines()
+                self.assertIn(
+                    'Error: validator_resource_limit Document '
+                    'Resource limit reached: ' + reason,
+                    results_lines)
+                self.assertIn(
+                    'Skip: bbc_timing_gaps Document Not checked because '
+                    'validation stopped early: ' + reason,
+                    results_lines)
+                self.assertNotIn(
+                    'validator_internal_exception', results_text)
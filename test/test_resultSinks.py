@@ -0,0 +1,218 @@
+# SPDX-FileCopyrightText: Copyright © 2026 BBC
+#
+# SPDX-License-Identifier: BSD-3-Clause
+
+from src.validationLogging.validationCodes import ValidationCode
+from src.validationLogging.validationLogger import ValidationLogger
+from src.validationLogging.resultSinks import PlaintextResultSink, \
+    CsvResultSink, NdjsonResultSink, CollatingResultSink, \
+    SqliteResultSink, open_results_database
+from src.validationLogging.validationResult import ERROR, WARN
+import src.validationLogging.validationSummariser as validationSummariser
+from unittest import TestCase
+import io
+import os
+import tempfile
+
+
+class countingFlushBuffer(io.BytesIO):
+    flush_count = 0
+
+    def flush(self) -> None:
+        self.flush_count += 1
+        return super().flush()
+
+
+class testResultSinks(TestCase):
+
+    maxDiff = None
+
+    def _log_results(self, validation_logger: ValidationLogger):
+        validation_logger.good(
+            location='testloc1',
+            message='simulated parse success',
+            code=ValidationCode.xml_parse
+        )
+        for loc in ['testloc1', 'testloc2', 'testloc3']:
+            validation_logger.error(
+                location=loc,
+                message='simulated xml id non-uniqueness',
+                code=ValidationCode.xml_id_unique
+            )
+        validation_logger.warn(
+            location='testloc1',
+            message='simulated ttml document timing warning',
+            code=ValidationCode.ttml_document_timing
+        )
+
+    def _make_stream(self) -> io.TextIOWrapper:
+        return io.TextIOWrapper(
+            buffer=io.BytesIO(), encoding='utf-8', newline='\n')
+
+    def _read_stream(self, stream: io.TextIOWrapper) -> str:
+        stream.flush()
+        stream.seek(0)
+        return stream.read()
+
+    def test_plaintext_sink_matches_write_plaintext(self):
+        streamed = self._make_stream()
+        streaming_logger = ValidationLogger(
+            sinks=[PlaintextResultSink(stream=streamed)])
+        self._log_results(streaming_logger)
+        streaming_logger.closeSinks()
+
+        written = self._make_stream()
+        streaming_logger.write_plaintext(written)
+
+        self.assertEqual(
+            self._read_stream(streamed),
+            self._read_stream(written))
+
+    def test_csv_sink_matches_write_csv(self):
+        streamed = self._make_stream()
+        streaming_logger = ValidationLogger(
+            sinks=[CsvResultSink(stream=streamed)])
+        self._log_results(streaming_logger)
+        streaming_logger.closeSinks()
+
+        written = self._make_stream()
+        streaming_logger.write_csv(written)
+
+        self.assertEqual(
+            self._read_stream(streamed),
+            self._read_stream(written))
+
+    def test_ndjson_sink_matches_write_ndjson(self):
+        streamed = self._make_stream()
+        streaming_logger = ValidationLogger(
+            sinks=[NdjsonResultSink(stream=streamed)])
+        self._log_results(streaming_logger)
+        streaming_logger.closeSinks()
+
+        written = self._make_stream()
+        streaming_logger.write_ndjson(written)
+
+        result = self._read_stream(streamed)
+        self.assertEqual(result, self._read_stream(written))
+        self.assertEqual(
+            result.splitlines()[0],
+            '{"status": 0, "location": "testloc1", '
+            '"message": "simulated parse success", "code": "xml_parse"}')
+
+    def test_sink_writes_before_close(self):
+        stream = self._make_stream()
+        validation_logger = ValidationLogger(
+            sinks=[PlaintextResultSink(stream=stream)])
+        validation_logger.error(
+            location='testloc1',
+            message='simulated xml id non-uniqueness',
+            code=ValidationCode.xml_id_unique
+        )
+        self.assertEqual(
+            stream.buffer.getvalue(),  # ty:ignore[unresolved-attribute]
+            b'Error: xml_id_unique testloc1 '
+            b'simulated xml id non-uniqueness\n')
+
+    def test_flush_every(self):
+        flush_checks = [
+            (1, 5),
+            (2, 2),
+            (0, 0),
+        ]
+        for flush_every, expected_flushes in flush_checks:
+            with self.subTest(flush_every=flush_every):
+                buffer = countingFlushBuffer()
+                stream = io.TextIOWrapper(
+                    buffer=buffer, encoding='utf-8', newline='\n')
+                validation_logger = ValidationLogger(
+                    sinks=[PlaintextResultSink(
+                        stream=stream, flush_every=flush_every)])
+                self._log_results(validation_logger)
+                self.assertEqual(buffer.flush_count, expected_flushes)
+                validation_logger.closeSinks()
+                self.assertEqual(buffer.flush_count, expected_flushes + 1)
+
+    def test_collating_sink(self):
+        stream = self._make_stream()
+        validation_logger = ValidationLogger(
+            sinks=[CollatingResultSink(
+                sink=PlaintextResultSink(stream=stream),
+                more_than=1)])
+        self._log_results(validation_logger)
+        validation_logger.closeSinks()
+        expected = """Success: xml_parse testloc1 simulated parse success
+Error: xml_id_unique testloc1 simulated xml id non-uniqueness
+Warning: ttml_document_timing testloc1 simulated ttml document timing warning
+Error: xml_id_unique 2 further locations simulated xml id non-uniqueness
+"""  # noqa: E501
+        self.assertEqual(self._read_stream(stream), expected)
+
+    def test_unretained_results_are_counted(self):
+        stream = self._make_stream()
+        validation_logger = ValidationLogger(
+            sinks=[PlaintextResultSink(stream=stream)],
+            retain_results=False)
+        self._log_results(validation_logger)
+        validation_logger.closeSinks()
+
+        self.assertEqual(len(validation_logger), 0)
+        self.assertEqual(len(self._read_stream(stream).splitlines()), 5)
+        self.assertEqual(
+            validation_logger.codeStatusCount(
+                code=ValidationCode.xml_id_unique, status=ERROR),
+            3)
+        self.assertEqual(
+            validationSummariser.XmlPassChecker.failuresAndWarningsAndSkips(
+                validation_logger),
+            (3, 0, 0))
+        self.assertEqual(
+            validationSummariser.TtmlPassChecker.failuresAndWarningsAndSkips(
+                validation_logger),
+            (0, 1, 0))
+        self.assertEqual(
+            validation_logger.codeStatusCount(
+                code=ValidationCode.xml_id_unique, status=WARN),
+            0)
+
+    def test_sqlite_sink(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            path = os.path.join(temp_dir, 'results.db')
+            connection = open_results_database(path)
+            self.assertEqual(
+                connection.execute('PRAGMA journal_mode').fetchone()[0],
+                'wal')
+            sink = SqliteResultSink(
+                connection=connection,
+                document='doc1',
+                flavour='bbc',
+                batch_size=2)
+            validation_logger = ValidationLogger(sinks=[sink])
+            self._log_results(validation_logger)
+            # Whole batches are written as they fill
+            reader = open_results_database(path)
+            self.assertEqual(
+                reader.execute('SELECT COUNT(*) FROM results').fetchone(),
+                (4,))
+            validation_logger.closeSinks()
+            self.assertEqual(
+                reader.execute(
+                    'SELECT document, flavour, status, code, location '
+                    'FROM results WHERE status = ? ORDER BY location',
+                    (ERROR,)).fetchall(),
+                [('doc1', 'bbc', ERROR, 'xml_id_unique', loc)
+                 for loc in ['testloc1', 'testloc2', 'testloc3']])
+
+            # Validating the document again replaces its results
+            validation_logger = ValidationLogger(sinks=[SqliteResultSink(
+                connection=path, document='doc1', flavour='bbc')])
+            validation_logger.warn(
+                location='testloc1',
+                message='only result',
+                code=ValidationCode.xml_xsd)
+            validation_logger.closeSinks()
+            self.assertEqual(
+                reader.execute(
+                    'SELECT status, code FROM results').fetchall(),
+                [(WARN, 'xml_xsd')])
+            reader.close()
+            connection.close()
@@ -0,0 +1,43 @@
+# SPDX-FileCopyrightText: Copyright © 2026 BBC
+#
+# SPDX-License-Identifier: BSD-3-Clause
+
+from unittest import TestCase
+import json
+from benchmarks.scalingBenchmark import case_key, compare, default_series, \
+    make_cases
+from benchmarks.ttmlGenerator import DocumentShape
+
+
+class testScalingBenchmark(TestCase):
+
+    def test_base_shape_runs_once(self):
+        cases = make_cases(series=default_series, base_subtitles=100)
+        shape_keys = [
+            json.dumps(shape.asDict(), sort_keys=True)
+            for _, shape in cases]
+        self.assertEqual(len(shape_keys), len(set(shape_keys)))
+        # The base shape is in the first series that has it
+        self.assertEqual(
+            [series for series, shape in cases
+             if shape.asDict() == DocumentShape(subtitles=100).asDict()],
+            ['subtitles'])
+        self.assertIn(
+            ('duration', 7200.0),
+            [(series, shape.duration) for series, shape in cases])
+
+    def test_case_key_includes_series(self):
+        case = {
+            'series': 'styles',
+            'flavour': 'bbc',
+            'valid': True,
+            'shape': {'styles': 10},
+            'docs_per_second': 2.0,
+        }
+        other_series = dict(case, series='regions')
+        self.assertNotEqual(case_key(case), case_key(other_series))
+        self.assertEqual(
+            compare(
+                {'cases': [case]},
+                {'cases': [other_series, dict(case, docs_per_second=1.0)]}),
+            ['styles bbc valid 10: 2.00x'])
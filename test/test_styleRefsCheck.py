@@ -358,6 +358,48 @@ class testStyleRefsCheck(unittest.TestCase):
             vr_errors,
             expected_validation_error_results)
 
+    def test_shared_and_chained_style_refs(self):
+        def style(style_id: str, style_refs: str = '', **attribs):
+            if style_refs:
+                attribs['style'] = style_refs
+            return ElementTree.Element('style', attribs)
+
+        # s1 and s2 both reference s3, which is not a cycle
+        id_to_style_map = {
+            's0': style('s0', 's1 s2', a='0'),
+            's1': style('s1', 's3', b='1'),
+            's2': style('s2', 's3', c='2'),
+            's3': style('s3', b='3', c='3', d='3'),
+        }
+        vr = ValidationLogger()
+        id_to_styleattribs_map = {}
+        valid = styleRefsCheck.styleRefsXmlCheck()._gather_style_attribs(
+            id_to_style_map=id_to_style_map,
+            validation_results=vr,
+            id_to_styleattribs_map=id_to_styleattribs_map)
+        self.assertTrue(valid)
+        self.assertListEqual(list(vr), [])
+        self.assertEqual(
+            id_to_styleattribs_map['s0'],
+            {'a': '0', 'b': '3', 'c': '2', 'd': '3'})
+
+        # Longer than the recursion limit
+        chain_length = 5000
+        id_to_style_map = {
+            's{}'.format(i): style(
+                's{}'.format(i),
+                's{}'.format(i + 1) if i + 1 < chain_length else '',
+                **{'a{}'.format(i % 3): str(i)})
+            for i in range(chain_length)}
+        id_to_styleattribs_map = {}
+        valid = styleRefsCheck.styleRefsXmlCheck()._gather_style_attribs(
+            id_to_style_map=id_to_style_map,
+            validation_results=vr,
+            id_to_styleattribs_map=id_to_styleattribs_map)
+        self.assertTrue(valid)
+        self.assertEqual(
+            id_to_styleattribs_map['s0'], {'a0': '0', 'a1': '1', 'a2': '2'})
+
     def test_background_color_unset_on_non_span(self):
         input_xml = """<?xml version="1.0" encoding="UTF-8"?>
 <tt xml:lang="en-GB"
@@ -0,0 +1,114 @@
+# SPDX-FileCopyrightText: Copyright © 2026 BBC
+#
+# SPDX-License-Identifier: BSD-3-Clause
+
+from concurrent.futures import ThreadPoolExecutor
+from random import Random
+from unittest import TestCase
+import copy
+import sys
+from benchmarks.ttmlGenerator import DocumentShape, generate
+from src.validator import ValidationOptions, _cached_constraint_set, \
+    constraint_set, validate
+
+
+class testThreadSafety(TestCase):
+    """
+    Checks that validation does not depend on state shared between runs,
+    so that documents can be validated in parallel threads sharing the
+    same checks and schemas.
+    """
+
+    thread_count = 8
+    rounds = 3
+
+    def _documents(self) -> list[tuple[str, bytes]]:
+        documents = []
+        for flavour in ['bbc', 'dapt']:
+            for seed in range(3):
+                for valid in [True, False]:
+                    documents.append((flavour, generate(
+                        flavour=flavour,
+                        shape=DocumentShape(
+                            subtitles=20, spans_per_p=2, regions=2),
+                        valid=valid,
+                        seed=seed)))
+
+        # Frame based times are only valid if the frame rate is given
+        dapt_frames = generate(
+            flavour='dapt', shape=DocumentShape(subtitles=20)) \
+            .replace(b'begin="0.000s"', b'begin="0f"')
+        documents.append(('dapt', dapt_frames))
+        documents.append(('dapt', dapt_frames.replace(
+            b'xml:lang="en">', b'xml:lang="en" ttp:frameRate="25">')))
+        return documents
+
+    @staticmethod
+    def _results(document: tuple[str, bytes]) -> list[tuple]:
+        flavour, in_bytes = document
+        report = validate(
+            in_bytes,
+            flavour=flavour,
+            options=ValidationOptions(collate_more_than=3))
+        return [(report.valid, report.failures, report.skips)] + [
+            (r.status, r.code, r.location, r.message) for r in report.results]
+
+    @staticmethod
+    def _checkState(checks: list) -> list:
+        # The attributes of every check and sub-check, with copies of
+        # any containers so that changes to their contents are seen
+        state = []
+        for check in checks:
+            state.append((id(check), [
+                (name, id(value),
+                 copy.copy(value)
+                 if isinstance(value, (list, dict, set)) else None)
+                for name, value in sorted(vars(check).items())]))
+            if hasattr(check, 'subChecks'):
+                state.extend(testThreadSafety._checkState(check.subChecks()))
+        return state
+
+    def test_checks_keep_no_per_run_state(self):
+        documents = self._documents()
+        # Start from checks that have not validated anything yet
+        _cached_constraint_set.cache_clear()
+        for flavour in ['bbc', 'dapt']:
+            with self.subTest(flavour=flavour):
+                constraints = constraint_set(flavour)
+                checks = constraints.preParseChecks() \
+                    + constraints.xmlChecks()
+                before = self._checkState(checks)
+                for document in documents:
+                    if document[0] == flavour:
+                        self._results(document)
+                self.assertEqual(self._checkState(checks), before)
+
+    def test_threaded_results_match_serial(self):
+        """
+        Validates a mix of documents from many threads at once and checks
+        that every result is the same as when validated serially.
+        """
+        documents = self._documents()
+        serial = [self._results(document) for document in documents]
+
+        # Switch threads often to interleave the checks as much as
+        # possible when there is a GIL
+        switch_interval = sys.getswitchinterval()
+        sys.setswitchinterval(1e-6)
+        try:
+            order = []
+            rng = Random(0)
+            for _ in range(self.rounds):
+                round_order = list(range(len(documents)))
+                rng.shuffle(round_order)
+                order.extend(round_order)
+            with ThreadPoolExecutor(max_workers=self.thread_count) as pool:
+                threaded = list(pool.map(
+                    lambda index: (index, self._results(documents[index])),
+                    order))
+        finally:
+            sys.setswitchinterval(switch_interval)
+
+        for index, results in threaded:
+            with self.subTest(document=index):
+                self.assertEqual(results, serial[index])
@@ -0,0 +1,82 @@
+# SPDX-FileCopyrightText: Copyright © 2026 BBC
+#
+# SPDX-License-Identifier: BSD-3-Clause
+
+from unittest import TestCase
+import io
+from benchmarks.ttmlGenerator import DocumentShape, generate, flavours, \
+    clock_time
+from src.ttmlValidator import default_args, validate_ttml
+
+
+class namedTestBuffer(io.BytesIO):
+    name = 'namedTestBuffer'
+
+
+class testTtmlGenerator(TestCase):
+
+    maxDiff = None
+
+    shapes = [
+        DocumentShape(subtitles=3),
+        DocumentShape(
+            subtitles=20,
+            spans_per_p=3,
+            styles=4,
+            style_chain_depth=2,
+            regions=3,
+            duration=3600),
+    ]
+
+    def _validate(self, document: bytes, flavour: str) -> tuple[int, str]:
+        results_out = io.TextIOWrapper(
+            buffer=namedTestBuffer(), encoding='utf-8', newline='\n')
+        args = default_args(
+            ttml_in=namedTestBuffer(document),
+            results_out=results_out,
+            csv=False,
+            json=False,
+            segment=False,
+            segdur=3.84,
+            segment_relative_timing=False,
+            vertical=False,
+            collate_more_than=0,
+            flavour=flavour,
+        )
+        result = validate_ttml(args)
+        results_out.seek(0)
+        return result, results_out.read()
+
+    def test_clock_time(self):
+        self.assertEqual(clock_time(0), '00:00:00.000')
+        self.assertEqual(clock_time(3723.5), '01:02:03.500')
+
+    def test_generate_is_deterministic(self):
+        for flavour in flavours:
+            for valid in [True, False]:
+                with self.subTest(flavour=flavour, valid=valid):
+                    self.assertEqual(
+                        generate(
+                            flavour=flavour, shape=self.shapes[1],
+                            valid=valid, seed=1),
+                        generate(
+                            flavour=flavour, shape=self.shapes[1],
+                            valid=valid, seed=1))
+
+    def test_valid_documents_validate(self):
+        for flavour in flavours:
+            for shape in self.shapes:
+                with self.subTest(flavour=flavour, shape=shape.asDict()):
+                    result, results_text = self._validate(
+                        generate(flavour=flavour, shape=shape), flavour)
+                    self.assertEqual(result, 0, results_text)
+                    self.assertNotIn('Warning:', results_text)
+
+    def test_invalid_documents_fail(self):
+        for flavour in flavours:
+            for shape in self.shapes:
+                with self.subTest(flavour=flavour, shape=shape.asDict()):
+                    result, _ = self._validate(
+                        generate(flavour=flavour, shape=shape, valid=False),
+                        flavour)
+                    self.assertGreater(result, 0)
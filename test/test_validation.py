@@ -3,11 +3,16 @@
 # SPDX-License-Identifier: BSD-3-Clause
 
 from src.validationLogging.validationCodes import ValidationCode
-from src.validationLogging.validationLogger import ValidationLogger
-from src.validationLogging.validationResult import ValidationResult, INFO
+from src.validationLogging.validationLogger import ValidationLogger, \
+    LocationSample
+from src.validationLogging.validationResult import ValidationResult, \
+    GOOD, INFO, WARN
 import src.validationLogging.validationSummariser as validationSummariser
 from unittest import TestCase
+from unittest.mock import patch
+from random import Random
 import io
+import pickle
 
 
 class testValidationLogging(TestCase):
@@ -129,3 +134,202 @@ Error: bbc_timing_gaps testloc1 simulated BBC timing gaps error
                 self.assertEqual(check[1], result_fails)
                 self.assertEqual(check[2], result_warns)
                 self.assertEqual(check[3], result_skips)
+
+    def test_append_time_collation(self):
+        vl = ValidationLogger(
+            collate_more_than=2,
+            collate_sample_first=2,
+            collate_sample_random=0)
+        for v in self.validationLogger:
+            vl.append(v)
+        tf = io.TextIOWrapper(
+            buffer=io.BytesIO(), encoding='utf-8', newline='\n')
+        vl.write_plaintext(tf)
+        tf.seek(0)
+        result = tf.read()
+        expected = """Information: unclassified test location test message
+Success: xml_parse testloc1 simulated parse success
+Warning: xml_id_unqualified testloc1 simulated unqualified id warning
+Error: xml_id_unique 3 locations including testloc1; testloc2 simulated xml id non-uniqueness
+Warning: ttml_document_timing testloc1 simulated ttml document timing warning
+Skip: ebuttd_styling_element_constraint testloc4 simulated ebu-tt-d styling skip
+Error: bbc_timing_gaps testloc1 simulated BBC timing gaps error
+"""  # noqa: E501
+        self.assertEqual(result, expected)
+        self.assertEqual(
+            vl.codeStatusCount(code=ValidationCode.xml_id_unique, status=3),
+            3)
+
+    def test_append_time_collation_is_bounded(self):
+        vl = ValidationLogger(
+            collate_more_than=5,
+            collate_sample_first=3,
+            collate_sample_random=2)
+        for i in range(10000):
+            vl.error(
+                location='loc{}'.format(i),
+                message='repeated error',
+                code=ValidationCode.bbc_timing_gaps)
+        vl.good(
+            location='doc',
+            message='a different message',
+            code=ValidationCode.bbc_timing_gaps)
+
+        self.assertEqual(len(vl), 2)
+        collated_location = vl[0].location
+        self.assertTrue(collated_location.startswith(
+            '10000 locations including loc0; loc1; loc2; loc'))
+        self.assertEqual(len(collated_location.split('; ')), 5)
+        self.assertEqual(vl[1].location, 'doc')
+        self.assertEqual(
+            validationSummariser.BbcPassChecker.failuresAndWarningsAndSkips(
+                vl),
+            (10000, 0, 0))
+
+    def test_collated_list_methods(self):
+        def collated() -> ValidationLogger:
+            vl = ValidationLogger(collate_more_than=2)
+            for i in range(5):
+                vl.warn(location='w{}'.format(i), message='w')
+            vl.info(location='i0', message='i')
+            return vl
+
+        self.assertEqual(
+            [r.location for r in reversed(collated())],
+            ['i0', '5 locations including w0; w1; w2; w3; w4'])
+        popped = collated().pop()
+        self.assertIsInstance(popped, ValidationResult)
+        self.assertEqual(popped.location, 'i0')
+        vl = collated()
+        info = vl[-1]
+        self.assertIn(info, vl)
+        self.assertEqual(vl.index(info), 1)
+        self.assertEqual(vl.count(info), 1)
+        self.assertEqual(len(vl.copy()), 2)
+        self.assertEqual(len(pickle.loads(pickle.dumps(collated()))), 2)
+        vl = collated()
+        vl.insert(0, info)
+        self.assertEqual(
+            [r.location for r in vl],
+            ['i0', '5 locations including w0; w1; w2; w3; w4', 'i0'])
+
+    def test_collated_location_described_when_read(self):
+        vl = ValidationLogger(collate_more_than=2)
+        with patch.object(
+                LocationSample, 'describe', autospec=True,
+                side_effect=LocationSample.describe) as describe:
+            for i in range(1000):
+                vl.warn(location='w{}'.format(i), message='w')
+            # Once, when the results are collated
+            self.assertEqual(describe.call_count, 1)
+            self.assertTrue(vl[0].location.startswith('1000 locations'))
+            self.assertEqual(describe.call_count, 2)
+
+    def test_append_time_collation_between_reads(self):
+        vl = ValidationLogger(
+            collate_more_than=2,
+            collate_sample_first=3,
+            collate_sample_random=0)
+        for i in range(2):
+            vl.warn(location='b{}'.format(i), message='b')
+            vl.error(location='a{}'.format(i), message='a')
+        vl.error(location='a2', message='a')
+        self.assertEqual(
+            [r.location for r in vl],
+            ['b0', '3 locations including a0; a1; a2', 'b1'])
+        # Collating after a read still replaces the right results
+        vl.warn(location='b2', message='b')
+        vl.info(location='c0', message='c')
+        self.assertEqual(len(vl), 3)
+        self.assertEqual(
+            [r.location for r in vl],
+            ['3 locations including b0; b1; b2',
+             '3 locations including a0; a1; a2',
+             'c0'])
+
+    def test_location_sample(self):
+        location_sample = LocationSample(
+            first_count=2, random_count=3, rng=Random(1))
+        for i in range(1000):
+            location_sample.add(str(i))
+        locations = location_sample.locations()
+        self.assertEqual(location_sample.count, 1000)
+        self.assertEqual(len(locations), 5)
+        self.assertEqual(locations[0:2], ['0', '1'])
+        sampled = [int(loc) for loc in locations[2:]]
+        self.assertEqual(sampled, sorted(sampled))
+        self.assertTrue(all(s >= 2 for s in sampled))
+
+    def test_min_status(self):
+        vl = ValidationLogger(min_status=WARN)
+        for v in self.validationLogger:
+            vl.append(v)
+        vl.good(
+            location='testloc5',
+            message='simulated parse success',
+            code=ValidationCode.xml_parse)
+        vl.info(
+            location='testloc5',
+            message='simulated info',
+            code=ValidationCode.xml_parse)
+        vl.warn(
+            location='testloc5',
+            message='simulated warning',
+            code=ValidationCode.xml_parse)
+
+        self.assertFalse(vl.isEnabledFor(INFO))
+        self.assertTrue(vl.isEnabledFor(WARN))
+        self.assertEqual(len(vl), 8)
+        self.assertTrue(all(v.status >= WARN for v in vl))
+        self.assertEqual(
+            vl.codeStatusCount(code=ValidationCode.xml_parse, status=GOOD),
+            2)
+        self.assertEqual(
+            vl.codeStatusCount(code=ValidationCode.xml_parse, status=INFO),
+            1)
+        self.assertEqual(
+            validationSummariser.XmlPassChecker.failuresAndWarningsAndSkips(
+                vl),
+            (3, 2, 0))
+        # Message arguments are only formatted for results that are kept
+        unformattable = object()
+        vl.good(
+            location='testloc6',
+            message='{:.3f}',
+            message_args=(unformattable,),
+            code=ValidationCode.xml_parse)
+        self.assertEqual(len(vl), 8)
+        self.assertEqual(
+            vl.codeStatusCount(code=ValidationCode.xml_parse, status=GOOD),
+            3)
+        vl.warn(
+            location='testloc6',
+            message='{:.3f}rh',
+            message_args=(1.5,),
+            code=ValidationCode.xml_parse)
+        self.assertEqual(vl[-1].message, '1.500rh')
+
+    def test_merge(self):
+        buffered = ValidationLogger(min_status=WARN)
+        for v in self.validationLogger:
+            buffered.append(v)
+        buffered.good(
+            location='testloc5',
+            message='simulated parse success',
+            code=ValidationCode.xml_parse)
+
+        direct = ValidationLogger(min_status=WARN, collate_more_than=1)
+        merged = ValidationLogger(min_status=WARN, collate_more_than=1)
+        for v in self.validationLogger:
+            direct.append(v)
+        direct.good(
+            location='testloc5',
+            message='simulated parse success',
+            code=ValidationCode.xml_parse)
+        merged.merge(buffered)
+
+        self.assertListEqual(merged, direct)
+        self.assertEqual(merged.resultCount(), direct.resultCount())
+        self.assertEqual(
+            merged.codeStatusCount(code=ValidationCode.xml_parse, status=GOOD),
+            direct.codeStatusCount(code=ValidationCode.xml_parse, status=GOOD))
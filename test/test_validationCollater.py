@@ -0,0 +1,217 @@
+# SPDX-FileCopyrightText: Copyright © 2026 BBC
+#
+# SPDX-License-Identifier: BSD-3-Clause
+
+from argparse import Namespace
+from unittest import TestCase
+import io
+import os
+import tempfile
+import time
+from src.validationCollater import PartialSummary, collate_database, \
+    collate_validation, documents_with, summarise_file, update_summary
+from src.validationLogging.resultSinks import SqliteResultSink, \
+    open_results_database
+from src.validationLogging.validationCodes import ValidationCode
+from src.validationLogging.validationResult import ERROR, GOOD, \
+    ValidationResult
+
+# The three files of the example in the module documentation
+example_files = [
+    [('Pass', 'xml_document_validity'),
+     ('Pass', 'ebuttd_document_validity'),
+     ('Fail', 'bbc_document_validity')],
+    [('Pass', 'xml_document_validity'),
+     ('Fail', 'bbc_document_validity')],
+    [('Pass', 'xml_document_validity'),
+     ('Pass', 'ebuttd_document_validity'),
+     ('Pass', 'bbc_document_validity')],
+]
+
+
+class testValidationCollater(TestCase):
+
+    def setUp(self):
+        self._dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self._dir.cleanup)
+
+    def _write_csv(self, name: str, rows: list[tuple[str, str]]) -> str:
+        path = os.path.join(self._dir.name, name)
+        with open(path, 'w', newline='', encoding='utf-8') as csv_file:
+            csv_file.write('status,code,location,message\r\n')
+            for status, code in rows:
+                csv_file.write('{},{},Document,message\r\n'.format(
+                    status, code))
+        return path
+
+    def _write_example(self) -> list[str]:
+        return [
+            self._write_csv('{}.csv'.format(index), rows)
+            for index, rows in enumerate(example_files)]
+
+    def test_collated(self):
+        paths = self._write_example()
+        summary = update_summary(paths=paths, previous=PartialSummary())
+        collated = summary.collated()
+        self.assertEqual(
+            collated['xml_document_validity']['good_count'], 3)
+        self.assertEqual(
+            collated['ebuttd_document_validity']['good_count'], 2)
+        self.assertEqual(
+            collated['bbc_document_validity'],
+            {'good_count': 1, 'info_count': 0, 'warn_count': 0,
+             'error_count': 2, 'skip_count': 0})
+
+    def test_parallel_matches_serial(self):
+        paths = self._write_example() * 4
+        serial = update_summary(paths=paths, previous=PartialSummary())
+        parallel = update_summary(
+            paths=paths, previous=PartialSummary(), workers=2)
+        self.assertEqual(parallel.files, serial.files)
+
+    def test_unchanged_files_are_not_read(self):
+        paths = self._write_example()
+        previous = update_summary(paths=paths, previous=PartialSummary())
+        with self.assertLogs(level='INFO') as logs:
+            summary = update_summary(paths=paths, previous=previous)
+        self.assertIn('Reading 0 new or changed files, 3 unchanged',
+                      logs.output[0])
+        self.assertEqual(summary.files, previous.files)
+
+        # A changed file is read again
+        self._write_csv('1.csv', [('Warn', 'xml_document_validity')])
+        summary = update_summary(paths=paths, previous=previous)
+        self.assertEqual(
+            summary.collated()['xml_document_validity']['warn_count'], 1)
+
+    def test_same_content_is_not_parsed(self):
+        path = self._write_csv('0.csv', example_files[0])
+        _, previous, _ = summarise_file(path)
+        # Statuses are taken from the previous entry if the hash matches
+        previous['statuses'] = {'xml_xsd': ['Fail']}
+        _, entry, _ = summarise_file(path, previous)
+        self.assertEqual(entry['statuses'], {'xml_xsd': ['Fail']})
+        previous['sha256'] = ''
+        _, entry, _ = summarise_file(path, previous)
+        self.assertNotIn('xml_xsd', entry['statuses'])
+
+    def test_unreadable_files_are_left_out(self):
+        paths = self._write_example()
+        paths.append(self._write_csv('bad.csv', [('Pass', 'no_such_code')]))
+        with self.assertLogs(level='ERROR'):
+            summary = update_summary(paths=paths, previous=PartialSummary())
+        self.assertEqual(len(summary.files), 3)
+
+    def test_merge(self):
+        older = {'mtime_ns': 1, 'size': 1, 'sha256': 'a',
+                 'statuses': {'xml_xsd': ['Fail']}}
+        newer = {'mtime_ns': 2, 'size': 1, 'sha256': 'b',
+                 'statuses': {'xml_xsd': ['Pass']}}
+        summary = PartialSummary({'a.csv': older, 'b.csv': newer})
+        summary.merge(PartialSummary({'a.csv': newer, 'b.csv': older,
+                                      'c.csv': older}))
+        self.assertEqual(
+            summary.files, {'a.csv': newer, 'b.csv': newer, 'c.csv': older})
+
+        path = os.path.join(self._dir.name, 'summary.json')
+        summary.save(path)
+        self.assertEqual(PartialSummary.load(path).files, summary.files)
+
+    def test_collate_validation(self):
+        paths = self._write_example()
+        manifest = os.path.join(self._dir.name, 'manifest.json')
+        shard = os.path.join(self._dir.name, 'shard.json')
+        PartialSummary({'elsewhere.csv': {
+            'mtime_ns': 0, 'size': 0, 'sha256': '',
+            'statuses': {'xml_document_validity': ['Fail']}}}).save(shard)
+        results_path = os.path.join(self._dir.name, 'results.txt')
+        with open(results_path, 'w', newline='') as results_out:
+            collate_validation(Namespace(
+                validation_csv_path=os.path.join(self._dir.name, '*.csv'),
+                results_out=results_out,
+                workers=1,
+                manifest=manifest,
+                merge=[shard],
+                summary_out=None,
+                results_db=None,
+                since=None))
+        with open(results_path, 'r', newline='') as results_file:
+            lines = results_file.read().splitlines()
+        self.assertEqual(
+            lines[0],
+            'code,good_count,info_count,warn_count,error_count,skip_count')
+        self.assertIn('xml_document_validity,3,0,0,1,0', lines)
+        self.assertIn('bbc_document_validity,1,0,0,2,0', lines)
+        # The manifest only holds the files found here
+        self.assertEqual(
+            sorted(PartialSummary.load(manifest).files),
+            sorted(os.path.abspath(path) for path in paths))
+
+    def _write_database(self) -> str:
+        path = os.path.join(self._dir.name, 'results.db')
+        status_map = {'Pass': GOOD, 'Fail': ERROR}
+        for index, rows in enumerate(example_files):
+            sink = SqliteResultSink(
+                connection=path, document=str(index), flavour='bbc')
+            for status, code in rows * 2:
+                sink.write(ValidationResult(
+                    status=status_map[status],
+                    code=ValidationCode[code],
+                    location='Document',
+                    message='message'))
+            sink.close()
+        return path
+
+    def test_collate_database(self):
+        connection = open_results_database(self._write_database())
+        self.addCleanup(connection.close)
+        collated, document_count = collate_database(connection)
+        self.assertEqual(document_count, 3)
+        files_collated = update_summary(
+            paths=self._write_example(),
+            previous=PartialSummary()).collated()
+        self.assertEqual(collated, files_collated)
+
+        _, document_count = collate_database(
+            connection, since=time.time() + 60)
+        self.assertEqual(document_count, 0)
+        self.assertEqual(
+            documents_with(
+                connection, ValidationCode.bbc_document_validity),
+            ['0', '1'])
+        self.assertEqual(
+            documents_with(
+                connection,
+                ValidationCode.bbc_document_validity,
+                since=time.time() + 60),
+            [])
+
+    def test_collate_validation_from_database(self):
+        results_path = os.path.join(self._dir.name, 'results.txt')
+        with open(results_path, 'w', newline='') as results_out:
+            collate_validation(Namespace(
+                validation_csv_path=None,
+                results_out=results_out,
+                workers=1,
+                manifest=None,
+                merge=None,
+                summary_out=None,
+                results_db=self._write_database(),
+                since='2000-01-01'))
+        with open(results_path, 'r', newline='') as results_file:
+            lines = results_file.read().splitlines()
+        self.assertIn('xml_document_validity,3,0,0,0,0', lines)
+        self.assertIn('bbc_document_validity,1,0,0,2,0', lines)
+
+    def test_database_is_not_combined_with_csv_files(self):
+        # A document in both would be counted twice
+        with self.assertRaises(ValueError):
+            collate_validation(Namespace(
+                validation_csv_path=os.path.join(self._dir.name, '*.csv'),
+                results_out=io.StringIO(),
+                workers=1,
+                manifest=None,
+                merge=None,
+                summary_out=None,
+                results_db=self._write_database(),
+                since=None))
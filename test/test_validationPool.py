@@ -0,0 +1,59 @@
+# SPDX-FileCopyrightText: Copyright © 2026 BBC
+#
+# SPDX-License-Identifier: BSD-3-Clause
+
+from unittest import TestCase, skipIf
+from benchmarks.ttmlGenerator import DocumentShape, generate
+from src.validationPool import InterpreterPoolExecutor, executor_kinds, \
+    make_executor, validate_batch
+from src.validator import validate
+
+
+class testValidationPool(TestCase):
+
+    def _results(self, report) -> list[tuple]:
+        return [
+            (r.status, r.code, r.location, r.message) for r in report.results]
+
+    def test_validate_batch(self):
+        documents = [
+            generate(
+                flavour='bbc',
+                shape=DocumentShape(subtitles=5),
+                valid=index % 2 == 0,
+                seed=index)
+            for index in range(4)]
+        expected = [
+            self._results(validate(document, flavour='bbc'))
+            for document in documents]
+        for kind in executor_kinds:
+            with self.subTest(kind=kind):
+                with make_executor(kind=kind, max_workers=2) as executor:
+                    reports = list(validate_batch(
+                        executor=executor,
+                        sources=documents,
+                        flavour='bbc'))
+                self.assertEqual(
+                    [report.valid for report in reports],
+                    [True, False, True, False])
+                self.assertEqual(
+                    [self._results(report) for report in reports],
+                    expected)
+
+    def test_unknown_executor_kind(self):
+        with self.assertRaises(ValueError):
+            make_executor(kind='fibre')
+
+    @skipIf(InterpreterPoolExecutor is None,
+            'Interpreter executors need Python 3.14 or later')
+    def test_interpreter_executor(self):
+        self.assertIn('interpreter', executor_kinds)
+        with make_executor(kind='interpreter', max_workers=1) as executor:
+            self.assertIsInstance(executor, InterpreterPoolExecutor)
+
+    @skipIf(InterpreterPoolExecutor is not None,
+            'Interpreter executors are available')
+    def test_interpreter_executor_unavailable(self):
+        self.assertNotIn('interpreter', executor_kinds)
+        with self.assertRaises(ValueError):
+            make_executor(kind='interpreter')
@@ -0,0 +1,190 @@
+# SPDX-FileCopyrightText: Copyright © 2026 BBC
+#
+# SPDX-License-Identifier: BSD-3-Clause
+
+from concurrent.futures import ThreadPoolExecutor
+from http.client import HTTPConnection
+from unittest import TestCase
+import csv
+import io
+import json
+import threading
+import time
+from benchmarks.ttmlGenerator import DocumentShape, generate
+from src.validationService import ServiceBusy, ValidationService, \
+    make_server, request_options
+
+
+class blockingExecutor(ThreadPoolExecutor):
+    """Holds every submitted task until released."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.release = threading.Event()
+        self.submitted = threading.Semaphore(0)
+
+    def submit(self, fn, /, *args, **kwargs):
+        def blocked():
+            self.release.wait(timeout=10)
+            return fn(*args, **kwargs)
+        future = super().submit(blocked)
+        self.submitted.release()
+        return future
+
+
+class testValidationService(TestCase):
+
+    maxDiff = None
+
+    def _start(self, service: ValidationService):
+        server = make_server(service=service, host='127.0.0.1', port=0)
+        thread = threading.Thread(target=server.serve_forever, daemon=True)
+        thread.start()
+
+        def stop():
+            server.shutdown()
+            server.server_close()
+            service.close()
+        self.addCleanup(stop)
+        return server.server_address[1]
+
+    def _request(
+            self,
+            port: int,
+            method: str,
+            path: str,
+            body: bytes | None = None):
+        connection = HTTPConnection('127.0.0.1', port, timeout=30)
+        try:
+            connection.request(method, path, body=body)
+            response = connection.getresponse()
+            return response.status, response.getheaders(), \
+                response.read().decode('utf-8')
+        finally:
+            connection.close()
+
+    def _waitUntilReady(self, port: int):
+        for _ in range(300):
+            status, _, _ = self._request(port, 'GET', '/ready')
+            if status == 200:
+                return
+            time.sleep(0.1)
+        self.fail('Service did not become ready')
+
+    def test_request_options(self):
+        flavour, output_format, options = request_options(
+            'flavour=dapt&format=csv&segment=true&name=3.xml&segdur=2'
+            '&vertical=true')
+        self.assertEqual(flavour, 'dapt')
+        self.assertEqual(output_format, 'csv')
+        self.assertEqual(options.epoch, 4)
+        self.assertEqual(options.segment_dur, 2)
+        self.assertTrue(options.vertical)
+        self.assertFalse(options.segment_relative_timing)
+        self.assertEqual(request_options('flavour=auto')[0], 'auto')
+        # As for -segment, a name without a segment number gives epoch 0
+        with self.assertLogs(level='WARNING'):
+            options = request_options('segment=true&name=subtitles.xml')[2]
+        self.assertEqual(options.epoch, 0)
+        self.assertEqual(options.segment_dur, 3.84)
+        self.assertIsNone(request_options('name=3.xml')[2].segment_dur)
+        for query in ['flavour=ebutt', 'format=xml', 'vertical=maybe',
+                      'segment=3', 'segment=true']:
+            with self.subTest(query=query):
+                with self.assertRaises(ValueError):
+                    request_options(query)
+
+    def test_validate_over_http(self):
+        port = self._start(ValidationService(kind='process', max_workers=2))
+        status, _, body = self._request(port, 'GET', '/health')
+        self.assertEqual((status, json.loads(body)), (200, {'status': 'ok'}))
+        self._waitUntilReady(port)
+
+        document = generate(flavour='bbc', shape=DocumentShape(subtitles=3))
+        status, headers, body = self._request(
+            port, 'POST', '/validate?flavour=bbc', document)
+        self.assertEqual(status, 200)
+        self.assertIn(('X-Document-Valid', 'true'), headers)
+        report = json.loads(body)
+        self.assertTrue(report['valid'])
+        self.assertEqual(report['flavour'], 'bbc')
+
+        invalid_document = generate(
+            flavour='dapt', shape=DocumentShape(subtitles=10), valid=False)
+        status, headers, body = self._request(
+            port, 'POST', '/validate?flavour=dapt&format=csv',
+            invalid_document)
+        self.assertEqual(status, 200)
+        self.assertIn(('X-Document-Valid', 'false'), headers)
+        rows = list(csv.reader(io.StringIO(body)))
+        self.assertEqual(rows[0], ['status', 'code', 'location', 'message'])
+        self.assertIn('Fail', [row[0] for row in rows[1:]])
+
+        status, _, _ = self._request(
+            port, 'POST', '/validate?flavour=imsc', document)
+        self.assertEqual(status, 400)
+        status, _, _ = self._request(port, 'GET', '/nowhere')
+        self.assertEqual(status, 404)
+
+    def test_too_large(self):
+        port = self._start(ValidationService(
+            kind='thread', max_workers=1, max_bytes=10))
+        status, _, _ = self._request(
+            port, 'POST', '/validate', b'<tt>too long</tt>')
+        self.assertEqual(status, 413)
+
+    def test_sheds_load_when_full(self):
+        executor = blockingExecutor(max_workers=1)
+        service = ValidationService(
+            executor=executor, max_workers=1, max_queue=1)
+        port = self._start(service)
+        self.addCleanup(executor.shutdown)
+        self.addCleanup(executor.release.set)
+        document = generate(flavour='bbc', shape=DocumentShape(subtitles=3))
+
+        # The first request holds the only slot until released
+        first_response = []
+        first_request = threading.Thread(
+            target=lambda: first_response.append(self._request(
+                port, 'POST', '/validate', document)))
+        first_request.start()
+        # Wait for the warming task and the first request to be submitted
+        for _ in range(2):
+            self.assertTrue(executor.submitted.acquire(timeout=10))
+        status, headers, _ = self._request(
+            port, 'POST', '/validate', document)
+        self.assertEqual(status, 503)
+        self.assertIn(('Retry-After', '1'), headers)
+
+        executor.release.set()
+        first_request.join(timeout=30)
+        self.assertEqual(first_response[0][0], 200)
+        self._waitUntilReady(port)
+
+    def test_timed_out_documents_hold_their_slots(self):
+        executor = blockingExecutor(max_workers=2)
+        self.addCleanup(executor.shutdown)
+        self.addCleanup(executor.release.set)
+        service = ValidationService(
+            executor=executor, max_workers=1, max_queue=1, timeout=0.1)
+        self.addCleanup(service.close)
+        document = generate(flavour='bbc', shape=DocumentShape(subtitles=3))
+        options = request_options('')[2]
+        with self.assertRaises(TimeoutError):
+            service.validate(document, 'bbc', options)
+        # The timed out job is still running, so counts against the limit
+        with self.assertRaises(ServiceBusy):
+            service.validate(document, 'bbc', request_options('')[2])
+        executor.release.set()
+        for _ in range(100):
+            if service.isReady() and self._slotFree(service):
+                break
+            time.sleep(0.1)
+        report = service.validate(document, 'bbc', request_options('')[2])
+        self.assertTrue(report.valid)
+
+    def _slotFree(self, service: ValidationService) -> bool:
+        if service._slots.acquire(blocking=False):
+            service._slots.release()
+            return True
+        return False
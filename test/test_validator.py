@@ -0,0 +1,528 @@
+# SPDX-FileCopyrightText: Copyright © 2026 BBC
+#
+# SPDX-License-Identifier: BSD-3-Clause
+
+from pathlib import Path
+from tempfile import TemporaryDirectory
+from unittest import TestCase
+from unittest.mock import patch
+import contextlib
+import csv
+import io
+import xml.etree.ElementTree as ElementTree
+from benchmarks.ttmlGenerator import DocumentShape, generate
+from src.validator import ValidationOptions, _ValidationRun, \
+    _cached_constraint_set, _parse, _pre_parse, _read_source, \
+    _select_checks, constraint_set, detect_flavour, parse_document, resume, \
+    validate, validate_flavours
+from src.validationPool import warm_worker
+from src.validationLogging.resourceLimits import ResourceLimits
+from src.validationLogging.validationLogger import ValidationLogger
+from src.validationLogging.validationCodes import ValidationCode
+from src.validationLogging.validationResult import ERROR, GOOD, INFO, \
+    SKIP, WARN
+from src.ttmlValidator import default_args, main, validate_ttml, \
+    validate_ttml_flavours
+
+
+class namedTestBuffer(io.BytesIO):
+    name = 'namedTestBuffer'
+
+
+class testValidator(TestCase):
+
+    maxDiff = None
+
+    def _results(self, report) -> list[tuple]:
+        return [
+            (r.status, r.code, r.location, r.message) for r in report.results]
+
+    def test_bytes_and_path_give_the_same_report(self):
+        document = generate(flavour='bbc', shape=DocumentShape(subtitles=3))
+        bytes_report = validate(document, flavour='bbc')
+        self.assertTrue(bytes_report.valid)
+        self.assertEqual(bytes_report.exitCode(), 0)
+        memoryview_report = validate(memoryview(document), flavour='bbc')
+        self.assertEqual(
+            self._results(memoryview_report), self._results(bytes_report))
+        with TemporaryDirectory() as directory:
+            path = Path(directory) / 'document.xml'
+            path.write_bytes(document)
+            path_report = validate(path, flavour='bbc')
+        self.assertEqual(
+            self._results(path_report), self._results(bytes_report))
+
+    def test_parsed_element(self):
+        document = generate(
+            flavour='dapt', shape=DocumentShape(subtitles=3))
+        root = ElementTree.fromstring(document)
+        before = ElementTree.tostring(root)
+        report = validate(root, flavour='dapt')
+        self.assertTrue(report.valid)
+        self.assertEqual(ElementTree.tostring(root), before)
+        self.assertEqual(
+            report.results.codeStatusCount(ValidationCode.xml_parse, INFO),
+            1)
+        self.assertEqual(
+            report.results.codeStatusCount(
+                ValidationCode.preParse_nullBytes, INFO),
+            0)
+        bytes_report = validate(document, flavour='dapt')
+        self.assertEqual(
+            self._results(report)[-3:], self._results(bytes_report)[-3:])
+        # Nor is it changed when DAPT, whose pruner modifies the tree,
+        # is detected or validated with other flavours
+        validate(root, flavour='auto')
+        validate_flavours(root, ['dapt', 'bbc'])
+        parse_document(root)
+        self.assertEqual(ElementTree.tostring(root), before)
+
+        # No BBC check modifies the tree, so it is not copied
+        bbc_root = ElementTree.fromstring(
+            generate(flavour='bbc', shape=DocumentShape(subtitles=3)))
+        with patch('copy.deepcopy') as deepcopy:
+            self.assertTrue(validate(bbc_root, flavour='bbc').valid)
+        deepcopy.assert_not_called()
+
+    def test_min_status_counts_unbuilt_results(self):
+        document = generate(
+            flavour='bbc', shape=DocumentShape(subtitles=10, spans_per_p=2))
+        report = validate(document, flavour='bbc')
+        warn_report = validate(
+            document, flavour='bbc',
+            options=ValidationOptions(min_status=WARN))
+        for code in [ValidationCode.bbc_text_fontSize_constraint,
+                     ValidationCode.bbc_text_linePadding_constraint]:
+            with self.subTest(code=code):
+                # One for each p, at least
+                self.assertGreaterEqual(
+                    report.results.codeStatusCount(code, GOOD), 10)
+                self.assertEqual(
+                    warn_report.results.codeStatusCount(code, GOOD),
+                    report.results.codeStatusCount(code, GOOD))
+                self.assertNotIn(
+                    code, [result.code for result in warn_report.results])
+
+    def test_invalid_document(self):
+        document = generate(
+            flavour='bbc', shape=DocumentShape(subtitles=10), valid=False)
+        report = validate(
+            document,
+            flavour='bbc',
+            options=ValidationOptions(collate_more_than=5, max_errors=1))
+        self.assertFalse(report.valid)
+        self.assertGreater(report.exitCode(), 0)
+        report_dict = report.asDict()
+        self.assertEqual(report_dict['flavour'], 'bbc')
+        self.assertFalse(report_dict['valid'])
+        self.assertEqual(report.results.statusCount(ERROR), 1)
+        self.assertEqual(len(report_dict['results']), len(report.results))
+
+    def test_tiers(self):
+        summary_codes = [
+            ValidationCode.xml_document_validity,
+            ValidationCode.ttml_document_validity,
+            ValidationCode.ebuttd_document_validity,
+            ValidationCode.bbc_document_validity,
+            ValidationCode.dapt_document_validity,
+        ]
+        for flavour in ['bbc', 'dapt']:
+            for valid in [True, False]:
+                with self.subTest(flavour=flavour, valid=valid):
+                    document = generate(
+                        flavour=flavour,
+                        shape=DocumentShape(subtitles=10),
+                        valid=valid,
+                        seed=1)
+                    report = validate(document, flavour=flavour)
+                    gate_report = validate(
+                        document,
+                        flavour=flavour,
+                        options=ValidationOptions(tier='gate'))
+                    full_report = resume(gate_report)
+                    self.assertEqual(
+                        (gate_report.tier, full_report.tier),
+                        ('gate', 'full'))
+                    self.assertIsNone(full_report.parsed)
+                    self.assertEqual(
+                        report.failures,
+                        gate_report.failures + full_report.failures)
+                    self.assertEqual(
+                        report.valid,
+                        gate_report.valid and full_report.valid)
+                    # Together the tiers log the same results, apart
+                    # from the summaries, and skip nothing
+                    self.assertEqual(
+                        sorted(
+                            (result for result in self._results(report)
+                             if result[1] not in summary_codes),
+                            key=str),
+                        sorted(
+                            (result for tier_report in [
+                                gate_report, full_report]
+                             for result in self._results(tier_report)
+                             if result[1] not in summary_codes),
+                            key=str))
+                    self.assertEqual(
+                        gate_report.results.statusCount(SKIP)
+                        + full_report.results.statusCount(SKIP),
+                        0)
+                    self.assertIn(
+                        'Document (full tier)',
+                        [result.location for result in full_report.results
+                         if result.code.name.endswith('_document_validity')])
+
+    def test_full_tier(self):
+        document = generate(
+            flavour='bbc', shape=DocumentShape(subtitles=10), valid=False,
+            seed=1)
+        full_report = validate(
+            document, flavour='bbc', options=ValidationOptions(tier='full'))
+        gate_report = validate(
+            document, flavour='bbc', options=ValidationOptions(tier='gate'))
+        resumed_report = resume(gate_report)
+        self.assertEqual(full_report.asDict()['tier'], 'full')
+        self.assertEqual(full_report.failures, resumed_report.failures)
+        self.assertIsNone(full_report.parsed)
+        # Parsing is not repeated when resuming
+        self.assertEqual(
+            resumed_report.results.codeStatusCount(
+                ValidationCode.xml_parse, INFO),
+            0)
+        self.assertEqual(
+            resumed_report.results.codeStatusCount(
+                ValidationCode.preParse_nullBytes, INFO),
+            0)
+
+    def test_tier_summaries(self):
+        document = generate(
+            flavour='bbc', shape=DocumentShape(subtitles=3), seed=1)
+        gate_report = validate(
+            document, flavour='bbc', options=ValidationOptions(tier='gate'))
+        self.assertTrue(gate_report.valid)
+        bbc_summaries = [
+            result for result in gate_report.results
+            if result.code == ValidationCode.bbc_document_validity]
+        self.assertEqual(len(bbc_summaries), 1)
+        self.assertEqual(bbc_summaries[0].status, INFO)
+        self.assertEqual(bbc_summaries[0].location, 'Document (gate tier)')
+        self.assertTrue(bbc_summaries[0].message.startswith(
+            'Document passes the gate tier of BBC checks with 0 '
+            'BBC-related failures'))
+        self.assertNotIn('should play okay', bbc_summaries[0].message)
+        self.assertNotIn(
+            GOOD,
+            [result.status for result in gate_report.results
+             if result.code.name.endswith('_document_validity')])
+
+    def test_full_tier_prerequisites(self):
+        document = generate(
+            flavour='bbc', shape=DocumentShape(subtitles=10), valid=False,
+            seed=1)
+        gate_report = validate(
+            document, flavour='bbc', options=ValidationOptions(tier='gate'))
+        full_report = validate(
+            document, flavour='bbc', options=ValidationOptions(tier='full'))
+        resumed_report = resume(gate_report)
+        self.assertIsNone(resumed_report.prerequisites)
+        # The gate checks the full tier needs are reported apart
+        self.assertEqual(
+            self._results(full_report), self._results(resumed_report))
+        self.assertEqual(full_report.valid, resumed_report.valid)
+        self.assertEqual(
+            full_report.prerequisites.codeStatusCount(
+                ValidationCode.preParse_nullBytes, GOOD),
+            1)
+        self.assertIn(
+            'Document (gate tier prerequisites)',
+            [result.location for result in full_report.prerequisites])
+        # A document the full tier cannot check is not valid
+        unparsed = validate(b'<tt', options=ValidationOptions(tier='full'))
+        self.assertFalse(unparsed.valid)
+        self.assertGreater(unparsed.results.statusCount(SKIP), 0)
+        self.assertEqual(
+            unparsed.prerequisites.codeStatusCount(
+                ValidationCode.xml_parse, ERROR),
+            1)
+
+    def test_resume_errors(self):
+        unparsed = validate(b'<tt', options=ValidationOptions(tier='gate'))
+        self.assertFalse(unparsed.valid)
+        self.assertIsNone(unparsed.parsed)
+        with self.assertRaises(ValueError):
+            resume(unparsed)
+        with self.assertRaises(ValueError):
+            resume(validate(generate(
+                flavour='bbc', shape=DocumentShape(subtitles=3))))
+        with self.assertRaises(ValueError):
+            validate(b'<tt/>', options=ValidationOptions(tier='fast'))
+        parsed = validate(
+            generate(flavour='bbc', shape=DocumentShape(subtitles=3)),
+            options=ValidationOptions(tier='gate')).parsed
+        with self.assertRaises(ValueError):
+            validate(parsed, flavour='dapt',
+                     options=ValidationOptions(tier='full'))
+        with self.assertRaises(ValueError):
+            validate(parsed, flavour='bbc')
+
+    def test_validate_ttml_full_out(self):
+        document = generate(
+            flavour='bbc', shape=DocumentShape(subtitles=10), valid=False,
+            seed=1)
+        results_out, full_out = [
+            io.TextIOWrapper(
+                buffer=namedTestBuffer(), encoding='utf-8', newline='\n')
+            for _ in range(2)]
+        result = validate_ttml(default_args(
+            ttml_in=namedTestBuffer(document),
+            results_out=results_out,
+            full_out=full_out,
+            tier='gate',
+            csv=True,
+            json=False,
+            segment=False,
+            segdur=3.84,
+            segment_relative_timing=False,
+            vertical=False,
+            collate_more_than=0,
+            flavour='bbc'))
+        report = validate(document, flavour='bbc')
+        self.assertEqual(result, report.exitCode())
+        for out, tier in [(results_out, 'gate'), (full_out, 'full')]:
+            out.seek(0)
+            rows = list(csv.reader(out))
+            self.assertEqual(
+                set(row[2] for row in rows
+                    if row[1].endswith('_document_validity')),
+                {'Document ({} tier)'.format(tier)})
+
+    def test_detect_flavour(self):
+        for flavour in ['bbc', 'dapt']:
+            with self.subTest(flavour=flavour):
+                document = generate(
+                    flavour=flavour, shape=DocumentShape(subtitles=3))
+                self.assertEqual(
+                    detect_flavour(ElementTree.fromstring(document)),
+                    flavour)
+                report = validate(document, flavour='auto')
+                self.assertEqual(report.flavour, flavour)
+                self.assertEqual(
+                    self._results(report),
+                    self._results(validate(document, flavour=flavour)))
+        self.assertEqual(detect_flavour(None), 'bbc')
+        self.assertEqual(
+            detect_flavour(ElementTree.fromstring(
+                '<tt xmlns="http://www.w3.org/ns/ttml" '
+                'xmlns:daptm="http://www.w3.org/ns/ttml/profile/'
+                'dapt#metadata" '
+                'daptm:scriptType="originalTranscript"/>')),
+            'dapt')
+        unparsed = validate(b'<tt', flavour='auto')
+        self.assertEqual(unparsed.flavour, 'bbc')
+        self.assertFalse(unparsed.valid)
+
+    def test_validate_flavours(self):
+        for flavour in ['bbc', 'dapt']:
+            for valid in [True, False]:
+                with self.subTest(flavour=flavour, valid=valid):
+                    document = generate(
+                        flavour=flavour,
+                        shape=DocumentShape(subtitles=10),
+                        valid=valid,
+                        seed=1)
+                    # DAPT prunes the tree, so runs after BBC, or on a
+                    # copy if there is another flavour after it
+                    for order in [['dapt', 'bbc'], ['dapt', 'dapt', 'bbc']]:
+                        reports = validate_flavours(document, order)
+                        self.assertEqual(list(reports), ['dapt', 'bbc'])
+                        for report_flavour, report in reports.items():
+                            self.assertEqual(
+                                self._results(report),
+                                self._results(validate(
+                                    document, flavour=report_flavour)))
+        with self.assertRaises(ValueError):
+            validate_flavours(b'<tt/>', ['bbc', 'auto'])
+        reports = validate_flavours(b'<tt', ['bbc', 'dapt'])
+        self.assertFalse(any(report.valid for report in reports.values()))
+
+    def test_parse_document(self):
+        document = generate(flavour='bbc', shape=DocumentShape(subtitles=3))
+        parsed = parse_document(document)
+        self.assertIsNone(parsed.flavour)
+        self.assertEqual(parsed.context['document_index'], {})
+        report = validate(parsed, flavour='bbc')
+        self.assertIn(
+            'xmlId_to_element_map', parsed.context['document_index'])
+        # The index built for one flavour is used by the next
+        self.assertEqual(
+            self._results(validate(parsed, flavour='bbc')),
+            self._results(report))
+        self.assertEqual(
+            self._results(report),
+            self._results(validate(document, flavour='bbc')))
+
+    def test_validate_ttml_flavours(self):
+        document = generate(
+            flavour='dapt', shape=DocumentShape(subtitles=3), seed=1)
+        results_out = io.TextIOWrapper(
+            buffer=namedTestBuffer(), encoding='utf-8', newline='\n')
+        args = default_args(
+            ttml_in=namedTestBuffer(document),
+            results_out=results_out,
+            flavour='bbc,dapt',
+            csv=True,
+            json=False,
+            segment=False,
+            segdur=3.84,
+            segment_relative_timing=False,
+            vertical=False,
+            collate_more_than=0)
+        self.assertEqual(validate_ttml_flavours(args), 1)
+        results_out.seek(0)
+        rows = list(csv.reader(results_out))
+        self.assertEqual(rows[0][0], 'flavour')
+        self.assertEqual(set(row[0] for row in rows[1:]), {'bbc', 'dapt'})
+
+    def test_default_args(self):
+        args = default_args(flavour='dapt', max_errors=3)
+        self.assertEqual(args.flavour, 'dapt')
+        self.assertEqual(args.max_errors, 3)
+        self.assertEqual(args.min_status, 'pass')
+        self.assertIs(args.func, validate_ttml)
+        with self.assertRaises(TypeError):
+            default_args(no_such_option=True)
+
+    def test_json_stream_is_rejected(self):
+        with patch('sys.argv', ['ttmlValidator', '-json', '-stream']), \
+                contextlib.redirect_stderr(io.StringIO()) as stderr, \
+                self.assertRaises(SystemExit):
+            main()
+        self.assertIn('-stream cannot write -json output', stderr.getvalue())
+
+    def test_constraint_sets_are_cached(self):
+        self.assertIs(constraint_set('bbc'), constraint_set('bbc'))
+        self.assertIs(
+            constraint_set('bbc'),
+            constraint_set(
+                flavour='bbc',
+                epoch=0,
+                segment_dur=None,
+                segment_relative_timing=False))
+        self.assertIsNot(
+            constraint_set('bbc'),
+            constraint_set('bbc', epoch=3.84, segment_dur=3.84))
+
+    def test_segments_share_constraint_sets(self):
+        document = generate(
+            flavour='bbc', shape=DocumentShape(subtitles=3), seed=1)
+        warm_worker(ValidationOptions(segment_dur=3.84))
+        misses = _cached_constraint_set.cache_info().misses
+        overlap_errors = [
+            validate(
+                document, flavour='bbc',
+                options=ValidationOptions(epoch=epoch, segment_dur=3.84))
+            .results.codeStatusCount(
+                ValidationCode.bbc_timing_segment_overlap, ERROR)
+            for epoch in [0, 3.84, 384]]
+        self.assertEqual(_cached_constraint_set.cache_info().misses, misses)
+        # Each document is still checked against its own epoch
+        self.assertEqual(overlap_errors, [0, 0, 1])
+
+    def test_bad_arguments(self):
+        with self.assertRaises(ValueError):
+            validate(b'<tt/>', flavour='unknown')
+        with self.assertRaises(TypeError):
+            validate('<tt/>', flavour='bbc')
+
+
+class testValidationStages(TestCase):
+
+    def _run(self, **limits) -> _ValidationRun:
+        return _ValidationRun(
+            validation_results=ValidationLogger(),
+            resource_limits=ResourceLimits(**limits),
+            error_budget=ValidationOptions().errorBudget())
+
+    def test_select_checks(self):
+        constraints = constraint_set('dapt')
+        options = ValidationOptions()
+        check_order, tier_checks, location = _select_checks(
+            constraints, options, resumed=False, parse_only=False,
+            prerequisites=False)
+        self.assertEqual(
+            sorted(check_order), list(range(len(constraints.xmlChecks()))))
+        self.assertEqual((tier_checks, location), (None, 'Document'))
+
+        self.assertEqual(
+            _select_checks(
+                constraints, options, resumed=False, parse_only=True,
+                prerequisites=False),
+            ([], None, 'Document'))
+
+        gate_checks = set(constraints.tierChecks('gate'))
+        check_order, tier_checks, location = _select_checks(
+            constraints, ValidationOptions(tier='full'), resumed=True,
+            parse_only=False, prerequisites=False)
+        self.assertEqual(tier_checks, set(constraints.tierChecks('full')))
+        self.assertFalse(gate_checks.intersection(check_order))
+        self.assertEqual(location, 'Document (full tier)')
+
+        check_order, tier_checks, location = _select_checks(
+            constraints, ValidationOptions(tier='full'), resumed=False,
+            parse_only=False, prerequisites=True)
+        self.assertTrue(gate_checks.issuperset(check_order))
+        self.assertEqual(tier_checks, set(check_order))
+        self.assertEqual(location, 'Document (gate tier prerequisites)')
+
+        with self.assertRaises(ValueError):
+            _select_checks(
+                constraints, ValidationOptions(tier='none'), resumed=False,
+                parse_only=False, prerequisites=False)
+
+    def test_read_source(self):
+        root = ElementTree.fromstring(b'<tt/>')
+        self.assertIs(_read_source(root, ResourceLimits(), False)[0], root)
+        copied = _read_source(root, ResourceLimits(), True)[0]
+        self.assertIsNot(copied, root)
+        self.assertEqual(copied.tag, 'tt')
+        self.assertEqual(
+            _read_source(b'<tt/>', ResourceLimits(), False),
+            (None, b'<tt/>', None))
+        # Read only far enough to tell that it is too large
+        self.assertEqual(
+            _read_source(io.BytesIO(b'<tt/>'), ResourceLimits(max_bytes=2),
+                         False),
+            (None, b'<tt', None))
+        root, in_bytes, error = _read_source(
+            b'\x1f\x8bnot gzip', ResourceLimits(), False)
+        self.assertIsNone(in_bytes)
+        self.assertIsNotNone(error)
+
+    def test_pre_parse_and_parse(self):
+        constraints = constraint_set('bbc')
+        xml_codes = [ValidationCode.xml_xsd]
+
+        run = self._run()
+        in_bytes = _pre_parse(
+            run, constraints.preParseChecks(), b'<tt/>', None, xml_codes)
+        root = _parse(run, in_bytes, xml_codes)
+        self.assertEqual(root.tag, 'tt')
+        self.assertTrue(run.valid)
+
+        run = self._run()
+        self.assertIsNone(_parse(run, b'<tt', xml_codes))
+        self.assertFalse(run.valid)
+        self.assertEqual(
+            run.validation_results.codeStatusCount(
+                ValidationCode.xml_parse, ERROR),
+            1)
+
+        # Stopping skips the codes of every later stage
+        run = self._run(max_bytes=2)
+        self.assertIsNone(_pre_parse(
+            run, constraints.preParseChecks(), b'<tt/>', None, xml_codes))
+        self.assertFalse(run.valid)
+        for code in [ValidationCode.xml_parse, ValidationCode.xml_xsd]:
+            with self.subTest(code=code):
+                self.assertEqual(
+                    run.validation_results.codeStatusCount(code, SKIP), 1)
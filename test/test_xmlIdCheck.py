@@ -82,6 +82,26 @@ class testXmlIdCheck(unittest.TestCase):
         )
         self.assertListEqual(vr, [expected_validation_result])
 
+    def test_xmlIdCheck_uses_document_index(self):
+        input_elementtree = ElementTree.fromstring(
+            '<tt xmlns="http://www.w3.org/ns/ttml"><body>'
+            '<div xml:id="d1"/><div xml:id="d1"/></body></tt>')
+        document_index = {}
+        maps = []
+        for _ in range(2):
+            context = {'document_index': document_index}
+            vr = ValidationLogger()
+            valid = duplicateXmlIdCheck().run(
+                input=input_elementtree,
+                context=context,
+                validation_results=vr
+            )
+            self.assertFalse(valid)
+            self.assertEqual(len(vr), 1)
+            maps.append(context['xmlId_to_element_map'])
+        self.assertIs(maps[0], maps[1])
+        self.assertIs(document_index['xmlId_to_element_map'], maps[0])
+
     def test_IDREFS_good(self):
         """
         Test all the happy paths